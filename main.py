@@ -8,12 +8,13 @@
 import sys
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.core.crawler import Alibaba1688Crawler
+# 爬虫和调度器模块会加载selenium、requests等依赖，在实际运行时才导入（--help等命令可快速返回）
 from src.core.config import CrawlerConfig
 
 
@@ -44,7 +45,7 @@ def get_user_input() -> tuple:
         print("\n📋 选择搜索流程：")
         print("1. 智能流程（优先缓存URL，自动降级，推荐）")
         print("2. 严格流程（按指定步骤执行：主页→弹窗→搜索→新标签页URL构造）")
-        print("3. 流程控制（严格按照process.txt文件步骤执行，用户确认每步）")
+        print("3. 流程控制（严格按照流程步骤执行，用户确认每步）")
         flow_choice = input("请选择流程 (1-3, 默认: 1): ").strip() or "1"
 
         # 获取搜索关键词
@@ -103,9 +104,45 @@ def print_results_summary(products: list, keyword: str):
         print(f"  ... 还有 {len(products) - 3} 个商品")
 
 
+def print_export_outputs(outputs: dict):
+    """打印导出文件列表"""
+    labels = {'jsonl': '📝 JSONL', 'csv': '📑 CSV', 'excel': '📊 Excel', 'json': '📄 JSON', 'parquet': '🗃️ Parquet'}
+    for format_type, filepath in outputs.items():
+        print(f"   {labels.get(format_type, format_type)}: {filepath}")
+
+
+def report_stream_result(keyword: str, result: dict):
+    """打印流式搜索的结果"""
+    if result.get('skipped'):
+        print(f"⏭️ {keyword}: 已在以前的运行中完成 ({result['count']} 个商品)")
+        print_export_outputs(result['outputs'])
+    elif result['count']:
+        print(f"✅ {keyword}: 获取 {result['count']} 个商品")
+        print_export_outputs(result['outputs'])
+    else:
+        print(f"❌ {keyword}: 未获取到商品")
+
+
+def finish_profiling():
+    """启用性能分析时打印阶段耗时汇总并导出"""
+    from src.utils.profiler import get_profiler
+
+    profiler = get_profiler()
+    if not profiler.enabled:
+        return
+
+    profiler.print_summary()
+    outputs = profiler.export()
+    for format_type, filepath in outputs.items():
+        print(f"⏱️ 性能分析({format_type}): {filepath}")
+
+
 def main():
     """主函数"""
+    from src.core.crawler import Alibaba1688Crawler
+
     crawler = None
+    stream = None
 
     try:
         # 获取用户输入
@@ -137,17 +174,24 @@ def main():
             products = crawler.search_products_strict_flow(keyword, pages=pages)
         elif flow_choice == "3":
             print("🔄 使用流程控制搜索...")
-            print("⚠️  注意：此流程会严格按照process.txt文件的步骤执行，每步都需要用户确认")
+            print("⚠️  注意：此流程会严格按照流程步骤执行，每步都需要用户确认")
             products = crawler.search_products_with_process_control(keyword, pages=pages)
         else:
             print("🧠 使用智能流程搜索...")
-            products = crawler.search_products(keyword, pages=pages)
+            # 每页提取后立即追加写入，程序中断时已抓取的数据不会丢失
+            stream = crawler.data_exporter.open_stream(keyword)
+            products = crawler.search_products(keyword, pages=pages, on_page=stream)
 
         # 打印结果摘要
         print_results_summary(products, keyword)
 
         # 保存数据
-        if products:
+        if stream:
+            print(f"\n💾 正在生成最终文件...")
+            outputs = stream.finalize()
+            crawler.mark_exported(products, keyword)
+            print_export_outputs(outputs)
+        elif products:
             print(f"\n💾 正在保存数据...")
 
             # 保存到Excel
@@ -160,6 +204,8 @@ def main():
             if json_filename:
                 print(f"📄 JSON文件: {json_filename}")
 
+            # 写入磁盘后才记为已导出，保存失败的商品下次仍会抓取
+            crawler.mark_exported(products, keyword, saved=bool(excel_filename or json_filename))
             if excel_filename or json_filename:
                 print("✅ 数据保存完成！")
             else:
@@ -179,49 +225,85 @@ def main():
         logging.error(f"程序执行出错: {e}", exc_info=True)
     finally:
         # 清理资源
+        if stream:
+            stream.close()
         if crawler:
             print(f"\n🧹 正在清理资源...")
             crawler.close()
 
+        finish_profiling()
         print("👋 程序结束")
 
 
 def run_batch_mode(keywords: list, base_url: str = "https://www.1688.com",
-                   pages: int = 1, flow_choice: str = "1"):
+                   pages: int = 1, flow_choice: str = "1", workers: int = 1,
+                   headless: bool = False):
     """
     批量模式运行
     :param keywords: 关键词列表
     :param base_url: 基础URL
     :param pages: 爬取页数
     :param flow_choice: 流程选择
+    :param workers: 并发浏览器实例数，大于1时使用驱动池并发处理
+    :param headless: 是否使用无头模式
     """
+    from src.core.crawler import Alibaba1688Crawler
+
     print(f"🔄 批量模式：处理 {len(keywords)} 个关键词")
 
     config = CrawlerConfig()
 
-    with Alibaba1688Crawler(base_url=base_url, headless=False, config=config) as crawler:
+    if workers > 1:
+        if flow_choice != "1":
+            print("⚠️ 并发模式仅支持智能流程，已切换为智能流程")
+        run_batch_with_pool(keywords, base_url, pages, workers, headless, config)
+        finish_profiling()
+        print("🎉 批量处理完成！")
+        return
+
+    with Alibaba1688Crawler(base_url=base_url, headless=headless, config=config) as crawler:
         for i, keyword in enumerate(keywords, 1):
             try:
                 print(f"\n📍 [{i}/{len(keywords)}] 处理关键词: {keyword}")
 
+                # 智能流程在流式写入中按页续抓，其他流程按关键词整体跳过（记录目标页数，完成后才能被识别）
+                if flow_choice in ("2", "3") and crawler.journal.begin_keyword(keyword, crawler.site, pages).done:
+                    print(f"⏭️ {keyword}: 已在以前的运行中完成，跳过")
+                    continue
+
                 if flow_choice == "2":
                     products = crawler.search_products_strict_flow(keyword, pages=pages)
                 elif flow_choice == "3":
                     products = crawler.search_products_with_process_control(keyword, pages=pages)
                 else:
-                    products = crawler.search_products(keyword, pages=pages)
+                    # 智能流程流式写入，长时间批量运行内存占用不随结果增长
+                    result = crawler.search_products_to_stream(keyword, pages=pages)
+                    report_stream_result(keyword, result)
+                    continue
 
                 if products:
                     # 保存数据
                     excel_filename = crawler.save_to_excel(products, keyword)
                     json_filename = crawler.save_to_json(products, keyword)
+                    saved = bool(excel_filename or json_filename)
+                    crawler.mark_exported(products, keyword, saved=saved)
+                    # 保存失败时记为failed，下次运行重新抓取
+                    crawler.journal.finish_keyword(
+                        keyword, crawler.site, products=len(products), status='done' if saved else 'failed',
+                        outputs={name: path for name, path in (('excel', excel_filename), ('json', json_filename)) if path}
+                    )
 
                     print(f"✅ {keyword}: 获取 {len(products)} 个商品")
                     if excel_filename:
                         print(f"   📊 Excel: {excel_filename}")
                     if json_filename:
                         print(f"   📄 JSON: {json_filename}")
+                elif crawler.last_found:
+                    # 找到了商品但都已在以前导出过，关键词同样已完成
+                    crawler.journal.finish_keyword(keyword, crawler.site, products=0, status='done')
+                    print(f"⏭️ {keyword}: 找到 {crawler.last_found} 个商品，均已在以前导出过")
                 else:
+                    crawler.journal.finish_keyword(keyword, crawler.site, products=0, status='failed')
                     print(f"❌ {keyword}: 未获取到商品")
 
             except Exception as e:
@@ -229,9 +311,97 @@ def run_batch_mode(keywords: list, base_url: str = "https://www.1688.com",
                 logging.error(f"处理关键词 '{keyword}' 时出错: {e}")
                 continue
 
+    finish_profiling()
+    print("🎉 批量处理完成！")
+
+
+def run_async_batch(keywords: list, base_url: str, pages: int, concurrency: int, headless: bool = False):
+    """
+    异步并发批量模式：HTTP获取器并发抓取所有关键词×页，按主机令牌桶控制访问频率
+    :param keywords: [(关键词, 优先级)]
+    :param base_url: 基础URL
+    :param pages: 爬取页数
+    :param concurrency: 并发任务数
+    :param headless: 浏览器回退时是否使用无头模式
+    """
+    from src.core.async_scheduler import AsyncKeywordScheduler
+
+    config = CrawlerConfig()
+    config.DEFAULT_BASE_URL = base_url
+
+    jobs = AsyncKeywordScheduler(config, concurrency=concurrency, pages=pages).run(keywords)
+
+    fallback = []
+    for job in jobs.values():
+        report_stream_result(job.keyword, {'count': job.count, 'outputs': job.outputs, 'skipped': job.skipped})
+        if job.needs_browser:
+            fallback.append(job.keyword)
+
+    if fallback and config.SCHEDULER['browser_fallback']:
+        from src.core.crawler import Alibaba1688Crawler
+        print(f"\n🔁 {len(fallback)} 个关键词被拦截或需要浏览器渲染，使用浏览器重新处理...")
+        with Alibaba1688Crawler(base_url=base_url, headless=headless, config=config) as crawler:
+            for keyword in fallback:
+                try:
+                    result = crawler.search_products_to_stream(keyword, pages=pages)
+                    report_stream_result(f"{keyword} (浏览器)", result)
+                except Exception as e:
+                    print(f"❌ 处理关键词 '{keyword}' 时出错: {e}")
+                    logging.error(f"处理关键词 '{keyword}' 时出错: {e}")
+
+    finish_profiling()
     print("🎉 批量处理完成！")
 
 
+def _crawl_keyword_with_pool(pool, keyword: str, base_url: str, pages: int, config: CrawlerConfig) -> int:
+    """
+    从驱动池借用浏览器处理单个关键词
+    :return: 获取的商品数量
+    """
+    from src.core.crawler import Alibaba1688Crawler
+
+    with pool.driver() as pooled:
+        crawler = Alibaba1688Crawler(base_url=base_url, config=config, driver=pooled.driver,
+                                     rate_limiter=pool.rate_limiter)
+        result = crawler.search_products_to_stream(keyword, pages=pages)
+        pooled.pages_in_use = result['pages']
+        report_stream_result(f"{keyword} (浏览器 #{pooled.index + 1})", result)
+        return result['count']
+
+
+def run_batch_with_pool(keywords: list, base_url: str, pages: int, workers: int,
+                        headless: bool, config: CrawlerConfig):
+    """
+    使用预热的驱动池并发处理关键词
+    :param keywords: 关键词列表
+    :param base_url: 基础URL
+    :param pages: 爬取页数
+    :param workers: 并发浏览器实例数
+    :param headless: 是否使用无头模式
+    :param config: 爬虫配置对象
+    """
+    from src.drivers.driver_pool import DriverPool
+
+    config.DEFAULT_BASE_URL = base_url
+    workers = min(workers, len(keywords)) or 1
+
+    with DriverPool(size=workers, config=config, headless=headless) as pool:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_crawl_keyword_with_pool, pool, keyword, base_url, pages, config): keyword
+                for keyword in keywords
+            }
+
+            for done, future in enumerate(as_completed(futures), 1):
+                keyword = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"❌ 处理关键词 '{keyword}' 时出错: {e}")
+                    logging.error(f"处理关键词 '{keyword}' 时出错: {e}")
+                print(f"📍 进度 [{done}/{len(keywords)}]")
+
+
 def show_help():
     """显示帮助信息"""
     help_text = """
@@ -249,21 +419,64 @@ def show_help():
     --site SITE     指定站点 (1688 或 global)
     --pages N       爬取页数 (默认: 1)
     --flow FLOW     搜索流程 (1=智能, 2=严格, 3=流程控制, 默认: 1)
+    --workers N     批量模式并发浏览器数 (默认: 1，大于1时使用预热的驱动池)
+    --async         批量模式使用异步调度：复用已保存的Cookie并发HTTP抓取，
+                    按主机令牌桶控制访问频率，被拦截的关键词最后用浏览器重新处理
+    --concurrency N 异步调度的并发任务数 (默认: 4)
+    --no-dedup      不跳过以前已抓取过的商品（默认按商品ID跨页、跨关键词、跨运行去重）
+    --unattended    无人值守模式：弹窗确认和流程确认按检测结果自动决策，不读取标准输入
+                    （标准输入不是终端时自动开启）
+    --profile       记录各阶段耗时和WebDriver命令数，结束时打印汇总并导出JSON/Prometheus文件
+    --no-resume     忽略抓取日志中以前的进度，所有关键词从第1页重新抓取
+                    （默认跳过已完成的关键词，中断的关键词从下一页继续并追加到原输出文件）
+    --fresh-profile 使用临时Chrome用户数据目录并在结束后删除（默认复用 outputs/chrome_profiles 下的目录，
+                    保留HTTP缓存和登录状态）
+    --fetch-mode M  搜索结果页获取方式 (browser=全程浏览器, http=复用已保存的Cookie直接HTTP获取，
+                    遇到登录或验证时回退浏览器, auto=有Cookie时按http, 默认: browser)
 
 示例:
     python main.py --batch keywords.txt --site 1688 --pages 2
+    python main.py --batch keywords.txt --workers 3 --headless
+    python main.py --batch keywords.txt --flow 3 --unattended
+    python main.py --batch keywords.txt --pages 5 --fetch-mode http
+    python main.py --batch keywords.txt --pages 3 --async --concurrency 8
     python main.py --headless --flow 2
 
 批量模式文件格式:
-    每行一个关键词，例如：
+    每行一个关键词，可以用 "关键词|优先级" 指定优先级（数值越大越先处理），例如：
     手机
-    电脑
+    电脑|5
     耳机
     """
     print(help_text)
 
 
 if __name__ == "__main__":
+    # 全局选项
+    if "--no-dedup" in sys.argv:
+        sys.argv.remove("--no-dedup")
+        CrawlerConfig.DEDUP['enabled'] = False
+    if "--unattended" in sys.argv:
+        sys.argv.remove("--unattended")
+        CrawlerConfig.UNATTENDED['enabled'] = True
+    if "--profile" in sys.argv:
+        sys.argv.remove("--profile")
+        CrawlerConfig.PROFILING['enabled'] = True
+    if "--no-resume" in sys.argv:
+        sys.argv.remove("--no-resume")
+        CrawlerConfig.JOURNAL['resume'] = False
+    if "--fresh-profile" in sys.argv:
+        sys.argv.remove("--fresh-profile")
+        CrawlerConfig.PROFILE_STORE['enabled'] = False
+    if "--fetch-mode" in sys.argv:
+        fetch_index = sys.argv.index("--fetch-mode")
+        fetch_mode = sys.argv[fetch_index + 1] if fetch_index + 1 < len(sys.argv) else ''
+        if fetch_mode not in ('browser', 'http', 'auto'):
+            print("❌ --fetch-mode 只能是 browser、http 或 auto")
+            sys.exit(1)
+        del sys.argv[fetch_index:fetch_index + 2]
+        CrawlerConfig.FETCH['mode'] = fetch_mode
+
     # 检查命令行参数
     if len(sys.argv) > 1:
         if "--help" in sys.argv or "-h" in sys.argv:
@@ -275,9 +488,10 @@ if __name__ == "__main__":
                 if batch_index + 1 < len(sys.argv):
                     keywords_file = sys.argv[batch_index + 1]
 
-                    # 读取关键词文件
-                    with open(keywords_file, 'r', encoding='utf-8') as f:
-                        keywords = [line.strip() for line in f if line.strip()]
+                    # 读取关键词文件（按优先级排序）
+                    from src.core.async_scheduler import load_keywords
+                    keyword_items = load_keywords(keywords_file, CrawlerConfig.SCHEDULER['default_priority'])
+                    keywords = [keyword for keyword, _ in keyword_items]
 
                     # 解析其他参数
                     base_url = "https://www.1688.com"
@@ -300,8 +514,25 @@ if __name__ == "__main__":
                         if flow_index + 1 < len(sys.argv):
                             flow_choice = sys.argv[flow_index + 1]
 
+                    workers = 1
+                    if "--workers" in sys.argv:
+                        workers_index = sys.argv.index("--workers")
+                        if workers_index + 1 < len(sys.argv):
+                            workers = max(1, int(sys.argv[workers_index + 1]))
+
+                    headless = "--headless" in sys.argv
+
+                    concurrency = CrawlerConfig.SCHEDULER['concurrency']
+                    if "--concurrency" in sys.argv:
+                        concurrency_index = sys.argv.index("--concurrency")
+                        if concurrency_index + 1 < len(sys.argv):
+                            concurrency = max(1, int(sys.argv[concurrency_index + 1]))
+
                     # 运行批量模式
-                    run_batch_mode(keywords, base_url, pages, flow_choice)
+                    if "--async" in sys.argv:
+                        run_async_batch(keyword_items, base_url, pages, concurrency, headless)
+                    else:
+                        run_batch_mode(keywords, base_url, pages, flow_choice, workers, headless)
                 else:
                     print("❌ --batch 参数需要指定关键词文件")
                     sys.exit(1)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+商品提取性能基准测试
+
+对比逐个方式提取（方式1-5）与单次批量提取在保存的HTML页面上的
+WebDriver往返次数和耗时。
+
+用法:
+    python scripts/benchmark_extraction.py                       # 使用 outputs/html_debug 下的HTML
+    python scripts/benchmark_extraction.py --fixtures DIR        # 指定HTML目录
+    python scripts/benchmark_extraction.py --generate 60         # 目录为空时生成60个卡片的示例页面
+"""
+
+import os
+import io
+import sys
+import time
+import glob
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CrawlerConfig
+from src.drivers.webdriver_manager import WebDriverManager
+from src.extractors.product_extractor import ProductExtractor
+
+
+def generate_fixture(directory: str, card_count: int) -> str:
+    """
+    生成模拟1688搜索结果页面的HTML文件
+    :param directory: 输出目录
+    :param card_count: 商品卡片数量
+    :return: 生成的文件路径
+    """
+    cards = []
+    for i in range(card_count):
+        cards.append(f"""
+        <div class="offer-card" data-h5-type="offerCard">
+            <a href="https://detail.1688.com/offer/6{i:011d}.html" title="示例商品标题 {i} 新款批发">
+                <img src="https://cbu01.alicdn.com/img/ibank/sample_{i}.jpg">
+            </a>
+            <div class="offer-title">示例商品标题 {i} 新款批发</div>
+            <div class="offer-price"><span>￥</span><span>{10 + i}.50</span></div>
+            <div class="offer-shop-name">示例贸易有限公司{i % 7}</div>
+            <div class="offer-sale-count">成交{100 + i * 3}件</div>
+        </div>""")
+
+    html = f"""<!DOCTYPE html>
+<html lang="zh-CN"><head><meta charset="utf-8"><title>手机 - 1688搜索</title></head>
+<body><div class="offer-list">{''.join(cards)}</div></body></html>"""
+
+    filepath = os.path.join(directory, f"synthetic_{card_count}_cards.html")
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return filepath
+
+
+class CommandCounter:
+    """统计WebDriver命令（HTTP往返）次数"""
+
+    def __init__(self, driver):
+        self.count = 0
+        self._original_execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            return self._original_execute(driver_command, params)
+
+        driver.execute = counting_execute
+
+    def reset(self):
+        self.count = 0
+
+
+def run_once(func, counter: CommandCounter) -> tuple:
+    """运行一次提取并返回 (商品数, 往返次数, 耗时)"""
+    counter.reset()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        products = func()
+    elapsed = time.perf_counter() - start
+    return len(products), counter.count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="商品提取性能基准测试")
+    parser.add_argument('--fixtures', default=CrawlerConfig.PATHS['html_debug'], help="保存的HTML页面目录")
+    parser.add_argument('--generate', type=int, default=60, help="目录为空时生成的示例卡片数量")
+    parser.add_argument('--show-browser', action='store_true', help="显示浏览器窗口")
+    args = parser.parse_args()
+
+    fixtures = sorted(glob.glob(os.path.join(args.fixtures, '*.html')))
+    if not fixtures:
+        temp_dir = tempfile.mkdtemp(prefix='1688_bench_')
+        fixtures = [generate_fixture(temp_dir, args.generate)]
+        print(f"未找到HTML页面，已生成示例页面: {fixtures[0]}")
+
+    config = CrawlerConfig()
+    manager = WebDriverManager(config)
+    driver = manager.create_driver(headless=not args.show_browser)
+    counter = CommandCounter(driver)
+    extractor = ProductExtractor(driver, config)
+
+    totals = {'legacy': [0, 0.0], 'single': [0, 0.0]}
+
+    try:
+        print(f"\n{'页面':<40} {'方式':<8} {'商品':>6} {'往返':>8} {'耗时(s)':>10}")
+        print("-" * 76)
+
+        for fixture in fixtures:
+            driver.get(Path(os.path.abspath(fixture)).as_uri())
+            name = os.path.basename(fixture)[:38]
+
+            for label, func in (('legacy', extractor._extract_products_legacy),
+                                ('single', extractor.extract_products_single_pass)):
+                product_count, round_trips, elapsed = run_once(func, counter)
+                totals[label][0] += round_trips
+                totals[label][1] += elapsed
+                print(f"{name:<40} {label:<8} {product_count:>6} {round_trips:>8} {elapsed:>10.3f}")
+
+        legacy_trips, legacy_time = totals['legacy']
+        single_trips, single_time = totals['single']
+        print("-" * 76)
+        print(f"逐个方式提取: {legacy_trips} 次往返, {legacy_time:.2f} 秒")
+        print(f"单次批量提取: {single_trips} 次往返, {single_time:.2f} 秒")
+        if single_trips and single_time:
+            print(f"节省往返: {legacy_trips - single_trips} 次 ({legacy_trips / single_trips:.0f}x), "
+                  f"节省耗时: {legacy_time - single_time:.2f} 秒 ({legacy_time / single_time:.1f}x)")
+
+    finally:
+        WebDriverManager.close_driver(driver)
+        manager.cleanup_temp_user_data_dir()
+
+
+if __name__ == "__main__":
+    main()
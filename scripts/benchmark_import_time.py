@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+启动/导入耗时基准测试
+
+在独立的子进程中用 python -X importtime 导入各入口模块，统计导入总耗时、
+最耗时的顶层依赖，以及是否加载了selenium、pandas等重量级依赖。
+
+用法:
+    python scripts/benchmark_import_time.py                      # 每个目标运行5次取中位数
+    python scripts/benchmark_import_time.py --repeat 10 --top 8
+    python scripts/benchmark_import_time.py --markdown doc/import_time_benchmark.md
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (名称, 运行参数)：-c 导入模块，或直接运行脚本
+TARGETS = [
+    ('config', ['-c', 'import src.core.config']),
+    ('crawl_journal', ['-c', 'import src.utils.crawl_journal']),
+    ('data_exporter', ['-c', 'import src.utils.data_exporter']),
+    ('async_scheduler', ['-c', 'import src.core.async_scheduler']),
+    ('crawler', ['-c', 'import src.core.crawler']),
+    ('main.py --help', ['main.py', '--help']),
+    ('crawl_journal_report --help', [os.path.join('scripts', 'crawl_journal_report.py'), '--help'])
+]
+
+# 需要关注是否被加载的重量级依赖
+HEAVY_PACKAGES = ['selenium', 'webdriver_manager', 'pandas', 'numpy', 'openpyxl', 'pyarrow', 'requests', 'bs4']
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    解析 -X importtime 输出
+    :param stderr: 子进程标准错误输出
+    :return: [(模块名, 自身耗时us, 累计耗时us, 嵌套层级)]
+    """
+    records = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def run_target(args: List[str]) -> Dict:
+    """
+    运行一次目标并收集导入耗时
+    :param args: python解释器参数
+    :return: {'ok', 'wall_ms', 'import_ms', 'records', 'error'}
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    started = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=PROJECT_ROOT, env=env,
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                             text=True, encoding='utf-8', errors='replace')
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    records = parse_importtime(process.stderr)
+    error = ''
+    if process.returncode != 0:
+        lines = [line for line in process.stderr.splitlines() if not line.startswith('import time:')]
+        error = lines[-1] if lines else f"退出码 {process.returncode}"
+    return {
+        'ok': process.returncode == 0,
+        'wall_ms': wall_ms,
+        'import_ms': sum(record[1] for record in records) / 1000,
+        'records': records,
+        'error': error
+    }
+
+
+def startup_modules() -> set:
+    """解释器启动本身导入的模块（python -c pass），汇总时排除"""
+    return {record[0] for record in run_target(['-c', 'pass'])['records']}
+
+
+def summarize(name: str, args: List[str], repeat: int, top: int, baseline: set) -> Dict:
+    """
+    多次运行同一目标，取墙钟和导入耗时的中位数
+    :param baseline: 解释器启动时导入的模块
+    :return: 汇总结果
+    """
+    runs = [run_target(args) for _ in range(repeat)]
+    last = runs[-1]
+    # 按顶层包汇总自身耗时
+    by_package = {}
+    for module, self_us, _, _ in last['records']:
+        if module not in baseline:
+            package = module.split('.')[0]
+            by_package[package] = by_package.get(package, 0) + self_us
+    top_packages = sorted(by_package.items(), key=lambda item: -item[1])[:top]
+    loaded = set(by_package)
+    return {
+        'name': name,
+        'ok': all(run['ok'] for run in runs),
+        'error': next((run['error'] for run in runs if run['error']), ''),
+        'wall_ms': statistics.median(run['wall_ms'] for run in runs),
+        'import_ms': statistics.median(run['import_ms'] for run in runs),
+        'modules': len(last['records']),
+        'heavy': [package for package in HEAVY_PACKAGES if package in loaded],
+        'top': [(package, self_us / 1000) for package, self_us in top_packages]
+    }
+
+
+def print_report(results: List[Dict]):
+    print(f"{'目标':<30}{'墙钟(ms)':>10}{'导入(ms)':>10}{'模块数':>8}  重量级依赖")
+    for result in results:
+        heavy = ', '.join(result['heavy']) or '-'
+        status = '' if result['ok'] else f"  ❌ {result['error']}"
+        print(f"{result['name']:<30}{result['wall_ms']:>10.0f}{result['import_ms']:>10.0f}{result['modules']:>8}  "
+              f"{heavy}{status}")
+    for result in results:
+        if result['top']:
+            print(f"\n{result['name']} 导入耗时最多的包:")
+            for package, package_ms in result['top']:
+                print(f"  {package_ms:>8.1f} ms  {package}")
+
+
+def write_markdown(results: List[Dict], filepath: str, repeat: int):
+    """将结果写入Markdown文件"""
+    lines = [
+        '# 启动/导入耗时基准',
+        '',
+        f"由 `python scripts/benchmark_import_time.py --markdown {os.path.relpath(filepath, PROJECT_ROOT)}` 生成，"
+        f"Python {sys.version.split()[0]}，每个目标运行{repeat}次取中位数。",
+        '',
+        '| 目标 | 墙钟 (ms) | 导入 (ms) | 模块数 | 加载的重量级依赖 | 耗时最多的包 |',
+        '| --- | ---: | ---: | ---: | --- | --- |'
+    ]
+    for result in results:
+        heavy = ', '.join(result['heavy']) or '-'
+        if not result['ok']:
+            heavy += f" (失败: {result['error']})"
+        top = ', '.join(f"{package} {package_ms:.0f}ms" for package, package_ms in result['top'][:3])
+        lines.append(f"| {result['name']} | {result['wall_ms']:.0f} | {result['import_ms']:.0f} | "
+                     f"{result['modules']} | {heavy} | {top} |")
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    print(f"\n结果已写入: {filepath}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动/导入耗时基准测试")
+    parser.add_argument('--repeat', type=int, default=5, help="每个目标运行次数")
+    parser.add_argument('--top', type=int, default=5, help="每个目标显示导入耗时最多的包数量")
+    parser.add_argument('--markdown', metavar='FILE', help="将结果写入Markdown文件")
+    args = parser.parse_args()
+
+    baseline = startup_modules()
+    results = [summarize(name, target_args, args.repeat, args.top, baseline) for name, target_args in TARGETS]
+    print_report(results)
+    if args.markdown:
+        write_markdown(results, args.markdown, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
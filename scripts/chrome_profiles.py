@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+查看、清理或删除可复用的Chrome配置目录
+
+用法:
+    python scripts/chrome_profiles.py                     # 显示所有配置目录
+    python scripts/chrome_profiles.py --prune             # 按配置清理过期、超量或缓存过大的目录
+    python scripts/chrome_profiles.py --clear-cache NAME  # 清空指定目录的缓存（保留登录状态）
+    python scripts/chrome_profiles.py --remove NAME       # 删除指定目录（包括登录状态）
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CrawlerConfig
+from src.drivers.profile_store import ProfileStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看、清理或删除可复用的Chrome配置目录")
+    parser.add_argument('--prune', action='store_true', help="清理过期、超出数量上限或缓存过大的目录")
+    parser.add_argument('--clear-cache', metavar='NAME', help="清空指定目录的缓存，保留Cookie和本地存储")
+    parser.add_argument('--remove', metavar='NAME', help="删除指定目录（正在使用时不删除）")
+    args = parser.parse_args()
+
+    store = ProfileStore(config=CrawlerConfig())
+
+    if args.prune:
+        result = store.prune()
+        print(f"已删除 {len(result['removed'])} 个目录，清空 {len(result['cache_cleared'])} 个目录的缓存，"
+              f"释放 {result['bytes_freed'] / 1024 / 1024:.1f} MB")
+        return
+    if args.clear_cache:
+        freed = store.clear_cache(args.clear_cache)
+        print(f"已清空 {args.clear_cache} 的缓存，释放 {freed / 1024 / 1024:.1f} MB")
+        return
+    if args.remove:
+        if store.remove(args.remove):
+            print(f"已删除 {args.remove}")
+        else:
+            print(f"未删除 {args.remove}（不存在或正在使用）")
+        return
+
+    profiles = store.list_profiles(with_size=True)
+    if not profiles:
+        print(f"暂无配置目录 ({store.root})")
+        return
+
+    print(f"{'名称':<14}{'状态':<8}{'运行次数':>8}{'大小(MB)':>10}  最近使用")
+    for profile in profiles:
+        last_used = (time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(profile['last_used']))
+                     if profile['last_used'] else '-')
+        status = '使用中' if profile['locked'] else '空闲'
+        print(f"{profile['name']:<14}{status:<8}{profile['runs']:>8}{profile['size'] / 1024 / 1024:>10.1f}  "
+              f"{last_used}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+将历史Excel导出转换为分区Parquet数据集
+
+读取 1688_<关键词>_<时间戳>.xlsx 文件，按文件名中的关键词和日期写入
+<输出目录>/keyword=<关键词>/date=<日期>/ 下，之后可用
+DataExporter.load_parquet_dataset 按关键词/日期快速读取。
+
+用法:
+    python scripts/convert_excel_to_parquet.py                    # 转换 data/*.xlsx
+    python scripts/convert_excel_to_parquet.py DIR --output outputs/parquet
+"""
+
+import os
+import re
+import sys
+import glob
+import argparse
+from datetime import datetime
+
+import pandas as pd
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CrawlerConfig
+from src.utils.data_exporter import DataExporter
+
+FILENAME_PATTERN = re.compile(r'^1688_(?P<keyword>.+)_(?P<timestamp>\d{8}_\d{6})\.xlsx$')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="将历史Excel导出转换为分区Parquet数据集")
+    parser.add_argument('directory', nargs='?', default='data', help="Excel文件目录")
+    parser.add_argument('--output', default=CrawlerConfig.PATHS['parquet'], help="Parquet数据集根目录")
+    args = parser.parse_args()
+
+    config = CrawlerConfig()
+    exporter = DataExporter(config)
+    reverse_mapping = {v: k for k, v in config.EXPORT_CONFIG['column_mapping'].items()}
+
+    files = sorted(glob.glob(os.path.join(args.directory, '*.xlsx')))
+    if not files:
+        print(f"❌ 目录中没有Excel文件: {args.directory}")
+        sys.exit(1)
+
+    converted = 0
+    for filepath in files:
+        match = FILENAME_PATTERN.match(os.path.basename(filepath))
+        if not match:
+            print(f"跳过无法识别的文件名: {os.path.basename(filepath)}")
+            continue
+
+        keyword = match.group('keyword')
+        crawl_time = datetime.strptime(match.group('timestamp'), "%Y%m%d_%H%M%S")
+
+        df = pd.read_excel(filepath, dtype=str).rename(columns=reverse_mapping)
+        products = exporter._validate_products(df.fillna('').to_dict('records'))
+        if not products:
+            print(f"{os.path.basename(filepath)}: 没有有效数据")
+            continue
+
+        output = exporter.write_parquet_chunks([products], keyword, args.output, crawl_time=crawl_time)
+        converted += 1
+        print(f"{os.path.basename(filepath)}: {len(products)} 条 -> {output}")
+
+    print(f"\n共转换 {converted}/{len(files)} 个文件")
+
+
+if __name__ == "__main__":
+    main()
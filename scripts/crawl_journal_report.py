@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+查看或重置抓取日志中的关键词进度
+
+用法:
+    python scripts/crawl_journal_report.py                  # 显示所有关键词的进度
+    python scripts/crawl_journal_report.py --reset 手机      # 清除该关键词的进度，下次从第1页重新抓取
+    python scripts/crawl_journal_report.py --reset-all      # 清除所有进度
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CrawlerConfig
+from src.utils.crawl_journal import CrawlJournal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看或重置抓取日志中的关键词进度")
+    parser.add_argument('--site', choices=['www', 'global'], help="只重置指定站点")
+    parser.add_argument('--reset', metavar='KEYWORD', help="清除指定关键词的进度")
+    parser.add_argument('--reset-all', action='store_true', help="清除所有进度")
+    args = parser.parse_args()
+
+    journal = CrawlJournal(config=CrawlerConfig())
+
+    if args.reset or args.reset_all:
+        count = journal.reset(None if args.reset_all else args.reset, args.site)
+        print(f"已清除 {count} 个关键词的进度")
+        return
+
+    records = journal.summary()
+    if not records:
+        print("暂无抓取记录")
+        return
+
+    print(f"{'站点':<8}{'状态':<10}{'页数':>8}{'商品':>8}  {'更新时间':<20}关键词")
+    for record in records:
+        updated = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record['updated_at']))
+        pages = f"{record['completed_pages']}/{record['pages']}"
+        print(f"{record['site']:<8}{record['status']:<10}{pages:>8}{record['products']:>8}  {updated:<20}"
+              f"{record['keyword']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+离线批量重新提取HTML页面中的商品
+
+无需浏览器，直接解析已保存的页面（默认 outputs/html_debug），
+并将结果导出为JSON/Excel。
+
+用法:
+    python scripts/reextract_html.py                          # 解析 outputs/html_debug/*.html
+    python scripts/reextract_html.py DIR --pattern "search_*.html"
+    python scripts/reextract_html.py DIR --formats json excel csv
+"""
+
+import os
+import sys
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CrawlerConfig
+from src.extractors.html_extractor import HTMLProductExtractor
+from src.utils.data_exporter import DataExporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线批量重新提取HTML页面中的商品")
+    parser.add_argument('directory', nargs='?', default=CrawlerConfig.PATHS['html_debug'], help="HTML文件目录")
+    parser.add_argument('--pattern', default='*.html', help="文件匹配模式")
+    parser.add_argument('--formats', nargs='+', default=['json'], help="导出格式 (json/excel/csv)")
+    parser.add_argument('--keyword', default='reextract', help="导出文件名中使用的关键词")
+    args = parser.parse_args()
+
+    config = CrawlerConfig()
+    extractor = HTMLProductExtractor(config)
+
+    results = extractor.extract_from_directory(args.directory, args.pattern)
+    if not results:
+        print(f"❌ 目录中没有匹配的HTML文件: {args.directory}")
+        sys.exit(1)
+
+    products = []
+    for file_products in results.values():
+        products.extend(file_products)
+
+    print(f"\n共解析 {len(results)} 个文件，提取 {len(products)} 个商品")
+
+    if products:
+        exporter = DataExporter(config)
+        outputs = exporter.export_multiple_formats(products, args.keyword, args.formats)
+        for format_type, filepath in outputs.items():
+            print(f"✅ {format_type}: {filepath}")
+
+
+if __name__ == "__main__":
+    main()
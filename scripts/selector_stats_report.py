@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+查看或重置商品卡片选择器的命中统计
+
+用法:
+    python scripts/selector_stats_report.py                 # 显示所有站点的统计
+    python scripts/selector_stats_report.py --site global   # 只显示国际站
+    python scripts/selector_stats_report.py --reset www     # 页面改版后清除中文站统计重新学习
+"""
+
+import os
+import sys
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CrawlerConfig
+from src.utils.selector_stats import SelectorStats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看或重置商品卡片选择器的命中统计")
+    parser.add_argument('--site', choices=['www', 'global'], help="只显示指定站点")
+    parser.add_argument('--reset', choices=['www', 'global', 'all'], help="清除指定站点的统计")
+    args = parser.parse_args()
+
+    stats = SelectorStats(config=CrawlerConfig())
+
+    if args.reset:
+        count = stats.reset(None if args.reset == 'all' else args.reset)
+        print(f"已清除 {count} 条选择器统计")
+        return
+
+    records = stats.summary(site=args.site)
+    if not records:
+        print("暂无选择器统计")
+        return
+
+    print(f"{'站点':<8}{'类别':<10}{'尝试':>6}{'命中':>6}{'命中率':>8}{'近期':>8}{'平均数量':>10}  选择器")
+    for record in records:
+        flag = ' (失效)' if record['stale'] else ''
+        print(f"{record['site']:<8}{record['kind']:<10}{record['attempts']:>6}{record['hits']:>6}"
+              f"{record['hit_rate']:>8.0%}{record['recent_rate']:>8.0%}{record['avg_yield']:>10.1f}  "
+              f"{record['selector']}{flag}")
+
+
+if __name__ == "__main__":
+    main()
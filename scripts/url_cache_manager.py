@@ -2,91 +2,71 @@
 # -*- coding: utf-8 -*-
 """
 1688成功URL缓存管理工具
-用于管理和维护成功的搜索URL缓存
+用于管理和维护成功的搜索URL缓存（outputs/cache/url_cache.db）
 """
 
 import os
 import sys
-from datetime import datetime
 
 # 添加项目根目录到Python路径
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CrawlerConfig
+from src.utils.url_cache_store import URLCacheStore
+
 
 class URLCacheManager:
-    def __init__(self, cache_file="successful_urls.txt"):
-        self.cache_file = cache_file
-        self.ensure_cache_file_exists()
-    
-    def ensure_cache_file_exists(self):
-        """确保缓存文件存在"""
-        if not os.path.exists(self.cache_file):
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                f.write("# 1688成功URL缓存文件\n")
-                f.write("# 格式: 关键词|成功的URL|时间戳|备注\n")
-                f.write("# 示例: 手机|https://s.1688.com/selloffer/offer_search.htm?keywords=%E6%89%8B%E6%9C%BA|2024-01-01 12:00:00|直接访问成功\n\n")
-            print(f"已创建缓存文件: {self.cache_file}")
+    def __init__(self, db_path=None, config=None):
+        self.config = config or CrawlerConfig()
+        self.store = URLCacheStore(db_path, self.config)
+        print(f"使用缓存数据库: {self.store.db_path}")
     
     def load_cache(self):
         """加载缓存数据"""
         cache_data = []
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        parts = line.split('|')
-                        if len(parts) >= 3:
-                            cache_data.append({
-                                'line_num': line_num,
-                                'keyword': parts[0].strip(),
-                                'url': parts[1].strip(),
-                                'timestamp': parts[2].strip(),
-                                'note': parts[3].strip() if len(parts) > 3 else '',
-                                'raw_line': line
-                            })
+            for record in self.store.all_records():
+                cache_data.append({
+                    'keyword': record['keyword'],
+                    'url': record['url'],
+                    'timestamp': URLCacheStore.format_timestamp(record['updated_at']),
+                    'note': record['note'],
+                    'success_count': record['success_count'],
+                    'failure_count': record['failure_count'],
+                    'usable': self.store.get(record['keyword']) is not None
+                })
             return cache_data
         except Exception as e:
-            print(f"加载缓存文件失败: {e}")
+            print(f"加载缓存失败: {e}")
             return []
     
     def display_cache(self):
         """显示缓存内容"""
         cache_data = self.load_cache()
         if not cache_data:
-            print("缓存文件为空或无有效记录")
+            print("缓存为空或无有效记录")
             return
         
-        print(f"\n=== 缓存文件内容 ({len(cache_data)} 条记录) ===")
-        print(f"{'序号':<4} {'关键词':<15} {'时间戳':<20} {'备注':<15} {'URL'}")
-        print("-" * 100)
+        print(f"\n=== 缓存内容 ({len(cache_data)} 条记录) ===")
+        print(f"{'序号':<4} {'关键词':<15} {'时间戳':<20} {'成功/失败':<10} {'状态':<6} {'备注':<15} {'URL'}")
+        print("-" * 120)
         
         for i, item in enumerate(cache_data, 1):
             url_display = item['url'][:50] + "..." if len(item['url']) > 50 else item['url']
-            print(f"{i:<4} {item['keyword']:<15} {item['timestamp']:<20} {item['note']:<15} {url_display}")
+            counts = f"{item['success_count']}/{item['failure_count']}"
+            status = "可用" if item['usable'] else "失效"
+            print(f"{i:<4} {item['keyword']:<15} {item['timestamp']:<20} {counts:<10} {status:<6} {item['note']:<15} {url_display}")
     
     def add_url(self, keyword, url, note="手动添加"):
         """添加新的URL到缓存"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # 检查是否已存在
-        cache_data = self.load_cache()
-        existing = [item for item in cache_data if item['keyword'] == keyword]
-        
-        if existing:
+        if self.store.get(keyword, include_stale=True):
             choice = input(f"关键词 '{keyword}' 已存在缓存。是否覆盖? (y/n): ").strip().lower()
             if choice != 'y':
                 print("取消添加")
                 return False
-            
-            # 删除现有记录
-            self.remove_url(keyword, silent=True)
-        
-        # 添加新记录
-        new_record = f"{keyword}|{url}|{timestamp}|{note}\n"
         
         try:
-            with open(self.cache_file, 'a', encoding='utf-8') as f:
-                f.write(new_record)
+            self.store.put(keyword, url, note)
             print(f"✅ 已添加: {keyword} -> {url[:50]}...")
             return True
         except Exception as e:
@@ -96,30 +76,9 @@ class URLCacheManager:
     def remove_url(self, keyword, silent=False):
         """删除指定关键词的URL"""
         try:
-            # 读取所有行
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # 过滤掉要删除的行
-            new_lines = []
-            removed_count = 0
-            
-            for line in lines:
-                if line.strip() and not line.startswith('#'):
-                    parts = line.split('|')
-                    if len(parts) >= 2 and parts[0].strip() == keyword:
-                        removed_count += 1
-                        if not silent:
-                            print(f"删除: {line.strip()}")
-                        continue
-                new_lines.append(line)
-            
-            # 写回文件
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
-            
+            removed = self.store.remove(keyword)
             if not silent:
-                print(f"✅ 已删除 {removed_count} 条记录")
+                print(f"✅ 已删除 {int(removed)} 条记录")
             return True
             
         except Exception as e:
@@ -129,32 +88,30 @@ class URLCacheManager:
     
     def test_url(self, keyword):
         """测试指定关键词的缓存URL是否有效"""
-        cache_data = self.load_cache()
-        target_item = None
-        
-        for item in cache_data:
-            if item['keyword'] == keyword:
-                target_item = item
-                break
-        
-        if not target_item:
+        record = self.store.get(keyword, include_stale=True)
+        if not record:
             print(f"未找到关键词 '{keyword}' 的缓存URL")
             return False
         
-        print(f"测试URL: {target_item['url']}")
+        print(f"测试URL: {record['url']}")
+        print(f"成功 {record['success_count']} 次, 失败 {record['failure_count']} 次, "
+              f"{'可用' if self.store.get(keyword) else '已过期或成功率过低'}")
         print("注意: 这里只是显示URL，实际测试需要在爬虫中进行")
         return True
+
+    def prune_cache(self):
+        """删除过期记录"""
+        count = self.store.prune_expired()
+        print(f"✅ 已删除 {count} 条过期记录")
+        return True
     
     def clean_cache(self):
-        """清理缓存文件"""
+        """清理缓存"""
         choice = input("确定要清空所有缓存记录吗? (y/n): ").strip().lower()
         if choice == 'y':
             try:
-                with open(self.cache_file, 'w', encoding='utf-8') as f:
-                    f.write("# 1688成功URL缓存文件\n")
-                    f.write("# 格式: 关键词|成功的URL|时间戳|备注\n")
-                    f.write("# 示例: 手机|https://s.1688.com/selloffer/offer_search.htm?keywords=%E6%89%8B%E6%9C%BA|2024-01-01 12:00:00|直接访问成功\n\n")
-                print("✅ 缓存已清空")
+                count = self.store.clear()
+                print(f"✅ 缓存已清空 ({count} 条记录)")
                 return True
             except Exception as e:
                 print(f"❌ 清空失败: {e}")
@@ -174,9 +131,10 @@ def main():
         print("3. 删除URL")
         print("4. 测试URL")
         print("5. 清空缓存")
-        print("6. 退出")
+        print("6. 删除过期记录")
+        print("7. 退出")
         
-        choice = input("\n请选择操作 (1-6): ").strip()
+        choice = input("\n请选择操作 (1-7): ").strip()
         
         if choice == '1':
             manager.display_cache()
@@ -209,6 +167,9 @@ def main():
             manager.clean_cache()
             
         elif choice == '6':
+            manager.prune_cache()
+            
+        elif choice == '7':
             print("退出程序")
             break
             
@@ -2,7 +2,23 @@
 核心模块 - 包含主要的爬虫逻辑和配置管理
 """
 
-from .crawler import Alibaba1688Crawler
-from .config import CrawlerConfig
+from typing import TYPE_CHECKING
 
-__all__ = ['Alibaba1688Crawler', 'CrawlerConfig']
+from ..utils.lazy_imports import lazy_exports
+
+# 导出名称 -> 子模块，首次访问时才导入，避免导入包时加载selenium、pandas等依赖
+_EXPORTS = {
+    'Alibaba1688Crawler': '.crawler',
+    'CrawlerConfig': '.config',
+    'AsyncKeywordScheduler': '.async_scheduler',
+    'load_keywords': '.async_scheduler'
+}
+
+__all__ = ['Alibaba1688Crawler', 'CrawlerConfig', 'AsyncKeywordScheduler', 'load_keywords']
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .crawler import Alibaba1688Crawler
+    from .config import CrawlerConfig
+    from .async_scheduler import AsyncKeywordScheduler, load_keywords
@@ -0,0 +1,286 @@
+"""
+异步关键词调度模块
+
+用asyncio把"关键词×页"任务分发给一组HTTP获取器并发执行：
+每个主机一个令牌桶在全局范围内控制访问频率，而不是在关键词之间串行等待；
+页面获取、解析和写入在线程池中执行，第1页成功后再按优先级加入后续页；
+每页写入后记入抓取日志，重新运行时跳过已完成的关键词和页
+"""
+
+import asyncio
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import CrawlerConfig
+from ..drivers.http_fetcher import HttpFetcher
+from ..extractors.html_extractor import HTMLProductExtractor
+from ..strategies.url_builder import URLBuilder
+from ..utils.cache_manager import CacheManager
+from ..utils.crawl_journal import CrawlJournal
+from ..utils.data_exporter import DataExporter
+from ..utils.dedup_index import DedupIndex, product_keys
+from ..utils.profiler import get_profiler
+from ..utils.rate_limiter import HostRateLimiter
+from ..utils.selector_stats import site_key
+
+
+def load_keywords(keywords_file: str, default_priority: int = 0) -> List[Tuple[str, int]]:
+    """
+    读取关键词文件：每行一个关键词，可以写成 "关键词|优先级"（数值越大越先抓取），
+    空行和#开头的行忽略
+    :param keywords_file: 关键词文件路径
+    :param default_priority: 未写优先级时的默认值
+    :return: [(关键词, 优先级)]，按优先级从高到低排序，同优先级保持文件顺序
+    """
+    keywords = []
+    with open(keywords_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            keyword, priority = line, default_priority
+            if '|' in line:
+                head, _, tail = line.rpartition('|')
+                try:
+                    keyword, priority = head.strip(), int(tail)
+                except ValueError:
+                    pass
+            if keyword:
+                keywords.append((keyword, priority))
+
+    return sorted(keywords, key=lambda item: -item[1])
+
+
+@dataclass
+class KeywordJob:
+    """单个关键词的调度状态"""
+
+    keyword: str
+    priority: int = 0
+    first_url: Optional[str] = None
+    sink: Any = None
+    count: int = 0
+    skipped: bool = False             # 已在以前的运行中完成
+    outputs: Dict[str, str] = field(default_factory=dict)
+    pages_done: List[int] = field(default_factory=list)
+    blocked_pages: List[int] = field(default_factory=list)
+    empty_pages: List[int] = field(default_factory=list)
+
+    @property
+    def last_result_page(self) -> Optional[int]:
+        """
+        搜索结果的最后一页：第1页之后出现没有商品的页、且其后没有成功的页时，视为结果在其前一页结束
+        （结果不足目标页数），否则为None
+        """
+        empty = [page for page in self.empty_pages if page > 1]
+        if not empty:
+            return None
+        first_empty = min(empty)
+        if any(page > first_empty for page in self.pages_done):
+            return None
+        return first_empty - 1
+
+    @property
+    def needs_browser(self) -> bool:
+        """有页面被拦截，或第1页没有可解析的商品（可能需要浏览器渲染）"""
+        return bool(self.blocked_pages) or 1 in self.empty_pages
+
+
+class AsyncKeywordScheduler:
+    """异步并发关键词调度器"""
+
+    def __init__(self, config: CrawlerConfig = None, concurrency: Optional[int] = None, pages: int = 1):
+        """
+        初始化异步并发关键词调度器
+        :param config: 爬虫配置对象
+        :param concurrency: 并发任务数（HTTP获取器数量），如果为None则使用配置中的默认值
+        :param pages: 每个关键词爬取的页数
+        """
+        self.config = config or CrawlerConfig()
+        self.concurrency = max(1, concurrency or self.config.SCHEDULER['concurrency'])
+        self.pages = max(1, int(pages or 1))
+
+        self.limiter = HostRateLimiter.from_config(self.config)
+        self.url_builder = URLBuilder(self.config)
+        self.cache_manager = CacheManager(None, self.config)
+        self.exporter = DataExporter(self.config)
+        self.html_extractor = HTMLProductExtractor(self.config)
+        self.journal = CrawlJournal.shared(config=self.config)
+        self.site = site_key(self.config.DEFAULT_BASE_URL)
+        self._sequence = itertools.count()
+
+    def run(self, keywords: List[Tuple[str, int]]) -> Dict[str, KeywordJob]:
+        """
+        同步入口，运行到所有任务完成
+        :param keywords: [(关键词, 优先级)]
+        :return: 关键词到调度状态的映射
+        """
+        return asyncio.run(self.run_async(keywords))
+
+    async def run_async(self, keywords: List[Tuple[str, int]]) -> Dict[str, KeywordJob]:
+        """
+        并发抓取所有关键词
+        :param keywords: [(关键词, 优先级)]
+        :return: 关键词到调度状态的映射
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        jobs: Dict[str, KeywordJob] = {}
+
+        for keyword, priority in keywords:
+            if keyword in jobs:
+                continue
+            job = KeywordJob(keyword, priority)
+            jobs[keyword] = job
+            progress = self.journal.begin_keyword(keyword, self.site, self.pages)
+            if progress.done:
+                job.skipped, job.count, job.outputs = True, progress.products, progress.outputs
+                continue
+
+            job.first_url = (self.cache_manager.get_cached_url(keyword)
+                             or (self.url_builder.build_search_urls(keyword) or [None])[0])
+            if not job.first_url:
+                job.blocked_pages.append(1)
+                continue
+            # 续抓时追加到上次的文件
+            job.sink = self.exporter.open_stream(keyword, paths=progress.stream_paths)
+            job.count = progress.products
+            self.journal.set_stream_paths(keyword, self.site, job.sink.paths)
+
+            # 第1页已完成时直接加入未完成的页，否则等第1页成功后再加入后续页
+            completed = set(progress.completed_pages)
+            job.pages_done.extend(sorted(completed))
+            if 1 in completed:
+                for page_number in range(2, self.pages + 1):
+                    if page_number not in completed:
+                        self._enqueue(queue, job, page_number)
+            else:
+                self._enqueue(queue, job, 1)
+
+        print(f"🚀 异步调度：{len(jobs)} 个关键词 × {self.pages} 页，并发 {self.concurrency}")
+
+        fetchers = [HttpFetcher(self.config) for _ in range(self.concurrency)]
+        for fetcher in fetchers:
+            fetcher.load_cookie_file()
+        if not fetchers[0].has_cookies:
+            print("⚠️ 没有已保存的Cookie，未登录状态下页面更容易被拦截")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='async-fetch') as executor:
+            workers = [asyncio.create_task(self._worker(queue, fetcher, executor)) for fetcher in fetchers]
+            try:
+                await queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                for fetcher in fetchers:
+                    fetcher.close()
+
+                # 即使中途出错也保留已写入的部分结果
+                for job in jobs.values():
+                    if job.sink is not None:
+                        job.outputs = await loop.run_in_executor(executor, job.sink.finalize)
+                        self.journal.finish_keyword(job.keyword, self.site, job.outputs, products=job.count,
+                                                    last_page=job.last_result_page)
+
+        return jobs
+
+    def _enqueue(self, queue: asyncio.PriorityQueue, job: KeywordJob, page_number: int):
+        """按 (优先级, 页码, 入队顺序) 加入任务：高优先级关键词先抓，同优先级先抓各关键词的前面页"""
+        queue.put_nowait((-job.priority, page_number, next(self._sequence), job, page_number))
+
+    async def _worker(self, queue: asyncio.PriorityQueue, fetcher: HttpFetcher, executor: ThreadPoolExecutor):
+        """从队列取任务执行，每个工作协程独占一个HTTP获取器"""
+        while True:
+            _, _, _, job, page_number = await queue.get()
+            try:
+                await self._run_page(queue, job, page_number, fetcher, executor)
+            except Exception as e:
+                print(f"❌ [{job.keyword}] 第 {page_number} 页处理出错: {e}")
+                logging.error(f"异步抓取关键词 '{job.keyword}' 第 {page_number} 页时出错: {e}")
+                job.blocked_pages.append(page_number)
+            finally:
+                queue.task_done()
+
+    async def _run_page(self, queue: asyncio.PriorityQueue, job: KeywordJob, page_number: int,
+                        fetcher: HttpFetcher, executor: ThreadPoolExecutor):
+        """获取并处理一页"""
+        loop = asyncio.get_running_loop()
+        if page_number == 1:
+            url, referer = job.first_url, None
+        else:
+            url = self.url_builder.modify_search_url(job.first_url, {'beginPage': str(page_number)})
+            referer = job.first_url
+
+        await self.limiter.acquire(url)
+        result = await loop.run_in_executor(executor, fetcher.fetch, url, referer)
+        if not result.ok:
+            print(f"⚠️ [{job.keyword}] 第 {page_number} 页被拦截 ({result.blocked})")
+            job.blocked_pages.append(page_number)
+            return
+
+        found, written = await loop.run_in_executor(executor, self._process_page, job, page_number,
+                                                    result.html, result.final_url)
+        if not found:
+            job.empty_pages.append(page_number)
+            return
+
+        job.count += written
+        job.pages_done.append(page_number)
+        if page_number == 1:
+            for next_page in range(2, self.pages + 1):
+                if next_page not in job.pages_done:
+                    self._enqueue(queue, job, next_page)
+
+    def _process_page(self, job: KeywordJob, page_number: int, html: str, page_url: str) -> Tuple[int, int]:
+        """
+        在线程池中解析、去重并写入
+        :return: (解析到的商品数, 写入的新商品数)
+        """
+        profiler = get_profiler()
+        with profiler.span('parse', keyword=job.keyword) as span:
+            products = self.html_extractor.extract_from_html(html, page_url)
+            if span is not None and not products:
+                span['outcome'] = 'empty'
+        if not products:
+            print(f"[{job.keyword}] 第 {page_number} 页未解析到商品")
+            return 0, 0
+
+        if page_number == 1:
+            self.cache_manager.save_successful_url(job.keyword, job.first_url)
+
+        new_products = self._filter_new(job.keyword, products)
+        with profiler.span('export', keyword=job.keyword):
+            if new_products:
+                job.sink.write(new_products)
+            # 先落盘再记录去重索引和完成状态，中断后不会跳过或丢失未写入的商品
+            job.sink.flush()
+            self._mark_exported(job.keyword, new_products)
+            self.journal.complete_page(job.keyword, self.site, page_number, len(new_products), url=page_url)
+        print(f"📄 [{job.keyword}] 第 {page_number} 页: 解析 {len(products)} 个，写入 {len(new_products)} 个")
+        return len(products), len(new_products)
+
+    def _filter_new(self, keyword: str, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """通过持久化去重索引过滤掉以前已抓取过的商品（未启用去重时原样返回）"""
+        if not self.config.DEDUP['enabled']:
+            return products
+        try:
+            with get_profiler().span('dedup', keyword=keyword):
+                return DedupIndex.shared(config=self.config).filter_new(products, keyword)
+        except Exception as e:
+            # 去重索引不可用时不影响抓取
+            logging.error(f"查询商品去重索引时出错: {e}")
+            return products
+
+    def _mark_exported(self, keyword: str, products: List[Dict[str, Any]]):
+        """将已写入磁盘的商品记录到持久化去重索引"""
+        if not products or not self.config.DEDUP['enabled']:
+            return
+        try:
+            DedupIndex.shared(config=self.config).mark_exported(product_keys(products), keyword)
+        except Exception as e:
+            logging.error(f"记录商品去重索引时出错: {e}")
@@ -53,6 +53,14 @@ class CrawlerConfig:
         ]
     }
 
+    # ChromeDriver解析配置：按已安装Chrome缓存chromedriver路径，命中时不做版本查询和网络请求
+    CHROMEDRIVER = {
+        'driver_path': None,          # 显式指定chromedriver路径（优先级最高，离线环境推荐）
+        'chrome_binary': None,        # 显式指定Chrome可执行文件，为None时自动查找
+        'offline': False,             # 只在本地查找（缓存、PATH、search_dirs、webdriver_manager下载目录），不联网下载
+        'search_dirs': []             # 额外查找chromedriver的目录
+    }
+
     # 浏览器首选项
     BROWSER_PREFS = {
         "profile.default_content_setting_values": {
@@ -84,14 +92,166 @@ class CrawlerConfig:
         'scroll_delay': 1
     }
 
+    # 页面就绪等待配置（基于信号而非固定时长）
+    READINESS = {
+        'network_idle': True,         # 通过CDP性能日志判断网络空闲
+        'network_idle_ms': 500,       # 无网络活动多久视为空闲（毫秒）
+        'max_inflight': 2,            # 允许的进行中请求数（长连接不会结束）
+        'dom_quiet_ms': 400,          # DOM结构无变化多久视为静默（毫秒）
+        'card_stable_ms': 800,        # 商品卡片数量保持不变多久视为稳定（毫秒）
+        'min_cards': 1,               # 卡片数量稳定判断所需的最少卡片数
+        'scroll_settle_ms': 1000,     # 滚动后无任何DOM变化多久视为没有懒加载（毫秒）
+        'page_timeout': 15,           # 页面就绪最长等待（秒）
+        'scroll_timeout': 4,          # 单次滚动后最长等待（秒）
+        'action_timeout': 2,          # 点击/按键后最长等待（秒）
+        'poll_interval': 0.2,         # 网络空闲轮询间隔（秒）
+        'script_timeout': 30          # 异步脚本超时（秒），需大于以上所有等待时间
+    }
+
+    # 资源拦截配置：通过CDP Network.setBlockedURLs在网络层拦截不需要的请求
+    RESOURCE_BLOCKING = {
+        'enabled': True,
+        'resource_types': ['image', 'font', 'media'],   # 按type_patterns拦截的资源类型
+        'type_patterns': {
+            'image': ['*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.ico*'],
+            'font': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+            'media': ['*.mp4*', '*.webm*', '*.m3u8*', '*.flv*']
+        },
+        # 统计、埋点和广告域名（包括子域名）；验证码和登录相关域名不要加入
+        'domains': [
+            'mmstat.com', 'arms-retcode.aliyuncs.com', 'retcode.taobao.com',
+            'hm.baidu.com', 'cnzz.com', 'google-analytics.com', 'googletagmanager.com', 'doubleclick.net'
+        ],
+        'url_patterns': [],           # 额外拦截的URL模式（'*'为通配符）
+        # 登录/验证码页面暂停拦截（二维码和滑动验证码需要加载图片），URL包含其中任一片段时生效
+        'exempt_url_keywords': ['login.1688.com', 'login.taobao.com', 'passport.', 'punish', '_____tmd_____',
+                                'captcha'],
+        # 估算节省流量时，某类型还没有已加载的样本时使用的单个资源大小（字节，CDP资源类型）
+        'estimated_bytes': {'Image': 30000, 'Font': 40000, 'Media': 500000, 'Script': 20000,
+                            'Ping': 500, 'Other': 5000}
+    }
+
+    # 网络响应捕获配置：从搜索结果页的XHR/JSONP响应中直接解析商品，不遍历DOM
+    NETWORK_CAPTURE = {
+        'enabled': True,
+        # 响应URL包含其中任一片段（不区分大小写）时视为商品列表接口
+        'url_patterns': ['offerResultViewService', 'offer_search', 'mtop.relationrecommend',
+                         'search/offer', 'offerlist'],
+        'mime_types': ['json', 'javascript'],
+        'max_body_bytes': 5 * 1024 * 1024,    # 超过该大小的响应不读取
+        'min_products': 20,           # 捕获的商品少于该数量时同时解析页面源代码并合并
+        # 商品字段在接口数据中的候选路径（按顺序取第一个非空值，'.'分隔嵌套字段）
+        'field_paths': {
+            'offer_id': ['offerId', 'id', 'information.offerId', 'offer_id'],
+            'title': ['information.subject', 'subject', 'title', 'offerTitle', 'name'],
+            'price': ['tradePrice.offerPrice.valueString', 'priceInfo.price', 'price', 'offerPrice', 'minPrice'],
+            'shop': ['company.name', 'companyName', 'shopName', 'sellerName', 'memberName'],
+            'sales': ['tradeQuantity.number', 'tradeQuantity.saleQuantity', 'saleQuantity', 'bookedCount',
+                      'soldCount', 'sales'],
+            'link': ['information.detailUrl', 'detailUrl', 'offerUrl', 'linkUrl', 'url'],
+            'image': ['image.imgUrl', 'imageUrl', 'offerPicUrl', 'imgUrl', 'picUrl']
+        }
+    }
+
+    # 礼貌性访问间隔配置（两次页面导航之间）
+    RATE_LIMIT = {
+        'min_interval': 3,
+        'max_interval': 6,
+        # 以下用于并发调度：每个主机一个令牌桶，默认速率为上面的平均间隔
+        'burst': 2,                   # 每个主机允许的突发请求数
+        'jitter': (0.0, 1.0),         # 取得令牌后额外随机等待的范围（秒）
+        'per_host': {}                # 按主机覆盖，如 {'global.1688.com': {'rate': 0.2, 'burst': 1}}
+    }
+
     # 文件路径配置
     PATHS = {
         'cookies': 'outputs/cookies/1688_cookies.json',
-        'url_cache': 'outputs/cache/successful_urls.txt',
+        'url_cache': 'outputs/cache/successful_urls.txt',    # 旧版文本缓存，首次使用时导入数据库
+        'url_cache_db': 'outputs/cache/url_cache.db',
+        'dedup_db': 'outputs/cache/dedup.db',
+        'journal_db': 'outputs/cache/crawl_journal.db',
+        'profiles': 'outputs/profiles',
+        'chrome_profiles': 'outputs/chrome_profiles',   # 可复用的Chrome用户数据目录
+        'chromedriver_cache': 'outputs/cache/chromedriver.json',   # 按Chrome版本缓存的chromedriver路径
+        'selector_stats_db': 'outputs/cache/selector_stats.db',
         'logs': 'outputs/logs/1688_crawler.log',
         'excel': 'outputs/excel',
         'json': 'outputs/json',
-        'html_debug': 'outputs/html_debug'
+        'html_debug': 'outputs/html_debug',
+        'parquet': 'outputs/parquet'          # 按 keyword=/date= 分区的Parquet数据集根目录
+    }
+
+    # URL缓存配置
+    URL_CACHE = {
+        'ttl_days': 30,               # 超过该天数未成功访问的URL不再使用，0表示不过期
+        'min_attempts': 3,            # 访问次数达到该值后才按成功率过滤
+        'min_success_rate': 0.3,      # 成功率低于该值的URL不再使用
+        'busy_timeout': 10            # 数据库被其他进程锁定时的等待时间（秒）
+    }
+
+    # 商品卡片选择器自适应排序配置
+    SELECTOR_RANKING = {
+        'enabled': True,              # 按各站点的命中统计调整PRODUCT_SELECTORS的探测顺序
+        'decay': 0.2,                 # 近期命中率的滑动平均系数，越大越快适应页面改版
+        'stale_after': 10,            # 至少探测该次数后才可能判定为失效
+        'stale_rate': 0.05,           # 近期命中率低于该值视为失效，不再每页探测
+        'explore_interval': 50,       # 每隔该次数探测一次失效的选择器，以便页面改回后恢复
+        'busy_timeout': 10            # 数据库被其他进程锁定时的等待时间（秒）
+    }
+
+    # 搜索URL模板排序配置：成功率统计与选择器统计共用数据库和失效判定参数
+    URL_RANKING = {
+        'enabled': True,              # 按各站点的成功统计调整搜索URL模板的尝试顺序
+        'max_candidates': 6,          # 每次最多尝试的URL数量（0为不限制）
+        'prevalidate': True           # 浏览器打开前先用HTTP请求排除明显无效的URL（首个候选除外，FETCH['mode']为browser时不预检）
+    }
+
+    # 无人值守配置：所有人工确认按策略自动决策，不读取标准输入
+    UNATTENDED = {
+        'enabled': False,             # 强制无人值守（--unattended 开启）
+        'auto_detect': True,          # 标准输入不是终端时自动进入无人值守
+        'popup_retry_budget': 5,      # 每页自动清理弹窗的最大尝试次数
+        'step_retry_budget': 3        # 流程控制中每个步骤失败后的最大重试次数
+    }
+
+    # 性能分析配置
+    PROFILING = {
+        'enabled': False,             # 是否记录各阶段耗时（--profile 开启）
+        'export_formats': ['json', 'prometheus'],
+        'max_spans': 20000            # 保留的span明细数量上限
+    }
+
+    # 商品去重索引配置（跨页、跨关键词、跨运行）
+    DEDUP = {
+        'enabled': True,              # 是否跳过以前已抓取过的商品
+        'ttl_days': 0,                # 距上次导出超过该天数的商品重新导出，0表示不重复导出
+        'busy_timeout': 10            # 数据库被其他进程锁定时的等待时间（秒）
+    }
+
+    # 抓取日志配置（按关键词/页记录进度，中断后续抓）
+    JOURNAL = {
+        'resume': True,               # 跳过已完成的关键词，未完成的从下一页继续（--no-resume 关闭并重新抓取）
+        'busy_timeout': 10            # 数据库被其他进程锁定时的等待时间（秒）
+    }
+
+    # 搜索结果页获取方式配置
+    FETCH = {
+        'mode': 'browser',            # browser=全程浏览器; http=复用Cookie用HTTP连接池获取，被拦截时回退浏览器;
+                                      # auto=有已保存的Cookie时按http，否则按browser
+        'timeout': 15,                # 单次请求超时（秒）
+        'pool_maxsize': 8,            # 每个主机保持的keep-alive连接数
+        'max_retries': 2,             # 连接错误和429/5xx的重试次数
+        'backoff_factor': 0.5,        # 重试间隔的退避系数（秒）
+        # 最终URL或页面内容包含以下标记时视为被拦截（滑块验证/风控页），需要浏览器处理
+        'block_url_markers': ['_____tmd_____', 'punish', 'x5secdata'],
+        'block_html_markers': ['nc_1_wrapper', 'nocaptcha', 'baxia-dialog']
+    }
+
+    # 异步并发调度配置（--async）
+    SCHEDULER = {
+        'concurrency': 4,             # 同时进行的关键词×页任务数（每个任务一个HTTP获取器）
+        'default_priority': 0,        # 关键词文件中未写优先级时的默认值，数值越大越先抓取
+        'browser_fallback': True      # 结束后用浏览器重新处理被拦截的关键词（已导出的商品由去重索引跳过）
     }
 
     # 登录页面检测关键词
@@ -110,7 +270,32 @@ class CrawlerConfig:
         'title_keywords': [
             '登录', '登陆', 'login', 'signin',
             '会员', 'member', '身份验证'
-        ]
+        ],
+        # 页面中同时可见至少min_elements种登录元素时判定为登录页
+        'element_selectors': [
+            "input[type='password']",  # 密码输入框
+            "div.login-dialog-wrap",   # 1688登录弹窗
+            "form[action*='login']",   # 登录表单
+            "div[class*='login']",     # 登录相关div
+            "button[class*='login']",  # 登录按钮
+            "a[href*='login']"         # 登录链接
+        ],
+        'min_elements': 2
+    }
+
+    # 验证码选择器配置
+    CAPTCHA_SELECTORS = {
+        'main': [
+            ".nc_iconfont.btn_slide",  # 滑动验证码
+            ".nc-lang-cnt",            # 验证码容器
+            ".nc_iconfont.btn_ok",     # 验证成功按钮
+            ".btn_slide",              # 滑动按钮
+            "#nc_1_wrapper",           # 验证码包装器
+            "#nocaptcha",              # 无验证码验证
+            ".nc-container",           # 验证码容器
+            "#nc_1_n1z"                # 滑块
+        ],
+        'iframe': [".captcha", ".geetest", ".nc-container", ".slider", ".slide-verify"]
     }
 
     # 弹窗选择器配置
@@ -128,6 +313,50 @@ class CrawlerConfig:
         "div[id*='popup']"
     ]
 
+    # 弹窗屏蔽配置：注入常驻MutationObserver脚本，弹窗出现时直接隐藏
+    POPUP_SUPPRESSION = {
+        'enabled': True,
+        'extra_selectors': [".next-dialog-wrapper", ".next-overlay-wrapper", "div[class*='mask']"],
+        'min_z_index': 100,           # 匹配选择器且固定/绝对定位、z-index不低于该值时隐藏
+        'overlay_ratio': 0.3,         # 或可见部分覆盖视口不低于该比例时隐藏
+        'unlock_scroll': True,        # 隐藏后恢复被弹窗锁定的页面滚动
+        'debounce_ms': 50,            # DOM变化合并处理的间隔（毫秒）
+        # 包含以下元素的浮层不隐藏（验证码选择器自动加入），交给登录/验证码处理流程
+        'protected_selectors': [
+            "input[type='password']", "div.login-dialog-wrap", "form[action*='login']",
+            "iframe[src*='login']", "iframe[src*='passport']", "iframe[src*='nocaptcha']"
+        ]
+    }
+
+    # iframe内的弹窗选择器（:contains('文本') 按元素文本匹配）
+    IFRAME_POPUP_SELECTORS = [
+        "div:contains('AiBUY')", "div:contains('下载')", "div:contains('采购助手')",
+        "div[class*='popup']", "div[class*='modal']", "div[class*='dialog']",
+        "div[style*='position: fixed']"
+    ]
+
+    # iframe分诊配置：只切换进可能是浮层弹窗的iframe
+    IFRAME_TRIAGE = {
+        'enabled': True,
+        'min_size': 50,               # 宽或高小于该值（像素）的iframe视为统计像素，跳过
+        'min_z_index': 100,           # 固定/绝对定位且z-index不低于该值时视为浮层
+        'overlay_ratio': 0.25,        # 可见部分覆盖视口不低于该比例时视为浮层
+        'give_up_after': 3,           # 同一src进入该次数都没有弹窗后不再进入
+        'recheck_interval': 20,       # 已放弃的src每隔该次数分诊重新进入检查一次
+        # src包含以下片段（小写）时直接跳过：统计、埋点、广告
+        'skip_src_patterns': ['mmstat.com', 'alilog', 'aplus', 'arms-retcode', 'googletagmanager',
+                              'google-analytics', 'doubleclick', 'hm.baidu.com', 'cnzz.com'],
+        # src包含以下片段（小写）时总是进入检查：登录、验证和营销弹层
+        'candidate_src_patterns': ['login', 'passport', 'nocaptcha', 'punish', 'aibuy', 'popup',
+                                   'dialog', 'modal', 'layer']
+    }
+
+    # 页面状态快照配置
+    PAGE_STATE = {
+        'max_age': 2.0,               # 快照最长复用时间（秒），导航或交互后立即失效
+        'popup_samples': 3            # 每个弹窗选择器记录的可见元素样本数（用于调试输出）
+    }
+
     # 商品选择器配置
     PRODUCT_SELECTORS = {
         'standard': [
@@ -154,6 +383,86 @@ class CrawlerConfig:
         ]
     }
 
+    # 商品卡片内字段选择器配置（按优先级排列）
+    PRODUCT_FIELD_SELECTORS = {
+        'title': [
+            "a[title]",
+            "*[class*='title']",
+            "*[class*='name']",
+            "*[class*='subject']",
+            "h3", "h4", "h5",
+            "a[href*='offer']",
+            ".offer-title",
+            ".product-title",
+            ".item-title"
+        ],
+        'price': [
+            "*[class*='price']",
+            "*[class*='Price']",
+            "*[class*='money']",
+            "*[class*='cost']",
+            "*[class*='amount']",
+            ".price-range",
+            ".unit-price"
+        ],
+        'shop': [
+            "*[class*='shop']",
+            "*[class*='store']",
+            "*[class*='seller']",
+            "*[class*='company']",
+            ".shop-name",
+            ".store-name",
+            ".seller-name",
+            ".company-name"
+        ],
+        'sales': [
+            "*[class*='sale']",
+            "*[class*='sold']",
+            "*[class*='deal']",
+            "*[class*='buy']",
+            ".sale-count",
+            ".sold-count",
+            ".deal-cnt"
+        ],
+        'link': [
+            "a[href*='offer']",
+            "a[href*='detail']",
+            "a[href*='product']"
+        ],
+        'image': [
+            "img"
+        ]
+    }
+
+    # 商品提取配置
+    EXTRACTION = {
+        'backend': 'browser',         # browser=在浏览器内提取, html=获取page_source后离线解析
+        'single_pass': True,          # 优先使用单次execute_script批量提取
+        'max_cards': 200,             # 单页最多提取的商品卡片数
+        'title_blacklist': ['登录', '注册', '首页', '导航', '搜索', '筛选']
+    }
+
+    # WebDriver池配置（批量模式并发）
+    DRIVER_POOL = {
+        'size': 2,                    # 默认预热的浏览器实例数
+        'max_pages_per_driver': 50,   # 单个实例处理多少页后回收重建
+        'acquire_timeout': 300,       # 等待空闲实例的超时（秒）
+        'retry_interval': 30,         # 重建失败的实例每隔多少秒重试一次
+        'warm_start': True            # 创建后打开主页并加载Cookie
+    }
+
+    # Chrome配置目录复用配置：未指定user_data_dir时从具名目录池中锁定一个，保留缓存和登录状态
+    PROFILE_STORE = {
+        'enabled': True,              # 关闭时每次使用临时目录并在结束后删除（--fresh-profile）
+        'max_profiles': 4,            # 目录数量上限，全部被占用时改用临时目录
+        'name_prefix': 'profile',
+        'disk_cache_mb': 256,         # 每个目录的HTTP磁盘缓存上限（MB），0表示不限制
+        'max_profile_mb': 1024,       # 目录超过该大小时清空缓存子目录（保留Cookie等），0表示不限制
+        'max_age_days': 30,           # 超过该天数未使用的目录被删除，0表示不过期
+        'stale_lock_hours': 12,       # 其他主机持有的锁超过该时间视为遗留（本机的锁按持有进程是否在运行判断）
+        'auto_prune': True            # 每个进程首次使用时清理一次
+    }
+
     # 数据导出配置
     EXPORT_CONFIG = {
         'excel_engine': 'openpyxl',
@@ -163,8 +472,16 @@ class CrawlerConfig:
             'shop': '店铺名称',
             'sales': '销量',
             'link': '商品链接',
-            'image': '图片链接'
-        }
+            'image': '图片链接',
+            'offer_id': '商品ID',
+            'price_value': '价格数值',         # 接口数据中的数值价格/销量（DOM提取的商品为空）
+            'sales_count': '销量数值'
+        },
+        'stream_batch_size': 50,              # 流式导出缓冲多少条后写入磁盘
+        'stream_formats': ['jsonl', 'csv'],   # 流式追加写入的格式
+        'finalize_formats': ['excel', 'json'],  # 结束时转换的格式
+        'stream_fsync': False,                # 每次刷新后是否fsync（更安全但更慢）
+        'parquet_compression': 'zstd'
     }
 
     @classmethod
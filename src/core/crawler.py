@@ -4,14 +4,15 @@
 整合所有功能模块，提供统一的爬虫接口
 """
 
-import time
 import logging
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Callable
 
 from .config import CrawlerConfig
 from ..drivers.webdriver_manager import WebDriverManager
 from ..drivers.browser_utils import BrowserUtils
+from ..drivers.resource_blocker import get_resource_blocker
+from ..drivers.popup_suppressor import get_popup_suppressor
 from ..handlers.login_handler import LoginHandler
 from ..handlers.popup_handler import PopupHandler
 from ..handlers.page_handler import PageHandler
@@ -21,6 +22,10 @@ from ..strategies.search_strategy import SearchStrategy
 from ..utils.cache_manager import CacheManager
 from ..utils.data_exporter import DataExporter
 from ..utils.helpers import setup_logging
+from ..utils.profiler import keyword_profiled
+from ..utils.interaction import InteractionPolicy
+from ..utils.crawl_journal import CrawlJournal
+from ..utils.selector_stats import site_key
 
 
 class Alibaba1688Crawler:
@@ -31,13 +36,16 @@ class Alibaba1688Crawler:
     """
 
     def __init__(self, base_url: Optional[str] = None, headless: bool = False,
-                 user_data_dir: Optional[str] = None, config: Optional[CrawlerConfig] = None):
+                 user_data_dir: Optional[str] = None, config: Optional[CrawlerConfig] = None,
+                 driver=None, rate_limiter=None):
         """
         初始化爬虫
         :param base_url: 基础URL (global.1688.com 或 www.1688.com)
         :param headless: 是否使用无头模式
         :param user_data_dir: Chrome用户数据目录路径，用于保持登录状态
         :param config: 爬虫配置对象
+        :param driver: 外部提供的WebDriver实例（如驱动池中的实例），由调用方负责关闭
+        :param rate_limiter: 外部提供的导航间隔控制器（驱动池中的实例共用），如果为None则单独创建
         """
         # 初始化配置
         self.config = config or CrawlerConfig()
@@ -49,19 +57,26 @@ class Alibaba1688Crawler:
 
         # 初始化WebDriver
         self.webdriver_manager = WebDriverManager(self.config)
-        self.driver = self.webdriver_manager.create_driver(
-            headless=headless,
-            user_data_dir=user_data_dir
-        )
+        self._owns_driver = driver is None
+        self._rate_limiter = rate_limiter
+        if driver is not None:
+            self.driver = driver
+        else:
+            self.driver = self.webdriver_manager.create_driver(
+                headless=headless,
+                user_data_dir=user_data_dir
+            )
 
         # 初始化各个功能模块
         self._init_modules()
 
         # 存储数据
         self.data = []
+        # 最近一次从页面提取到的商品数（去重前），区分"未找到商品"和"商品都已抓取过"
+        self.last_found = 0
 
-        # 流程控制相关
-        self.process_file = "process.txt"
+        # 流程控制相关（步骤状态记录在抓取日志中）
+        self.process_keyword = ''
         self.process_steps = [
             "打开浏览器加载主页",
             "清理弹窗",
@@ -77,9 +92,11 @@ class Alibaba1688Crawler:
         """初始化各个功能模块"""
         try:
             # 基础工具
+            self.interaction = InteractionPolicy(self.config)
             self.browser_utils = BrowserUtils(self.driver)
             self.cache_manager = CacheManager(self.driver, self.config)
             self.data_exporter = DataExporter(self.config)
+            self.journal = CrawlJournal.shared(config=self.config)
 
             # 处理器
             self.login_handler = LoginHandler(self.driver, self.config)
@@ -91,7 +108,7 @@ class Alibaba1688Crawler:
             self.page_analyzer = PageAnalyzer(self.driver, self.config)
 
             # 搜索策略
-            self.search_strategy = SearchStrategy(self.driver, self.config)
+            self.search_strategy = SearchStrategy(self.driver, self.config, self._rate_limiter)
 
             # 重写搜索策略的商品提取方法，避免循环导入
             self.search_strategy._extract_products_from_current_page = self._extract_products_from_current_page
@@ -103,38 +120,30 @@ class Alibaba1688Crawler:
             logging.error(f"初始化功能模块时出错: {e}")
             raise
 
+    @property
+    def site(self) -> str:
+        """当前站点标识（www/global），抓取日志按站点分别记录"""
+        return site_key(self.config.DEFAULT_BASE_URL)
+
     def _init_process_file(self):
         """
-        初始化流程文件，将所有步骤状态设为0
+        初始化流程步骤，将所有步骤状态设为0
         """
         try:
-            with open(self.process_file, 'w', encoding='utf-8') as f:
-                for step in self.process_steps:
-                    f.write(f"{step} 0\n")
-            print(f"✅ 流程文件已初始化: {self.process_file}")
+            self.journal.reset_steps(self.process_keyword, self.process_steps)
+            print(f"✅ 流程步骤已初始化: {self.journal.db_path}")
         except Exception as e:
-            print(f"❌ 初始化流程文件失败: {e}")
+            print(f"❌ 初始化流程步骤失败: {e}")
 
     def _read_process_status(self):
         """
-        读取流程文件状态
+        读取流程步骤状态
         :return: 返回步骤状态字典
         """
         try:
-            status = {}
-            if os.path.exists(self.process_file):
-                with open(self.process_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            parts = line.rsplit(' ', 1)  # 从右边分割，只分割一次
-                            if len(parts) == 2:
-                                step_name = parts[0]
-                                step_status = int(parts[1])
-                                status[step_name] = step_status
-            return status
+            return self.journal.step_status(self.process_keyword)
         except Exception as e:
-            print(f"❌ 读取流程文件失败: {e}")
+            print(f"❌ 读取流程步骤失败: {e}")
             return {}
 
     def _update_process_status(self, step_name, status):
@@ -144,17 +153,10 @@ class Alibaba1688Crawler:
         :param status: 状态值 (0=失败, 1=成功)
         """
         try:
-            current_status = self._read_process_status()
-            current_status[step_name] = status
-
-            with open(self.process_file, 'w', encoding='utf-8') as f:
-                for step in self.process_steps:
-                    step_status = current_status.get(step, 0)
-                    f.write(f"{step} {step_status}\n")
-
+            self.journal.set_step(self.process_keyword, step_name, status)
             print(f"✅ 已更新步骤状态: {step_name} -> {status}")
         except Exception as e:
-            print(f"❌ 更新流程文件失败: {e}")
+            print(f"❌ 更新流程步骤失败: {e}")
 
     def _get_current_step(self):
         """
@@ -171,32 +173,40 @@ class Alibaba1688Crawler:
             print(f"❌ 获取当前步骤失败: {e}")
             return None
 
-    def _ask_user_confirmation(self, step_name):
+    def _ask_user_confirmation(self, step_name, step_success: bool = False):
         """
         询问用户步骤是否成功完成
         :param step_name: 步骤名称
+        :param step_success: 步骤自身的执行结果，无人值守时作为确认结果
         :return: 用户回答 (0=失败, 1=成功)
         """
         print(f"\n=== 步骤确认: {step_name} ===")
         while True:
-            user_input = input(f"步骤 '{step_name}' 是否成功完成？(0=失败, 1=成功): ").strip()
+            user_input = self.interaction.ask(
+                f"步骤 '{step_name}' 是否成功完成？(0=失败, 1=成功): ",
+                '1' if step_success else '0',
+                "步骤执行成功" if step_success else "步骤执行失败"
+            )
             if user_input in ['0', '1']:
                 return int(user_input)
             else:
                 print("请输入 0 或 1")
 
-    def search_products(self, keyword: str, pages: int = 1) -> List[Dict[str, Any]]:
+    @keyword_profiled
+    def search_products(self, keyword: str, pages: int = 1,
+                        on_page: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
         """
         搜索商品 - 智能流程
         :param keyword: 搜索关键词
         :param pages: 爬取页数
+        :param on_page: 每页提取完成后的回调 (页码, 商品列表)
         :return: 商品列表
         """
         try:
             print(f"\n🔍 开始搜索商品: '{keyword}' (页数: {pages})")
 
             # 使用搜索策略进行搜索
-            products = self.search_strategy.search_products(keyword, pages)
+            products = self.search_strategy.search_products(keyword, pages, on_page=on_page)
 
             if products:
                 print(f"✅ 搜索完成，找到 {len(products)} 个商品")
@@ -211,6 +221,62 @@ class Alibaba1688Crawler:
             logging.error(f"搜索商品时出错: {e}")
             return []
 
+    def iter_search_pages(self, keyword: str, pages: int = 1
+                          ) -> Iterator[Tuple[int, Optional[List[Dict[str, Any]]]]]:
+        """
+        逐页搜索商品 - 智能流程，每完成一页就产出该页商品
+        :param keyword: 搜索关键词
+        :param pages: 爬取页数
+        :return: (页码, 商品列表) 的迭代器；该页提取失败时商品列表为None
+        """
+        for page_number, products in self.search_strategy.iter_search_pages(keyword, pages):
+            self.data.extend(products or [])
+            yield page_number, products
+
+    @keyword_profiled
+    def search_products_to_stream(self, keyword: str, pages: int = 1,
+                                  formats: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        搜索商品 - 智能流程，每页结果直接追加写入磁盘，不在内存中保留商品列表
+        :param keyword: 搜索关键词
+        :param pages: 爬取页数
+        :param formats: 结束时转换的格式，默认使用配置
+        :return: {'count': 商品数量, 'outputs': 格式到文件路径的映射, 'skipped': 是否因已完成而跳过,
+                  'pages': 本次实际处理的页数}
+        """
+        site = self.site
+        progress = self.journal.begin_keyword(keyword, site, pages)
+        if progress.done:
+            print(f"⏭️ 关键词 '{keyword}' 已完成 {progress.pages} 页，跳过")
+            return {'count': progress.products, 'outputs': progress.outputs, 'skipped': True, 'pages': 0}
+
+        # 续抓时追加到上次的文件
+        sink = self.data_exporter.open_stream(keyword, paths=progress.stream_paths)
+        self.journal.set_stream_paths(keyword, site, sink.paths)
+        pages_processed = 0
+        try:
+            for page_number, products in self.search_strategy.iter_search_pages(
+                    keyword, pages, on_page=sink, start_page=progress.next_page):
+                pages_processed += 1
+                if products is None:
+                    # 提取失败的页不记为完成，续抓时从该页重试
+                    continue
+                # 先落盘再记录去重索引和完成状态，中断后不会跳过或丢失未写入的商品
+                sink.flush()
+                self.search_strategy.mark_products_exported(keyword, products)
+                self.journal.complete_page(keyword, site, page_number, len(products))
+                print(f"📄 第 {page_number} 页: {len(products)} 个商品已写入")
+        except Exception as e:
+            print(f"❌ 流式搜索商品时出错: {e}")
+            logging.error(f"流式搜索商品时出错: {e}")
+
+        # 即使中途出错也保留已写入的部分结果
+        outputs = sink.finalize(formats)
+        self.journal.finish_keyword(keyword, site, outputs, products=sink.count,
+                                    last_page=self.search_strategy.last_result_page)
+        return {'count': sink.count, 'outputs': outputs, 'skipped': False, 'pages': pages_processed}
+
+    @keyword_profiled
     def search_products_strict_flow(self, keyword: str, pages: int = 1) -> List[Dict[str, Any]]:
         """
         搜索商品 - 严格流程
@@ -220,6 +286,7 @@ class Alibaba1688Crawler:
         """
         try:
             print(f"\n🔍 开始严格流程搜索: '{keyword}' (页数: {pages})")
+            self.last_found = 0
 
             # 使用搜索策略的严格流程
             products = self.search_strategy.search_products_strict_flow(keyword, pages)
@@ -237,20 +304,25 @@ class Alibaba1688Crawler:
             logging.error(f"严格流程搜索时出错: {e}")
             return []
 
+    @keyword_profiled
     def search_products_with_process_control(self, keyword: str, pages: int = 1) -> List[Dict[str, Any]]:
         """
-        使用流程控制进行搜索 - 严格按照process.txt文件的步骤执行
+        使用流程控制进行搜索 - 严格按照流程步骤执行，步骤状态记录在抓取日志中
         :param keyword: 搜索关键词
         :param pages: 爬取页数
         :return: 商品列表
         """
         try:
             print(f"\n🔄 开始流程控制搜索: '{keyword}' (页数: {pages})")
+            self.last_found = 0
 
-            # 初始化流程文件
+            # 初始化流程步骤（浏览器状态无法跨进程保留，每次从第一步开始）
+            self.process_keyword = keyword
             self._init_process_file()
 
             all_products = []
+            step_failures = {}
+            retry_budget = self.config.UNATTENDED['step_retry_budget']
 
             # 按步骤执行
             while True:
@@ -265,7 +337,7 @@ class Alibaba1688Crawler:
                 step_success = self._execute_step(current_step, keyword)
 
                 # 询问用户确认
-                user_confirmation = self._ask_user_confirmation(current_step)
+                user_confirmation = self._ask_user_confirmation(current_step, step_success)
 
                 if user_confirmation == 1:
                     # 用户确认成功，更新状态
@@ -274,7 +346,8 @@ class Alibaba1688Crawler:
                     # 如果是最后一步（搜索结果页面），提取商品信息
                     if current_step == "搜索结果页面":
                         print("🔍 开始提取商品信息...")
-                        products = self._extract_products_from_current_page(keyword)
+                        products = self.search_strategy.filter_new_products(
+                            keyword, self._extract_products_from_current_page(keyword))
                         if products:
                             all_products.extend(products)
                             print(f"✅ 成功提取 {len(products)} 个商品")
@@ -284,10 +357,16 @@ class Alibaba1688Crawler:
                     # 用户确认失败，保持状态为0，可以重新执行该步骤
                     print(f"⚠️ 步骤 '{current_step}' 未成功，将重新执行")
 
-                    # 询问是否继续
-                    continue_choice = input("是否继续执行该步骤？(1=继续, 0=退出): ").strip()
+                    # 询问是否继续（无人值守时在重试预算内自动重试）
+                    step_failures[current_step] = step_failures.get(current_step, 0) + 1
+                    within_budget = step_failures[current_step] <= retry_budget
+                    continue_choice = self.interaction.ask(
+                        "是否继续执行该步骤？(1=继续, 0=退出): ",
+                        '1' if within_budget else '0',
+                        f"第{step_failures[current_step]}次失败，重试预算{retry_budget}次"
+                    )
                     if continue_choice != '1':
-                        print("❌ 用户选择退出")
+                        print("❌ 选择退出")
                         break
 
             if all_products:
@@ -315,8 +394,7 @@ class Alibaba1688Crawler:
 
             if step_name == "打开浏览器加载主页":
                 # 访问主页
-                self.driver.get(self.config.DEFAULT_BASE_URL)
-                time.sleep(3)
+                self.search_strategy.navigate(self.config.DEFAULT_BASE_URL, expect_results=False)
                 print(f"✅ 已访问主页: {self.config.DEFAULT_BASE_URL}")
                 return True
 
@@ -388,6 +466,7 @@ class Alibaba1688Crawler:
 
             # 提取商品信息
             products = self.product_extractor.extract_products_from_search_page(keyword)
+            self.last_found = len(products or [])
 
             if products:
                 print(f"✅ 成功提取 {len(products)} 个商品")
@@ -467,6 +546,18 @@ class Alibaba1688Crawler:
             logging.error(f"保存数据时出错: {e}")
             return ""
 
+    def mark_exported(self, products: List[Dict[str, Any]], keyword: str, saved: bool = True):
+        """
+        商品保存后更新去重索引：保存成功时记为已导出，失败时放弃待导出状态（下次仍会抓取）
+        :param products: 商品列表
+        :param keyword: 搜索关键词
+        :param saved: 是否已成功写入磁盘
+        """
+        if saved:
+            self.search_strategy.mark_products_exported(keyword, products)
+        else:
+            self.search_strategy.release_products(products)
+
     def get_crawler_status(self) -> Dict[str, Any]:
         """
         获取爬虫状态信息
@@ -512,13 +603,26 @@ class Alibaba1688Crawler:
     def close(self):
         """关闭爬虫，释放资源"""
         try:
+            self.search_strategy.close()
+
+            blocker = get_resource_blocker(self.driver) if self.driver else None
+            if blocker:
+                blocker.print_summary()
+            suppressor = get_popup_suppressor(self.driver) if self.driver else None
+            if suppressor:
+                suppressor.print_summary()
+
+            # 外部提供的驱动（如驱动池）由调用方负责关闭
+            if not self._owns_driver:
+                return
+
             if self.driver:
                 self.driver.quit()
+                self.driver = None
                 print("✅ 浏览器已关闭")
 
             # 清理临时文件
-            if hasattr(self.webdriver_manager, 'cleanup'):
-                self.webdriver_manager.cleanup()
+            self.webdriver_manager.cleanup_temp_user_data_dir()
 
         except Exception as e:
             print(f"❌ 关闭爬虫时出错: {e}")
@@ -589,7 +693,7 @@ class Alibaba1688Crawler:
             try:
                 search_box = self.driver.find_element(By.CSS_SELECTOR, "input[name='keywords']")
                 search_box.send_keys(Keys.RETURN)
-                time.sleep(2)
+                self.search_strategy.wait_for_results_page()
                 print("✅ 使用回车键执行搜索")
                 return True
             except:
@@ -612,7 +716,7 @@ class Alibaba1688Crawler:
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
                     search_btn.click()
-                    time.sleep(2)
+                    self.search_strategy.wait_for_results_page()
                     print(f"✅ 使用选择器 {selector} 点击搜索按钮")
                     return True
                 except:
@@ -2,7 +2,44 @@
 驱动模块 - WebDriver管理和浏览器工具
 """
 
-from .webdriver_manager import WebDriverManager
-from .browser_utils import BrowserUtils
+from typing import TYPE_CHECKING
 
-__all__ = ['WebDriverManager', 'BrowserUtils']
+from ..utils.lazy_imports import lazy_exports
+
+# 导出名称 -> 子模块，首次访问时才导入，避免导入包时加载selenium、pandas等依赖
+_EXPORTS = {
+    'WebDriverManager': '.webdriver_manager',
+    'BrowserUtils': '.browser_utils',
+    'DriverPool': '.driver_pool',
+    'PooledDriver': '.driver_pool',
+    'CDPEventReader': '.cdp_events',
+    'get_event_reader': '.cdp_events',
+    'HttpFetcher': '.http_fetcher',
+    'FetchResult': '.http_fetcher',
+    'ResourceBlocker': '.resource_blocker',
+    'get_resource_blocker': '.resource_blocker',
+    'PopupSuppressor': '.popup_suppressor',
+    'get_popup_suppressor': '.popup_suppressor',
+    'ProfileStore': '.profile_store',
+    'ProfileLease': '.profile_store',
+    'ChromeDriverResolver': '.driver_resolver',
+    'resolve_chromedriver': '.driver_resolver'
+}
+
+__all__ = ['WebDriverManager', 'BrowserUtils', 'DriverPool', 'PooledDriver', 'CDPEventReader', 'get_event_reader',
+           'HttpFetcher', 'FetchResult', 'ResourceBlocker', 'get_resource_blocker',
+           'PopupSuppressor', 'get_popup_suppressor', 'ProfileStore', 'ProfileLease',
+           'ChromeDriverResolver', 'resolve_chromedriver']
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .webdriver_manager import WebDriverManager
+    from .browser_utils import BrowserUtils
+    from .driver_pool import DriverPool, PooledDriver
+    from .cdp_events import CDPEventReader, get_event_reader
+    from .http_fetcher import HttpFetcher, FetchResult
+    from .resource_blocker import ResourceBlocker, get_resource_blocker
+    from .popup_suppressor import PopupSuppressor, get_popup_suppressor
+    from .profile_store import ProfileStore, ProfileLease
+    from .driver_resolver import ChromeDriverResolver, resolve_chromedriver
@@ -5,14 +5,19 @@
 """
 
 import time
-from selenium import webdriver
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
+
+from .resource_blocker import get_resource_blocker
+from .popup_suppressor import get_popup_suppressor
+
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 
 class BrowserUtils:
     """浏览器工具类"""
     
-    def __init__(self, driver: webdriver.Chrome):
+    def __init__(self, driver: 'webdriver.Chrome'):
         """
         初始化浏览器工具
         :param driver: WebDriver实例
@@ -60,6 +65,13 @@ class BrowserUtils:
         """
         try:
             self.driver.switch_to.window(window_handle)
+            # 拦截规则和弹窗屏蔽脚本按标签页生效，新标签页需要重新设置
+            blocker = get_resource_blocker(self.driver)
+            if blocker:
+                blocker.ensure_current_tab()
+            suppressor = get_popup_suppressor(self.driver)
+            if suppressor:
+                suppressor.ensure_current_tab()
             print(f"✅ 成功切换到标签页: {window_handle}")
             return True
         except Exception as e:
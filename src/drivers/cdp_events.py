@@ -0,0 +1,162 @@
+"""
+CDP事件读取模块
+
+从Chrome性能日志(goog:loggingPrefs performance)中读取DevTools协议事件，
+供就绪等待、资源拦截统计和网络响应捕获等模块共享
+"""
+
+import json
+import time
+import logging
+import threading
+import weakref
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+# 每个WebDriver共享一个读取器：性能日志读取后即被清空，多个读取器会互相"吞掉"事件
+_readers = weakref.WeakKeyDictionary()
+_readers_lock = threading.Lock()
+
+
+def get_event_reader(driver: 'webdriver.Chrome') -> 'CDPEventReader':
+    """
+    获取WebDriver对应的共享CDP事件读取器
+    :param driver: WebDriver实例
+    :return: CDP事件读取器
+    """
+    with _readers_lock:
+        reader = _readers.get(driver)
+        if reader is None:
+            reader = CDPEventReader(driver)
+            _readers[driver] = reader
+        return reader
+
+
+class CDPEventReader:
+    """CDP性能日志事件读取器"""
+
+    # 保留最近的事件数量上限，避免长时间运行占用过多内存
+    MAX_BUFFERED_EVENTS = 5000
+
+    def __init__(self, driver: 'webdriver.Chrome'):
+        """
+        初始化CDP事件读取器
+        :param driver: WebDriver实例（需在创建时启用performance日志）
+        """
+        self.driver = driver
+        self.available = True
+        self.events: Deque[Dict] = deque(maxlen=self.MAX_BUFFERED_EVENTS)
+        self._inflight: Set[str] = set()
+        self._last_network_activity = time.time()
+        self._subscribers: Dict[str, List[Callable[[Dict], None]]] = {}
+        self._lock = threading.RLock()
+
+    def subscribe(self, method: str, callback: Callable[[Dict], None]):
+        """
+        订阅指定CDP事件，每次poll读取到该事件时调用回调
+        :param method: CDP事件名，如 'Network.responseReceived'
+        :param callback: 回调函数，参数为事件的params字典（附带'_timestamp'）
+        """
+        with self._lock:
+            self._subscribers.setdefault(method, []).append(callback)
+
+    def unsubscribe(self, method: str, callback: Callable[[Dict], None]):
+        """取消订阅"""
+        with self._lock:
+            callbacks = self._subscribers.get(method, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def poll(self) -> List[Dict]:
+        """
+        读取自上次调用以来的新事件
+        :return: 新事件列表，每项为 {'method', 'params', 'timestamp'}
+        """
+        if not self.available:
+            return []
+
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            # 未启用performance日志时不再重复尝试
+            self.available = False
+            logging.debug(f"CDP性能日志不可用: {e}")
+            return []
+
+        new_events = []
+        with self._lock:
+            for entry in entries:
+                try:
+                    message = json.loads(entry['message'])['message']
+                except (KeyError, ValueError, TypeError):
+                    continue
+
+                event = {
+                    'method': message.get('method', ''),
+                    'params': message.get('params', {}),
+                    'timestamp': entry.get('timestamp', 0)
+                }
+                self._track_network(event)
+                self.events.append(event)
+                new_events.append(event)
+
+            subscribers = {method: list(callbacks) for method, callbacks in self._subscribers.items()}
+
+        for event in new_events:
+            for callback in subscribers.get(event['method'], []):
+                try:
+                    callback(dict(event['params'], _timestamp=event['timestamp']))
+                except Exception as e:
+                    logging.error(f"处理CDP事件 {event['method']} 时出错: {e}")
+
+        return new_events
+
+    def _track_network(self, event: Dict):
+        """根据Network事件维护进行中的请求集合"""
+        method = event['method']
+        if not method.startswith('Network.'):
+            return
+
+        request_id = event['params'].get('requestId')
+        if method == 'Network.requestWillBeSent' and request_id:
+            self._inflight.add(request_id)
+        elif method in ('Network.loadingFinished', 'Network.loadingFailed') and request_id:
+            self._inflight.discard(request_id)
+
+        # 使用日志条目的时间戳（毫秒），避免轮询间隔把旧事件算作最近活动
+        event_time = event['timestamp'] / 1000.0
+        if event_time > self._last_network_activity:
+            self._last_network_activity = event_time
+
+    def reset_network(self):
+        """导航到新页面前重置进行中的请求（旧页面的请求不会再有结束事件）"""
+        self.poll()
+        with self._lock:
+            self._inflight.clear()
+            self._last_network_activity = time.time()
+
+    @property
+    def inflight_count(self) -> int:
+        """当前进行中的请求数"""
+        return len(self._inflight)
+
+    def network_idle_for(self) -> float:
+        """距最近一次网络事件的秒数"""
+        return max(0.0, time.time() - self._last_network_activity)
+
+    def events_since(self, method: Optional[str] = None, since: float = 0) -> List[Dict]:
+        """
+        查询已缓存的事件
+        :param method: 事件名过滤，为None时返回所有事件
+        :param since: 只返回时间戳（毫秒）大于该值的事件
+        :return: 事件列表
+        """
+        with self._lock:
+            return [
+                event for event in self.events
+                if (method is None or event['method'] == method) and event['timestamp'] > since
+            ]
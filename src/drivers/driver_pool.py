@@ -0,0 +1,252 @@
+"""
+WebDriver池模块
+
+维护一组预热的、已加载Cookie的Chrome实例，供批量任务并发复用
+"""
+
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, List
+
+from ..core.config import CrawlerConfig
+from ..utils.cache_manager import CacheManager
+from ..utils.rate_limiter import RateLimiter
+from .webdriver_manager import WebDriverManager
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+class PooledDriver:
+    """池中的WebDriver及其使用统计"""
+
+    def __init__(self, index: int, driver: 'webdriver.Chrome', manager: WebDriverManager):
+        """
+        :param index: 在池中的编号
+        :param driver: WebDriver实例
+        :param manager: 创建该实例的WebDriver管理器（用于清理临时目录）
+        """
+        self.index = index
+        self.driver = driver
+        self.manager = manager
+        self.pages_served = 0
+        self.keywords_served = 0
+        # 本次借用期间实际处理的页数，由调用方记录，归还时计入回收计数
+        self.pages_in_use = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """WebDriver池"""
+
+    def __init__(self, size: Optional[int] = None, config: CrawlerConfig = None, headless: bool = True,
+                 max_pages_per_driver: Optional[int] = None):
+        """
+        初始化WebDriver池
+        :param size: 池中驱动数量，如果为None则使用配置中的默认值
+        :param config: 爬虫配置对象
+        :param headless: 是否使用无头模式
+        :param max_pages_per_driver: 单个驱动处理多少页后回收重建，如果为None则使用配置中的默认值
+        """
+        self.config = config or CrawlerConfig()
+        self.size = size or self.config.DRIVER_POOL['size']
+        self.headless = headless
+        self.max_pages_per_driver = max_pages_per_driver or self.config.DRIVER_POOL['max_pages_per_driver']
+
+        # 所有实例共用的导航间隔控制器：并发的浏览器合计仍按RATE_LIMIT访问站点，
+        # 且每个关键词的第一次导航也与其他实例的上一次导航保持间隔
+        self.rate_limiter = RateLimiter.from_config(self.config)
+
+        self._available = queue.Queue()
+        self._all: List[PooledDriver] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        # 重建失败的位置，在acquire中按retry_interval重试，避免池逐渐缩小
+        self._lost_slots: List[int] = []
+        self._creating = 0
+        self._next_retry = 0.0
+
+    def start(self) -> 'DriverPool':
+        """
+        并行创建并预热所有驱动
+        :return: 驱动池自身
+        """
+        print(f"🚀 正在预热 {self.size} 个浏览器实例...")
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            for index, pooled in enumerate(executor.map(self._create_pooled_driver, range(self.size))):
+                if pooled:
+                    self._register(pooled)
+                else:
+                    self._lost_slots.append(index)
+
+        if not self._all:
+            raise RuntimeError("驱动池中没有可用的浏览器实例")
+
+        print(f"✅ 驱动池就绪: {len(self._all)}/{self.size} 个浏览器实例")
+        return self
+
+    def _create_pooled_driver(self, index: int) -> Optional[PooledDriver]:
+        """创建单个驱动，加载Cookie完成预热"""
+        try:
+            manager = WebDriverManager(self.config)
+            driver = manager.create_driver(headless=self.headless)
+
+            if self.config.DRIVER_POOL.get('warm_start', True):
+                # 通过CDP写入Cookie，不需要先打开主页；同一驱动上的搜索不会再重复加载
+                CacheManager(driver, self.config).ensure_cookies()
+
+            return PooledDriver(index, driver, manager)
+
+        except Exception as e:
+            print(f"❌ 创建第 {index + 1} 个浏览器实例失败: {e}")
+            logging.error(f"创建池化浏览器实例 {index} 失败: {e}")
+            return None
+
+    def _register(self, pooled: PooledDriver):
+        with self._lock:
+            self._all.append(pooled)
+        self._available.put(pooled)
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        获取一个健康的驱动
+        :param timeout: 等待超时（秒），如果为None则使用配置中的默认值
+        :return: 池化驱动
+        """
+        timeout = timeout or self.config.DRIVER_POOL['acquire_timeout']
+        deadline = time.time() + timeout
+
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError("等待可用浏览器实例超时")
+
+            pooled = self._restore_lost_slot()
+            if pooled:
+                return pooled
+
+            with self._lock:
+                no_live_slots = not self._all and not self._creating
+                lost = bool(self._lost_slots)
+            if no_live_slots:
+                # 没有存活的实例时等待不会有结果，立即重试一次，仍失败则直接报错
+                pooled = self._restore_lost_slot(force=True)
+                if pooled:
+                    return pooled
+                raise RuntimeError("驱动池中已没有可用的浏览器实例")
+
+            # 有待重试的位置时分段等待，到期后回到循环开头重试创建
+            wait = min(remaining, self.config.DRIVER_POOL['retry_interval']) if lost else remaining
+            try:
+                pooled = self._available.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+            if self._is_healthy(pooled):
+                return pooled
+
+            print(f"⚠️ 浏览器实例 {pooled.index + 1} 健康检查失败，正在重建...")
+            replacement = self._recycle(pooled)
+            if replacement:
+                return replacement
+
+    def release(self, pooled: PooledDriver, pages_used: int = 0):
+        """
+        归还驱动，达到页数上限时回收重建
+        :param pooled: 池化驱动
+        :param pages_used: 本次使用处理的页数
+        """
+        pooled.pages_served += pages_used
+        pooled.keywords_served += 1
+
+        if self._closed:
+            self._quit(pooled)
+            return
+
+        if pooled.pages_served >= self.max_pages_per_driver:
+            print(f"♻️ 浏览器实例 {pooled.index + 1} 已处理 {pooled.pages_served} 页，回收重建")
+            pooled = self._recycle(pooled)
+            if not pooled:
+                return
+
+        self._available.put(pooled)
+
+    @contextmanager
+    def driver(self):
+        """
+        以上下文管理器方式借用驱动，使用期间将实际处理的页数记入 pooled.pages_in_use，归还时用于回收计数
+        """
+        pooled = self.acquire()
+        pooled.pages_in_use = 0
+        try:
+            yield pooled
+        finally:
+            self.release(pooled, pooled.pages_in_use)
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        """检查驱动会话是否仍然可用"""
+        try:
+            return bool(pooled.driver.window_handles)
+        except Exception:
+            return False
+
+    def _recycle(self, pooled: PooledDriver) -> Optional[PooledDriver]:
+        """关闭旧驱动并在相同位置创建新驱动，创建失败时记录该位置以便之后重试"""
+        with self._lock:
+            if pooled in self._all:
+                self._all.remove(pooled)
+            self._creating += 1
+        self._quit(pooled)
+        return self._create_in_slot(pooled.index)
+
+    def _restore_lost_slot(self, force: bool = False) -> Optional[PooledDriver]:
+        """
+        重试创建之前重建失败的驱动
+        :param force: 是否忽略重试间隔
+        :return: 新驱动（已登记，直接交给调用方使用），没有到期的位置或仍然失败时返回None
+        """
+        with self._lock:
+            if self._closed or not self._lost_slots or (not force and time.time() < self._next_retry):
+                return None
+            index = self._lost_slots.pop(0)
+            self._creating += 1
+        print(f"🔄 重试创建第 {index + 1} 个浏览器实例...")
+        return self._create_in_slot(index)
+
+    def _create_in_slot(self, index: int) -> Optional[PooledDriver]:
+        """在指定位置创建驱动并登记（调用前已增加_creating计数）"""
+        replacement = self._create_pooled_driver(index)
+        with self._lock:
+            self._creating -= 1
+            if replacement:
+                self._all.append(replacement)
+            else:
+                self._lost_slots.append(index)
+                self._next_retry = time.time() + self.config.DRIVER_POOL['retry_interval']
+        return replacement
+
+    @staticmethod
+    def _quit(pooled: PooledDriver):
+        WebDriverManager.close_driver(pooled.driver)
+        pooled.manager.cleanup_temp_user_data_dir()
+
+    def close(self):
+        """关闭池中所有驱动"""
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+
+        for pooled in drivers:
+            self._quit(pooled)
+        print(f"✅ 驱动池已关闭 ({len(drivers)} 个浏览器实例)")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
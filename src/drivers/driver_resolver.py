@@ -0,0 +1,255 @@
+"""
+ChromeDriver解析模块
+
+按已安装Chrome的路径、修改时间和版本缓存chromedriver路径。缓存命中时只需一次stat，
+不再每次创建浏览器都通过ChromeDriverManager().install()做版本查询和网络请求；
+未命中时先在本地（PATH、配置目录、webdriver_manager下载目录）查找主版本匹配的chromedriver，
+只有在允许联网时才回退到webdriver_manager下载
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shutil
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config import CrawlerConfig
+
+
+_VERSION_PATTERN = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+# 各平台Chrome可执行文件的常见名称/位置
+_CHROME_NAMES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+_MAC_CHROME_PATHS = [
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    '/Applications/Chromium.app/Contents/MacOS/Chromium'
+]
+
+
+def _parse_version(text: str) -> Optional[str]:
+    match = _VERSION_PATTERN.search(text or '')
+    return match.group(0) if match else None
+
+
+def _major(version: Optional[str]) -> Optional[int]:
+    return int(version.split('.')[0]) if version else None
+
+
+def _version_key(version: Optional[str]) -> Tuple[int, ...]:
+    return tuple(int(part) for part in version.split('.')) if version else ()
+
+
+def find_chrome_binary(configured: Optional[str] = None) -> Optional[str]:
+    """
+    查找Chrome可执行文件
+    :param configured: 配置中显式指定的路径
+    :return: 可执行文件路径，找不到时返回None
+    """
+    if configured:
+        return configured if os.path.isfile(configured) else None
+
+    if sys.platform.startswith('win'):
+        for base in (os.environ.get('PROGRAMFILES'), os.environ.get('PROGRAMFILES(X86)'),
+                     os.environ.get('LOCALAPPDATA')):
+            if base:
+                path = os.path.join(base, 'Google', 'Chrome', 'Application', 'chrome.exe')
+                if os.path.isfile(path):
+                    return path
+        return None
+
+    if sys.platform == 'darwin':
+        for path in _MAC_CHROME_PATHS:
+            if os.path.isfile(path):
+                return path
+
+    for name in _CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return os.path.realpath(path)
+    return None
+
+
+def read_binary_version(binary: str) -> Optional[str]:
+    """
+    读取Chrome或chromedriver的版本号（Windows上Chrome从Application目录下的版本目录读取，其他情况执行--version）
+    :param binary: 可执行文件路径
+    :return: 版本号（如 '120.0.6099.109'），无法读取时返回None
+    """
+    if sys.platform.startswith('win') and os.path.basename(binary).lower() == 'chrome.exe':
+        versions = [name for name in os.listdir(os.path.dirname(binary)) if _VERSION_PATTERN.fullmatch(name)]
+        return max(versions, key=_version_key) if versions else None
+    try:
+        output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logging.debug(f"读取版本号失败 ({binary}): {e}")
+        return None
+    return _parse_version(output)
+
+
+class ChromeDriverResolver:
+    """chromedriver路径解析器"""
+
+    # 进程内缓存：(Chrome路径, 修改时间) -> chromedriver路径，驱动池创建实例时不再读取文件
+    _memo: Dict[Tuple[str, float], str] = {}
+    _memo_lock = threading.Lock()
+
+    def __init__(self, config: CrawlerConfig = None):
+        """
+        初始化chromedriver解析器
+        :param config: 爬虫配置对象
+        """
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.CHROMEDRIVER
+        self.cache_path = self.config.PATHS['chromedriver_cache']
+
+    def resolve(self) -> str:
+        """
+        获取chromedriver路径：显式配置 > 进程内缓存 > 缓存文件 > 本地查找 > webdriver_manager下载（非离线时）
+        :return: chromedriver可执行文件路径
+        """
+        override = self.settings['driver_path']
+        if override:
+            if not os.path.isfile(override):
+                raise FileNotFoundError(f"配置的chromedriver不存在: {override}")
+            return override
+
+        started = time.perf_counter()
+        chrome = find_chrome_binary(self.settings['chrome_binary'])
+        key = self._cache_key(chrome)
+
+        with self._memo_lock:
+            path = self._memo.get(key)
+        if path and os.path.isfile(path):
+            return path
+
+        path, source = self._from_cache_file(key), '缓存'
+        if not path:
+            chrome_version = read_binary_version(chrome) if chrome else None
+            path, source = self._find_local(chrome_version), '本地查找'
+            if not path:
+                path, source = self._download(chrome_version), 'webdriver_manager'
+            self._save_cache_file(key, chrome_version, path)
+
+        with self._memo_lock:
+            self._memo[key] = path
+        logging.info(f"使用ChromeDriver ({source}, {(time.perf_counter() - started) * 1000:.0f}ms): {path}")
+        return path
+
+    def invalidate(self):
+        """丢弃当前Chrome对应的缓存（会话创建失败、可能是版本不匹配时调用），下次重新解析"""
+        key = self._cache_key(find_chrome_binary(self.settings['chrome_binary']))
+        with self._memo_lock:
+            self._memo.pop(key, None)
+        cache = self._load_cache_file()
+        if cache.pop(key[0], None) is not None:
+            self._write_cache_file(cache)
+
+    # ---------- 缓存 ----------
+
+    @staticmethod
+    def _cache_key(chrome: Optional[str]) -> Tuple[str, float]:
+        """Chrome升级后可执行文件的修改时间会变化，缓存随之失效"""
+        if not chrome:
+            return '', 0.0
+        try:
+            return chrome, os.path.getmtime(chrome)
+        except OSError:
+            return chrome, 0.0
+
+    def _load_cache_file(self) -> Dict[str, Dict]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache_file(self, cache: Dict[str, Dict]):
+        # 先写临时文件再替换，多个进程同时写入时不会读到不完整的文件
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logging.error(f"保存ChromeDriver缓存失败: {e}")
+
+    def _from_cache_file(self, key: Tuple[str, float]) -> Optional[str]:
+        entry = self._load_cache_file().get(key[0])
+        if not entry or entry.get('chrome_mtime') != key[1]:
+            return None
+        path = entry.get('driver_path')
+        return path if path and os.path.isfile(path) else None
+
+    def _save_cache_file(self, key: Tuple[str, float], chrome_version: Optional[str], driver_path: str):
+        cache = self._load_cache_file()
+        cache[key[0]] = {
+            'chrome_mtime': key[1],
+            'chrome_version': chrome_version,
+            'driver_path': driver_path,
+            'resolved_at': time.time()
+        }
+        self._write_cache_file(cache)
+
+    # ---------- 查找和下载 ----------
+
+    def _candidates(self) -> List[str]:
+        """本地可能的chromedriver：PATH、配置的目录、webdriver_manager下载目录"""
+        executable = 'chromedriver.exe' if sys.platform.startswith('win') else 'chromedriver'
+        candidates = []
+        on_path = shutil.which('chromedriver')
+        if on_path:
+            candidates.append(on_path)
+        for directory in self.settings['search_dirs']:
+            candidates.append(os.path.join(directory, executable))
+        wdm_root = os.environ.get('WDM_ROOT') or os.path.join(os.path.expanduser('~'), '.wdm')
+        candidates.extend(glob.glob(os.path.join(wdm_root, 'drivers', 'chromedriver', '**', executable),
+                                    recursive=True))
+        return [path for path in dict.fromkeys(candidates) if os.path.isfile(path)]
+
+    def _find_local(self, chrome_version: Optional[str]) -> Optional[str]:
+        """
+        在本地查找与Chrome主版本一致的chromedriver（Chrome版本未知时取版本最高的）
+        :param chrome_version: Chrome版本号
+        :return: chromedriver路径，找不到时返回None
+        """
+        found = []
+        for path in self._candidates():
+            # webdriver_manager下载目录的路径中包含版本号，其他位置执行--version读取
+            version = _parse_version(path) or read_binary_version(path)
+            if version and (chrome_version is None or _major(version) == _major(chrome_version)):
+                found.append((version, path))
+        if not found:
+            return None
+        return max(found, key=lambda item: _version_key(item[0]))[1]
+
+    def _download(self, chrome_version: Optional[str]) -> str:
+        """
+        通过webdriver_manager下载chromedriver（离线模式下直接报错）
+        :param chrome_version: Chrome版本号
+        :return: chromedriver路径
+        """
+        if self.settings['offline']:
+            raise RuntimeError(
+                f"离线模式下找不到与Chrome {chrome_version or '(未知版本)'} 匹配的chromedriver，"
+                f"请在 CrawlerConfig.CHROMEDRIVER['driver_path'] 中指定路径，或放入 search_dirs 中的目录")
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+
+
+def resolve_chromedriver(config: CrawlerConfig = None) -> str:
+    """
+    获取chromedriver路径
+    :param config: 爬虫配置对象
+    :return: chromedriver可执行文件路径
+    """
+    return ChromeDriverResolver(config).resolve()
@@ -0,0 +1,204 @@
+"""
+HTTP页面获取模块
+
+复用浏览器建立的登录会话（已保存的Cookie和User-Agent），
+用带keep-alive连接池的requests会话直接获取搜索结果页和翻页；
+检测到登录重定向或滑块验证时返回拦截原因，由调用方回退到浏览器
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+import requests
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.config import CrawlerConfig
+from ..utils.profiler import profiled
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+@dataclass
+class FetchResult:
+    """HTTP获取结果"""
+
+    url: str
+    final_url: str = ''
+    status: int = 0
+    html: str = ''
+    blocked: Optional[str] = None     # 拦截原因：login/captcha/http_<状态码>/error，未拦截时为None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.blocked is None
+
+
+class HttpFetcher:
+    """复用浏览器Cookie的HTTP页面获取器"""
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, config: CrawlerConfig = None, user_agent: Optional[str] = None):
+        """
+        初始化HTTP页面获取器
+        :param config: 爬虫配置对象
+        :param user_agent: 请求使用的User-Agent，应与建立会话的浏览器一致；为None时从配置中选取
+        """
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.FETCH
+        self.session = requests.Session()
+
+        retry = Retry(total=self.settings['max_retries'], backoff_factor=self.settings['backoff_factor'],
+                      status_forcelist=self.RETRY_STATUSES, allowed_methods=frozenset(['GET', 'HEAD']),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.settings['pool_maxsize'], max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.session.headers.update({
+            'User-Agent': user_agent or self.config.USER_AGENTS[0],
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+            'Upgrade-Insecure-Requests': '1',
+            'Referer': self.config.DEFAULT_BASE_URL + '/'
+        })
+
+        self.stats = {'requests': 0, 'blocked': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def has_cookies(self) -> bool:
+        """会话中是否已有Cookie"""
+        return len(self.session.cookies) > 0
+
+    @property
+    def user_agent(self) -> str:
+        return self.session.headers['User-Agent']
+
+    def set_cookies(self, cookies: List[Dict[str, Any]]) -> int:
+        """
+        把Selenium格式的Cookie写入会话
+        :param cookies: driver.get_cookies() 或Cookie文件中的Cookie列表
+        :return: 写入的Cookie数量
+        """
+        count = 0
+        for cookie in cookies:
+            try:
+                self.session.cookies.set(
+                    cookie['name'], cookie['value'],
+                    domain=cookie.get('domain', ''), path=cookie.get('path', '/'),
+                    secure=cookie.get('secure', False), expires=cookie.get('expiry'),
+                    rest={'HttpOnly': cookie.get('httpOnly', False)}
+                )
+                count += 1
+            except (KeyError, TypeError) as e:
+                logging.debug(f"跳过无效Cookie {cookie}: {e}")
+        return count
+
+    def load_cookie_file(self, cookie_file: Optional[str] = None) -> int:
+        """
+        从CacheManager保存的Cookie文件加载会话
+        :param cookie_file: Cookie文件路径，如果为None则使用配置中的默认路径
+        :return: 加载的Cookie数量，文件不存在或无法读取时为0
+        """
+        cookie_file = cookie_file or self.config.PATHS['cookies']
+        if not os.path.exists(cookie_file):
+            return 0
+
+        try:
+            with open(cookie_file, 'r', encoding='utf-8') as f:
+                cookies = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.error(f"读取Cookie文件失败: {e}")
+            return 0
+
+        count = self.set_cookies(cookies)
+        logging.info(f"HTTP会话已加载{count}个Cookie")
+        return count
+
+    def sync_from_driver(self, driver: 'webdriver.Chrome') -> int:
+        """
+        从浏览器同步Cookie和User-Agent（浏览器刚完成登录或通过验证后调用）
+        :param driver: WebDriver实例
+        :return: 同步的Cookie数量
+        """
+        try:
+            user_agent = driver.execute_script("return navigator.userAgent")
+            if user_agent:
+                self.session.headers['User-Agent'] = user_agent
+            self.session.cookies.clear()
+            count = self.set_cookies(driver.get_cookies())
+            logging.info(f"HTTP会话已从浏览器同步{count}个Cookie")
+            return count
+        except Exception as e:
+            logging.error(f"从浏览器同步Cookie失败: {e}")
+            return 0
+
+    @profiled('fetch')
+    def fetch(self, url: str, referer: Optional[str] = None) -> FetchResult:
+        """
+        获取页面
+        :param url: 页面URL
+        :param referer: Referer，翻页时传入上一页URL
+        :return: 获取结果，blocked不为None时需要回退到浏览器
+        """
+        result = FetchResult(url=url)
+        headers = {'Referer': referer} if referer else None
+        start = time.monotonic()
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.settings['timeout'])
+            if not response.encoding or response.encoding.lower() == 'iso-8859-1':
+                response.encoding = response.apparent_encoding
+
+            result.final_url = response.url
+            result.status = response.status_code
+            result.html = response.text
+            if response.status_code != 200:
+                result.blocked = f"http_{response.status_code}"
+            else:
+                result.blocked = self._blocked_reason(result.final_url, result.html)
+
+            with self._lock:
+                self.stats['bytes'] += len(response.content)
+
+        except requests.RequestException as e:
+            logging.error(f"HTTP获取 {url} 失败: {e}")
+            result.blocked = 'error'
+
+        result.elapsed = time.monotonic() - start
+        with self._lock:
+            self.stats['requests'] += 1
+            if result.blocked:
+                self.stats['blocked'] += 1
+
+        if result.blocked:
+            logging.info(f"HTTP获取被拦截 ({result.blocked}): {url} -> {result.final_url}")
+        return result
+
+    def _blocked_reason(self, final_url: str, html: str) -> Optional[str]:
+        """
+        检查响应是否为登录页或验证页
+        :param final_url: 重定向后的最终URL
+        :param html: 页面内容
+        :return: 拦截原因，正常页面返回None
+        """
+        lower_url = final_url.lower()
+        if any(keyword in lower_url for keyword in self.config.LOGIN_INDICATORS['url_keywords']):
+            return 'login'
+        if any(marker in lower_url for marker in self.settings['block_url_markers']):
+            return 'captcha'
+        if any(marker in html for marker in self.settings['block_html_markers']):
+            return 'captcha'
+        return None
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
@@ -0,0 +1,308 @@
+"""
+弹窗屏蔽模块
+
+通过CDP Page.addScriptToEvaluateOnNewDocument在每个文档加载时注入一段常驻脚本，
+用MutationObserver在弹窗/遮罩层出现时直接隐藏（不需要Python端轮询检测和关闭），
+并在页面中累计屏蔽数量，由页面状态快照或collect()读取回Python端
+"""
+
+import json
+import logging
+import threading
+import weakref
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ..core.config import CrawlerConfig
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+# 注入脚本，__CONFIG__会替换为JSON配置（新文档脚本不能传参）
+SUPPRESSOR_SCRIPT = """
+(function () {
+    if (window.__popupSuppressor) { return; }
+    var cfg = __CONFIG__;
+    var state = {hidden: 0, kept: 0, bySelector: {}};
+    try {
+        Object.defineProperty(window, '__popupSuppressor', {value: state, configurable: true});
+    } catch (e) {
+        return;
+    }
+
+    var MARK = 'data-popup-suppressed';
+    var pending = [];
+    var scheduled = false;
+
+    function matches(el, selector) {
+        try { return el.matches(selector); } catch (e) { return false; }
+    }
+
+    function isProtected(el) {
+        // 验证码和登录表单必须保留，交给验证码/登录处理流程
+        for (var i = 0; i < cfg.protected.length; i++) {
+            var selector = cfg.protected[i];
+            try {
+                if (el.matches(selector) || el.querySelector(selector)) { return true; }
+            } catch (e) {}
+        }
+        return false;
+    }
+
+    function isOverlay(el) {
+        if (!el.getClientRects().length) { return false; }
+        var style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden') { return false; }
+        if (style.position !== 'fixed' && style.position !== 'absolute') { return false; }
+        var z = parseInt(style.zIndex, 10);
+        if (!isNaN(z) && z >= cfg.minZIndex) { return true; }
+        var rect = el.getBoundingClientRect();
+        var viewW = window.innerWidth || 1;
+        var viewH = window.innerHeight || 1;
+        var width = Math.max(0, Math.min(rect.right, viewW) - Math.max(rect.left, 0));
+        var height = Math.max(0, Math.min(rect.bottom, viewH) - Math.max(rect.top, 0));
+        return (width * height) / (viewW * viewH) >= cfg.overlayRatio;
+    }
+
+    function unlockScroll() {
+        [document.documentElement, document.body].forEach(function (el) {
+            if (el && window.getComputedStyle(el).overflow === 'hidden') {
+                el.style.setProperty('overflow', 'auto', 'important');
+            }
+        });
+    }
+
+    function check(el) {
+        if (el.nodeType !== 1 || el.hasAttribute(MARK)) { return; }
+        for (var i = 0; i < cfg.selectors.length; i++) {
+            var selector = cfg.selectors[i];
+            if (!matches(el, selector)) { continue; }
+            if (!isOverlay(el)) { return; }
+            if (isProtected(el)) {
+                el.setAttribute(MARK, 'kept');
+                state.kept += 1;
+                return;
+            }
+            el.setAttribute(MARK, 'hidden');
+            el.style.setProperty('display', 'none', 'important');
+            state.hidden += 1;
+            state.bySelector[selector] = (state.bySelector[selector] || 0) + 1;
+            if (cfg.unlockScroll) { unlockScroll(); }
+            return;
+        }
+    }
+
+    function scan(root) {
+        if (root.nodeType !== 1 && root.nodeType !== 9) { return; }
+        if (root.nodeType === 1) { check(root); }
+        for (var i = 0; i < cfg.selectors.length; i++) {
+            var nodes;
+            try { nodes = root.querySelectorAll(cfg.selectors[i]); } catch (e) { continue; }
+            for (var j = 0; j < nodes.length; j++) { check(nodes[j]); }
+        }
+    }
+
+    function flush() {
+        scheduled = false;
+        var items = pending;
+        pending = [];
+        for (var i = 0; i < items.length; i++) {
+            var node = items[i][0];
+            if (!node.isConnected) { continue; }
+            if (items[i][1]) { scan(node); } else { check(node); }
+        }
+    }
+
+    // deep为true时扫描整个子树（新插入的节点），否则只检查该元素本身（属性变化）
+    function schedule(node, deep) {
+        pending.push([node, deep]);
+        if (!scheduled) {
+            scheduled = true;
+            setTimeout(flush, cfg.debounceMs);
+        }
+    }
+
+    new MutationObserver(function (mutations) {
+        for (var i = 0; i < mutations.length; i++) {
+            var m = mutations[i];
+            if (m.type === 'attributes') {
+                // 已有元素通过class/style切换为显示；html/body的样式变化（包括unlockScroll自身的写入）不是弹窗
+                var target = m.target;
+                if (target.nodeType !== 1 || target === document.documentElement || target === document.body) { continue; }
+                if (!target.hasAttribute(MARK)) { schedule(target, false); }
+                continue;
+            }
+            for (var j = 0; j < m.addedNodes.length; j++) {
+                if (m.addedNodes[j].nodeType === 1) { schedule(m.addedNodes[j], true); }
+            }
+        }
+    }).observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style']});
+
+    if (document.readyState !== 'loading') {
+        schedule(document, true);
+    } else {
+        document.addEventListener('DOMContentLoaded', function () { schedule(document, true); });
+    }
+})();
+"""
+
+# 读取并清零当前文档的屏蔽计数（页面状态快照脚本中也会读取并清零）
+COLLECT_SCRIPT = """
+var s = window.__popupSuppressor;
+if (!s) { return null; }
+var result = {hidden: s.hidden, kept: s.kept, bySelector: s.bySelector};
+s.hidden = 0; s.kept = 0; s.bySelector = {};
+return result;
+"""
+
+
+# 每个WebDriver一个屏蔽器，统计在同一浏览器的所有页面间累计
+_suppressors = weakref.WeakKeyDictionary()
+_suppressors_lock = threading.Lock()
+
+
+def get_popup_suppressor(driver: 'webdriver.Chrome') -> Optional['PopupSuppressor']:
+    """
+    获取WebDriver上已安装的弹窗屏蔽器
+    :param driver: WebDriver实例
+    :return: 弹窗屏蔽器，未安装时返回None
+    """
+    with _suppressors_lock:
+        return _suppressors.get(driver)
+
+
+class PopupSuppressor:
+    """常驻弹窗屏蔽脚本管理器"""
+
+    def __init__(self, driver: 'webdriver.Chrome', config: CrawlerConfig = None):
+        """
+        初始化弹窗屏蔽器
+        :param driver: WebDriver实例
+        :param config: 爬虫配置对象
+        """
+        self.driver = driver
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.POPUP_SUPPRESSION
+        self.script = self.build_script()
+        self._applied_windows = set()
+
+        self.hidden = 0
+        self.kept = 0
+        self.by_selector: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def install(cls, driver: 'webdriver.Chrome', config: CrawlerConfig = None) -> Optional['PopupSuppressor']:
+        """
+        在WebDriver上安装弹窗屏蔽脚本（未启用时不做任何操作）
+        :param driver: WebDriver实例
+        :param config: 爬虫配置对象
+        :return: 弹窗屏蔽器，未启用或安装失败时返回None
+        """
+        config = config or CrawlerConfig()
+        if not config.POPUP_SUPPRESSION['enabled']:
+            return None
+
+        suppressor = cls(driver, config)
+        if not suppressor.apply():
+            return None
+        with _suppressors_lock:
+            _suppressors[driver] = suppressor
+        return suppressor
+
+    def build_script(self) -> str:
+        """
+        根据配置生成注入脚本
+        :return: 脚本源码
+        """
+        selectors = list(dict.fromkeys(self.config.POPUP_SELECTORS + self.settings['extra_selectors']))
+        protected = list(dict.fromkeys(self.config.CAPTCHA_SELECTORS['main'] + self.settings['protected_selectors']))
+        script_config = {
+            'selectors': selectors,
+            'protected': protected,
+            'minZIndex': self.settings['min_z_index'],
+            'overlayRatio': self.settings['overlay_ratio'],
+            'unlockScroll': self.settings['unlock_scroll'],
+            'debounceMs': self.settings['debounce_ms']
+        }
+        return SUPPRESSOR_SCRIPT.replace('__CONFIG__', json.dumps(script_config, ensure_ascii=False))
+
+    def apply(self) -> bool:
+        """
+        在当前标签页注册新文档脚本，并在已加载的当前文档中立即执行一次，新打开的标签页需要再次调用
+        :return: 是否设置成功
+        """
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self.script})
+            self._applied_windows.add(self.driver.current_window_handle)
+        except Exception as e:
+            logging.error(f"安装弹窗屏蔽脚本失败: {e}")
+            return False
+
+        try:
+            self.driver.execute_script(self.script)
+        except Exception as e:
+            logging.debug(f"在当前文档执行弹窗屏蔽脚本失败: {e}")
+
+        logging.info("弹窗屏蔽脚本已启用")
+        return True
+
+    def ensure_current_tab(self):
+        """切换标签页后调用：当前标签页还没有注入屏蔽脚本时注入"""
+        try:
+            if self.driver.current_window_handle in self._applied_windows:
+                return
+        except Exception as e:
+            logging.debug(f"获取当前标签页失败: {e}")
+            return
+        self.apply()
+
+    def record(self, counts: Optional[Dict[str, Any]]) -> int:
+        """
+        累计页面中读取到的屏蔽计数
+        :param counts: 注入脚本的计数 {'hidden', 'kept', 'bySelector'}，当前文档没有屏蔽脚本时为None
+        :return: 本次读取到的屏蔽数量
+        """
+        if not counts:
+            return 0
+        hidden = int(counts.get('hidden') or 0)
+        with self._lock:
+            self.hidden += hidden
+            self.kept += int(counts.get('kept') or 0)
+            self.by_selector.update({selector: int(count) for selector, count in
+                                     (counts.get('bySelector') or {}).items()})
+        return hidden
+
+    def collect(self) -> int:
+        """
+        读取并清零当前文档的屏蔽计数
+        :return: 自上次读取以来在当前文档中屏蔽的弹窗数量
+        """
+        try:
+            return self.record(self.driver.execute_script(COLLECT_SCRIPT))
+        except Exception as e:
+            logging.debug(f"读取弹窗屏蔽计数失败: {e}")
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取屏蔽统计（先读取当前文档尚未读取的计数）
+        :return: {'hidden', 'kept', 'top_selectors'}
+        """
+        self.collect()
+        with self._lock:
+            return {
+                'hidden': self.hidden,
+                'kept': self.kept,
+                'top_selectors': self.by_selector.most_common(5)
+            }
+
+    def print_summary(self):
+        """打印屏蔽统计"""
+        stats = self.stats()
+        if not stats['hidden'] and not stats['kept']:
+            return
+        top = ', '.join(f"{selector} {count}" for selector, count in stats['top_selectors'])
+        print(f"🛡️ 弹窗屏蔽: 自动隐藏 {stats['hidden']} 个弹窗 ({top})，"
+              f"保留 {stats['kept']} 个验证码/登录浮层")
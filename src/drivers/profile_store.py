@@ -0,0 +1,325 @@
+"""
+Chrome配置目录管理模块
+
+维护一组具名、可复用的Chrome用户数据目录，代替每次运行新建的临时目录，
+使HTTP缓存、Service Worker和登录状态在多次运行之间保留。
+每个目录用独占创建的锁文件保证同一时间只被一个浏览器使用，
+按最近使用时间轮换，并清理长期未使用或缓存过大的目录
+"""
+
+import os
+import json
+import time
+import shutil
+import socket
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..core.config import CrawlerConfig
+
+
+LOCK_FILE = '.crawler.lock'
+META_FILE = '.crawler_profile.json'
+
+# 超过大小上限时清空的缓存子目录（保留Cookie、Local Storage等登录状态）
+CACHE_DIRS = [
+    os.path.join('Default', 'Cache'),
+    os.path.join('Default', 'Code Cache'),
+    os.path.join('Default', 'GPUCache'),
+    os.path.join('Default', 'Service Worker', 'CacheStorage'),
+    os.path.join('Default', 'Service Worker', 'ScriptCache'),
+    'GrShaderCache',
+    'ShaderCache'
+]
+
+
+@dataclass
+class ProfileLease:
+    """已锁定的配置目录"""
+
+    name: str
+    path: str
+    created: bool = False             # 本次新建的目录（首次使用，没有缓存）
+
+
+def _pid_alive(pid: int) -> bool:
+    """判断进程是否仍在运行"""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _dir_size(path: str) -> int:
+    """目录总大小（字节）"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+class ProfileStore:
+    """具名Chrome配置目录池"""
+
+    _shared: Dict[str, 'ProfileStore'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, root: Optional[str] = None, config: CrawlerConfig = None):
+        """
+        初始化配置目录池
+        :param root: 配置目录的根目录
+        :param config: 爬虫配置对象
+        """
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.PROFILE_STORE
+        self.root = os.path.abspath(root or self.config.PATHS['chrome_profiles'])
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @classmethod
+    def shared(cls, root: Optional[str] = None, config: CrawlerConfig = None) -> 'ProfileStore':
+        """
+        获取进程内共享的配置目录池
+        :param root: 配置目录的根目录
+        :param config: 爬虫配置对象
+        :return: 配置目录池
+        """
+        config = config or CrawlerConfig()
+        key = os.path.abspath(root or config.PATHS['chrome_profiles'])
+        with cls._shared_lock:
+            store = cls._shared.get(key)
+            if store is None:
+                store = cls(key, config)
+                cls._shared[key] = store
+                if store.settings['auto_prune']:
+                    store.prune()
+            return store
+
+    def profile_path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    # ---------- 加锁和释放 ----------
+
+    def acquire(self, name: Optional[str] = None) -> Optional[ProfileLease]:
+        """
+        锁定一个配置目录：指定名称时只尝试该目录，否则优先复用最近使用过的空闲目录，
+        全部被占用且未达到数量上限时新建
+        :param name: 配置目录名称
+        :return: 配置目录租约，没有可用目录时返回None（调用方应改用临时目录）
+        """
+        with self._lock:
+            if name:
+                return self._try_lock(name)
+
+            for profile in sorted(self.list_profiles(), key=lambda p: -p['last_used']):
+                if profile['locked']:
+                    continue
+                lease = self._try_lock(profile['name'])
+                if lease:
+                    return lease
+
+            names = {profile['name'] for profile in self.list_profiles()}
+            if len(names) >= self.settings['max_profiles']:
+                logging.warning(f"所有Chrome配置目录都在使用中 (上限 {self.settings['max_profiles']} 个)")
+                return None
+            index = 1
+            while f"{self.settings['name_prefix']}-{index}" in names:
+                index += 1
+            return self._try_lock(f"{self.settings['name_prefix']}-{index}")
+
+    def _try_lock(self, name: str) -> Optional[ProfileLease]:
+        """用独占创建的锁文件锁定目录，清理已退出进程遗留的锁"""
+        path = self.profile_path(name)
+        created = not os.path.isdir(path)
+        os.makedirs(path, exist_ok=True)
+        lock_path = os.path.join(path, LOCK_FILE)
+
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._clear_stale_lock(lock_path):
+                    return None
+                continue
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'pid': os.getpid(), 'host': socket.gethostname(), 'locked_at': time.time()}, f)
+            self._update_meta(path, runs=1)
+            logging.info(f"使用Chrome配置目录: {path}")
+            return ProfileLease(name=name, path=path, created=created)
+        return None
+
+    def _read_lock(self, lock_path: str) -> Dict[str, Any]:
+        try:
+            with open(lock_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _lock_is_stale(self, lock_path: str) -> bool:
+        """
+        锁的持有进程在本机已退出；其他主机（共享目录）的锁无法检查进程，超过最长持有时间视为遗留。
+        本机仍在运行的进程持有的锁始终有效，长时间的批量任务不会被其他浏览器抢占目录
+        """
+        info = self._read_lock(lock_path)
+        if info.get('host') == socket.gethostname():
+            return not _pid_alive(int(info.get('pid') or 0))
+        try:
+            age = time.time() - os.path.getmtime(lock_path)
+        except OSError:
+            return True
+        return age > self.settings['stale_lock_hours'] * 3600
+
+    def _clear_stale_lock(self, lock_path: str) -> bool:
+        """删除遗留的锁，返回是否已删除"""
+        if not self._lock_is_stale(lock_path):
+            return False
+        try:
+            os.remove(lock_path)
+            logging.info(f"清理遗留的配置目录锁: {lock_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"清理配置目录锁失败: {e}")
+            return False
+        return True
+
+    def release(self, lease: Optional[ProfileLease]):
+        """
+        释放配置目录（只删除锁文件，保留缓存和登录状态）
+        :param lease: 配置目录租约
+        """
+        if not lease:
+            return
+        self._update_meta(lease.path)
+        lock_path = os.path.join(lease.path, LOCK_FILE)
+        if self._read_lock(lock_path).get('pid') not in (None, os.getpid()):
+            return
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"释放配置目录锁失败 ({lease.name}): {e}")
+
+    # ---------- 元数据和清理 ----------
+
+    def _update_meta(self, path: str, runs: int = 0):
+        meta_path = os.path.join(path, META_FILE)
+        meta = self._read_meta(path)
+        now = time.time()
+        meta.setdefault('created_at', now)
+        meta['last_used'] = now
+        meta['runs'] = meta.get('runs', 0) + runs
+        try:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except OSError as e:
+            logging.debug(f"写入配置目录信息失败: {e}")
+
+    def _read_meta(self, path: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def list_profiles(self, with_size: bool = False) -> List[Dict[str, Any]]:
+        """
+        列出所有配置目录
+        :param with_size: 是否统计目录大小（需要遍历目录）
+        :return: [{'name', 'path', 'locked', 'last_used', 'runs', 'size'}]
+        """
+        profiles = []
+        for name in sorted(os.listdir(self.root)):
+            path = self.profile_path(name)
+            if not os.path.isdir(path):
+                continue
+            meta = self._read_meta(path)
+            lock_path = os.path.join(path, LOCK_FILE)
+            profiles.append({
+                'name': name,
+                'path': path,
+                'locked': os.path.exists(lock_path) and not self._lock_is_stale(lock_path),
+                'last_used': meta.get('last_used', 0),
+                'runs': meta.get('runs', 0),
+                'size': _dir_size(path) if with_size else None
+            })
+        return profiles
+
+    def clear_cache(self, name: str) -> int:
+        """
+        清空配置目录的缓存子目录，保留Cookie和本地存储
+        :param name: 配置目录名称
+        :return: 释放的字节数
+        """
+        path = self.profile_path(name)
+        freed = 0
+        for cache_dir in CACHE_DIRS:
+            cache_path = os.path.join(path, cache_dir)
+            if os.path.isdir(cache_path):
+                freed += _dir_size(cache_path)
+                shutil.rmtree(cache_path, ignore_errors=True)
+        return freed
+
+    def remove(self, name: str) -> bool:
+        """
+        删除未被占用的配置目录
+        :param name: 配置目录名称
+        :return: 是否已删除
+        """
+        path = self.profile_path(name)
+        lock_path = os.path.join(path, LOCK_FILE)
+        if not os.path.isdir(path) or (os.path.exists(lock_path) and not self._lock_is_stale(lock_path)):
+            return False
+        shutil.rmtree(path, ignore_errors=True)
+        logging.info(f"删除Chrome配置目录: {path}")
+        return True
+
+    def prune(self) -> Dict[str, Any]:
+        """
+        清理空闲的配置目录：删除超过保留天数未使用的和超出数量上限的（按最近使用时间），
+        清空超过大小上限的目录的缓存
+        :return: {'removed': [名称], 'cache_cleared': [名称], 'bytes_freed': 字节数}
+        """
+        result = {'removed': [], 'cache_cleared': [], 'bytes_freed': 0}
+        max_age = self.settings['max_age_days'] * 86400
+        max_bytes = self.settings['max_profile_mb'] * 1024 * 1024
+        now = time.time()
+
+        with self._lock:
+            profiles = sorted(self.list_profiles(with_size=True), key=lambda p: -p['last_used'])
+            for rank, profile in enumerate(profiles):
+                if profile['locked']:
+                    continue
+                expired = max_age and profile['last_used'] and now - profile['last_used'] > max_age
+                if expired or rank >= self.settings['max_profiles']:
+                    if self.remove(profile['name']):
+                        result['removed'].append(profile['name'])
+                        result['bytes_freed'] += profile['size']
+                elif max_bytes and profile['size'] > max_bytes:
+                    result['bytes_freed'] += self.clear_cache(profile['name'])
+                    result['cache_cleared'].append(profile['name'])
+        return result
+
+    def chrome_arguments(self) -> List[str]:
+        """
+        使用托管配置目录时附加的Chrome参数（限制磁盘缓存大小）
+        :return: 参数列表
+        """
+        arguments = []
+        if self.settings['disk_cache_mb']:
+            arguments.append(f"--disk-cache-size={self.settings['disk_cache_mb'] * 1024 * 1024}")
+        return arguments
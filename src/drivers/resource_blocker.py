@@ -0,0 +1,254 @@
+"""
+资源拦截模块
+
+通过CDP Network.setBlockedURLs在浏览器网络层拦截图片、字体、视频和统计/广告域名的请求，
+减少每个搜索结果页的下载量和加载时间；登录和验证码页面暂停拦截，避免二维码、滑块图片无法显示；
+从CDP性能日志统计被拦截的请求数，并按同类型已加载资源的平均大小估算节省的流量
+"""
+
+import logging
+import threading
+import weakref
+from collections import Counter
+from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.config import CrawlerConfig
+from .cdp_events import get_event_reader
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+# 每个WebDriver一个拦截器，统计在同一浏览器的所有页面间累计
+_blockers = weakref.WeakKeyDictionary()
+_blockers_lock = threading.Lock()
+
+
+def get_resource_blocker(driver: 'webdriver.Chrome') -> Optional['ResourceBlocker']:
+    """
+    获取WebDriver上已安装的资源拦截器
+    :param driver: WebDriver实例
+    :return: 资源拦截器，未安装时返回None
+    """
+    with _blockers_lock:
+        return _blockers.get(driver)
+
+
+class ResourceBlocker:
+    """CDP资源拦截器"""
+
+    # 被拦截请求/进行中请求的跟踪上限，避免长时间运行占用过多内存
+    MAX_TRACKED_REQUESTS = 2000
+
+    def __init__(self, driver: 'webdriver.Chrome', config: CrawlerConfig = None):
+        """
+        初始化资源拦截器
+        :param driver: WebDriver实例
+        :param config: 爬虫配置对象
+        """
+        self.driver = driver
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.RESOURCE_BLOCKING
+        self.patterns: List[str] = []
+        self.installed = False
+        self.lifted = False               # 登录/验证码页面上暂停了拦截
+        self._applied_windows = set()
+
+        self.blocked_by_type: Counter = Counter()
+        self.blocked_by_host: Counter = Counter()
+        self.loaded_bytes_by_type: Counter = Counter()
+        self.loaded_count_by_type: Counter = Counter()
+        self._request_hosts: Dict[str, str] = {}
+        self._request_types: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def install(cls, driver: 'webdriver.Chrome', config: CrawlerConfig = None) -> Optional['ResourceBlocker']:
+        """
+        在WebDriver上安装资源拦截（未启用时不做任何操作）
+        :param driver: WebDriver实例
+        :param config: 爬虫配置对象
+        :return: 资源拦截器，未启用或安装失败时返回None
+        """
+        config = config or CrawlerConfig()
+        if not config.RESOURCE_BLOCKING['enabled']:
+            return None
+
+        blocker = cls(driver, config)
+        if not blocker.apply():
+            return None
+        with _blockers_lock:
+            _blockers[driver] = blocker
+        return blocker
+
+    def build_patterns(self) -> List[str]:
+        """
+        根据配置生成拦截URL模式：资源类型对应的扩展名模式、拦截域名和额外的URL模式
+        :return: URL模式列表（'*'为通配符）
+        """
+        patterns = []
+        for resource_type in self.settings['resource_types']:
+            patterns.extend(self.settings['type_patterns'].get(resource_type, []))
+        for domain in self.settings['domains']:
+            patterns.extend([f"*://{domain}/*", f"*.{domain}/*"])
+        patterns.extend(self.settings['url_patterns'])
+        # 去重并保持顺序
+        return list(dict.fromkeys(patterns))
+
+    def apply(self) -> bool:
+        """
+        （重新）设置当前标签页的拦截规则，新打开的标签页需要再次调用
+        :return: 是否设置成功
+        """
+        self.patterns = self.build_patterns()
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+            self._applied_windows.add(self.driver.current_window_handle)
+        except Exception as e:
+            logging.error(f"设置资源拦截失败: {e}")
+            return False
+
+        if not self.installed:
+            reader = get_event_reader(self.driver)
+            reader.subscribe('Network.requestWillBeSent', self._on_request)
+            reader.subscribe('Network.responseReceived', self._on_response)
+            reader.subscribe('Network.loadingFinished', self._on_finished)
+            reader.subscribe('Network.loadingFailed', self._on_failed)
+            self.installed = True
+
+        logging.info(f"资源拦截已启用: {len(self.patterns)} 条规则")
+        return True
+
+    def ensure_current_tab(self):
+        """切换标签页后调用：当前标签页还没有设置拦截规则时设置"""
+        try:
+            if self.driver.current_window_handle in self._applied_windows:
+                return
+        except Exception as e:
+            logging.debug(f"获取当前标签页失败: {e}")
+            return
+        self.apply()
+
+    def is_exempt(self, url: str) -> bool:
+        """URL是否为需要加载图片的登录/验证码页面"""
+        url = (url or '').lower()
+        return any(keyword in url for keyword in self.settings['exempt_url_keywords'])
+
+    def lift(self, reload: bool = False) -> bool:
+        """
+        暂停当前标签页的拦截（手动登录的二维码、滑动验证码需要加载图片），restore或下次导航时恢复
+        :param reload: 是否刷新当前页面，重新加载已被拦截的图片
+        :return: 是否已暂停
+        """
+        if not self.lifted:
+            try:
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+            except Exception as e:
+                logging.error(f"暂停资源拦截失败: {e}")
+                return False
+            self.lifted = True
+            logging.info("登录/验证码页面，暂停资源拦截")
+            if reload:
+                try:
+                    self.driver.refresh()
+                except Exception as e:
+                    logging.debug(f"暂停资源拦截后刷新页面失败: {e}")
+        return True
+
+    def restore(self):
+        """恢复被lift暂停的拦截规则"""
+        if self.lifted:
+            self.lifted = False
+            self.apply()
+
+    def prepare_navigation(self, url: str):
+        """
+        导航前调用：目标为登录/验证码页面时暂停拦截，否则恢复之前暂停的拦截
+        :param url: 目标URL
+        """
+        if self.is_exempt(url):
+            self.lift()
+        else:
+            self.restore()
+
+    # ---------- CDP事件 ----------
+
+    def _remember(self, mapping: Dict[str, str], request_id: str, value: str):
+        if len(mapping) >= self.MAX_TRACKED_REQUESTS:
+            mapping.clear()
+        mapping[request_id] = value
+
+    def _on_request(self, params: Dict[str, Any]):
+        request_id = params.get('requestId')
+        url = params.get('request', {}).get('url', '')
+        if request_id and url:
+            with self._lock:
+                self._remember(self._request_hosts, request_id, urlparse(url).netloc)
+
+    def _on_response(self, params: Dict[str, Any]):
+        request_id = params.get('requestId')
+        if request_id:
+            with self._lock:
+                self._remember(self._request_types, request_id, params.get('type', 'Other'))
+
+    def _on_finished(self, params: Dict[str, Any]):
+        request_id = params.get('requestId')
+        with self._lock:
+            resource_type = self._request_types.pop(request_id, None)
+            self._request_hosts.pop(request_id, None)
+            if resource_type:
+                self.loaded_bytes_by_type[resource_type] += int(params.get('encodedDataLength') or 0)
+                self.loaded_count_by_type[resource_type] += 1
+
+    def _on_failed(self, params: Dict[str, Any]):
+        request_id = params.get('requestId')
+        with self._lock:
+            host = self._request_hosts.pop(request_id, '')
+            self._request_types.pop(request_id, None)
+            # setBlockedURLs拦截的请求blockedReason为inspector
+            if params.get('blockedReason') != 'inspector':
+                return
+            self.blocked_by_type[params.get('type', 'Other')] += 1
+            if host:
+                self.blocked_by_host[host] += 1
+
+    # ---------- 统计 ----------
+
+    def _estimated_size(self, resource_type: str) -> float:
+        """同类型已加载资源的平均大小，没有样本时使用配置中的估计值"""
+        count = self.loaded_count_by_type.get(resource_type, 0)
+        if count:
+            return self.loaded_bytes_by_type[resource_type] / count
+        estimates = self.settings['estimated_bytes']
+        return estimates.get(resource_type, estimates.get('Other', 0))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取拦截统计（先读取尚未处理的CDP事件）
+        :return: {'rules', 'blocked', 'by_type', 'top_hosts', 'bytes_saved', 'bytes_loaded'}
+        """
+        get_event_reader(self.driver).poll()
+        with self._lock:
+            by_type = dict(self.blocked_by_type)
+            bytes_saved = sum(count * self._estimated_size(resource_type) for resource_type, count in by_type.items())
+            return {
+                'rules': len(self.patterns),
+                'blocked': sum(by_type.values()),
+                'by_type': by_type,
+                'top_hosts': self.blocked_by_host.most_common(5),
+                'bytes_saved': int(bytes_saved),
+                'bytes_loaded': sum(self.loaded_bytes_by_type.values())
+            }
+
+    def print_summary(self):
+        """打印拦截统计"""
+        stats = self.stats()
+        if not stats['blocked']:
+            return
+        by_type = ', '.join(f"{resource_type} {count}" for resource_type, count in
+                            sorted(stats['by_type'].items(), key=lambda item: -item[1]))
+        print(f"🚫 资源拦截: {stats['blocked']} 个请求 ({by_type})，"
+              f"约节省 {stats['bytes_saved'] / 1024 / 1024:.1f} MB，"
+              f"实际下载 {stats['bytes_loaded'] / 1024 / 1024:.1f} MB")
@@ -8,13 +8,17 @@ import os
 import random
 import logging
 import tempfile # Added
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import SessionNotCreatedException # Added
-from webdriver_manager.chrome import ChromeDriverManager
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from ..core.config import CrawlerConfig
+from ..utils.profiler import get_profiler
+from .resource_blocker import ResourceBlocker
+from .popup_suppressor import PopupSuppressor
+from .profile_store import ProfileStore, ProfileLease
+from .driver_resolver import ChromeDriverResolver
+
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 
 class WebDriverManager:
@@ -27,52 +31,81 @@ class WebDriverManager:
         """
         self.config = config or CrawlerConfig()
         self.temp_user_data_dir = None # For storing path to temp user data dir
+        self.profile_lease: Optional[ProfileLease] = None  # 从配置目录池锁定的目录
         
-    def create_driver(self, headless: bool = False, user_data_dir: Optional[str] = None) -> webdriver.Chrome:
+    def create_driver(self, headless: bool = False, user_data_dir: Optional[str] = None) -> 'webdriver.Chrome':
         """
         创建Chrome WebDriver实例
         :param headless: 是否使用无头模式
-        :param user_data_dir: Chrome用户数据目录路径，用于保持登录状态
+        :param user_data_dir: Chrome用户数据目录路径，用于保持登录状态；
+                              为None时从配置目录池中锁定一个可复用的目录（未启用或没有空闲目录时使用临时目录）
         :return: WebDriver实例
         """
+        # selenium和webdriver_manager导入较慢，只在实际创建浏览器时加载
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.common.exceptions import SessionNotCreatedException
+
         options = self._create_chrome_options(headless, user_data_dir)
+        resolver = ChromeDriverResolver(self.config)
         
         try:
-            driver_path = ChromeDriverManager().install()
+            driver_path = resolver.resolve()
             service = Service(executable_path=driver_path)
             logging.info(f"Using ChromeDriver at: {driver_path}")
             logging.info(f"Chrome options being used: {options.arguments}")
             driver = webdriver.Chrome(service=service, options=options)
+            driver.set_script_timeout(self.config.READINESS['script_timeout'])
+            if get_profiler().enabled:
+                get_profiler().instrument_driver(driver)
             
             self._apply_anti_detection(driver)
             self._set_request_headers(driver)
+            ResourceBlocker.install(driver, self.config)
+            PopupSuppressor.install(driver, self.config)
             return driver
         except SessionNotCreatedException as e:
             logging.error(f"SessionNotCreatedException during WebDriver initialization.")
-            logging.error(f"User-data-dir used: {self.temp_user_data_dir or user_data_dir}")
+            logging.error(f"User-data-dir used: {self.user_data_dir or user_data_dir}")
             logging.error(f"Chrome options: {options.arguments}")
             logging.error(f"Exception details: {e}")
+            # 可能是Chrome升级后与缓存的chromedriver版本不匹配，下次重新解析
+            resolver.invalidate()
+            self.cleanup_temp_user_data_dir()
             raise
         except Exception as e:
             logging.error(f"Unexpected exception during WebDriver initialization: {e}")
             logging.error(f"Chrome options: {options.arguments}")
+            self.cleanup_temp_user_data_dir()
             raise
     
-    def _create_chrome_options(self, headless: bool, user_data_dir: Optional[str]) -> webdriver.ChromeOptions:
+    def _create_chrome_options(self, headless: bool, user_data_dir: Optional[str]) -> 'webdriver.ChromeOptions':
         """
         创建Chrome选项
         :param headless: 是否使用无头模式
         :param user_data_dir: Chrome用户数据目录路径
         :return: Chrome选项对象
         """
+        from selenium import webdriver
+
         options = webdriver.ChromeOptions()
+        if self.config.CHROMEDRIVER['chrome_binary']:
+            options.binary_location = self.config.CHROMEDRIVER['chrome_binary']
 
         if user_data_dir:
             options.add_argument(f'--user-data-dir={user_data_dir}')
         else:
-            self.temp_user_data_dir = tempfile.mkdtemp()
-            options.add_argument(f'--user-data-dir={self.temp_user_data_dir}')
-            logging.info(f"Using temporary user data directory: {self.temp_user_data_dir}")
+            if self.config.PROFILE_STORE['enabled']:
+                store = ProfileStore.shared(config=self.config)
+                self.profile_lease = store.acquire()
+                if self.profile_lease:
+                    options.add_argument(f'--user-data-dir={self.profile_lease.path}')
+                    for argument in store.chrome_arguments():
+                        options.add_argument(argument)
+            if not self.profile_lease:
+                self.temp_user_data_dir = tempfile.mkdtemp()
+                options.add_argument(f'--user-data-dir={self.temp_user_data_dir}')
+                logging.info(f"Using temporary user data directory: {self.temp_user_data_dir}")
         
         if headless:
             options.add_argument('--headless=new')
@@ -139,6 +172,12 @@ class WebDriverManager:
         
         # 设置浏览器首选项
         options.add_experimental_option("prefs", self.config.BROWSER_PREFS)
+
+        # 启用性能日志以读取CDP Network事件（用于判断网络空闲、统计资源拦截和捕获接口响应）
+        if (self.config.READINESS['network_idle'] or self.config.RESOURCE_BLOCKING['enabled']
+                or self.config.NETWORK_CAPTURE['enabled']):
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
         
         # 添加随机用户代理
         user_agent = random.choice(self.config.USER_AGENTS)
@@ -147,8 +186,17 @@ class WebDriverManager:
         
         return options
 
+    @property
+    def user_data_dir(self) -> Optional[str]:
+        """当前使用的托管配置目录或临时目录"""
+        return self.profile_lease.path if self.profile_lease else self.temp_user_data_dir
+
     # Method to clean up temp user data dir if created
     def cleanup_temp_user_data_dir(self):
+        # 托管配置目录只释放锁，保留缓存和登录状态供下次运行使用
+        if self.profile_lease:
+            ProfileStore.shared(config=self.config).release(self.profile_lease)
+            self.profile_lease = None
         if self.temp_user_data_dir and os.path.exists(self.temp_user_data_dir):
             try:
                 import shutil
@@ -158,7 +206,7 @@ class WebDriverManager:
             except Exception as e:
                 logging.error(f"Error cleaning up temporary user data directory {self.temp_user_data_dir}: {e}")
 
-    def _apply_anti_detection(self, driver: webdriver.Chrome):
+    def _apply_anti_detection(self, driver: 'webdriver.Chrome'):
         """
         应用反检测JavaScript
         :param driver: WebDriver实例
@@ -232,7 +280,7 @@ class WebDriverManager:
             "source": anti_detection_script
         })
     
-    def _set_request_headers(self, driver: webdriver.Chrome):
+    def _set_request_headers(self, driver: 'webdriver.Chrome'):
         """
         设置额外的请求头
         :param driver: WebDriver实例
@@ -246,7 +294,7 @@ class WebDriverManager:
         })
     
     @staticmethod
-    def close_driver(driver: webdriver.Chrome):
+    def close_driver(driver: 'webdriver.Chrome'):
         """
         安全关闭WebDriver
         :param driver: WebDriver实例
@@ -262,7 +310,7 @@ class WebDriverManager:
     # if an instance of WebDriverManager is retained by the crawler.
     # For now, OS will handle temp dir cleanup.
 
-    def apply_stealth_mode(self, driver: webdriver.Chrome):
+    def apply_stealth_mode(self, driver: 'webdriver.Chrome'):
         """
         应用隐身模式设置
         :param driver: WebDriver实例
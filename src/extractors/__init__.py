@@ -2,7 +2,27 @@
 提取器模块 - 数据提取和页面分析
 """
 
-from .product_extractor import ProductExtractor
-from .page_analyzer import PageAnalyzer
+from typing import TYPE_CHECKING
 
-__all__ = ['ProductExtractor', 'PageAnalyzer']
+from ..utils.lazy_imports import lazy_exports
+
+# 导出名称 -> 子模块，首次访问时才导入，避免导入包时加载selenium、pandas等依赖
+_EXPORTS = {
+    'ProductExtractor': '.product_extractor',
+    'PageAnalyzer': '.page_analyzer',
+    'HTMLProductExtractor': '.html_extractor',
+    'NetworkCapture': '.network_capture',
+    'OfferPayloadParser': '.network_capture',
+    'get_network_capture': '.network_capture'
+}
+
+__all__ = ['ProductExtractor', 'PageAnalyzer', 'HTMLProductExtractor', 'NetworkCapture', 'OfferPayloadParser',
+           'get_network_capture']
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .product_extractor import ProductExtractor
+    from .page_analyzer import PageAnalyzer
+    from .html_extractor import HTMLProductExtractor
+    from .network_capture import NetworkCapture, OfferPayloadParser, get_network_capture
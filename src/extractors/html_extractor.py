@@ -0,0 +1,212 @@
+"""
+HTML离线解析提取模块
+
+基于页面源代码（driver.page_source、HTML文件或字符串）在进程内提取商品信息，
+输出结构与ProductExtractor一致，无需浏览器参与
+"""
+
+import os
+import glob
+import logging
+from urllib.parse import urljoin
+from typing import List, Dict, Any, Optional
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from ..core.config import CrawlerConfig
+from .product_fields import build_product_record
+from ..utils.selector_stats import get_selector_stats, probe_selectors, site_key
+
+try:
+    import lxml  # noqa: F401
+    _DEFAULT_PARSER = 'lxml'
+except ImportError:
+    _DEFAULT_PARSER = 'html.parser'
+
+
+class HTMLProductExtractor:
+    """HTML离线商品提取器"""
+
+    PRICE_MARKERS = ('￥', '元', '¥')
+
+    def __init__(self, config: CrawlerConfig = None, parser: Optional[str] = None):
+        """
+        初始化HTML离线商品提取器
+        :param config: 爬虫配置对象
+        :param parser: BeautifulSoup解析器，默认优先使用lxml
+        """
+        self.config = config or CrawlerConfig()
+        self.parser = parser or _DEFAULT_PARSER
+
+        # 预编译选择器，避免每页重复解析
+        self._card_selectors = dict(self._compile_selectors(self.config.PRODUCT_SELECTORS['standard']))
+        self.selector_stats = get_selector_stats(self.config)
+        self._anchor_selector = soupsieve.compile("a[href*='offer']")
+        self._field_selectors = {
+            field: self._compile_selectors(selectors)
+            for field, selectors in self.config.PRODUCT_FIELD_SELECTORS.items()
+        }
+        self._title_blacklist = self.config.EXTRACTION['title_blacklist']
+
+    @staticmethod
+    def _compile_selectors(selectors: List[str]) -> List[tuple]:
+        """编译CSS选择器列表，跳过无法编译的选择器"""
+        compiled = []
+        for selector in selectors:
+            try:
+                compiled.append((selector, soupsieve.compile(selector)))
+            except Exception as e:
+                logging.warning(f"无法编译选择器 '{selector}': {e}")
+        return compiled
+
+    def extract_from_driver(self, driver) -> List[Dict[str, Any]]:
+        """
+        获取一次page_source后在进程内提取商品
+        :param driver: WebDriver实例
+        :return: 商品列表
+        """
+        try:
+            html = driver.page_source
+            base_url = driver.current_url
+        except Exception as e:
+            print(f"获取页面源代码时出错: {e}")
+            logging.error(f"获取页面源代码时出错: {e}")
+            return []
+        return self.extract_from_html(html, base_url)
+
+    def extract_from_file(self, filepath: str, base_url: str = "") -> List[Dict[str, Any]]:
+        """
+        从HTML文件提取商品
+        :param filepath: HTML文件路径
+        :param base_url: 用于补全相对链接的基础URL
+        :return: 商品列表
+        """
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                html = f.read()
+        except Exception as e:
+            print(f"读取HTML文件失败: {e}")
+            logging.error(f"读取HTML文件失败 {filepath}: {e}")
+            return []
+        return self.extract_from_html(html, base_url or self.config.DEFAULT_BASE_URL)
+
+    def extract_from_directory(self, directory: str, pattern: str = "*.html") -> Dict[str, List[Dict[str, Any]]]:
+        """
+        批量提取目录下所有HTML文件
+        :param directory: HTML文件目录
+        :param pattern: 文件匹配模式
+        :return: 文件路径到商品列表的映射
+        """
+        results = {}
+        for filepath in sorted(glob.glob(os.path.join(directory, pattern))):
+            results[filepath] = self.extract_from_file(filepath)
+            print(f"{os.path.basename(filepath)}: 提取 {len(results[filepath])} 个商品")
+        return results
+
+    def extract_from_html(self, html: str, base_url: str = "") -> List[Dict[str, Any]]:
+        """
+        从HTML字符串提取商品
+        :param html: 页面HTML
+        :param base_url: 用于补全相对链接的基础URL
+        :return: 商品列表
+        """
+        products = []
+        try:
+            soup = BeautifulSoup(html, self.parser)
+            cards = self._find_cards(soup, site_key(base_url or self.config.DEFAULT_BASE_URL))
+
+            for card in cards[:self.config.EXTRACTION['max_cards']]:
+                raw = self._extract_card_fields(card, base_url)
+                product_info = build_product_record(raw, 'HTML解析')
+                if product_info:
+                    products.append(product_info)
+
+        except Exception as e:
+            print(f"解析HTML提取商品时出错: {e}")
+            logging.error(f"解析HTML提取商品时出错: {e}")
+
+        return products
+
+    def _find_cards(self, soup: BeautifulSoup, site: str = 'www') -> list:
+        """按命中统计排序查找商品卡片，命中第一个选择器后停止"""
+        selector, cards = probe_selectors(list(self._card_selectors),
+                                          lambda selector: self._card_selectors[selector].select(soup),
+                                          site, 'standard', self.selector_stats)
+        if cards:
+            logging.debug(f"HTML解析使用选择器 '{selector}' 找到 {len(cards)} 个商品卡片")
+            return cards
+
+        # 标准选择器都未命中时，退回到商品链接
+        return self._anchor_selector.select(soup)
+
+    def _extract_card_fields(self, card, base_url: str) -> Dict[str, str]:
+        """提取单个卡片的原始字段"""
+        # 退回到商品链接时卡片本身就是<a>，字段选择器只匹配子元素
+        link = self._first_match(card, 'link', lambda el: self._accept_link(el, base_url))
+        if not link and card.name == 'a':
+            link = self._accept_link(card, base_url)
+        title = self._first_match(card, 'title', self._accept_title)
+        if not title and card.name == 'a':
+            title = self._accept_title(card)
+
+        return {
+            'title': title,
+            'price': self._first_match(card, 'price', self._accept_price) or self._price_by_text(card),
+            'shop': self._first_match(card, 'shop', self._accept_shop),
+            'sales': self._first_match(card, 'sales', self._accept_sales),
+            'link': link,
+            'image': self._first_match(card, 'image', lambda el: self._accept_image(el, base_url))
+        }
+
+    def _first_match(self, card, field: str, accept) -> str:
+        """按字段选择器顺序返回第一个通过校验的值"""
+        for _, compiled in self._field_selectors.get(field, []):
+            for element in compiled.select(card):
+                value = accept(element)
+                if value:
+                    return value
+        return ''
+
+    @staticmethod
+    def _text(element) -> str:
+        return element.get_text(' ', strip=True)
+
+    def _accept_title(self, element) -> str:
+        title = (element.get('title') or '').strip() or self._text(element)
+        if len(title) <= 3 or len(title) >= 200:
+            return ''
+        if any(keyword in title.lower() for keyword in self._title_blacklist):
+            return ''
+        return title
+
+    def _accept_price(self, element) -> str:
+        text = self._text(element)
+        return text if text and any(char in text for char in ['￥', '元', '¥', '.']) else ''
+
+    def _accept_shop(self, element) -> str:
+        text = self._text(element)
+        return text if 1 < len(text) < 100 else ''
+
+    def _accept_sales(self, element) -> str:
+        text = self._text(element)
+        return text if text and any(char in text for char in ['人', '笔', '件']) else ''
+
+    @staticmethod
+    def _accept_link(element, base_url: str) -> str:
+        href = element.get('href') or ''
+        return urljoin(base_url, href) if 'offer' in href else ''
+
+    @staticmethod
+    def _accept_image(element, base_url: str) -> str:
+        src = element.get('src') or element.get('data-src') or element.get('data-lazy-src') or ''
+        if any(ext in src for ext in ('jpg', 'jpeg', 'png')):
+            return urljoin(base_url, src)
+        return ''
+
+    def _price_by_text(self, card) -> str:
+        """通过价格符号文本定位价格（对应XPath contains(text(), '￥')）"""
+        element = card.find(lambda tag: any(
+            marker in text for text in tag.find_all(string=True, recursive=False) for marker in self.PRICE_MARKERS
+        ))
+        return self._text(element) if element else ''
@@ -0,0 +1,281 @@
+"""
+网络响应捕获提取模块
+
+搜索结果页的商品卡片由XHR/JSONP接口数据渲染。本模块从CDP性能日志中找出商品列表接口的响应，
+页面加载和滚动完成后通过Network.getResponseBody读取响应内容，直接转换为标准商品结构，
+同时保留商品ID、数值价格和数值销量，不需要逐个遍历DOM元素
+"""
+
+import re
+import json
+import base64
+import logging
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.config import CrawlerConfig
+from ..drivers.cdp_events import get_event_reader
+from ..utils.dedup_index import dedup_batch
+from ..utils.helpers import parse_number
+from .product_fields import build_product_record
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+_JSONP_PATTERN = re.compile(r'^[\w$.]+\s*\((.*)\)\s*;?\s*$', re.S)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# 接口数据中查找商品列表的最大嵌套深度
+_MAX_DEPTH = 8
+
+_captures = weakref.WeakKeyDictionary()
+_captures_lock = threading.Lock()
+
+
+def get_network_capture(driver: 'webdriver.Chrome', config: CrawlerConfig = None) -> Optional['NetworkCapture']:
+    """
+    获取WebDriver共享的网络响应捕获器（同一浏览器只订阅一次CDP事件）
+    :param driver: WebDriver实例
+    :param config: 爬虫配置对象
+    :return: 网络响应捕获器，未启用时返回None
+    """
+    config = config or CrawlerConfig()
+    if not config.NETWORK_CAPTURE['enabled']:
+        return None
+    with _captures_lock:
+        capture = _captures.get(driver)
+        if capture is None:
+            capture = NetworkCapture(driver, config)
+            _captures[driver] = capture
+        return capture
+
+
+def parse_payload(text: str) -> Any:
+    """
+    解析JSON或JSONP响应内容
+    :param text: 响应内容
+    :return: 解析后的数据，无法解析时返回None
+    """
+    text = (text or '').strip()
+    if not text:
+        return None
+    if text[0] not in '{[':
+        match = _JSONP_PATTERN.match(text)
+        if not match:
+            return None
+        text = match.group(1)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+class OfferPayloadParser:
+    """商品列表接口数据解析器"""
+
+    def __init__(self, config: CrawlerConfig = None):
+        """
+        初始化接口数据解析器
+        :param config: 爬虫配置对象
+        """
+        self.config = config or CrawlerConfig()
+        self.field_paths = self.config.NETWORK_CAPTURE['field_paths']
+
+    def parse_text(self, text: str) -> List[Dict[str, Any]]:
+        """
+        解析一个接口响应
+        :param text: 响应内容（JSON或JSONP）
+        :return: 商品列表
+        """
+        data = parse_payload(text)
+        if data is None:
+            return []
+
+        products = []
+        for items in self._find_offer_lists(data, 0):
+            for item in items:
+                product = self.to_product(item)
+                if product:
+                    products.append(product)
+        return products
+
+    def _find_offer_lists(self, data: Any, depth: int) -> List[List[Dict[str, Any]]]:
+        """递归查找看起来像商品列表的数组（元素为带商品ID或链接、且有标题的对象）"""
+        if depth > _MAX_DEPTH:
+            return []
+
+        if isinstance(data, list):
+            dicts = [item for item in data if isinstance(item, dict)]
+            if dicts and self._looks_like_offer(dicts[0]):
+                return [dicts]
+            found = []
+            for item in dicts:
+                found.extend(self._find_offer_lists(item, depth + 1))
+            return found
+
+        if isinstance(data, dict):
+            found = []
+            for value in data.values():
+                if isinstance(value, (dict, list)):
+                    found.extend(self._find_offer_lists(value, depth + 1))
+            return found
+
+        return []
+
+    def _looks_like_offer(self, item: Dict[str, Any]) -> bool:
+        return bool(self._field(item, 'title') and (self._field(item, 'offer_id') or self._field(item, 'link')))
+
+    def _field(self, item: Dict[str, Any], field: str) -> Any:
+        """按候选路径取字段的第一个非空值"""
+        for path in self.field_paths.get(field, []):
+            value = item
+            for key in path.split('.'):
+                value = value.get(key) if isinstance(value, dict) else None
+                if value is None:
+                    break
+            if value not in (None, '', [], {}) and not isinstance(value, (dict, list)):
+                return value
+        return None
+
+    def to_product(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        将接口中的单个商品对象转换为标准商品记录
+        :param item: 商品对象
+        :return: 商品信息字典（额外包含offer_id、price_value、sales_count），信息不完整时返回None
+        """
+        offer_id = str(self._field(item, 'offer_id') or '')
+        link = str(self._field(item, 'link') or '')
+        if link.startswith('//'):
+            link = 'https:' + link
+        if not link and offer_id.isdigit():
+            link = f"https://detail.1688.com/offer/{offer_id}.html"
+
+        image = str(self._field(item, 'image') or '')
+        if image.startswith('//'):
+            image = 'https:' + image
+
+        price = self._field(item, 'price')
+        sales = self._field(item, 'sales')
+        raw = {
+            'title': _TAG_PATTERN.sub('', str(self._field(item, 'title') or '')),
+            'price': str(price) if price is not None else '',
+            'shop': str(self._field(item, 'shop') or ''),
+            'sales': str(sales) if sales is not None else '',
+            'link': link,
+            'image': image
+        }
+        product = build_product_record(raw, 'network')
+        if not product:
+            return None
+
+        sales_count = parse_number(sales)
+        product.update({
+            'offer_id': offer_id,
+            'price_value': parse_number(price),
+            'sales_count': int(sales_count) if sales_count is not None else None
+        })
+        return product
+
+
+class NetworkCapture:
+    """搜索结果接口响应捕获器"""
+
+    # 等待读取响应内容的请求数上限
+    MAX_PENDING = 200
+
+    def __init__(self, driver: 'webdriver.Chrome', config: CrawlerConfig = None):
+        """
+        初始化网络响应捕获器
+        :param driver: WebDriver实例（需在创建时启用performance日志）
+        :param config: 爬虫配置对象
+        """
+        self.driver = driver
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.NETWORK_CAPTURE
+        self.parser = OfferPayloadParser(self.config)
+        self.stats = {'responses': 0, 'products': 0, 'errors': 0}
+
+        self._matched: Dict[str, str] = {}      # requestId -> URL（已收到响应头）
+        self._finished: List[str] = []          # 已加载完成、等待读取内容的requestId
+        self._products: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+        reader = get_event_reader(driver)
+        reader.subscribe('Network.responseReceived', self._on_response)
+        reader.subscribe('Network.loadingFinished', self._on_finished)
+
+    def _on_response(self, params: Dict[str, Any]):
+        response = params.get('response', {})
+        url = response.get('url', '')
+        mime_type = response.get('mimeType', '').lower()
+        if not any(pattern.lower() in url.lower() for pattern in self.settings['url_patterns']):
+            return
+        if not any(mime in mime_type for mime in self.settings['mime_types']):
+            return
+        with self._lock:
+            if len(self._matched) < self.MAX_PENDING:
+                self._matched[params.get('requestId')] = url
+
+    def _on_finished(self, params: Dict[str, Any]):
+        request_id = params.get('requestId')
+        with self._lock:
+            if request_id not in self._matched:
+                return
+            if (params.get('encodedDataLength') or 0) > self.settings['max_body_bytes']:
+                self._matched.pop(request_id, None)
+                return
+            self._finished.append(request_id)
+
+    def reset(self):
+        """导航到新页面前调用：丢弃上一页的捕获结果（旧页面的响应内容导航后无法再读取）"""
+        get_event_reader(self.driver).poll()
+        with self._lock:
+            self._matched.clear()
+            self._finished.clear()
+            self._products = []
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """
+        读取当前页面已完成的商品列表接口响应（应在页面加载和滚动完成后、导航离开前调用）
+        :return: 当前页面到目前为止捕获的商品（已在批内去重）
+        """
+        get_event_reader(self.driver).poll()
+        with self._lock:
+            pending = [(request_id, self._matched.pop(request_id, '')) for request_id in self._finished]
+            self._finished = []
+
+        for request_id, url in pending:
+            body = self._get_body(request_id)
+            if body is None:
+                continue
+            products = self.parser.parse_text(body)
+            self.stats['responses'] += 1
+            self.stats['products'] += len(products)
+            if products:
+                logging.info(f"从接口响应捕获 {len(products)} 个商品: {url}")
+                with self._lock:
+                    self._products.extend(products)
+
+        with self._lock:
+            self._products = dedup_batch(self._products)
+            return list(self._products)
+
+    def _get_body(self, request_id: str) -> Optional[str]:
+        """通过CDP读取响应内容"""
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            # 响应内容可能已被浏览器释放
+            self.stats['errors'] += 1
+            logging.debug(f"读取响应内容失败 ({request_id}): {e}")
+            return None
+
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            try:
+                body = base64.b64decode(body).decode('utf-8', errors='replace')
+            except ValueError:
+                return None
+        return body
@@ -15,6 +15,7 @@ from typing import Dict, List, Optional, Tuple
 
 from ..core.config import CrawlerConfig
 from ..utils.helpers import save_page_source
+from ..handlers.page_state import get_page_state_probe
 
 
 class PageAnalyzer:
@@ -28,6 +29,7 @@ class PageAnalyzer:
         """
         self.driver = driver
         self.config = config or CrawlerConfig()
+        self.page_state = get_page_state_probe(driver, self.config)
     
     def analyze_current_page(self) -> Dict[str, any]:
         """
@@ -35,15 +37,17 @@ class PageAnalyzer:
         :return: 页面分析结果字典
         """
         try:
+            # 登录、弹窗、商品数量和加载状态来自同一次脚本调用
+            state = self.page_state.snapshot()
             analysis = {
-                'url': self.driver.current_url,
-                'title': self.driver.title,
+                'url': state.url,
+                'title': state.title,
                 'page_type': self._detect_page_type(),
-                'has_products': self._has_product_elements(),
-                'product_count': self._count_product_elements(),
-                'has_popups': self._has_popup_elements(),
-                'needs_login': self._needs_login(),
-                'page_loaded': self._is_page_loaded(),
+                'has_products': state.has_products,
+                'product_count': state.product_count,
+                'has_popups': state.has_popup,
+                'needs_login': state.is_login_page,
+                'page_loaded': state.is_loaded,
                 'search_keyword': self._extract_search_keyword(),
                 'page_language': self._detect_page_language(),
                 'timestamp': time.time()
@@ -100,94 +104,33 @@ class PageAnalyzer:
     
     def _has_product_elements(self) -> bool:
         """检查页面是否有商品元素"""
-        try:
-            for selector in self.config.PRODUCT_SELECTORS['standard']:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    return True
-            return False
-        except Exception:
-            return False
+        return self._count_product_elements() > 0
     
     def _count_product_elements(self) -> int:
-        """统计页面中的商品元素数量"""
+        """统计页面中的商品元素数量（页面状态快照按命中统计排序探测，第一个命中的选择器即停止）"""
         try:
-            total_count = 0
-            for selector in self.config.PRODUCT_SELECTORS['standard']:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    total_count = max(total_count, len(elements))
-            return total_count
+            return self.page_state.snapshot().product_count
         except Exception:
             return 0
     
     def _has_popup_elements(self) -> bool:
         """检查页面是否有弹窗元素"""
         try:
-            for selector in self.config.POPUP_SELECTORS:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                visible_elements = [el for el in elements if el.is_displayed()]
-                if visible_elements:
-                    return True
-            return False
+            return self.page_state.snapshot().has_popup
         except Exception:
             return False
     
     def _needs_login(self) -> bool:
         """检查页面是否需要登录"""
         try:
-            url = self.driver.current_url.lower()
-            title = self.driver.title.lower()
-            
-            # 检查URL
-            for keyword in self.config.LOGIN_INDICATORS['url_keywords']:
-                if keyword in url:
-                    return True
-            
-            # 检查标题
-            for keyword in self.config.LOGIN_INDICATORS['title_keywords']:
-                if keyword in title:
-                    return True
-            
-            # 检查页面元素
-            login_selectors = [
-                "input[type='password']",
-                "div.login-dialog-wrap",
-                "form[action*='login']",
-                "div[class*='login']",
-                "button[class*='login']"
-            ]
-            
-            login_elements_found = 0
-            for selector in login_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    visible_elements = [el for el in elements if el.is_displayed()]
-                    if visible_elements:
-                        login_elements_found += 1
-                except:
-                    continue
-            
-            return login_elements_found >= 2
-            
+            return self.page_state.snapshot().is_login_page
         except Exception:
             return False
     
     def _is_page_loaded(self) -> bool:
         """检查页面是否完全加载"""
         try:
-            # 检查页面加载状态
-            ready_state = self.driver.execute_script("return document.readyState")
-            if ready_state != "complete":
-                return False
-            
-            # 检查是否有基本的页面结构
-            body_elements = self.driver.find_elements(By.TAG_NAME, "body")
-            if not body_elements:
-                return False
-            
-            return True
-            
+            return self.page_state.snapshot().is_loaded
         except Exception:
             return False
     
@@ -319,7 +262,8 @@ class PageAnalyzer:
                     )
                 )
                 validation_result['product_list_check'] = True
-                validation_result['product_count'] = self._count_product_elements()
+                # 等待期间页面已变化，重新采集快照
+                validation_result['product_count'] = self.page_state.snapshot(refresh=True).product_count
                 print("✅ 商品列表容器验证通过")
                 
             except TimeoutException:
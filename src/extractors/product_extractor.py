@@ -4,8 +4,6 @@
 负责从搜索结果页面提取商品信息，支持多种提取策略
 """
 
-import re
-import time
 import logging
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -13,11 +11,135 @@ from typing import List, Dict, Optional, Any
 
 from ..core.config import CrawlerConfig
 from ..utils.helpers import clean_text
+from .product_fields import format_price_text, build_product_record
+from .html_extractor import HTMLProductExtractor
+from ..utils.dedup_index import dedup_batch
+from ..utils.profiler import profiled
+from ..utils.selector_stats import current_site, get_selector_stats, probe_selectors
+from ..handlers.page_readiness import PageReadiness
+
+
+# 单次批量提取脚本：一次execute_script遍历全部商品卡片并返回字段
+SINGLE_PASS_EXTRACTION_SCRIPT = """
+var cardSelectors = arguments[0] || [];
+var cardXpaths = arguments[1] || [];
+var fields = arguments[2] || {};
+var maxCards = arguments[3] || 200;
+var blacklist = arguments[4] || [];
+
+function textOf(el) {
+    return ((el.innerText || el.textContent || '') + '').trim();
+}
+
+function firstMatch(card, selectors, accept) {
+    selectors = selectors || [];
+    for (var i = 0; i < selectors.length; i++) {
+        var nodes;
+        try { nodes = card.querySelectorAll(selectors[i]); } catch (e) { continue; }
+        for (var j = 0; j < nodes.length; j++) {
+            var value = accept(nodes[j]);
+            if (value) { return value; }
+        }
+    }
+    return '';
+}
+
+function acceptTitle(el) {
+    var t = ((el.getAttribute('title') || '') + '').trim() || textOf(el);
+    if (t.length <= 3 || t.length >= 200) { return ''; }
+    var lower = t.toLowerCase();
+    for (var i = 0; i < blacklist.length; i++) {
+        if (lower.indexOf(blacklist[i]) !== -1) { return ''; }
+    }
+    return t;
+}
+
+function acceptPrice(el) {
+    var t = textOf(el);
+    return (t && /[￥元¥.]/.test(t)) ? t : '';
+}
+
+function acceptShop(el) {
+    var t = textOf(el);
+    return (t.length > 1 && t.length < 100) ? t : '';
+}
+
+function acceptSales(el) {
+    var t = textOf(el);
+    return (t && /[人笔件]/.test(t)) ? t : '';
+}
+
+function acceptLink(el) {
+    var href = el.href || el.getAttribute('href') || '';
+    return href.indexOf('offer') !== -1 ? href : '';
+}
+
+function acceptImage(el) {
+    var src = el.getAttribute('src') || el.getAttribute('data-src') || el.getAttribute('data-lazy-src') || '';
+    return /jpg|jpeg|png/.test(src) ? src : '';
+}
+
+function priceByText(card) {
+    try {
+        var node = document.evaluate(
+            ".//*[contains(text(), '￥') or contains(text(), '元') or contains(text(), '¥')]",
+            card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return node ? textOf(node) : '';
+    } catch (e) {
+        return '';
+    }
+}
+
+var cards = [];
+var matched = '';
+for (var i = 0; i < cardSelectors.length && !cards.length; i++) {
+    try {
+        var found = document.querySelectorAll(cardSelectors[i]);
+        if (found.length) { cards = Array.prototype.slice.call(found); matched = cardSelectors[i]; }
+    } catch (e) {}
+}
+for (var k = 0; k < cardXpaths.length && !cards.length; k++) {
+    try {
+        var snapshot = document.evaluate(cardXpaths[k], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var n = 0; n < snapshot.snapshotLength; n++) { cards.push(snapshot.snapshotItem(n)); }
+        if (cards.length) { matched = cardXpaths[k]; }
+    } catch (e) {}
+}
+if (!cards.length) {
+    cards = Array.prototype.slice.call(document.querySelectorAll('a[href*="offer"]'));
+    matched = cards.length ? 'a[href*="offer"]' : '';
+}
+
+var results = [];
+for (var c = 0; c < cards.length && results.length < maxCards; c++) {
+    var card = cards[c];
+    var link = firstMatch(card, fields.link, acceptLink);
+    if (!link && card.tagName === 'A') { link = acceptLink(card); }
+    results.push({
+        title: firstMatch(card, fields.title, acceptTitle),
+        price: firstMatch(card, fields.price, acceptPrice) || priceByText(card),
+        shop: firstMatch(card, fields.shop, acceptShop),
+        sales: firstMatch(card, fields.sales, acceptSales),
+        link: link,
+        image: firstMatch(card, fields.image, acceptImage)
+    });
+}
+
+return {selector: matched, total: cards.length, cards: results};
+"""
 
 
 class ProductExtractor:
     """商品信息提取器"""
 
+    # 方式4使用的宽泛选择器
+    BROAD_SELECTORS = [
+        "div[class*='offer']",
+        "div[class*='product']",
+        "div[class*='item']",
+        "a[href*='offer']"
+    ]
+
     def __init__(self, driver: webdriver.Chrome, config: CrawlerConfig = None):
         """
         初始化商品信息提取器
@@ -26,7 +148,23 @@ class ProductExtractor:
         """
         self.driver = driver
         self.config = config or CrawlerConfig()
-
+        self.html_extractor = HTMLProductExtractor(self.config)
+        self.readiness = PageReadiness(driver, self.config)
+        self.selector_stats = get_selector_stats(self.config)
+
+    @property
+    def site(self) -> str:
+        """当前页面所在的站点标识，用于按站点统计选择器命中率（每次读取都会查询浏览器当前URL）"""
+        return current_site(self.driver, self.config.DEFAULT_BASE_URL)
+
+    def _ranked_selectors(self, kind: str, site: str) -> List[str]:
+        """按命中统计排序的商品卡片选择器（kind为 'standard' 或 'xpath'）"""
+        selectors = self.config.PRODUCT_SELECTORS[kind]
+        if not self.selector_stats:
+            return list(selectors)
+        return self.selector_stats.rank(site, selectors, kind)
+
+    @profiled('extract')
     def extract_products_from_search_page(self, keyword: str) -> List[Dict[str, Any]]:
         """
         从搜索结果页面提取商品信息
@@ -36,9 +174,95 @@ class ProductExtractor:
         try:
             print("开始从搜索结果页面提取商品信息...")
 
-            # 等待页面加载
-            time.sleep(2)
+            # 等待商品卡片数量稳定
+            self.readiness.wait_for_card_count_stable()
+
+            # 离线解析后端：获取一次page_source后在进程内提取
+            if self.config.EXTRACTION.get('backend') == 'html':
+                print("\n===== 离线解析页面源代码提取商品 =====")
+                products = self.html_extractor.extract_from_driver(self.driver)
+                if products:
+                    unique_products = self._remove_duplicates(products)
+                    print(f"离线解析找到 {len(products)} 个商品，去重后 {len(unique_products)} 个")
+                    return unique_products
+                print("离线解析未找到商品，回退到浏览器内提取...")
+
+            # 优先使用单次批量提取
+            if self.config.EXTRACTION.get('single_pass', True):
+                print("\n===== 单次批量提取商品 =====")
+                products = self.extract_products_single_pass()
+                if products:
+                    unique_products = self._remove_duplicates(products)
+                    print(f"批量提取找到 {len(products)} 个商品，去重后 {len(unique_products)} 个")
+                    return unique_products
+                print("批量提取未找到商品，回退到逐个方式提取...")
+
+            return self._extract_products_legacy()
+
+        except Exception as e:
+            print(f"从搜索结果页面提取商品信息时出错: {e}")
+            logging.error(f"从搜索结果页面提取商品信息时出错: {e}")
+            return []
+
+    def extract_products_single_pass(self) -> List[Dict[str, Any]]:
+        """
+        单次批量提取：一次execute_script遍历DOM，返回所有商品卡片的字段
+        卡片与字段选择器均来自配置中的PRODUCT_SELECTORS和PRODUCT_FIELD_SELECTORS
+        :return: 商品列表
+        """
+        products = []
+        try:
+            site = self.site
+            css_selectors = self._ranked_selectors('standard', site)
+            xpath_selectors = self._ranked_selectors('xpath', site)
+            result = self.driver.execute_script(
+                SINGLE_PASS_EXTRACTION_SCRIPT,
+                css_selectors,
+                xpath_selectors,
+                self.config.PRODUCT_FIELD_SELECTORS,
+                self.config.EXTRACTION['max_cards'],
+                self.config.EXTRACTION['title_blacklist']
+            ) or {}
+
+            cards = result.get('cards') or []
+            if result.get('selector'):
+                print(f"使用选择器 '{result['selector']}' 找到 {result.get('total', 0)} 个商品卡片")
+                self._record_single_pass(site, css_selectors, xpath_selectors, result['selector'],
+                                         result.get('total', 0))
+
+            for raw in cards:
+                product_info = build_product_record(raw, '批量提取')
+                if product_info:
+                    products.append(product_info)
+
+        except Exception as e:
+            print(f"批量提取商品时出错: {e}")
+            logging.error(f"批量提取商品时出错: {e}")
+
+        return products
+
+    def _record_single_pass(self, site: str, css_selectors: List[str], xpath_selectors: List[str], matched: str,
+                            total: int):
+        """根据脚本命中的选择器记录统计：脚本按顺序尝试，命中之前的选择器都未命中"""
+        if not self.selector_stats:
+            return
+        if matched in css_selectors:
+            self.selector_stats.record_ordered_hit(site, css_selectors, matched, total, 'standard')
+            return
+
+        # 页面有商品但CSS选择器全部未命中
+        self.selector_stats.record_probe(site, css_selectors, None, 0, 'standard')
+        self.selector_stats.record_ordered_hit(site, xpath_selectors, matched, total, 'xpath')
 
+    def _find_elements_by_css(self, selector: str) -> list:
+        return self.driver.find_elements(By.CSS_SELECTOR, selector)
+
+    def _extract_products_legacy(self) -> List[Dict[str, Any]]:
+        """
+        逐个方式提取：依次运行方式1-5并合并去重
+        :return: 商品列表
+        """
+        try:
             # 提取商品信息
             print("开始提取商品信息...")
             all_found_products = []
@@ -81,24 +305,24 @@ class ProductExtractor:
             return unique_products
 
         except Exception as e:
-            print(f"从搜索结果页面提取商品信息时出错: {e}")
-            logging.error(f"从搜索结果页面提取商品信息时出错: {e}")
+            print(f"逐个方式提取商品信息时出错: {e}")
+            logging.error(f"逐个方式提取商品信息时出错: {e}")
             return []
 
     def extract_products_method1(self) -> List[Dict[str, Any]]:
         """方式1: 使用标准CSS选择器查找商品"""
         products = []
         try:
-            # 使用配置中的标准选择器
-            for selector in self.config.PRODUCT_SELECTORS['standard']:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    print(f"使用选择器 '{selector}' 找到 {len(elements)} 个商品")
-                    for element in elements[:10]:  # 限制处理数量
-                        product_info = self.extract_product_details_from_element(element)
-                        if product_info:
-                            products.append(product_info)
-                    break  # 找到商品后就停止尝试其他选择器
+            # 使用配置中的标准选择器，按命中统计排序，找到商品后就停止尝试其他选择器
+            selector, elements = probe_selectors(self.config.PRODUCT_SELECTORS['standard'],
+                                                 self._find_elements_by_css, self.site, 'standard',
+                                                 self.selector_stats)
+            if elements:
+                print(f"使用选择器 '{selector}' 找到 {len(elements)} 个商品")
+                for element in elements[:10]:  # 限制处理数量
+                    product_info = self.extract_product_details_from_element(element)
+                    if product_info:
+                        products.append(product_info)
 
             # 如果标准选择器都没找到商品，尝试通过价格文本定位
             if not products:
@@ -131,15 +355,15 @@ class ProductExtractor:
         products = []
         try:
             # 使用配置中的XPath选择器
-            for xpath in self.config.PRODUCT_SELECTORS['xpath']:
-                elements = self.driver.find_elements(By.XPATH, xpath)
-                if elements:
-                    print(f"使用XPath '{xpath}' 找到 {len(elements)} 个商品")
-                    for element in elements[:10]:  # 只处理前10个
-                        product_info = self.extract_product_details_from_element(element)
-                        if product_info:
-                            products.append(product_info)
-                    break
+            xpath, elements = probe_selectors(self.config.PRODUCT_SELECTORS['xpath'],
+                                              lambda selector: self.driver.find_elements(By.XPATH, selector),
+                                              self.site, 'xpath', self.selector_stats)
+            if elements:
+                print(f"使用XPath '{xpath}' 找到 {len(elements)} 个商品")
+                for element in elements[:10]:  # 只处理前10个
+                    product_info = self.extract_product_details_from_element(element)
+                    if product_info:
+                        products.append(product_info)
 
         except Exception as e:
             print(f"方式2提取商品时出错: {e}")
@@ -200,15 +424,15 @@ class ProductExtractor:
         """方式4: 使用更宽泛的选择器查找商品"""
         products = []
         try:
-            # 更宽泛的选择器
-            selectors = [
-                "div[class*='offer']",
-                "div[class*='product']",
-                "div[class*='item']",
-                "a[href*='offer']"
-            ]
+            # 更宽泛的选择器，按命中统计排序；以能提取到商品作为命中
+            selectors = self.BROAD_SELECTORS
+            site = self.site
+            if self.selector_stats:
+                selectors = self.selector_stats.rank(site, selectors, 'broad')
 
+            tried = []
             for selector in selectors:
+                tried.append(selector)
                 elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 if elements:
                     print(f"使用宽泛选择器 '{selector}' 找到 {len(elements)} 个潜在商品")
@@ -220,6 +444,8 @@ class ProductExtractor:
                             if product_info:
                                 products.append(product_info)
                     if products:
+                        if self.selector_stats:
+                            self.selector_stats.record_probe(site, tried, selector, len(products), 'broad')
                         break
 
         except Exception as e:
@@ -438,53 +664,21 @@ class ProductExtractor:
 
     def _format_price(self, price_text: str) -> str:
         """格式化价格文本"""
-        if not price_text:
-            return "价格面议"
-
-        try:
-            # 提取数字和价格符号
-            price_match = re.search(r'[￥¥]?[\d,]+\.?\d*', price_text)
-            if price_match:
-                return price_match.group()
-            else:
-                return clean_text(price_text) if price_text.strip() else "价格面议"
-        except:
-            return "价格面议"
+        return format_price_text(price_text)
 
     def _remove_duplicates(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """去除重复的商品"""
-        seen_titles = set()
-        seen_links = set()
-        unique_products = []
-
-        for product in products:
-            title = product.get('title', '').strip()
-            link = product.get('link', '').strip()
-
-            # 基于标题和链接去重
-            title_key = title.lower() if title else ''
-            link_key = link if link else ''
-
-            if title_key and title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_products.append(product)
-            elif link_key and link_key not in seen_links:
-                seen_links.add(link_key)
-                unique_products.append(product)
-
-        return unique_products
+        """去除重复的商品（按商品ID，无法解析时按标题+店铺）"""
+        return dedup_batch(products)
 
     def find_products_elements(self) -> List:
         """查找商品元素"""
-        # 尝试多种选择器定位商品元素
-        for selector in self.config.PRODUCT_SELECTORS['standard']:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    print(f"使用选择器 '{selector}' 找到 {len(elements)} 个商品元素")
-                    return elements
-            except Exception as e:
-                print(f"使用选择器 '{selector}' 时出错: {e}")
+        # 按命中统计排序尝试选择器定位商品元素
+        selector, elements = probe_selectors(self.config.PRODUCT_SELECTORS['standard'],
+                                             self._find_elements_by_css, self.site, 'standard',
+                                             self.selector_stats)
+        if elements:
+            print(f"使用选择器 '{selector}' 找到 {len(elements)} 个商品元素")
+            return elements
 
         print("未找到商品元素，请检查页面结构或选择器")
         return []
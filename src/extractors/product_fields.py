@@ -0,0 +1,66 @@
+"""
+商品字段规范化模块
+
+将各种提取方式得到的原始字段统一转换为标准的商品数据结构
+"""
+
+import re
+from typing import Dict, Any, Optional
+
+from ..utils.helpers import clean_text
+
+
+# 标准商品字段
+PRODUCT_FIELDS = ['title', 'price', 'shop', 'sales', 'link', 'image']
+
+_PRICE_PATTERN = re.compile(r'[￥¥]?[\d,]+\.?\d*')
+
+
+def format_price_text(price_text: str) -> str:
+    """
+    格式化价格文本
+    :param price_text: 原始价格文本
+    :return: 格式化后的价格
+    """
+    if not price_text:
+        return "价格面议"
+
+    try:
+        # 提取数字和价格符号
+        price_match = _PRICE_PATTERN.search(price_text)
+        if price_match:
+            return price_match.group()
+        else:
+            return clean_text(price_text) if price_text.strip() else "价格面议"
+    except Exception:
+        return "价格面议"
+
+
+def build_product_record(raw: Dict[str, Any], source: str) -> Optional[Dict[str, Any]]:
+    """
+    将原始字段字典转换为标准商品记录
+    :param raw: 原始字段（title/price/shop/sales/link/image）
+    :param source: 数据来源说明
+    :return: 商品信息字典，如果信息不完整则返回None
+    """
+    title = clean_text(raw.get('title') or '')
+    price_text = (raw.get('price') or '').strip()
+    shop = clean_text(raw.get('shop') or '')
+    sales = clean_text(raw.get('sales') or '')
+    link = (raw.get('link') or '').strip()
+    image = (raw.get('image') or '').strip()
+
+    product_info = {
+        'title': title,
+        'price': format_price_text(price_text) if price_text else '',
+        'shop': shop,
+        'sales': sales or '0人付款',
+        'link': link,
+        'image': image,
+        'source': source
+    }
+
+    # 验证提取的信息质量
+    if product_info['title'] and (product_info['price'] or product_info['shop'] or product_info['link']):
+        return product_info
+    return None
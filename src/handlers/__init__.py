@@ -2,8 +2,31 @@
 处理器模块 - 各种专门的处理器
 """
 
-from .popup_handler import PopupHandler
-from .login_handler import LoginHandler
-from .page_handler import PageHandler
+from typing import TYPE_CHECKING
 
-__all__ = ['PopupHandler', 'LoginHandler', 'PageHandler']
+from ..utils.lazy_imports import lazy_exports
+
+# 导出名称 -> 子模块，首次访问时才导入，避免导入包时加载selenium、pandas等依赖
+_EXPORTS = {
+    'PopupHandler': '.popup_handler',
+    'LoginHandler': '.login_handler',
+    'PageHandler': '.page_handler',
+    'PageReadiness': '.page_readiness',
+    'PageState': '.page_state',
+    'PageStateProbe': '.page_state',
+    'IframeTriage': '.iframe_triage',
+    'FrameInfo': '.iframe_triage'
+}
+
+__all__ = ['PopupHandler', 'LoginHandler', 'PageHandler', 'PageReadiness', 'PageState', 'PageStateProbe',
+           'IframeTriage', 'FrameInfo']
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .popup_handler import PopupHandler
+    from .login_handler import LoginHandler
+    from .page_handler import PageHandler
+    from .page_readiness import PageReadiness
+    from .page_state import PageState, PageStateProbe
+    from .iframe_triage import IframeTriage, FrameInfo
@@ -0,0 +1,218 @@
+"""
+iframe分诊模块
+
+用一次注入脚本收集页面上所有iframe的src、尺寸、可见性、定位方式和z-index，
+只把可能是浮层弹窗的iframe交给弹窗检测/关闭逻辑切换进去，跳过统计、广告等无关iframe。
+按iframe的src（去掉查询参数）记录进入后的结果，多次进入都没有弹窗的src在后续页面中直接跳过
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from urllib.parse import urlparse
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from typing import Dict, List, Optional, Sequence
+
+from ..core.config import CrawlerConfig
+
+
+FRAME_TRIAGE_SCRIPT = """
+var frames = document.getElementsByTagName('iframe');
+var viewW = window.innerWidth || document.documentElement.clientWidth;
+var viewH = window.innerHeight || document.documentElement.clientHeight;
+var result = [];
+for (var i = 0; i < frames.length; i++) {
+    var frame = frames[i];
+    var rect = frame.getBoundingClientRect();
+    var visible = frame.getClientRects().length > 0;
+    var zIndex = 0;
+    var overlay = false;
+    // 沿祖先链查找定位方式和最大z-index（浮层通常由外层容器定位）
+    for (var el = frame; el && el.nodeType === 1; el = el.parentElement) {
+        var style = window.getComputedStyle(el);
+        if (style.display === 'none' || style.visibility === 'hidden' || parseFloat(style.opacity || '1') === 0) {
+            visible = false;
+            break;
+        }
+        if (style.position === 'fixed' || style.position === 'absolute' || style.position === 'sticky') {
+            overlay = true;
+        }
+        var z = parseInt(style.zIndex, 10);
+        if (!isNaN(z) && z > zIndex) { zIndex = z; }
+    }
+    var width = Math.max(0, Math.min(rect.right, viewW) - Math.max(rect.left, 0));
+    var height = Math.max(0, Math.min(rect.bottom, viewH) - Math.max(rect.top, 0));
+    var sameOrigin = false;
+    try { sameOrigin = !!frame.contentDocument; } catch (e) {}
+    result.push({
+        index: i,
+        src: frame.src || frame.getAttribute('src') || '',
+        id: frame.id || '',
+        className: typeof frame.className === 'string' ? frame.className : '',
+        width: Math.round(rect.width),
+        height: Math.round(rect.height),
+        visible: visible && rect.width > 0 && rect.height > 0,
+        coverage: viewW && viewH ? (width * height) / (viewW * viewH) : 0,
+        zIndex: zIndex,
+        overlay: overlay,
+        sameOrigin: sameOrigin
+    });
+}
+return result;
+"""
+
+
+@dataclass
+class FrameInfo:
+    """单个iframe的分诊结果"""
+
+    index: int
+    src: str
+    id: str = ''
+    class_name: str = ''
+    width: int = 0
+    height: int = 0
+    visible: bool = False
+    coverage: float = 0.0
+    z_index: int = 0
+    overlay: bool = False
+    same_origin: bool = False
+    verdict: str = 'skip'             # candidate（需要进入检查）/skip
+    reason: str = ''
+
+    @property
+    def is_candidate(self) -> bool:
+        return self.verdict == 'candidate'
+
+    @property
+    def cache_key(self) -> str:
+        """按src（去掉查询参数和片段）缓存，没有src的iframe不缓存"""
+        parsed = urlparse(self.src)
+        if not parsed.netloc:
+            return ''
+        return f"{parsed.netloc}{parsed.path}"
+
+
+class IframeTriage:
+    """iframe分诊器"""
+
+    # 按src记录的进入结果，进程内所有页面共享
+    _history: Dict[str, Dict[str, int]] = {}
+    _history_lock = threading.Lock()
+
+    def __init__(self, driver: webdriver.Chrome, config: CrawlerConfig = None):
+        """
+        初始化iframe分诊器
+        :param driver: WebDriver实例
+        :param config: 爬虫配置对象
+        """
+        self.driver = driver
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.IFRAME_TRIAGE
+
+    def triage(self) -> List[FrameInfo]:
+        """
+        用一次脚本调用收集并分类当前页面的所有iframe
+        :return: iframe分诊结果列表（序号与find_elements(By.TAG_NAME, 'iframe')一致）
+        """
+        try:
+            raw_frames = self.driver.execute_script(FRAME_TRIAGE_SCRIPT) or []
+        except Exception as e:
+            logging.error(f"iframe分诊脚本执行失败: {e}")
+            return []
+
+        frames = []
+        for raw in raw_frames:
+            frame = FrameInfo(
+                index=raw.get('index', len(frames)), src=raw.get('src', ''), id=raw.get('id', ''),
+                class_name=raw.get('className', ''), width=raw.get('width', 0), height=raw.get('height', 0),
+                visible=bool(raw.get('visible')), coverage=float(raw.get('coverage') or 0),
+                z_index=int(raw.get('zIndex') or 0), overlay=bool(raw.get('overlay')),
+                same_origin=bool(raw.get('sameOrigin'))
+            )
+            frame.verdict, frame.reason = self._classify(frame)
+            frames.append(frame)
+        return frames
+
+    def candidates(self, frame_indices: Optional[Sequence[int]] = None, silent: bool = True) -> List[FrameInfo]:
+        """
+        获取需要进入检查的iframe
+        :param frame_indices: 只在这些序号中挑选，为None时考虑全部iframe
+        :param silent: 是否不打印分诊结果
+        :return: 候选iframe列表（未启用分诊时返回全部）
+        """
+        if not self.settings['enabled']:
+            try:
+                count = len(self.driver.find_elements(By.TAG_NAME, 'iframe'))
+            except Exception:
+                return []
+            indices = range(count) if frame_indices is None else [i for i in frame_indices if i < count]
+            return [FrameInfo(index=i, src='', verdict='candidate', reason='未启用分诊') for i in indices]
+
+        frames = self.triage()
+        allowed = set(frame_indices) if frame_indices is not None else None
+        candidates = [frame for frame in frames
+                      if frame.is_candidate and (allowed is None or frame.index in allowed)]
+        if not silent:
+            print(f"iframe分诊: 共 {len(frames)} 个，需要检查 {len(candidates)} 个")
+            for frame in candidates:
+                print(f"  候选iframe {frame.index + 1}: {frame.reason}, src='{frame.src[:60]}'")
+        return candidates
+
+    def _classify(self, frame: FrameInfo) -> tuple:
+        """
+        分类单个iframe
+        :return: (verdict, reason)
+        """
+        src = frame.src.lower()
+        if any(pattern in src for pattern in self.settings['skip_src_patterns']):
+            return 'skip', 'src匹配跳过列表'
+        if not frame.visible:
+            return 'skip', '不可见'
+        if frame.width < self.settings['min_size'] or frame.height < self.settings['min_size']:
+            return 'skip', f"尺寸过小 {frame.width}x{frame.height}"
+
+        by_src = any(pattern in src for pattern in self.settings['candidate_src_patterns'])
+        if not by_src and self._given_up(frame.cache_key):
+            return 'skip', '多次进入都没有弹窗'
+
+        if by_src:
+            return 'candidate', 'src匹配弹窗特征'
+        if frame.overlay and frame.z_index >= self.settings['min_z_index']:
+            return 'candidate', f"浮层 z-index={frame.z_index}"
+        if frame.coverage >= self.settings['overlay_ratio']:
+            return 'candidate', f"覆盖视口 {frame.coverage:.0%}"
+        return 'skip', '普通内嵌iframe'
+
+    def _given_up(self, key: str) -> bool:
+        """该src多次进入都没有发现弹窗（每隔recheck_interval次分诊重新检查一次）"""
+        if not key:
+            return False
+        with self._history_lock:
+            record = self._history.get(key)
+            if not record or record['hits'] or record['visits'] < self.settings['give_up_after']:
+                return False
+            record['skipped'] = record.get('skipped', 0) + 1
+            return record['skipped'] % self.settings['recheck_interval'] != 0
+
+    def record_result(self, frame: FrameInfo, found: bool):
+        """
+        记录进入iframe后的检查结果
+        :param frame: 分诊结果
+        :param found: 是否发现弹窗
+        """
+        key = frame.cache_key
+        if not key:
+            return
+        with self._history_lock:
+            record = self._history.setdefault(key, {'visits': 0, 'hits': 0})
+            record['visits'] += 1
+            if found:
+                record['hits'] += 1
+
+    @classmethod
+    def history(cls) -> Dict[str, Dict[str, int]]:
+        """按src汇总的进入结果"""
+        with cls._history_lock:
+            return {key: dict(value) for key, value in cls._history.items()}
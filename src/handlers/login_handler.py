@@ -14,6 +14,8 @@ from typing import Optional
 
 from ..core.config import CrawlerConfig
 from ..utils.helpers import save_page_source
+from .page_state import get_page_state_probe
+from ..drivers.resource_blocker import get_resource_blocker
 
 
 class LoginHandler:
@@ -57,55 +59,34 @@ class LoginHandler:
             logging.error(f"检查登录页面时出错: {e}")
             return False
     
-    def is_redirected_to_login(self) -> bool:
+    def is_redirected_to_login(self, refresh: bool = False) -> bool:
         """
         检查当前页面是否被重定向到登录页面（增强版）
+        使用共享的页面状态快照，一次脚本调用同时检查URL、标题和登录元素
+        :param refresh: 是否强制重新采集页面状态
         :return: True表示是登录页面，False表示不是
         """
         try:
-            current_url = self.driver.current_url.lower()
-            page_title = self.driver.title.lower()
-            
-            # 检查URL
-            for keyword in self.config.LOGIN_INDICATORS['url_keywords']:
-                if keyword in current_url:
-                    print(f"检测到登录页面URL关键词: {keyword}")
-                    return True
-            
-            # 检查标题
-            for keyword in self.config.LOGIN_INDICATORS['title_keywords']:
-                if keyword in page_title:
-                    print(f"检测到登录页面标题关键词: {keyword}")
-                    return True
-            
-            # 检查页面元素
-            login_selectors = [
-                "input[type='password']",  # 密码输入框
-                "div.login-dialog-wrap",   # 1688登录弹窗
-                "form[action*='login']",   # 登录表单
-                "div[class*='login']",     # 登录相关div
-                "button[class*='login']",  # 登录按钮
-                "a[href*='login']"         # 登录链接
-            ]
-            
-            login_elements_found = 0
-            for selector in login_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    visible_elements = [el for el in elements if el.is_displayed()]
-                    if visible_elements:
-                        login_elements_found += 1
-                        print(f"检测到登录页面元素: {selector} (共{len(visible_elements)}个)")
-                except:
-                    continue
-            
-            # 如果找到2个或以上登录相关元素，认为是登录页面
-            if login_elements_found >= 2:
-                print(f"检测到{login_elements_found}个登录相关元素，判定为登录页面")
+            state = get_page_state_probe(self.driver, self.config).snapshot(refresh)
+
+            if state.login_url_keyword:
+                print(f"检测到登录页面URL关键词: {state.login_url_keyword}")
                 return True
-            
+
+            if state.login_title_keyword:
+                print(f"检测到登录页面标题关键词: {state.login_title_keyword}")
+                return True
+
+            for selector in state.login_elements:
+                print(f"检测到登录页面元素: {selector}")
+
+            # 如果找到足够多的登录相关元素，认为是登录页面
+            if state.is_login_page:
+                print(f"检测到{len(state.login_elements)}个登录相关元素，判定为登录页面")
+                return True
+
             return False
-            
+
         except Exception as e:
             print(f"检查登录页面时出错: {e}")
             logging.error(f"检查登录页面时出错: {e}")
@@ -131,6 +112,11 @@ class LoginHandler:
         print("1. 在浏览器中完成登录")
         print(f"2. 您有 {timeout} 秒时间完成登录")
         print("3. 登录成功后程序会自动继续\n")
+
+        # 登录二维码和滑动验证码需要加载图片，暂停资源拦截并刷新登录页
+        blocker = get_resource_blocker(self.driver)
+        if blocker:
+            blocker.lift(reload=True)
         
         # 保存当前URL用于检测页面变化
         current_url = self.driver.current_url
@@ -139,7 +125,9 @@ class LoginHandler:
             # 等待页面URL变化或超时
             start_time = time.time()
             while time.time() - start_time < timeout:
-                if not self.is_redirected_to_login() and self.driver.current_url != current_url: # Changed here
+                if not self.is_redirected_to_login(refresh=True) and self.driver.current_url != current_url: # Changed here
+                    if blocker:
+                        blocker.restore()
                     print("\n=== 登录成功 ===")
                     print(f"已重定向到: {self.driver.current_url}")
                     time.sleep(2)  # 等待页面完全加载
@@ -157,7 +145,7 @@ class LoginHandler:
                     print(f"剩余时间: {remaining}秒...")
             
             # 检查最终状态
-            if self.is_redirected_to_login(): # Changed here
+            if self.is_redirected_to_login(refresh=True): # Changed here
                 print("\n=== 登录超时 ===")
                 print("可能的原因：")
                 print("1. 未在指定时间内完成登录")
@@ -263,7 +251,7 @@ class LoginHandler:
             wait = WebDriverWait(self.driver, timeout)
             
             def not_login_page(driver):
-                return not self.is_redirected_to_login() # Changed here
+                return not self.is_redirected_to_login(refresh=True) # Changed here
             
             wait.until(not_login_page)
             print("✅ 登录完成")
@@ -4,17 +4,21 @@
 负责页面滚动、等待、验证和交互等功能
 """
 
-import time
 import logging
+import urllib.parse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from typing import Optional
+from typing import List, Optional
 
 from ..core.config import CrawlerConfig
 from ..utils.helpers import save_page_source, get_random_delay
+from ..utils.profiler import profiled
+from .page_readiness import PageReadiness
+from .page_state import get_page_state_probe
+from ..drivers.resource_blocker import get_resource_blocker
 
 
 class PageHandler:
@@ -28,7 +32,10 @@ class PageHandler:
         """
         self.driver = driver
         self.config = config or CrawlerConfig()
+        self.readiness = PageReadiness(driver, self.config)
+        self.page_state = get_page_state_probe(driver, self.config)
     
+    @profiled('scroll')
     def scroll_page_enhanced(self) -> bool:
         """
         增强的页面滚动功能
@@ -56,11 +63,8 @@ class PageHandler:
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 print(f"已滚动到页面底部")
                 
-                # 等待内容加载
-                time.sleep(3)
-                
-                # 检查页面高度是否发生变化
-                after_scroll_height = self.driver.execute_script("return document.body.scrollHeight")
+                # 等待懒加载内容（页面变高且DOM静默，或确认没有新内容）
+                after_scroll_height = self.readiness.wait_after_scroll(before_scroll_height)['height']
                 print(f"滚动前高度: {before_scroll_height}px, 滚动后高度: {after_scroll_height}px")
                 
                 if after_scroll_height > before_scroll_height:
@@ -98,7 +102,7 @@ class PageHandler:
                                 print(f"找到加载更多按钮: {selector}")
                                 visible_elements[0].click()
                                 load_more_clicked = True
-                                time.sleep(2)
+                                self.readiness.wait_after_action()
                                 break
                         except Exception:
                             continue
@@ -108,25 +112,19 @@ class PageHandler:
                         print("未找到加载更多按钮，尝试模拟用户滚动行为...")
                         # 模拟真实用户的滚动行为
                         for micro_scroll in range(3):
-                            scroll_position = self.driver.execute_script("return window.pageYOffset;")
-                            self.driver.execute_script(f"window.scrollTo(0, {scroll_position + 200});")
-                            time.sleep(0.5)
+                            self.driver.execute_script("window.scrollBy(0, 200);")
                         
-                        # 滚动到底部并等待
-                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(2)
+                        # 滚动到底部并等待懒加载
+                        current_height = self.driver.execute_script(
+                            "window.scrollTo(0, document.body.scrollHeight); return document.body.scrollHeight;")
+                        self.readiness.wait_after_scroll(current_height)
                         
                         # 再次尝试小幅滚动
                         self.driver.execute_script("window.scrollBy(0, 100);")
-                        time.sleep(1)
                         self.driver.execute_script("window.scrollBy(0, -50);")
-                        time.sleep(1)
                 
                 except Exception as e:
                     print(f"尝试触发更多内容加载时出错: {e}")
-                
-                # 短暂等待
-                time.sleep(1)
             
             # 滚动回页面顶部
             self.driver.execute_script("window.scrollTo(0, 0);")
@@ -143,6 +141,7 @@ class PageHandler:
             logging.error(f"增强滚动时出错: {e}")
             return False
     
+    @profiled('scroll')
     def scroll_page_basic(self) -> bool:
         """
         基础页面滚动功能
@@ -159,11 +158,8 @@ class PageHandler:
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 print(f"滚动尝试 {scroll_attempts+1}/{max_scroll_attempts}")
                 
-                # 等待页面加载
-                time.sleep(2)  # 增加等待时间，给页面更多加载时间
-                
-                # 计算新的滚动高度并与上一个滚动高度比较
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
+                # 等待懒加载内容
+                new_height = self.readiness.wait_after_scroll(last_height)['height']
                 if new_height == last_height:
                     print("页面高度未变化，可能已加载完所有内容")
                     break
@@ -199,6 +195,7 @@ class PageHandler:
             print(f"等待元素超时: {selector}")
             return False
     
+    @profiled('page_load')
     def wait_for_page_load(self, timeout: int = None) -> bool:
         """
         等待页面加载完成
@@ -226,54 +223,33 @@ class PageHandler:
         try:
             print("检查页面是否有验证码或需要手动处理的情况...")
             
+            state = self.page_state.snapshot()
+
             # 1. 检查滑动验证码
-            captcha_selectors = [
-                ".nc_iconfont.btn_slide",  # 滑动验证码
-                ".nc-lang-cnt",  # 验证码容器
-                ".nc_iconfont.btn_ok",  # 验证成功按钮
-                ".btn_slide",  # 滑动按钮
-                "#nc_1_wrapper",  # 验证码包装器
-                "#nocaptcha",  # 无验证码验证
-                ".nc-container",  # 验证码容器
-                "#nc_1_n1z"  # 滑块
-            ]
-            
-            for selector in captcha_selectors:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                visible_captcha_elements = [el for el in elements if el.is_displayed()]
-                if visible_captcha_elements:
-                    print(f"检测到可见的验证码相关元素: {selector}。这通常需要手动操作。")
-                    save_page_source(self.driver, "captcha_detected.html", self.config.PATHS['html_debug'])
-                    return True  # 表明需要手动干预
+            if state.captcha_elements:
+                print(f"检测到可见的验证码相关元素: {state.captcha_elements[0]}。这通常需要手动操作。")
+                save_page_source(self.driver, "captcha_detected.html", self.config.PATHS['html_debug'])
+                self._allow_manual_verification()
+                return True  # 表明需要手动干预
             
-            # 2. 检查iframe中的验证码
-            try:
-                iframes = self.driver.find_elements(By.TAG_NAME, 'iframe')
-                for iframe in iframes:
-                    try:
-                        self.driver.switch_to.frame(iframe)
-                        # 检查iframe中是否有验证码
-                        iframe_captcha_elements = self.driver.find_elements(By.CSS_SELECTOR, ".captcha, .geetest, .nc-container, .slider, .slide-verify")
-                        visible_iframe_captcha = [el for el in iframe_captcha_elements if el.is_displayed()]
-                        if visible_iframe_captcha:
-                            print(f"检测到 iframe 内的可见验证码元素 ({[el.get_attribute('class') for el in visible_iframe_captcha]})。需要手动处理。")
-                            save_page_source(self.driver, "iframe_captcha_detected.html", self.config.PATHS['html_debug'])
-                            return True  # 表明需要手动干预
-                    except:
-                        pass
-                    finally:
-                        # 切回主文档
-                        self.driver.switch_to.default_content()
-            except Exception as e:
-                print(f"检查iframe时出错: {e}")
+            # 2. 检查iframe中的验证码（同源iframe已在快照中检查，跨域iframe需要切换进去）
+            if state.iframe_captcha:
+                print("检测到 iframe 内的可见验证码元素。需要手动处理。")
+                save_page_source(self.driver, "iframe_captcha_detected.html", self.config.PATHS['html_debug'])
+                self._allow_manual_verification()
+                return True  # 表明需要手动干预
+
+            if state.cross_origin_iframes and self._check_cross_origin_iframe_captcha(
+                    [frame['index'] for frame in state.cross_origin_iframes]):
+                self._allow_manual_verification()
+                return True  # 表明需要手动干预
             
             # 3. 检查页面是否重定向到登录页
-            current_url = self.driver.current_url.lower()
-            for url in self.config.LOGIN_INDICATORS['url_keywords']:
-                if url in current_url:
-                    print(f"检测到页面已重定向到登录相关URL: {current_url}")
-                    save_page_source(self.driver, "login_page_redirect_detected.html", self.config.PATHS['html_debug'])
-                    return True  # 表明需要手动干预
+            if state.login_url_keyword:
+                print(f"检测到页面已重定向到登录相关URL: {state.url.lower()}")
+                save_page_source(self.driver, "login_page_redirect_detected.html", self.config.PATHS['html_debug'])
+                self._allow_manual_verification()
+                return True  # 表明需要手动干预
             
             return False
             
@@ -285,6 +261,42 @@ class PageHandler:
             save_page_source(self.driver, "captcha_error.html", self.config.PATHS['html_debug'])
             return False
     
+    def _allow_manual_verification(self):
+        """需要手动处理验证码或登录时暂停资源拦截并刷新，使滑块和二维码图片能够加载"""
+        blocker = get_resource_blocker(self.driver)
+        if blocker:
+            blocker.lift(reload=True)
+
+    def _check_cross_origin_iframe_captcha(self, frame_indices: List[int]) -> bool:
+        """
+        切换进跨域iframe检查验证码
+        :param frame_indices: 需要检查的iframe序号
+        :return: True表示检测到验证码
+        """
+        try:
+            iframes = self.driver.find_elements(By.TAG_NAME, 'iframe')
+            selector = ", ".join(self.config.CAPTCHA_SELECTORS['iframe'])
+            for index in frame_indices:
+                if index >= len(iframes):
+                    continue
+                try:
+                    self.driver.switch_to.frame(iframes[index])
+                    # 检查iframe中是否有验证码
+                    iframe_captcha_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    visible_iframe_captcha = [el for el in iframe_captcha_elements if el.is_displayed()]
+                    if visible_iframe_captcha:
+                        print(f"检测到 iframe 内的可见验证码元素 ({[el.get_attribute('class') for el in visible_iframe_captcha]})。需要手动处理。")
+                        save_page_source(self.driver, "iframe_captcha_detected.html", self.config.PATHS['html_debug'])
+                        return True
+                except:
+                    pass
+                finally:
+                    # 切回主文档
+                    self.driver.switch_to.default_content()
+        except Exception as e:
+            print(f"检查iframe时出错: {e}")
+        return False
+
     def verify_search_results_page(self, keyword: str, is_subsequent_page: bool = False) -> bool:
         """
         验证当前页面是否为有效的搜索结果页面
@@ -319,9 +331,11 @@ class PageHandler:
             if not is_correct_path and not is_subsequent_page:
                 print("❌ URL路径验证失败，不是搜索结果页面")
             
-            # 2. 检查关键词是否在URL或页面中
+            # 2. 检查关键词是否在URL或页面中（URL中的关键词通常经过编码）
             keyword_present = False
-            if keyword.lower() in current_url.lower() or keyword.lower() in page_title.lower():
+            decoded_url = urllib.parse.unquote_plus(current_url)
+            if (keyword.lower() in current_url.lower() or keyword.lower() in decoded_url.lower()
+                    or keyword.lower() in page_title.lower()):
                 print(f"✅ 关键词验证通过: '{keyword}' 在URL或标题中")
                 keyword_present = True
             else:
@@ -367,6 +381,44 @@ class PageHandler:
             logging.error(f"验证搜索结果页面时出错: {e}")
             return False
     
+    def has_next_page(self) -> Optional[bool]:
+        """
+        根据分页控件判断当前结果页之后是否还有下一页
+        :return: True（下一页按钮可用）、False（有分页控件但下一页按钮不存在或已禁用，即最后一页），
+                 None（页面中没有分页控件，无法判断）
+        """
+        try:
+            return self.driver.execute_script("""
+                const pager = document.querySelector('.fui-paging');
+                const next = (pager || document).querySelector('.fui-next');
+                if (!next) return pager ? false : null;
+                return !(next.disabled || next.getAttribute('aria-disabled') === 'true'
+                         || next.classList.contains('fui-next-disabled') || next.classList.contains('disabled'));
+            """)
+        except Exception as e:
+            logging.debug(f"检查分页控件时出错: {e}")
+            return None
+
+    def current_page_number(self) -> Optional[int]:
+        """
+        读取当前结果页的页码：优先取分页控件中高亮的页码，其次取URL中的beginPage参数
+        :return: 页码，无法判断时返回None
+        """
+        try:
+            text = self.driver.execute_script("""
+                const current = document.querySelector('.fui-paging .fui-current, .fui-paging .fui-paging-num.active');
+                return current ? current.textContent.trim() : null;
+            """)
+            if text and text.isdigit():
+                return int(text)
+
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(self.driver.current_url).query)
+            begin_page = (query.get('beginPage') or [''])[0]
+            return int(begin_page) if begin_page.isdigit() else None
+        except Exception as e:
+            logging.debug(f"读取当前页码时出错: {e}")
+            return None
+
     def go_to_next_page(self) -> bool:
         """
         跳转到下一页
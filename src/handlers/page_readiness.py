@@ -0,0 +1,261 @@
+"""
+页面就绪等待模块
+
+基于具体信号判断页面是否就绪，替代固定时长的等待：
+DOM变更静默、商品卡片数量稳定、CDP网络空闲
+"""
+
+import time
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from ..core.config import CrawlerConfig
+from ..drivers.cdp_events import get_event_reader
+from ..utils.selector_stats import current_site, get_selector_stats
+from .page_state import get_page_state_probe
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+# DOM结构在quietMs内无变化即视为静默
+DOM_QUIET_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var start = Date.now(), last = Date.now(), mutations = 0;
+var observer = new MutationObserver(function(records) {
+    mutations += records.length;
+    last = Date.now();
+});
+observer.observe(document.documentElement || document, {childList: true, subtree: true});
+
+(function check() {
+    var now = Date.now();
+    var quiet = now - last >= quietMs;
+    if (quiet || now - start >= timeoutMs) {
+        observer.disconnect();
+        done({quiet: quiet, mutations: mutations, elapsed: now - start});
+        return;
+    }
+    setTimeout(check, Math.min(50, quietMs));
+})();
+"""
+
+# 按选择器顺序统计商品卡片数量，数量在stableMs内不变即视为稳定
+CARD_COUNT_STABLE_SCRIPT = """
+var selectors = arguments[0], stableMs = arguments[1], timeoutMs = arguments[2], minCount = arguments[3];
+var done = arguments[arguments.length - 1];
+var start = Date.now(), lastCount = -1, lastChange = Date.now();
+
+function count() {
+    for (var i = 0; i < selectors.length; i++) {
+        try {
+            var n = document.querySelectorAll(selectors[i]).length;
+            if (n > 0) return {selector: selectors[i], count: n};
+        } catch (e) {}
+    }
+    return {selector: null, count: 0};
+}
+
+(function check() {
+    var now = Date.now(), current = count();
+    if (current.count !== lastCount) {
+        lastCount = current.count;
+        lastChange = now;
+    }
+    var stable = current.count >= minCount && now - lastChange >= stableMs;
+    if (stable || now - start >= timeoutMs) {
+        done({stable: stable, selector: current.selector, count: current.count, elapsed: now - start});
+        return;
+    }
+    setTimeout(check, 100);
+})();
+"""
+
+# 滚动后等待懒加载：页面变高且DOM静默，或在settleMs内没有任何DOM变化
+SCROLL_SETTLE_SCRIPT = """
+var previousHeight = arguments[0], quietMs = arguments[1], settleMs = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var start = Date.now(), last = Date.now(), mutations = 0;
+var observer = new MutationObserver(function(records) {
+    mutations += records.length;
+    last = Date.now();
+});
+observer.observe(document.documentElement || document, {childList: true, subtree: true});
+
+(function check() {
+    var now = Date.now(), height = document.body.scrollHeight;
+    var grew = height > previousHeight;
+    var settled = grew ? now - last >= quietMs : (mutations === 0 && now - start >= settleMs) || (mutations > 0 && now - last >= settleMs);
+    if (settled || now - start >= timeoutMs) {
+        observer.disconnect();
+        done({grew: grew, height: height, mutations: mutations, elapsed: now - start});
+        return;
+    }
+    setTimeout(check, 50);
+})();
+"""
+
+
+class PageReadiness:
+    """页面就绪等待器"""
+
+    def __init__(self, driver: 'webdriver.Chrome', config: CrawlerConfig = None):
+        """
+        初始化页面就绪等待器
+        :param driver: WebDriver实例
+        :param config: 爬虫配置对象
+        """
+        self.driver = driver
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.READINESS
+
+    @property
+    def events(self):
+        """当前驱动共享的CDP事件读取器"""
+        return get_event_reader(self.driver)
+
+    @property
+    def page_state(self):
+        """当前驱动共享的页面状态探测器"""
+        return get_page_state_probe(self.driver, self.config)
+
+    def begin_navigation(self):
+        """导航前调用，重置网络请求跟踪并丢弃页面状态快照"""
+        self.page_state.invalidate()
+        if self.settings['network_idle']:
+            self.events.reset_network()
+
+    def wait_for_dom_quiet(self, quiet_ms: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        等待DOM结构停止变化
+        :param quiet_ms: 静默时长（毫秒），如果为None则使用配置中的默认值
+        :param timeout: 超时时间（秒），如果为None则使用配置中的默认值
+        :return: 是否在超时前静默
+        """
+        quiet_ms = quiet_ms or self.settings['dom_quiet_ms']
+        timeout = timeout or self.settings['page_timeout']
+
+        # 等待期间页面仍在变化，之前的快照不再可信
+        self.page_state.invalidate()
+        result = self._run_async(DOM_QUIET_SCRIPT, quiet_ms, int(timeout * 1000))
+        if result is None:
+            return False
+
+        logging.debug(f"DOM静默等待: {result}")
+        return bool(result.get('quiet'))
+
+    def wait_for_card_count_stable(self, selectors: Optional[List[str]] = None, stable_ms: Optional[int] = None,
+                                   timeout: Optional[float] = None) -> Dict:
+        """
+        等待商品卡片数量稳定
+        :param selectors: 商品卡片CSS选择器，如果为None则使用按命中统计排序的标准选择器
+        :param stable_ms: 数量保持不变的时长（毫秒）
+        :param timeout: 超时时间（秒）
+        :return: {'stable', 'selector', 'count', 'elapsed'}
+        """
+        if not selectors:
+            selectors = self.config.PRODUCT_SELECTORS['standard']
+            stats = get_selector_stats(self.config)
+            if stats:
+                selectors = stats.rank(current_site(self.driver, self.config.DEFAULT_BASE_URL), selectors,
+                                       advance=False)
+        stable_ms = stable_ms or self.settings['card_stable_ms']
+        timeout = timeout or self.settings['page_timeout']
+
+        self.page_state.invalidate()
+        result = self._run_async(CARD_COUNT_STABLE_SCRIPT, selectors, stable_ms,
+                                 int(timeout * 1000), self.settings['min_cards'])
+        if result is None:
+            return {'stable': False, 'selector': None, 'count': 0, 'elapsed': 0}
+
+        logging.debug(f"商品卡片数量等待: {result}")
+        return result
+
+    def wait_for_network_idle(self, idle_ms: Optional[int] = None, timeout: Optional[float] = None,
+                              max_inflight: Optional[int] = None) -> bool:
+        """
+        通过CDP Network事件等待网络空闲
+        :param idle_ms: 无网络活动的时长（毫秒）
+        :param timeout: 超时时间（秒）
+        :param max_inflight: 允许的进行中请求数（长连接请求不会结束）
+        :return: 是否在超时前达到空闲；性能日志不可用时返回False
+        """
+        if not self.settings['network_idle']:
+            return False
+
+        idle_seconds = (idle_ms or self.settings['network_idle_ms']) / 1000.0
+        timeout = timeout or self.settings['page_timeout']
+        max_inflight = self.settings['max_inflight'] if max_inflight is None else max_inflight
+
+        reader = self.events
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            reader.poll()
+            if not reader.available:
+                return False
+            if reader.inflight_count <= max_inflight and reader.network_idle_for() >= idle_seconds:
+                return True
+            time.sleep(self.settings['poll_interval'])
+
+        logging.debug(f"网络空闲等待超时，进行中请求: {reader.inflight_count}")
+        return False
+
+    def wait_for_page_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待普通页面就绪：网络空闲（可用时）并且DOM静默
+        :param timeout: 超时时间（秒）
+        :return: 是否就绪
+        """
+        timeout = timeout or self.settings['page_timeout']
+        start = time.monotonic()
+
+        self.wait_for_network_idle(timeout=timeout)
+        remaining = max(0.5, timeout - (time.monotonic() - start))
+        return self.wait_for_dom_quiet(timeout=remaining)
+
+    def wait_for_search_results(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待搜索结果页就绪：网络空闲（可用时）并且商品卡片数量稳定
+        :param timeout: 超时时间（秒）
+        :return: 是否就绪
+        """
+        timeout = timeout or self.settings['page_timeout']
+        start = time.monotonic()
+
+        self.wait_for_network_idle(timeout=timeout)
+        remaining = max(0.5, timeout - (time.monotonic() - start))
+        result = self.wait_for_card_count_stable(timeout=remaining)
+        return bool(result.get('stable'))
+
+    def wait_after_scroll(self, previous_height: int, timeout: Optional[float] = None) -> Dict:
+        """
+        滚动后等待懒加载内容
+        :param previous_height: 滚动前的页面高度
+        :param timeout: 超时时间（秒）
+        :return: {'grew', 'height', 'mutations', 'elapsed'}
+        """
+        timeout = timeout or self.settings['scroll_timeout']
+
+        self.page_state.invalidate()
+        result = self._run_async(SCROLL_SETTLE_SCRIPT, previous_height, self.settings['dom_quiet_ms'],
+                                 self.settings['scroll_settle_ms'], int(timeout * 1000))
+        if result is None:
+            return {'grew': False, 'height': previous_height, 'mutations': 0, 'elapsed': 0}
+        return result
+
+    def wait_after_action(self, timeout: Optional[float] = None) -> bool:
+        """
+        点击、按键等交互之后的短暂等待（如关闭弹窗后）
+        :param timeout: 超时时间（秒）
+        :return: DOM是否静默
+        """
+        return self.wait_for_dom_quiet(timeout=timeout or self.settings['action_timeout'])
+
+    def _run_async(self, script: str, *args) -> Optional[Dict]:
+        """执行异步脚本，出错时返回None"""
+        try:
+            return self.driver.execute_async_script(script, *args)
+        except Exception as e:
+            logging.debug(f"执行就绪等待脚本时出错: {e}")
+            return None
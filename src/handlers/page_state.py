@@ -0,0 +1,290 @@
+"""
+页面状态快照模块
+
+用一次注入脚本同时收集登录标识、可见弹窗、验证码、商品卡片数量和readyState，
+生成类型化的快照，供登录/弹窗/页面处理器和页面分析器在下一次导航前复用，
+避免每个处理器各自逐个选择器调用find_elements和is_displayed
+"""
+
+import time
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.config import CrawlerConfig
+from ..drivers.popup_suppressor import get_popup_suppressor
+from ..utils.selector_stats import SITES, get_selector_stats
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+PAGE_STATE_SCRIPT = """
+var cfg = arguments[0];
+
+function visible(el) {
+    if (!el || !el.getClientRects || !el.getClientRects().length) { return false; }
+    var view = (el.ownerDocument && el.ownerDocument.defaultView) || window;
+    var style = view.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity || '1') > 0;
+}
+
+function query(doc, selector) {
+    try {
+        // 支持 tag:contains('文本') 写法，按元素直接文本匹配
+        var m = /^([a-zA-Z*]+):contains\\('(.*)'\\)$/.exec(selector);
+        if (m) {
+            var snap = doc.evaluate("//" + m[1] + "[contains(text(), '" + m[2] + "')]", doc, null,
+                                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snap.snapshotLength; i++) { nodes.push(snap.snapshotItem(i)); }
+            return nodes;
+        }
+        return Array.prototype.slice.call(doc.querySelectorAll(selector));
+    } catch (e) {
+        return [];
+    }
+}
+
+function visibleMatches(doc, selectors) {
+    var result = [];
+    for (var i = 0; i < selectors.length; i++) {
+        var shown = query(doc, selectors[i]).filter(visible);
+        if (shown.length) { result.push({selector: selectors[i], elements: shown}); }
+    }
+    return result;
+}
+
+function closeButtonCount(el) {
+    try {
+        return document.evaluate(
+            ".//*[contains(@class, 'close') or contains(text(), '×') or contains(text(), 'X') or contains(@aria-label, 'close')]",
+            el, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    } catch (e) {
+        return 0;
+    }
+}
+
+var state = {
+    url: location.href,
+    title: document.title || '',
+    readyState: document.readyState,
+    hasBody: !!document.body,
+    login: visibleMatches(document, cfg.login).map(function (m) { return m.selector; }),
+    captcha: visibleMatches(document, cfg.captcha).map(function (m) { return m.selector; }),
+    popups: visibleMatches(document, cfg.popup).map(function (m) {
+        return {
+            selector: m.selector,
+            count: m.elements.length,
+            samples: m.elements.slice(0, cfg.samples).map(function (el) {
+                return {
+                    text: ((el.innerText || el.textContent || '') + '').trim().slice(0, 50),
+                    className: ((el.getAttribute('class') || '') + '').slice(0, 30),
+                    id: el.id || '',
+                    closeButtons: closeButtonCount(el)
+                };
+            })
+        };
+    }),
+    productSelector: null,
+    productCount: 0,
+    iframeCount: 0,
+    iframePopups: 0,
+    iframeCaptcha: false,
+    crossOriginIframes: []
+};
+
+// 读取并清零常驻弹窗屏蔽脚本的计数（未安装时为null）
+var suppressor = window.__popupSuppressor;
+state.suppressed = suppressor ? {hidden: suppressor.hidden, kept: suppressor.kept, bySelector: suppressor.bySelector} : null;
+if (suppressor) { suppressor.hidden = 0; suppressor.kept = 0; suppressor.bySelector = {}; }
+
+// 按实际页面所在站点（www/global）选择对应的命中顺序
+var products = cfg.products[location.hostname.toLowerCase().indexOf('global.') === 0 ? 'global' : 'www'];
+for (var p = 0; p < products.length; p++) {
+    var cards = query(document, products[p]);
+    if (cards.length) { state.productSelector = products[p]; state.productCount = cards.length; break; }
+}
+
+var frames = document.getElementsByTagName('iframe');
+state.iframeCount = frames.length;
+for (var f = 0; f < frames.length; f++) {
+    var doc = null;
+    try { doc = frames[f].contentDocument; } catch (e) { doc = null; }
+    if (doc && doc.documentElement) {
+        if (visibleMatches(doc, cfg.iframePopup).length) { state.iframePopups += 1; }
+        if (visibleMatches(doc, cfg.iframeCaptcha).length) { state.iframeCaptcha = true; }
+    } else if (visible(frames[f])) {
+        // 跨域iframe无法在页面脚本中检查，记录下来由调用方决定是否切换进去检查
+        state.crossOriginIframes.push({index: f, src: (frames[f].src || '').slice(0, 200),
+                                       id: frames[f].id || '', className: frames[f].className || ''});
+    }
+}
+
+return state;
+"""
+
+
+@dataclass
+class PageState:
+    """页面状态快照"""
+
+    url: str = ''
+    title: str = ''
+    ready_state: str = ''
+    has_body: bool = False
+    login_url_keyword: Optional[str] = None
+    login_title_keyword: Optional[str] = None
+    login_elements: List[str] = field(default_factory=list)
+    min_login_elements: int = 2
+    popups: List[Dict[str, Any]] = field(default_factory=list)
+    captcha_elements: List[str] = field(default_factory=list)
+    product_selector: Optional[str] = None
+    product_count: int = 0
+    iframe_count: int = 0
+    iframe_popup_count: int = 0
+    iframe_captcha: bool = False
+    cross_origin_iframes: List[Dict[str, Any]] = field(default_factory=list)
+    suppressed_popups: int = 0
+    captured_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def is_login_page(self) -> bool:
+        """URL或标题包含登录关键词，或同时可见足够多的登录元素"""
+        return bool(self.login_url_keyword or self.login_title_keyword
+                    or len(self.login_elements) >= self.min_login_elements)
+
+    @property
+    def has_popup(self) -> bool:
+        """主页面或同源iframe中有可见弹窗"""
+        return bool(self.popups) or self.iframe_popup_count > 0
+
+    @property
+    def has_captcha(self) -> bool:
+        """主页面或同源iframe中有可见验证码"""
+        return bool(self.captcha_elements) or self.iframe_captcha
+
+    @property
+    def has_products(self) -> bool:
+        return self.product_count > 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.ready_state == 'complete' and self.has_body
+
+    @property
+    def age(self) -> float:
+        """快照已存在的秒数"""
+        return time.monotonic() - self.captured_at
+
+
+# 每个WebDriver共享一个探测器，任一处理器触发的失效对所有处理器生效
+_probes = weakref.WeakKeyDictionary()
+_probes_lock = threading.Lock()
+
+
+def get_page_state_probe(driver: 'webdriver.Chrome', config: CrawlerConfig = None) -> 'PageStateProbe':
+    """
+    获取WebDriver对应的共享页面状态探测器
+    :param driver: WebDriver实例
+    :param config: 爬虫配置对象
+    :return: 页面状态探测器
+    """
+    with _probes_lock:
+        probe = _probes.get(driver)
+        if probe is None:
+            probe = PageStateProbe(driver, config)
+            _probes[driver] = probe
+        return probe
+
+
+class PageStateProbe:
+    """页面状态探测器"""
+
+    def __init__(self, driver: 'webdriver.Chrome', config: CrawlerConfig = None):
+        """
+        初始化页面状态探测器
+        :param driver: WebDriver实例
+        :param config: 爬虫配置对象
+        """
+        self.driver = driver
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.PAGE_STATE
+        self.selector_stats = get_selector_stats(self.config)
+        self._state: Optional[PageState] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self, refresh: bool = False) -> PageState:
+        """
+        获取页面状态快照，导航或交互之前复用同一份快照
+        :param refresh: 是否强制重新采集
+        :return: 页面状态快照
+        """
+        with self._lock:
+            state = self._state
+            if refresh or state is None or state.age > self.settings['max_age']:
+                state = self._capture()
+                self._state = state
+            return state
+
+    def invalidate(self):
+        """页面已导航或发生交互，丢弃缓存的快照"""
+        with self._lock:
+            self._state = None
+
+    def _capture(self) -> PageState:
+        """执行一次注入脚本采集页面状态"""
+        # 采集前不知道当前页面属于哪个站点，两个站点的顺序都传入，由脚本按页面域名选择；
+        # 快照只用命中顺序找商品卡片，命中结果由提取流程按页记录一次
+        product_selectors = {}
+        for site in SITES:
+            product_selectors[site] = list(self.config.PRODUCT_SELECTORS['standard'])
+            if self.selector_stats:
+                product_selectors[site] = self.selector_stats.rank(site, product_selectors[site], advance=False)
+
+        raw = self.driver.execute_script(PAGE_STATE_SCRIPT, {
+            'login': self.config.LOGIN_INDICATORS['element_selectors'],
+            'captcha': self.config.CAPTCHA_SELECTORS['main'],
+            'popup': self.config.POPUP_SELECTORS,
+            'iframePopup': self.config.IFRAME_POPUP_SELECTORS,
+            'iframeCaptcha': self.config.CAPTCHA_SELECTORS['iframe'],
+            'products': product_selectors,
+            'samples': self.settings['popup_samples']
+        }) or {}
+
+        suppressor = get_popup_suppressor(self.driver)
+        suppressed = suppressor.record(raw.get('suppressed')) if suppressor else 0
+
+        url = raw.get('url', '')
+        title = raw.get('title', '')
+        lower_url = url.lower()
+        lower_title = title.lower()
+
+        state = PageState(
+            url=url,
+            title=title,
+            ready_state=raw.get('readyState', ''),
+            has_body=bool(raw.get('hasBody')),
+            login_url_keyword=next(
+                (k for k in self.config.LOGIN_INDICATORS['url_keywords'] if k in lower_url), None),
+            login_title_keyword=next(
+                (k for k in self.config.LOGIN_INDICATORS['title_keywords'] if k in lower_title), None),
+            login_elements=raw.get('login') or [],
+            min_login_elements=self.config.LOGIN_INDICATORS['min_elements'],
+            popups=raw.get('popups') or [],
+            captcha_elements=raw.get('captcha') or [],
+            product_selector=raw.get('productSelector'),
+            product_count=raw.get('productCount') or 0,
+            iframe_count=raw.get('iframeCount') or 0,
+            iframe_popup_count=raw.get('iframePopups') or 0,
+            iframe_captcha=bool(raw.get('iframeCaptcha')),
+            cross_origin_iframes=raw.get('crossOriginIframes') or [],
+            suppressed_popups=suppressed
+        )
+
+        logging.debug(f"页面状态: {state.url} ready={state.ready_state} login={state.is_login_page} "
+                      f"popups={len(state.popups)}+{state.iframe_popup_count} captcha={state.has_captcha} "
+                      f"products={state.product_count} cross_origin_iframes={len(state.cross_origin_iframes)}")
+        return state
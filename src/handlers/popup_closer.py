@@ -4,7 +4,6 @@
 包含各种弹窗关闭的具体实现方法
 """
 
-import time
 import logging
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -13,6 +12,8 @@ from selenium.webdriver.common.action_chains import ActionChains
 from typing import List
 
 from ..core.config import CrawlerConfig
+from .page_readiness import PageReadiness
+from .iframe_triage import IframeTriage
 
 
 class PopupCloser:
@@ -26,6 +27,8 @@ class PopupCloser:
         """
         self.driver = driver
         self.config = config or CrawlerConfig()
+        self.readiness = PageReadiness(driver, self.config)
+        self.triage = IframeTriage(driver, self.config)
 
     def close_iframe_popups(self, silent: bool = False) -> bool:
         """
@@ -36,17 +39,26 @@ class PopupCloser:
         try:
             if not silent:
                 print("开始关闭iframe中的弹窗...")
+            # 一次脚本调用完成分诊，只切换进可能是浮层的iframe
+            candidates = self.triage.candidates(silent=silent)
+            if not candidates:
+                return False
             iframes = self.driver.find_elements(By.TAG_NAME, 'iframe')
             if not silent:
                 print(f"找到 {len(iframes)} 个iframe")
 
             success = False
-            for i, iframe in enumerate(iframes):
+            for frame in candidates:
+                i = frame.index
+                if i >= len(iframes):
+                    continue
                 try:
                     if not silent:
                         print(f"处理iframe {i+1}/{len(iframes)}")
-                    self.driver.switch_to.frame(iframe)
-                    if self._close_popup_in_current_frame(silent=silent):
+                    self.driver.switch_to.frame(iframes[i])
+                    closed = self._close_popup_in_current_frame(silent=silent)
+                    self.triage.record_result(frame, closed)
+                    if closed:
                         if not silent:
                             print(f"  成功关闭iframe {i+1} 中的弹窗")
                         success = True
@@ -180,7 +192,7 @@ class PopupCloser:
                                     if not silent:
                                         print(f"    关闭按钮 {i+1} 点击成功")
                                     success = True
-                                    time.sleep(1)
+                                    self.readiness.wait_after_action()
                             except Exception as click_error:
                                 if not silent:
                                     print(f"    点击关闭按钮 {i+1} 失败: {click_error}")
@@ -13,8 +13,13 @@ from selenium.webdriver.common.action_chains import ActionChains
 from typing import List, Optional
 
 from ..core.config import CrawlerConfig
+from ..drivers.popup_suppressor import get_popup_suppressor
 from ..utils.helpers import save_page_source
+from ..utils.profiler import profiled
+from ..utils.interaction import InteractionPolicy
 from .popup_closer import PopupCloser
+from .page_readiness import PageReadiness
+from .page_state import get_page_state_probe
 
 
 class PopupHandler:
@@ -29,6 +34,10 @@ class PopupHandler:
         self.driver = driver
         self.config = config or CrawlerConfig()
         self.closer = PopupCloser(driver, config)
+        self.readiness = PageReadiness(driver, self.config)
+        self.interaction = InteractionPolicy(self.config)
+        self.page_state = get_page_state_probe(driver, self.config)
+        self.suppressor = get_popup_suppressor(driver)
 
     def detect_popups(self, save_debug: bool = True, silent: bool = False) -> bool:
         """
@@ -47,10 +56,17 @@ class PopupHandler:
                 if not silent:
                     print("已保存页面源码用于调试")
 
+            # 主页面和同源iframe在一次脚本调用中检测
+            state = self.page_state.snapshot()
+
             # 1. 检测iframe中的弹窗
             if not silent:
                 print("检测iframe中的弹窗...")
-            iframe_popup_found = self._detect_iframe_popups(silent=silent)
+            iframe_popup_found = state.iframe_popup_count > 0
+            if not iframe_popup_found and state.cross_origin_iframes:
+                # 跨域iframe只能切换进去检查
+                iframe_popup_found = self._detect_iframe_popups(
+                    silent=silent, frame_indices=[frame['index'] for frame in state.cross_origin_iframes])
             if iframe_popup_found:
                 if not silent:
                     print("在iframe中检测到弹窗")
@@ -59,7 +75,7 @@ class PopupHandler:
             # 2. 检测主页面弹窗
             if not silent:
                 print("检测主页面弹窗...")
-            main_popup_found = self._detect_main_page_popups(silent=silent)
+            main_popup_found = self._detect_main_page_popups(silent=silent, state=state)
             if main_popup_found:
                 if not silent:
                     print("在主页面检测到弹窗")
@@ -82,6 +98,7 @@ class PopupHandler:
         """
         return self.detect_popups(save_debug=False, silent=True)
 
+    @profiled('popup_clear')
     def close_popups_enhanced(self, save_debug: bool = True, silent: bool = False) -> bool:
         """
         增强的弹窗关闭方法，包括多种关闭策略和iframe处理
@@ -90,6 +107,9 @@ class PopupHandler:
         :return: True表示成功关闭，False表示失败
         """
         try:
+            if self._popups_suppressed(silent=silent):
+                return False
+
             if not silent:
                 print("开始增强弹窗关闭流程...")
             success = False
@@ -154,12 +174,14 @@ class PopupHandler:
                 if not silent:
                     print("已保存关闭后页面状态")
 
+            self.page_state.invalidate()
             return success
 
         except Exception as e:
             if not silent:
                 print(f"增强弹窗关闭失败: {e}")
             logging.error(f"增强弹窗关闭失败: {e}")
+            self.page_state.invalidate()
             return False
 
     def close_popups_enhanced_silent(self) -> bool:
@@ -169,16 +191,22 @@ class PopupHandler:
         """
         return self.close_popups_enhanced(save_debug=False, silent=True)
 
+    @profiled('popup_clear')
     def handle_search_page_popups_comprehensive(self, keyword: str):
         """
-        综合处理搜索结果页面的弹窗 - 包含用户交互
+        综合处理搜索结果页面的弹窗 - 包含用户交互，无人值守时按检测结果自动决策
         :param keyword: 搜索关键词，用于保存调试文件
         """
         try:
             print("=== 开始综合弹窗检查和处理 ===")
 
             # 等待页面稳定
-            time.sleep(2)
+            self.readiness.wait_for_dom_quiet(timeout=self.config.READINESS['action_timeout'])
+
+            # 常驻屏蔽脚本已处理弹窗时不再逐步检测、确认和轮询关闭
+            if self._popups_suppressed():
+                print("=== 弹窗检查和处理完成 ===\n")
+                return
 
             # 1. 自动检测弹窗
             print("1. 自动检测页面弹窗...")
@@ -187,7 +215,7 @@ class PopupHandler:
             if has_popup:
                 print("✅ 自动检测到弹窗，开始自动关闭...")
                 self.close_popups_enhanced()
-                time.sleep(2)
+                self.readiness.wait_after_action()
 
                 # 再次检测是否还有弹窗
                 if self.detect_popups_silent():
@@ -197,16 +225,21 @@ class PopupHandler:
             else:
                 print("❌ 自动检测未发现弹窗")
 
-            # 2. 用户确认
+            # 2. 用户确认（无人值守时以再次检测结果为准）
             print("\n2. 用户确认弹窗状态...")
-            user_sees_popup = input("您是否看到页面上有弹窗或广告？(1=是, 0=否): ").strip()
+            still_has_popup = self.detect_popups_silent()
+            user_sees_popup = self.interaction.ask(
+                "您是否看到页面上有弹窗或广告？(1=是, 0=否): ",
+                '1' if still_has_popup else '0',
+                "自动检测到弹窗" if still_has_popup else "自动检测未发现弹窗"
+            )
 
             if user_sees_popup == '1':
-                print("用户确认有弹窗，进行5次自动清理尝试...")
+                max_popup_attempts = self.config.UNATTENDED['popup_retry_budget']
+                print(f"确认有弹窗，进行{max_popup_attempts}次自动清理尝试...")
 
-                # 3. 连续5次尝试关闭弹窗
+                # 3. 连续多次尝试关闭弹窗
                 popup_attempts = 0
-                max_popup_attempts = 5
 
                 while popup_attempts < max_popup_attempts:
                     popup_attempts += 1
@@ -220,14 +253,23 @@ class PopupHandler:
 
                     # 尝试关闭弹窗
                     self.close_popups_enhanced_silent()
-                    time.sleep(2)  # 等待页面响应
+                    self.readiness.wait_after_action()  # 等待页面响应
 
                 # 4. 最终用户确认
                 print(f"\n已完成{popup_attempts}次弹窗清理尝试")
-                final_confirmation = input("弹窗是否已清理完成？(1=是, 0=否): ").strip()
+                remaining_popup = self.detect_popups_silent()
+                final_confirmation = self.interaction.ask(
+                    "弹窗是否已清理完成？(1=是, 0=否): ",
+                    '0' if remaining_popup else '1',
+                    "清理后仍检测到弹窗" if remaining_popup else "清理后未检测到弹窗"
+                )
 
                 if final_confirmation == '1':
-                    print("✅ 用户确认弹窗清理成功")
+                    print("✅ 确认弹窗清理成功")
+                elif self.interaction.unattended:
+                    # 没有人可以手动处理，超出重试预算后直接继续
+                    print(f"⚠️ {popup_attempts}次清理后仍有弹窗，无人值守模式下继续执行")
+                    logging.warning(f"关键词 '{keyword}' 页面弹窗在{popup_attempts}次清理后仍存在")
                 else:
                     print("❌ 用户确认弹窗未完全清理")
                     print("请手动关闭剩余弹窗...")
@@ -239,7 +281,7 @@ class PopupHandler:
 
                     print("继续执行后续流程...")
             else:
-                print("✅ 用户确认无弹窗，继续执行")
+                print("✅ 确认无弹窗，继续执行")
 
             # 5. 保存当前页面状态用于调试
             save_page_source(self.driver, f"after_popup_handling_{keyword}.html", self.config.PATHS['html_debug'])
@@ -253,14 +295,50 @@ class PopupHandler:
             # 保存错误页面
             save_page_source(self.driver, f"popup_handling_error_{keyword}.html", self.config.PATHS['html_debug'])
 
-    def _detect_iframe_popups(self, silent: bool = False) -> bool:
-        """检测iframe中的弹窗"""
+    def _popups_suppressed(self, silent: bool = False) -> bool:
+        """
+        常驻弹窗屏蔽脚本已生效且页面上没有需要处理的弹窗
+        :param silent: 是否以静默模式运行
+        :return: True表示主页面和同源iframe没有可见弹窗，也没有需要切换检查的跨域iframe
+        """
+        if not self.suppressor:
+            return False
         try:
+            state = self.page_state.snapshot()
+            if state.has_popup:
+                return False
+            if state.cross_origin_iframes and self.closer.triage.candidates(
+                    [frame['index'] for frame in state.cross_origin_iframes]):
+                return False
+        except Exception as e:
+            logging.debug(f"检查弹窗屏蔽状态失败: {e}")
+            return False
+
+        if not silent:
+            print(f"✅ 弹窗屏蔽脚本已生效（新隐藏 {state.suppressed_popups} 个弹窗），页面无可见弹窗")
+        return True
+
+    def _detect_iframe_popups(self, silent: bool = False, frame_indices: Optional[List[int]] = None) -> bool:
+        """
+        切换进iframe检测弹窗
+        :param silent: 是否以静默模式运行
+        :param frame_indices: 只检测这些序号的iframe（页面脚本无法访问的跨域iframe），为None时检测全部
+        :return: True表示检测到弹窗
+        """
+        try:
+            # 只切换进分诊判定为可能是浮层的iframe
+            candidates = self.closer.triage.candidates(frame_indices, silent=silent)
+            if not candidates:
+                return False
             iframes = self.driver.find_elements(By.TAG_NAME, 'iframe')
             if not silent:
                 print(f"找到 {len(iframes)} 个iframe")
 
-            for i, iframe in enumerate(iframes):
+            for frame in candidates:
+                i = frame.index
+                if i >= len(iframes):
+                    continue
+                iframe = iframes[i]
                 try:
                     if not silent:
                         print(f"检测iframe {i+1}/{len(iframes)}")
@@ -277,6 +355,7 @@ class PopupHandler:
 
                     # 在iframe中查找弹窗元素 (Pass silent to helper)
                     iframe_popup_found = self._check_iframe_popup_elements(silent=silent)
+                    self.closer.triage.record_result(frame, iframe_popup_found)
 
                     # 切回主文档
                     self.driver.switch_to.default_content()
@@ -312,12 +391,7 @@ class PopupHandler:
     def _check_iframe_popup_elements(self, silent: bool = False) -> bool:
         """在iframe中检查弹窗元素"""
         try:
-            iframe_popup_selectors = [
-                "div:contains('AiBUY')", "div:contains('下载')", "div:contains('采购助手')",
-                "div[class*='popup']", "div[class*='modal']", "div[class*='dialog']",
-                "div[style*='position: fixed']"
-            ]
-            for selector in iframe_popup_selectors:
+            for selector in self.config.IFRAME_POPUP_SELECTORS:
                 try:
                     if ":contains(" in selector:
                         text = selector.split(":contains('")[1].split("')")[0]
@@ -341,45 +415,23 @@ class PopupHandler:
         """静默检测iframe中的弹窗"""
         return self._detect_iframe_popups(silent=True)
 
-    def _detect_main_page_popups(self, silent: bool = False) -> bool:
-        """检测主页面弹窗"""
+    def _detect_main_page_popups(self, silent: bool = False, state=None) -> bool:
+        """
+        检测主页面弹窗
+        :param silent: 是否以静默模式运行
+        :param state: 页面状态快照，为None时从共享探测器获取
+        :return: True表示检测到弹窗
+        """
         try:
-            popup_found = False
-            for selector in self.config.POPUP_SELECTORS:
-                try:
-                    if ":contains(" in selector:
-                        text = selector.split(":contains('")[1].split("')")[0]
-                        tag = selector.split(":contains(")[0]
-                        xpath_selector = f"//{tag}[contains(text(), '{text}')]"
-                        elements = self.driver.find_elements(By.XPATH, xpath_selector)
-                    else:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    visible_elements = [el for el in elements if el.is_displayed()]
-                    if visible_elements:
-                        if not silent:
-                            print(f"检测到弹窗元素: {selector} (共{len(visible_elements)}个)")
-                        popup_found = True
-                        if not silent:
-                            for i, el in enumerate(visible_elements[:3]):
-                                try:
-                                    element_text = el.text.strip()[:50]
-                                    element_class = el.get_attribute('class') or ''
-                                    element_id = el.get_attribute('id') or ''
-                                    print(f"  元素{i+1}: 文本='{element_text}', 类名='{element_class[:30]}', ID='{element_id}'")
-                                    close_buttons = el.find_elements(By.XPATH, ".//*[contains(@class, 'close') or contains(text(), '×') or contains(text(), 'X') or contains(@aria-label, 'close')]")
-                                    if close_buttons:
-                                        print(f"    找到{len(close_buttons)}个可能的关闭按钮")
-                                        for j, btn in enumerate(close_buttons[:2]):
-                                            btn_text = btn.text.strip()
-                                            btn_class = btn.get_attribute('class') or ''
-                                            print(f"      关闭按钮{j+1}: 文本='{btn_text}', 类名='{btn_class}'")
-                                except Exception as detail_error:
-                                    print(f"    获取元素详细信息时出错: {detail_error}")
-                except Exception as e:
-                    if not silent:
-                        print(f"检测选择器 '{selector}' 时出错: {e}")
-                    continue
-            return popup_found
+            state = state or self.page_state.snapshot()
+            if not silent:
+                for popup in state.popups:
+                    print(f"检测到弹窗元素: {popup['selector']} (共{popup['count']}个)")
+                    for i, sample in enumerate(popup['samples']):
+                        print(f"  元素{i+1}: 文本='{sample['text']}', 类名='{sample['className']}', ID='{sample['id']}'")
+                        if sample['closeButtons']:
+                            print(f"    找到{sample['closeButtons']}个可能的关闭按钮")
+            return bool(state.popups)
         except Exception as e:
             if not silent:
                 print(f"检测主页面弹窗时出错: {e}")
@@ -396,12 +448,11 @@ class PopupHandler:
                 print("尝试键盘操作关闭弹窗...")
             actions = ActionChains(self.driver)
             actions.send_keys(Keys.ESCAPE).perform()
-            time.sleep(1)
             if not silent:
                 print("已发送ESC键")
             for _ in range(3):
                 actions.send_keys(Keys.ESCAPE).perform()
-                time.sleep(0.5)
+            self.readiness.wait_after_action()
             return True
         except Exception as e:
             if not silent:
@@ -430,7 +481,7 @@ class PopupHandler:
                         if not silent:
                             print(f"找到遮罩层: {selector}")
                         self.driver.execute_script("arguments[0].click();", visible_elements[0])
-                        time.sleep(1)
+                        self.readiness.wait_after_action()
                         return True
                 except Exception:
                     continue
@@ -466,7 +517,7 @@ class PopupHandler:
             if removed_count > 0:
                 if not silent:
                     print(f"JavaScript强制移除了{removed_count}个可能的弹窗元素")
-                time.sleep(1)
+                self.readiness.wait_after_action()
                 return True
             else:
                 if not silent:
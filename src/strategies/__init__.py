@@ -2,7 +2,20 @@
 策略模块 - 搜索策略和URL构造
 """
 
-from .search_strategy import SearchStrategy
-from .url_builder import URLBuilder
+from typing import TYPE_CHECKING
+
+from ..utils.lazy_imports import lazy_exports
+
+# 导出名称 -> 子模块，首次访问时才导入，避免导入包时加载selenium、pandas等依赖
+_EXPORTS = {
+    'SearchStrategy': '.search_strategy',
+    'URLBuilder': '.url_builder'
+}
 
 __all__ = ['SearchStrategy', 'URLBuilder']
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .search_strategy import SearchStrategy
+    from .url_builder import URLBuilder
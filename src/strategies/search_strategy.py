@@ -4,30 +4,40 @@
 提供不同的搜索策略，包括直接URL搜索、传统首页搜索等
 """
 
-import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Callable
 
 from ..core.config import CrawlerConfig
 from ..utils.cache_manager import CacheManager
-from ..utils.helpers import get_random_delay
 from ..handlers.login_handler import LoginHandler
 from ..handlers.popup_handler import PopupHandler
 from ..handlers.page_handler import PageHandler
+from ..handlers.page_readiness import PageReadiness
+from ..utils.rate_limiter import RateLimiter
+from ..utils.dedup_index import DedupIndex, dedup_batch, product_keys
+from ..utils.profiler import profiled, get_profiler
+from ..utils.interaction import InteractionPolicy
 from ..drivers.browser_utils import BrowserUtils
+from ..drivers.http_fetcher import HttpFetcher
+from ..drivers.resource_blocker import get_resource_blocker
+from ..extractors.html_extractor import HTMLProductExtractor
+from ..extractors.network_capture import get_network_capture
 from .url_builder import URLBuilder
 
 
 class SearchStrategy:
     """搜索策略类"""
 
-    def __init__(self, driver: webdriver.Chrome, config: CrawlerConfig = None):
+    def __init__(self, driver: webdriver.Chrome, config: CrawlerConfig = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         """
         初始化搜索策略
         :param driver: WebDriver实例
         :param config: 爬虫配置对象
+        :param rate_limiter: 导航间隔控制器（驱动池中的实例共用一个），如果为None则单独创建
         """
         self.driver = driver
         self.config = config or CrawlerConfig()
@@ -39,40 +49,418 @@ class SearchStrategy:
         self.page_handler = PageHandler(driver, config)
         self.browser_utils = BrowserUtils(driver)
         self.url_builder = URLBuilder(config)
+        self.html_extractor = HTMLProductExtractor(config)
+        self.readiness = PageReadiness(driver, self.config)
+        self.rate_limiter = rate_limiter or RateLimiter.from_config(self.config)
+        self.interaction = InteractionPolicy(self.config)
+        self.network_capture = get_network_capture(driver, self.config)
+        self._http_fetcher: Optional[HttpFetcher] = None
+        # 最近一次逐页搜索中分页控件显示的最后一页（结果不足目标页数时），未到达结果末尾时为None
+        self.last_result_page: Optional[int] = None
+
+    @property
+    def http_fetcher(self) -> HttpFetcher:
+        """HTTP页面获取器（首次使用时创建并加载已保存的Cookie）"""
+        if self._http_fetcher is None:
+            self._http_fetcher = HttpFetcher(self.config)
+            self._http_fetcher.load_cookie_file()
+        return self._http_fetcher
+
+    def _use_http_fetch(self) -> bool:
+        """根据FETCH['mode']判断本次搜索是否先用HTTP获取"""
+        mode = self.config.FETCH['mode']
+        if mode == 'http':
+            return True
+        if mode == 'auto':
+            return self.http_fetcher.has_cookies
+        return False
 
-    def search_products(self, keyword: str, pages: int = 1) -> List[Dict[str, Any]]:
+    def search_products(self, keyword: str, pages: int = 1,
+                        on_page: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
         """
         主要的搜索方法，使用智能策略选择最佳搜索方式
         :param keyword: 搜索关键词
         :param pages: 爬取页数
+        :param on_page: 每页提取完成后的回调 (页码, 商品列表)，在后台解析线程中调用
         :return: 商品列表
         """
-        print(f"\n开始搜索商品: '{keyword}'")
-
-        # 设置反检测
-        self._apply_anti_detection()
+        all_products = []
+        for page_number, products in self.iter_search_pages(keyword, pages, on_page):
+            all_products.extend(products or [])
+        return all_products
+
+    def iter_search_pages(self, keyword: str, pages: int = 1,
+                          on_page: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+                          start_page: int = 1) -> Iterator[Tuple[int, Optional[List[Dict[str, Any]]]]]:
+        """
+        逐页搜索商品，每完成一页就产出该页的商品
+        :param keyword: 搜索关键词
+        :param pages: 爬取页数
+        :param on_page: 每页提取完成后的回调 (页码, 商品列表)，在后台解析线程中调用
+        :param start_page: 起始页码（中断后续抓时跳过已完成的页）
+        :return: (页码, 商品列表) 的迭代器；该页提取失败时商品列表为None（调用方不应将其记为已完成）
+        """
+        pages = max(1, int(pages or 1))
+        start_page = max(1, int(start_page or 1))
+        self.last_result_page = None
+        if start_page > pages:
+            return
+        print(f"\n开始搜索商品: '{keyword}' (页数: {pages})")
 
         try:
+            # 策略0: 复用已保存的会话直接HTTP获取，被拦截时从该页开始回退到浏览器
+            if self._use_http_fetch():
+                start_page = yield from self._iter_http_pages(keyword, pages, on_page, start_page)
+                if start_page > pages:
+                    return
+                print(f"第 {start_page} 页起回退到浏览器获取...")
+
+            # 设置反检测
+            self._apply_anti_detection()
+
             # 策略1: 优先使用直接URL搜索
             if self._try_direct_url_search(keyword):
                 print("✅ 直接URL搜索成功")
                 # 处理搜索结果页面的弹窗
                 self.popup_handler.handle_search_page_popups_comprehensive(keyword)
-                return self._extract_products_from_current_page(keyword)
-
-            # 策略2: 传统首页搜索
-            print("直接URL搜索失败，尝试传统搜索方式...")
-            if self._try_homepage_search(keyword):
+            else:
+                # 策略2: 传统首页搜索
+                print("直接URL搜索失败，尝试传统搜索方式...")
+                if not self._try_homepage_search(keyword):
+                    print("❌ 所有搜索策略都失败了")
+                    return
                 print("✅ 传统搜索成功")
-                return self._extract_products_from_current_page(keyword)
 
-            print("❌ 所有搜索策略都失败了")
-            return []
+            yield from self._iter_result_pages(keyword, pages, on_page, start_page)
+
+            # 浏览器已建立或刷新了会话，同步给HTTP会话供后续关键词使用
+            if self.config.FETCH['mode'] != 'browser':
+                self.http_fetcher.sync_from_driver(self.driver)
 
         except Exception as e:
             print(f"搜索过程中出错: {e}")
             logging.error(f"搜索过程中出错: {e}")
-            return []
+
+    def _iter_http_pages(self, keyword: str, pages: int,
+                         on_page: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+                         start_page: int = 1) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        用HTTP连接池逐页获取并解析搜索结果，不经过浏览器
+        :param keyword: 搜索关键词
+        :param pages: 爬取页数
+        :param on_page: 每页提取完成后的回调
+        :param start_page: 起始页码
+        :return: (页码, 商品列表) 的迭代器；生成器返回值为需要浏览器接手的页码，全部完成时为pages+1
+        """
+        pages = max(1, int(pages or 1))
+        cached_url = self.cache_manager.get_cached_url(keyword)
+        first_page_url = cached_url or (self.url_builder.build_search_urls(keyword) or [None])[0]
+        if not first_page_url:
+            return start_page
+
+        print(f"=== HTTP获取搜索结果: {first_page_url} ===")
+        referer = first_page_url if start_page > 1 else None
+        for page_number in range(start_page, pages + 1):
+            if page_number == 1:
+                url = first_page_url
+            else:
+                url = self.url_builder.modify_search_url(first_page_url, {'beginPage': str(page_number)})
+
+            self.rate_limiter.wait()
+            result = self.http_fetcher.fetch(url, referer)
+            if not result.ok:
+                print(f"⚠️ 第 {page_number} 页HTTP获取被拦截 ({result.blocked})")
+                return page_number
+
+            # 没有解析到商品时可能是需要浏览器渲染的页面，交给浏览器确认
+            products = self._process_page_snapshot(keyword, page_number, result.html, result.final_url, on_page)
+            if products is None:
+                return page_number
+
+            if page_number == 1:
+                self.cache_manager.save_successful_url(keyword, first_page_url)
+            yield page_number, products
+            referer = result.final_url
+
+        return pages + 1
+
+    def _iter_result_pages(self, keyword: str, pages: int,
+                           on_page: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+                           start_page: int = 1) -> Iterator[Tuple[int, Optional[List[Dict[str, Any]]]]]:
+        """
+        流水线方式逐页提取：第N页的HTML在后台线程解析和导出的同时，浏览器导航并加载第N+1页。
+        每页的商品来源依次为：接口响应捕获的商品足够时直接使用；否则获取一次页面源代码离线解析（主路径，
+        浏览器无需停留）；页面源代码获取失败或为空时，趁浏览器仍在该页用浏览器内提取脚本一次性提取。
+        离线解析没有找到商品的页只有最后一页还能回退到浏览器内提取，前面的页浏览器已经离开
+        :param keyword: 搜索关键词
+        :param pages: 爬取页数
+        :param on_page: 每页提取完成后的回调
+        :param start_page: 起始页码（前面的页已通过HTTP获取），浏览器当前应位于第1页
+        :return: (页码, 商品列表) 的迭代器；离线解析失败且无法回退到浏览器内提取的页为None
+        """
+        pages = max(1, int(pages or 1))
+        first_page_url = self.driver.current_url
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='page-parser')
+        pending = None
+        # 浏览器当前所在的页码（通过下一页按钮翻页时据此计算需要点击的次数）
+        browser_page = 1
+
+        try:
+            for page_number in range(start_page, pages + 1):
+                # 浏览器仍停留在上一页，分页控件显示已是最后一页时结果已全部抓取
+                if page_number > start_page and self.page_handler.has_next_page() is False:
+                    print(f"第 {page_number - 1} 页已是最后一页，停止翻页")
+                    self.last_result_page = page_number - 1
+                    break
+
+                if page_number > 1:
+                    if not self._go_to_result_page(keyword, first_page_url, page_number, browser_page):
+                        print(f"无法进入第 {page_number} 页，停止翻页")
+                        break
+                    browser_page = page_number
+
+                self._prepare_results_page(page_number)
+
+                # 接口响应中已捕获足够商品时不再获取页面源代码
+                captured = self.network_capture.collect() if self.network_capture else []
+                html, extracted = '', None
+                if len(captured) < self.config.NETWORK_CAPTURE['min_products']:
+                    # 只获取一次页面源代码，之后浏览器即可继续导航
+                    html = self._read_page_source(page_number)
+                    if not html:
+                        print(f"第 {page_number} 页没有获取到页面源代码，改为浏览器内提取...")
+                        extracted = self._extract_products_from_current_page(keyword)
+                page_url = self.driver.current_url
+                future = executor.submit(self._process_page_snapshot, keyword, page_number, html, page_url,
+                                         on_page, captured, extracted)
+
+                # 上一页的解析在本页导航期间已经完成；浏览器已离开该页，解析失败时产出None，不当作空页
+                if pending:
+                    products = pending[1].result()
+                    if products is None:
+                        print(f"⚠️ 第 {pending[0]} 页离线解析未找到商品，该页不记为完成")
+                    yield pending[0], products
+                pending = (page_number, future, extracted is not None)
+
+            if pending:
+                page_number, future, browser_extracted = pending
+                products = future.result()
+                if products is None and not browser_extracted:
+                    # 仍停留在最后一页，可以回退到浏览器内提取
+                    print(f"第 {page_number} 页离线解析未找到商品，回退到浏览器内提取...")
+                    extracted = self._extract_products_from_current_page(keyword)
+                    # 浏览器内也没有提取到商品时视为失败；提取到但全部是重复商品时为空列表
+                    products = self.filter_new_products(keyword, extracted) if extracted else None
+                    if products and on_page:
+                        on_page(page_number, products)
+                yield page_number, products
+
+        finally:
+            executor.shutdown(wait=True)
+
+    @profiled('navigate')
+    def navigate(self, url: str, expect_results: bool = True, wait: bool = True):
+        """
+        导航到指定URL：先满足访问间隔，再等待页面就绪信号
+        :param url: 目标URL
+        :param expect_results: 是否为搜索结果页（等待商品卡片数量稳定）
+        :param wait: 是否等待访问间隔（调用方刚为同一URL等待过时为False）
+        """
+        if wait:
+            self.rate_limiter.wait()
+        self.readiness.begin_navigation()
+        if self.network_capture:
+            self.network_capture.reset()
+        blocker = get_resource_blocker(self.driver)
+        if blocker:
+            blocker.prepare_navigation(url)
+        self.driver.get(url)
+
+        if expect_results:
+            self.wait_for_results_page()
+        else:
+            self.readiness.wait_for_page_ready()
+
+    def wait_for_results_page(self):
+        """等待搜索结果页就绪，被重定向到登录页时不等待商品卡片"""
+        current_url = self.driver.current_url.lower()
+        if any(keyword in current_url for keyword in self.config.LOGIN_INDICATORS['url_keywords']):
+            return
+
+        if not self.readiness.wait_for_search_results():
+            print("⚠️ 等待商品卡片稳定超时，继续处理当前页面")
+
+    def _read_page_source(self, page_number: int) -> str:
+        """获取当前页面源代码，出错时返回空字符串"""
+        try:
+            return self.driver.page_source or ''
+        except Exception as e:
+            print(f"获取第 {page_number} 页源代码时出错: {e}")
+            logging.error(f"获取第 {page_number} 页源代码时出错: {e}")
+            return ''
+
+    def _process_page_snapshot(self, keyword: str, page_number: int, html: str, page_url: str,
+                               on_page: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+                               captured: Optional[List[Dict[str, Any]]] = None,
+                               extracted: Optional[List[Dict[str, Any]]] = None
+                               ) -> Optional[List[Dict[str, Any]]]:
+        """
+        在后台线程中解析页面快照、去重并调用回调
+        :param captured: 从接口响应捕获的商品，与页面源代码的解析结果合并（同一商品以接口数据为准）
+        :param extracted: 没有页面源代码时在浏览器内提取的商品，代替离线解析结果
+        :return: 该页的新商品列表；解析失败或页面中没有商品时返回None
+        """
+        profiler = get_profiler()
+        try:
+            # 后台线程没有关键词上下文，显式指定
+            with profiler.span('parse', keyword=keyword) as span:
+                products = self.html_extractor.extract_from_html(html, page_url) if html else list(extracted or [])
+                if captured:
+                    products = dedup_batch(list(captured) + products)
+                if span is not None and not products:
+                    span['outcome'] = 'empty'
+            source = f"（接口 {len(captured)} 个）" if captured else ""
+            print(f"第 {page_number} 页解析完成，提取 {len(products)} 个商品{source}")
+            if not products:
+                return None
+
+            products = self.filter_new_products(keyword, products)
+            if products and on_page:
+                with profiler.span('export', keyword=keyword):
+                    on_page(page_number, products)
+            return products
+
+        except Exception as e:
+            print(f"解析第 {page_number} 页时出错: {e}")
+            logging.error(f"解析关键词 '{keyword}' 第 {page_number} 页时出错: {e}")
+            return None
+
+    def filter_new_products(self, keyword: str, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        通过持久化去重索引过滤掉以前已抓取过的商品（未启用去重时原样返回）
+        :param keyword: 搜索关键词
+        :param products: 商品列表
+        :return: 新商品列表
+        """
+        if not products or not self.config.DEDUP['enabled']:
+            return products
+
+        try:
+            with get_profiler().span('dedup', keyword=keyword):
+                new_products = DedupIndex.shared(config=self.config).filter_new(products, keyword)
+        except Exception as e:
+            # 去重索引不可用时不影响抓取
+            print(f"查询商品去重索引时出错: {e}")
+            logging.error(f"查询商品去重索引时出错: {e}")
+            return products
+
+        skipped = len(products) - len(new_products)
+        if skipped:
+            print(f"跳过 {skipped} 个重复或以前已抓取过的商品")
+        return new_products
+
+    def mark_products_exported(self, keyword: str, products: List[Dict[str, Any]]):
+        """
+        将已写入磁盘的商品记录到持久化去重索引（必须在输出落盘之后调用，写入前中断的商品下次仍会抓取）
+        :param keyword: 搜索关键词
+        :param products: 已写入的商品列表
+        """
+        if not products or not self.config.DEDUP['enabled']:
+            return
+
+        try:
+            DedupIndex.shared(config=self.config).mark_exported(product_keys(products), keyword)
+        except Exception as e:
+            print(f"记录商品去重索引时出错: {e}")
+            logging.error(f"记录商品去重索引时出错: {e}")
+
+    def release_products(self, products: List[Dict[str, Any]]):
+        """
+        写入失败时放弃这些商品的待导出状态，本次运行中可以再次抓取
+        :param products: 未能写入的商品列表
+        """
+        if not products or not self.config.DEDUP['enabled']:
+            return
+        DedupIndex.shared(config=self.config).release(product_keys(products))
+
+    def _prepare_results_page(self, page_number: int):
+        """
+        提取前准备结果页：等待加载、清理弹窗、滚动加载更多商品
+        :param page_number: 页码
+        """
+        self.page_handler.wait_for_page_load()
+        if page_number > 1:
+            self.popup_handler.close_popups_enhanced_silent()
+        self.page_handler.scroll_page_enhanced()
+
+    def _go_to_result_page(self, keyword: str, first_page_url: str, page_number: int,
+                           current_page: Optional[int] = None) -> bool:
+        """
+        跳转到指定页码的搜索结果页，优先构造beginPage URL，失败时点击下一页按钮
+        :param keyword: 搜索关键词
+        :param first_page_url: 第一页的URL
+        :param page_number: 目标页码
+        :param current_page: 浏览器当前所在的页码（分页控件无法读取页码时使用），默认为上一页
+        :return: 是否成功
+        """
+        try:
+            print(f"\n=== 跳转到第 {page_number} 页 ===")
+
+            if self.url_builder.validate_search_url(first_page_url):
+                page_url = self.url_builder.modify_search_url(first_page_url, {'beginPage': str(page_number)})
+                self.navigate(page_url)
+            elif not self._click_to_result_page(page_number, current_page or page_number - 1):
+                return False
+
+            if self.login_handler.is_redirected_to_login():
+                print(f"❌ 第 {page_number} 页被重定向到登录页面")
+                return False
+
+            return self.page_handler.verify_search_results_page(keyword, is_subsequent_page=True)
+
+        except Exception as e:
+            print(f"跳转到第 {page_number} 页时出错: {e}")
+            logging.error(f"跳转到第 {page_number} 页时出错: {e}")
+            return False
+
+    def _click_to_result_page(self, page_number: int, current_page: int) -> bool:
+        """
+        逐次点击下一页按钮直到到达目标页码（如HTTP获取被拦截后浏览器从第1页开始）；
+        无法确认已到达目标页时返回False，避免把其他页的商品记为目标页
+        :param page_number: 目标页码
+        :param current_page: 浏览器当前所在的页码
+        :return: 是否到达目标页
+        """
+        current = self.page_handler.current_page_number() or current_page
+        if current >= page_number:
+            print(f"❌ 浏览器位于第 {current} 页，无法通过下一页按钮到达第 {page_number} 页")
+            return False
+
+        blocker = get_resource_blocker(self.driver)
+        if blocker:
+            blocker.restore()
+
+        while current < page_number:
+            if self.page_handler.has_next_page() is False:
+                print(f"第 {current} 页已是最后一页，无法到达第 {page_number} 页")
+                return False
+
+            self.rate_limiter.wait()
+            self.readiness.begin_navigation()
+            if self.network_capture:
+                self.network_capture.reset()
+            if not self.page_handler.go_to_next_page():
+                return False
+            self.wait_for_results_page()
+
+            # 分页控件显示的页码与预期不一致时不再继续，以免页码错位
+            reported = self.page_handler.current_page_number()
+            if reported is not None and reported != current + 1:
+                print(f"❌ 点击下一页后位于第 {reported} 页（预期第 {current + 1} 页）")
+                return False
+            current += 1
+
+        return True
 
     def search_products_strict_flow(self, keyword: str, pages: int = 1) -> List[Dict[str, Any]]:
         """
@@ -94,9 +482,14 @@ class SearchStrategy:
             print("\n【步骤2】检查和处理弹窗...")
             self.popup_handler.handle_search_page_popups_comprehensive("homepage")
 
-            # 步骤3: 用户提醒
+            # 步骤3: 用户提醒（无人值守时以页面就绪和弹窗检测代替人工确认）
             print("\n【步骤3】用户确认...")
-            input("请确认页面已正常加载且无弹窗干扰，然后按 Enter 键继续...")
+            if self.interaction.unattended:
+                self.readiness.wait_for_page_ready()
+                if self.popup_handler.detect_popups_silent():
+                    self.popup_handler.close_popups_enhanced_silent()
+            self.interaction.pause("请确认页面已正常加载且无弹窗干扰，然后按 Enter 键继续...",
+                                   "页面已就绪且已自动清理弹窗")
 
             # 步骤4: 执行搜索
             print(f"\n【步骤4】执行搜索: '{keyword}'...")
@@ -106,7 +499,7 @@ class SearchStrategy:
 
             # 步骤5: 检查搜索结果
             print("\n【步骤5】检查搜索结果...")
-            time.sleep(get_random_delay(3, 5))
+            self.wait_for_results_page()
 
             # 检查是否被重定向到登录页面
             if self.login_handler.is_redirected_to_login(): # Changed here
@@ -126,7 +519,7 @@ class SearchStrategy:
                 return []
 
             print("✅ 搜索成功，开始提取商品信息")
-            return self._extract_products_from_current_page(keyword)
+            return self.filter_new_products(keyword, self._extract_products_from_current_page(keyword))
 
         except Exception as e:
             print(f"严格流程搜索时出错: {e}")
@@ -142,6 +535,9 @@ class SearchStrategy:
         try:
             print("=== 尝试直接URL搜索 ===")
 
+            # Cookie文件未变化时沿用浏览器中已有的Cookie，直接访问搜索URL
+            self.cache_manager.ensure_cookies()
+
             # 1. 优先尝试缓存的URL
             cached_url = self.cache_manager.get_cached_url(keyword)
             if cached_url:
@@ -149,17 +545,10 @@ class SearchStrategy:
                 if self._try_cached_url(cached_url, keyword):
                     return True
 
-            # 2. 构造新的搜索URL
+            # 2. 按模板历史成功率构造新的搜索URL
             print("构造新的搜索URL...")
-            search_urls = self.url_builder.build_search_urls(keyword)
-
-            for i, url in enumerate(search_urls, 1):
-                print(f"尝试URL {i}/{len(search_urls)}: {url}")
-
-                if self._try_search_url(url, keyword):
-                    # 保存成功的URL到缓存
-                    self.cache_manager.save_successful_url(keyword, url)
-                    return True
+            if self._try_ranked_search_urls(keyword):
+                return True
 
             print("所有直接URL搜索都失败")
             return False
@@ -172,22 +561,13 @@ class SearchStrategy:
     def _try_cached_url(self, cached_url: str, keyword: str) -> bool:
         """尝试使用缓存的URL"""
         try:
-            # 先访问主页设置基本Cookie
-            print("先访问主页设置基本Cookie...")
-            self.driver.get(self.config.DEFAULT_BASE_URL)
-            time.sleep(2)
-
-            # 尝试加载保存的Cookie
-            self.cache_manager.load_cookies()
-            time.sleep(1)
-
-            # 访问缓存的URL
-            self.driver.get(cached_url)
-            time.sleep(get_random_delay(3, 6))
+            self.navigate(cached_url)
 
             # 检查结果
             if self.login_handler.is_redirected_to_login(): # Changed here
                 print("❌ 缓存URL被重定向到登录页面")
+                self.cache_manager.invalidate_cookies()
+                self.cache_manager.record_url_failure(keyword, cached_url)
                 return False
 
             if self.page_handler.verify_search_results_page(keyword):
@@ -197,37 +577,99 @@ class SearchStrategy:
                 return True
 
             print("❌ 缓存URL不是有效的搜索结果页面")
+            self.cache_manager.record_url_failure(keyword, cached_url)
             return False
 
         except Exception as e:
             print(f"使用缓存URL时出错: {e}")
             return False
 
+    def _try_ranked_search_urls(self, keyword: str) -> bool:
+        """
+        按模板历史成功率依次尝试构造的搜索URL，并记录各模板的结果；
+        被重定向到登录页与URL模板无关，不计入统计
+        :param keyword: 搜索关键词
+        :return: 是否成功
+        """
+        candidates = self.url_builder.rank_search_candidates(keyword)
+        tried = []
+
+        for i, (template_id, url) in enumerate(candidates, 1):
+            # 排在第一的模板通常直接成功，只对后面的候选做HTTP预检
+            checked = self._prevalidate_search_url(url) if i > 1 else None
+            if checked is False:
+                print(f"⏭️ URL {i}/{len(candidates)} ({template_id}) HTTP预检无效，跳过")
+                tried.append(template_id)
+                continue
+
+            print(f"尝试URL {i}/{len(candidates)} ({template_id}): {url}")
+            # 通过预检的URL紧接着在浏览器中打开，预检请求已占用本次访问间隔
+            outcome = self._visit_search_url(url, keyword, wait=checked is None)
+            if outcome == 'ok':
+                self.url_builder.record_search_result(tried + [template_id], template_id)
+                # 保存成功的URL到缓存
+                self.cache_manager.save_successful_url(keyword, url)
+                return True
+            if outcome == 'invalid':
+                tried.append(template_id)
+
+        self.url_builder.record_search_result(tried)
+        return False
+
+    def _prevalidate_search_url(self, url: str) -> Optional[bool]:
+        """
+        用HTTP请求预检搜索URL，只排除明确无效的（404/410，或被重定向到非搜索页）；
+        被拦截、需要登录或请求出错时无法判断，仍交给浏览器。
+        只在FETCH['mode']允许HTTP获取时预检，预检请求等待访问间隔，之后的浏览器访问不再重复等待
+        :param url: 搜索URL
+        :return: True（已预检，值得在浏览器中打开）、False（明确无效）、None（未预检）
+        """
+        if not self.config.URL_RANKING['prevalidate'] or not self._use_http_fetch():
+            return None
+
+        self.rate_limiter.wait()
+        result = self.http_fetcher.fetch(url)
+        if result.blocked in ('http_404', 'http_410'):
+            return False
+        if result.ok and not self.url_builder.validate_search_url(result.final_url):
+            return False
+        return True
+
     def _try_search_url(self, url: str, keyword: str) -> bool:
         """尝试访问搜索URL"""
+        return self._visit_search_url(url, keyword) == 'ok'
+
+    def _visit_search_url(self, url: str, keyword: str, wait: bool = True) -> str:
+        """
+        访问搜索URL并验证结果
+        :param url: 搜索URL
+        :param keyword: 搜索关键词
+        :param wait: 是否先满足访问间隔（刚对该URL做过HTTP预检时为False）
+        :return: 'ok'（有效的搜索结果页）、'login'（被重定向到登录页）、'invalid'（不是搜索结果页）或'error'
+        """
         try:
             # 访问搜索URL
-            self.driver.get(url)
-            time.sleep(get_random_delay(3, 6))
+            self.navigate(url, wait=wait)
 
             # 检查是否被重定向到登录页面
             if self.login_handler.is_redirected_to_login(): # Changed here
                 print("❌ 被重定向到登录页面")
-                return False
+                self.cache_manager.invalidate_cookies()
+                return 'login'
 
             # 检查是否是有效的搜索结果页面
             if self.page_handler.verify_search_results_page(keyword):
                 print("✅ 成功访问搜索结果页面")
                 # 保存成功的Cookie
                 self.cache_manager.save_cookies()
-                return True
+                return 'ok'
 
             print("❌ 不是有效的搜索结果页面")
-            return False
+            return 'invalid'
 
         except Exception as e:
             print(f"访问搜索URL时出错: {e}")
-            return False
+            return 'error'
 
     def _try_homepage_search(self, keyword: str) -> bool:
         """
@@ -259,7 +701,7 @@ class SearchStrategy:
                 return False
 
             # 5. 等待搜索结果加载
-            time.sleep(get_random_delay(3, 5))
+            self.wait_for_results_page()
 
             # 6. 验证搜索结果
             if self.login_handler.is_redirected_to_login(): # Changed here
@@ -283,8 +725,7 @@ class SearchStrategy:
         """访问主页"""
         try:
             print(f"访问主页: {self.config.DEFAULT_BASE_URL}")
-            self.driver.get(self.config.DEFAULT_BASE_URL)
-            time.sleep(get_random_delay(3, 5))
+            self.navigate(self.config.DEFAULT_BASE_URL, expect_results=False)
 
             # 等待页面加载
             if not self.page_handler.wait_for_page_load():
@@ -341,7 +782,7 @@ class SearchStrategy:
             # 清空搜索框并输入关键词
             search_box.clear()
             search_box.send_keys(keyword)
-            time.sleep(1)
+            self.readiness.wait_after_action()
 
             # 查找搜索按钮
             search_button_selectors = [
@@ -444,33 +885,8 @@ class SearchStrategy:
     def _try_direct_url_in_current_tab(self, keyword: str) -> bool:
         """在当前标签页中尝试直接构造搜索URL"""
         try:
-            search_urls = self.url_builder.build_search_urls(keyword)
-
-            for i, url in enumerate(search_urls, 1):
-                try:
-                    print(f"尝试URL {i}/{len(search_urls)}: {url}")
-
-                    # 访问搜索URL
-                    self.driver.get(url)
-                    time.sleep(get_random_delay(3, 6))
-
-                    # 检查是否成功
-                    if self.login_handler.is_redirected_to_login(): # Changed here
-                        print(f"❌ URL {i} 被重定向到登录页面")
-                        continue
-
-                    # 检查是否是有效的搜索结果页面
-                    if self.page_handler.verify_search_results_page(keyword):
-                        print(f"✅ URL {i} 成功访问搜索结果页面")
-                        # 保存成功的URL到缓存
-                        self.cache_manager.save_successful_url(keyword, url)
-                        return True
-                    else:
-                        print(f"❌ URL {i} 不是有效的搜索结果页面")
-
-                except Exception as e:
-                    print(f"❌ URL {i} 访问失败: {e}")
-                    continue
+            if self._try_ranked_search_urls(keyword):
+                return True
 
             print("所有URL构造尝试都失败")
             return False
@@ -513,6 +929,12 @@ class SearchStrategy:
         except Exception as e:
             print(f"应用反检测设置时出错: {e}")
 
+    def close(self):
+        """关闭HTTP连接池"""
+        if self._http_fetcher is not None:
+            self._http_fetcher.close()
+            self._http_fetcher = None
+
     def get_search_strategy_info(self) -> Dict[str, Any]:
         """获取搜索策略信息"""
         return {
@@ -521,6 +943,8 @@ class SearchStrategy:
                 'homepage_search',
                 'strict_flow_search'
             ],
+            'fetch_mode': self.config.FETCH['mode'],
+            'pagination_enabled': True,
             'cache_enabled': True,
             'anti_detection_enabled': True,
             'popup_handling_enabled': True,
@@ -1,13 +1,19 @@
 """
 URL构造器模块
 
-负责构造各种搜索URL，支持不同的参数组合和编码方式
+负责构造各种搜索URL，支持不同的参数组合和编码方式。
+每个URL模板有固定的ID，按站点记录各模板的成功率，历史上最好的模板先尝试，长期不成功的模板不再尝试
 """
 
+import logging
 import urllib.parse
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
 from ..core.config import CrawlerConfig
+from ..utils.selector_stats import SelectorStats, site_key
+
+# 模板成功率与选择器命中率共用一个统计库，用单独的类别区分
+URL_TEMPLATE_KIND = 'url_template'
 
 
 class URLBuilder:
@@ -19,14 +25,70 @@ class URLBuilder:
         :param config: 爬虫配置对象
         """
         self.config = config or CrawlerConfig()
-    
+        self.settings = self.config.URL_RANKING
+
+    @property
+    def stats(self) -> Optional[SelectorStats]:
+        """URL模板成功率统计，未启用排序或无法打开时为None"""
+        if not self.settings['enabled']:
+            return None
+        try:
+            return SelectorStats.shared(config=self.config)
+        except Exception as e:
+            logging.error(f"打开URL模板统计失败，按默认顺序尝试: {e}")
+            return None
+
     def build_search_urls(self, keyword: str, base_url: Optional[str] = None) -> List[str]:
         """
-        构造搜索URL列表
+        构造搜索URL列表（按历史成功率排序）。只借用排序、不记录尝试结果，不推进失效模板的重新验证计数
         :param keyword: 搜索关键词
         :param base_url: 基础URL，如果为None则使用配置中的默认值
         :return: 搜索URL列表
         """
+        return [url for _, url in self.rank_search_candidates(keyword, base_url, advance=False)]
+
+    def rank_search_candidates(self, keyword: str, base_url: Optional[str] = None,
+                               advance: bool = True) -> List[Tuple[str, str]]:
+        """
+        构造搜索URL并按模板历史成功率排序：成功率高的在前，
+        尝试多次从未成功的模板默认不返回（定期放回队尾重新验证），最多返回max_candidates个
+        :param keyword: 搜索关键词
+        :param base_url: 基础URL，如果为None则使用配置中的默认值
+        :param advance: 是否计为一次尝试（之后会调用record_search_result时为True）
+        :return: [(模板ID, URL)]
+        """
+        base_url = base_url or self.config.DEFAULT_BASE_URL
+        candidates = self.build_search_candidates(keyword, base_url)
+        stats = self.stats
+        if not stats or not candidates:
+            return candidates
+
+        urls = dict(candidates)
+        ordered = stats.rank(site_key(base_url), [template_id for template_id, _ in candidates], URL_TEMPLATE_KIND,
+                             advance=advance)
+        ranked = [(template_id, urls[template_id]) for template_id in ordered]
+        return ranked[:self.settings['max_candidates']] if self.settings['max_candidates'] else ranked
+
+    def record_search_result(self, tried: Sequence[str], hit: Optional[str] = None, base_url: Optional[str] = None):
+        """
+        记录一次URL尝试结果：hit之前尝试过的模板记为失败
+        :param tried: 按尝试顺序排列的模板ID（只包括确实打开并验证过的，被重定向到登录页的不计入）
+        :param hit: 成功的模板ID，都不成功时为None
+        :param base_url: 基础URL，如果为None则使用配置中的默认值
+        """
+        stats = self.stats
+        if stats and tried:
+            stats.record_probe(site_key(base_url or self.config.DEFAULT_BASE_URL), list(tried), hit,
+                               kind=URL_TEMPLATE_KIND)
+
+    def build_search_candidates(self, keyword: str, base_url: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        按默认顺序构造所有搜索URL
+        :param keyword: 搜索关键词
+        :param base_url: 基础URL，如果为None则使用配置中的默认值
+        :param advance: 是否计为一次尝试（之后会调用record_search_result时为True）
+        :return: [(模板ID, URL)]
+        """
         base_url = base_url or self.config.DEFAULT_BASE_URL
         search_urls = []
         
@@ -59,7 +121,7 @@ class URLBuilder:
             print(f"构造搜索URL时出错: {e}")
             return []
     
-    def _build_standard_search_urls(self, keyword: str, encoded_keyword: str, base_url: str) -> List[str]:
+    def _build_standard_search_urls(self, keyword: str, encoded_keyword: str, base_url: str) -> List[Tuple[str, str]]:
         """构造标准搜索URL"""
         urls = []
         
@@ -96,18 +158,18 @@ class URLBuilder:
         
         search_path = self.config.get_search_url(base_url)
         
-        for params in param_combinations:
+        for index, params in enumerate(param_combinations):
             try:
                 query_string = urllib.parse.urlencode(params)
                 url = f"{search_path}?{query_string}"
-                urls.append(url)
+                urls.append((f"standard-{index}", url))
             except Exception as e:
                 print(f"构造标准URL时出错: {e}")
                 continue
         
         return urls
     
-    def _build_enhanced_search_urls(self, keyword: str, encoded_keyword: str, base_url: str) -> List[str]:
+    def _build_enhanced_search_urls(self, keyword: str, encoded_keyword: str, base_url: str) -> List[Tuple[str, str]]:
         """构造增强搜索URL"""
         urls = []
         
@@ -151,18 +213,19 @@ class URLBuilder:
         
         search_path = self.config.get_search_url(base_url)
         
-        for params in enhanced_params:
+        for index, params in enumerate(enhanced_params):
             try:
                 query_string = urllib.parse.urlencode(params)
                 url = f"{search_path}?{query_string}"
-                urls.append(url)
+                urls.append((f"enhanced-{index}", url))
             except Exception as e:
                 print(f"构造增强URL时出错: {e}")
                 continue
         
         return urls
     
-    def _build_encoding_variant_urls(self, keyword: str, encoded_keyword_plus: str, base_url: str) -> List[str]:
+    def _build_encoding_variant_urls(self, keyword: str, encoded_keyword_plus: str,
+                                     base_url: str) -> List[Tuple[str, str]]:
         """构造不同编码方式的URL"""
         urls = []
         
@@ -193,11 +256,11 @@ class URLBuilder:
             
             search_path = self.config.get_search_url(base_url)
             
-            for params in encoding_variants:
+            for index, params in enumerate(encoding_variants):
                 try:
                     query_string = urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
                     url = f"{search_path}?{query_string}"
-                    urls.append(url)
+                    urls.append((f"encoding-{index}", url))
                 except Exception as e:
                     print(f"构造编码变体URL时出错: {e}")
                     continue
@@ -207,7 +270,7 @@ class URLBuilder:
         
         return urls
     
-    def _build_global_search_urls(self, keyword: str, encoded_keyword: str) -> List[str]:
+    def _build_global_search_urls(self, keyword: str, encoded_keyword: str) -> List[Tuple[str, str]]:
         """构造国际站搜索URL"""
         urls = []
         
@@ -239,11 +302,11 @@ class URLBuilder:
             ]
             
             for search_path in global_search_paths:
-                for params in global_params:
+                for index, params in enumerate(global_params):
                     try:
                         query_string = urllib.parse.urlencode(params)
                         url = f"{global_base_url}{search_path}?{query_string}"
-                        urls.append(url)
+                        urls.append((f"global{search_path}-{index}", url))
                     except Exception as e:
                         print(f"构造国际站URL时出错: {e}")
                         continue
@@ -411,7 +474,7 @@ class URLBuilder:
                 return False
             
             # 检查是否是搜索路径
-            search_paths = ['/s/offer_search.htm', '/search', '/products']
+            search_paths = ['/s/offer_search.htm', 'offer_search', '/search', '/products']
             if not any(path in parsed_url.path for path in search_paths):
                 return False
             
@@ -2,8 +2,44 @@
 工具模块 - 缓存管理、数据导出和通用工具
 """
 
-from .cache_manager import CacheManager
-from .data_exporter import DataExporter
-from .helpers import get_random_delay, save_page_source, safe_filename, ensure_directory_exists
+from typing import TYPE_CHECKING
 
-__all__ = ['CacheManager', 'DataExporter', 'get_random_delay', 'save_page_source', 'safe_filename', 'ensure_directory_exists']
+from .lazy_imports import lazy_exports
+
+# 导出名称 -> 子模块，首次访问时才导入，避免导入包时加载selenium、pandas等依赖
+_EXPORTS = {
+    'CacheManager': '.cache_manager',
+    'DataExporter': '.data_exporter',
+    'RateLimiter': '.rate_limiter',
+    'URLCacheStore': '.url_cache_store',
+    'ProductStreamSink': '.stream_sink',
+    'DedupIndex': '.dedup_index',
+    'product_key': '.dedup_index',
+    'CrawlProfiler': '.profiler',
+    'get_profiler': '.profiler',
+    'InteractionPolicy': '.interaction',
+    'SelectorStats': '.selector_stats',
+    'CrawlJournal': '.crawl_journal',
+    'KeywordProgress': '.crawl_journal',
+    'get_random_delay': '.helpers',
+    'save_page_source': '.helpers',
+    'safe_filename': '.helpers',
+    'ensure_directory_exists': '.helpers'
+}
+
+__all__ = ['CacheManager', 'DataExporter', 'RateLimiter', 'URLCacheStore', 'ProductStreamSink', 'DedupIndex', 'product_key', 'CrawlProfiler', 'get_profiler', 'InteractionPolicy', 'SelectorStats', 'CrawlJournal', 'KeywordProgress', 'get_random_delay', 'save_page_source', 'safe_filename', 'ensure_directory_exists']
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .cache_manager import CacheManager
+    from .data_exporter import DataExporter
+    from .rate_limiter import RateLimiter
+    from .url_cache_store import URLCacheStore
+    from .stream_sink import ProductStreamSink
+    from .dedup_index import DedupIndex, product_key
+    from .profiler import CrawlProfiler, get_profiler
+    from .interaction import InteractionPolicy
+    from .selector_stats import SelectorStats
+    from .crawl_journal import CrawlJournal, KeywordProgress
+    from .helpers import get_random_delay, save_page_source, safe_filename, ensure_directory_exists
@@ -6,18 +6,46 @@
 
 import os
 import json
+import time
 import logging
-from datetime import datetime
-from selenium import webdriver
-from typing import Dict, Optional, List
+import threading
+import weakref
+from dataclasses import dataclass
+from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Dict, Optional, List, Any
 
 from ..core.config import CrawlerConfig
+from .url_cache_store import URLCacheStore
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+@dataclass
+class CookieSessionState:
+    """WebDriver Cookie状态：记录已加载的Cookie文件版本，避免每次访问都重新加载"""
+
+    cookie_file: Optional[str] = None
+    file_mtime: Optional[float] = None    # 已加载（或已保存）的Cookie文件修改时间
+    expires_at: Optional[float] = None    # 已加载Cookie中最早的过期时间
+    primed: bool = False
+
+    def is_valid(self, cookie_file: str, file_mtime: Optional[float]) -> bool:
+        """已加载的Cookie与文件一致且未过期"""
+        if not self.primed or self.cookie_file != cookie_file or self.file_mtime != file_mtime:
+            return False
+        return self.expires_at is None or time.time() < self.expires_at
+
+
+# 每个WebDriver一份Cookie状态，同一浏览器上的多个CacheManager共享
+_cookie_states = weakref.WeakKeyDictionary()
+_cookie_states_lock = threading.Lock()
 
 
 class CacheManager:
     """缓存管理器"""
     
-    def __init__(self, driver: webdriver.Chrome, config: CrawlerConfig = None):
+    def __init__(self, driver: 'webdriver.Chrome', config: CrawlerConfig = None):
         """
         初始化缓存管理器
         :param driver: WebDriver实例
@@ -45,18 +73,27 @@ class CacheManager:
         
         try:
             if os.path.exists(cookie_file):
+                file_mtime = os.path.getmtime(cookie_file)
                 with open(cookie_file, 'r', encoding='utf-8') as f:
                     cookies = json.load(f)
-                    
-                loaded_count = 0
-                for cookie in cookies:
-                    try:
-                        self.driver.add_cookie(cookie)
-                        loaded_count += 1
-                    except Exception as e:
-                        print(f"添加Cookie失败: {e}")
+
+                # CDP可以直接写入任意域名的Cookie，不需要先打开对应域名的页面
+                loaded_count = self._set_cookies_via_cdp(cookies)
+                if loaded_count is None:
+                    # add_cookie只能写入当前页面域名的Cookie
+                    base_host = urlparse(self.config.DEFAULT_BASE_URL).netloc
+                    if urlparse(self.driver.current_url).netloc != base_host:
+                        self.driver.get(self.config.DEFAULT_BASE_URL)
+                    loaded_count = 0
+                    for cookie in cookies:
+                        try:
+                            self.driver.add_cookie(cookie)
+                            loaded_count += 1
+                        except Exception as e:
+                            print(f"添加Cookie失败: {e}")
                         
                 print(f"已加载{loaded_count}/{len(cookies)}个Cookie")
+                self._mark_cookies_loaded(cookie_file, file_mtime, cookies)
                 return True
             else:
                 print("Cookie文件不存在")
@@ -66,6 +103,84 @@ class CacheManager:
             print(f"加载Cookie失败: {e}")
             logging.error(f"加载Cookie失败: {e}")
             return False
+
+    @property
+    def cookie_state(self) -> CookieSessionState:
+        """当前WebDriver的Cookie状态"""
+        with _cookie_states_lock:
+            state = _cookie_states.get(self.driver)
+            if state is None:
+                state = CookieSessionState()
+                _cookie_states[self.driver] = state
+            return state
+
+    def ensure_cookies(self, cookie_file: Optional[str] = None) -> bool:
+        """
+        确保浏览器已加载最新的Cookie：Cookie文件自上次加载后没有变化且Cookie未过期时不做任何操作，
+        否则重新加载（不需要打开主页）
+        :param cookie_file: Cookie文件路径，如果为None则使用配置中的默认路径
+        :return: 浏览器中是否有可用的已保存Cookie
+        """
+        cookie_file = cookie_file or self.config.PATHS['cookies']
+        try:
+            file_mtime = os.path.getmtime(cookie_file)
+        except OSError:
+            # 没有Cookie文件，直接访问即可
+            return False
+
+        if self.cookie_state.is_valid(cookie_file, file_mtime):
+            return True
+
+        if not self.cookie_state.primed:
+            print("浏览器尚未加载Cookie，从文件加载...")
+        else:
+            print("Cookie文件已更新或Cookie已过期，重新加载...")
+        return self.load_cookies(cookie_file)
+
+    def invalidate_cookies(self):
+        """标记浏览器Cookie失效（如被重定向到登录页），下次访问前重新加载"""
+        self.cookie_state.primed = False
+
+    def _set_cookies_via_cdp(self, cookies: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        通过CDP Network.setCookies写入Cookie
+        :param cookies: Selenium格式的Cookie列表
+        :return: 写入的Cookie数量，不支持CDP时返回None（调用方改用add_cookie）
+        """
+        if not hasattr(self.driver, 'execute_cdp_cmd'):
+            return None
+
+        params = []
+        for cookie in cookies:
+            if 'name' not in cookie or 'value' not in cookie or not cookie.get('domain'):
+                continue
+            param = {
+                'name': cookie['name'], 'value': cookie['value'], 'domain': cookie['domain'],
+                'path': cookie.get('path', '/'), 'secure': cookie.get('secure', False),
+                'httpOnly': cookie.get('httpOnly', False)
+            }
+            if cookie.get('expiry'):
+                param['expires'] = cookie['expiry']
+            if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+                param['sameSite'] = cookie['sameSite']
+            params.append(param)
+
+        try:
+            self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+            return len(params)
+        except Exception as e:
+            logging.debug(f"CDP写入Cookie失败，改用add_cookie: {e}")
+            return None
+
+    def _mark_cookies_loaded(self, cookie_file: str, file_mtime: float, cookies: List[Dict[str, Any]]):
+        """记录浏览器中的Cookie与文件的当前版本一致"""
+        now = time.time()
+        expiries = [cookie['expiry'] for cookie in cookies if cookie.get('expiry') and cookie['expiry'] > now]
+        state = self.cookie_state
+        state.cookie_file = cookie_file
+        state.file_mtime = file_mtime
+        state.expires_at = min(expiries) if expiries else None
+        state.primed = True
     
     def save_cookies(self, cookie_file: Optional[str] = None) -> bool:
         """
@@ -83,7 +198,9 @@ class CacheManager:
             
             with open(cookie_file, 'w', encoding='utf-8') as f:
                 json.dump(cookies, f, ensure_ascii=False, indent=2)
-                
+
+            # 文件内容来自当前浏览器，不需要再加载回来
+            self._mark_cookies_loaded(cookie_file, os.path.getmtime(cookie_file), cookies)
             print(f"已保存{len(cookies)}个Cookie到{cookie_file}")
             return True
             
@@ -96,40 +213,27 @@ class CacheManager:
         """清除所有Cookie"""
         try:
             self.driver.delete_all_cookies()
+            self.invalidate_cookies()
             print("已清除所有Cookie")
         except Exception as e:
             print(f"清除Cookie失败: {e}")
             logging.error(f"清除Cookie失败: {e}")
     
+    def _get_url_store(self, cache_file: Optional[str] = None) -> URLCacheStore:
+        """获取URL缓存存储（同一数据库文件在进程内共享）"""
+        return URLCacheStore.shared(cache_file, self.config)
+
     def load_successful_urls(self, cache_file: Optional[str] = None) -> Dict[str, str]:
         """
         加载成功的URL缓存
-        :param cache_file: 缓存文件路径，如果为None则使用配置中的默认路径
+        :param cache_file: 缓存数据库路径，如果为None则使用配置中的默认路径
         :return: 关键词到URL的映射字典
         """
-        cache_file = cache_file or self.config.PATHS['url_cache']
-        
         try:
-            url_cache = {}
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split('|')
-                            if len(parts) >= 2:
-                                keyword = parts[0].strip()
-                                url = parts[1].strip()
-                                url_cache[keyword] = url
-                            else:
-                                print(f"警告：第{line_num}行格式不正确: {line}")
-                                
-                print(f"已加载{len(url_cache)}个成功URL缓存")
-            else:
-                print("URL缓存文件不存在，将创建新文件")
-                
+            url_cache = {record['keyword']: record['url'] for record in self._get_url_store(cache_file).all_records()}
+            print(f"已加载{len(url_cache)}个成功URL缓存")
             return url_cache
-            
+
         except Exception as e:
             print(f"加载URL缓存失败: {e}")
             logging.error(f"加载URL缓存失败: {e}")
@@ -137,43 +241,14 @@ class CacheManager:
     
     def save_successful_url(self, keyword: str, url: str, cache_file: Optional[str] = None) -> bool:
         """
-        保存成功的URL到缓存文件
+        保存成功的URL到缓存，并累计成功次数
         :param keyword: 搜索关键词
         :param url: 成功的URL
-        :param cache_file: 缓存文件路径，如果为None则使用配置中的默认路径
+        :param cache_file: 缓存数据库路径，如果为None则使用配置中的默认路径
         :return: 是否保存成功
         """
-        cache_file = cache_file or self.config.PATHS['url_cache']
-        
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # 读取现有内容
-            existing_lines = []
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    existing_lines = f.readlines()
-            
-            # 检查是否已存在该关键词的记录
-            keyword_exists = False
-            for i, line in enumerate(existing_lines):
-                if line.strip() and not line.startswith('#'):
-                    parts = line.split('|')
-                    if len(parts) >= 2 and parts[0].strip() == keyword:
-                        # 更新现有记录
-                        existing_lines[i] = f"{keyword}|{url}|{timestamp}|直接访问成功\n"
-                        keyword_exists = True
-                        break
-            
-            # 如果不存在，添加新记录
-            if not keyword_exists:
-                new_record = f"{keyword}|{url}|{timestamp}|直接访问成功\n"
-                existing_lines.append(new_record)
-            
-            # 写回文件
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                f.writelines(existing_lines)
-            
+            self._get_url_store(cache_file).record_success(keyword, url)
             print(f"已保存成功URL: {keyword} -> {url}")
             return True
             
@@ -181,17 +256,32 @@ class CacheManager:
             print(f"保存成功URL失败: {e}")
             logging.error(f"保存成功URL失败: {e}")
             return False
+
+    def record_url_failure(self, keyword: str, url: Optional[str] = None, cache_file: Optional[str] = None) -> bool:
+        """
+        记录缓存URL访问失败，失败率过高的URL不再返回
+        :param keyword: 搜索关键词
+        :param url: 失败的URL
+        :param cache_file: 缓存数据库路径，如果为None则使用配置中的默认路径
+        :return: 是否记录成功
+        """
+        try:
+            self._get_url_store(cache_file).record_failure(keyword, url)
+            return True
+
+        except Exception as e:
+            logging.error(f"记录URL失败次数失败: {e}")
+            return False
     
     def get_cached_url(self, keyword: str, cache_file: Optional[str] = None) -> Optional[str]:
         """
-        获取关键词对应的缓存URL
+        获取关键词对应的缓存URL（已过期或成功率过低的不返回）
         :param keyword: 搜索关键词
-        :param cache_file: 缓存文件路径，如果为None则使用配置中的默认路径
+        :param cache_file: 缓存数据库路径，如果为None则使用配置中的默认路径
         :return: 缓存的URL，如果不存在返回None
         """
         try:
-            url_cache = self.load_successful_urls(cache_file)
-            cached_url = url_cache.get(keyword)
+            cached_url = self._get_url_store(cache_file).get_url(keyword)
             
             if cached_url:
                 print(f"找到缓存URL: {keyword} -> {cached_url}")
@@ -209,37 +299,11 @@ class CacheManager:
         """
         删除指定关键词的缓存URL
         :param keyword: 搜索关键词
-        :param cache_file: 缓存文件路径，如果为None则使用配置中的默认路径
+        :param cache_file: 缓存数据库路径，如果为None则使用配置中的默认路径
         :return: 是否删除成功
         """
-        cache_file = cache_file or self.config.PATHS['url_cache']
-        
         try:
-            if not os.path.exists(cache_file):
-                print(f"缓存文件不存在: {cache_file}")
-                return False
-            
-            # 读取现有内容
-            existing_lines = []
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                existing_lines = f.readlines()
-            
-            # 过滤掉指定关键词的记录
-            filtered_lines = []
-            removed = False
-            
-            for line in existing_lines:
-                if line.strip() and not line.startswith('#'):
-                    parts = line.split('|')
-                    if len(parts) >= 2 and parts[0].strip() == keyword:
-                        removed = True
-                        continue
-                filtered_lines.append(line)
-            
-            if removed:
-                # 写回文件
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    f.writelines(filtered_lines)
+            if self._get_url_store(cache_file).remove(keyword):
                 print(f"已删除关键词 '{keyword}' 的缓存URL")
                 return True
             else:
@@ -251,31 +315,23 @@ class CacheManager:
             logging.error(f"删除缓存URL失败: {e}")
             return False
     
-    def get_all_cached_urls(self, cache_file: Optional[str] = None) -> List[Dict[str, str]]:
+    def get_all_cached_urls(self, cache_file: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取所有缓存的URL记录
-        :param cache_file: 缓存文件路径，如果为None则使用配置中的默认路径
+        :param cache_file: 缓存数据库路径，如果为None则使用配置中的默认路径
         :return: 缓存记录列表
         """
-        cache_file = cache_file or self.config.PATHS['url_cache']
-        
         try:
             records = []
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split('|')
-                            if len(parts) >= 4:
-                                record = {
-                                    'keyword': parts[0].strip(),
-                                    'url': parts[1].strip(),
-                                    'timestamp': parts[2].strip(),
-                                    'status': parts[3].strip()
-                                }
-                                records.append(record)
-            
+            for record in self._get_url_store(cache_file).all_records():
+                records.append({
+                    'keyword': record['keyword'],
+                    'url': record['url'],
+                    'timestamp': URLCacheStore.format_timestamp(record['updated_at']),
+                    'status': record['note'],
+                    'success_count': record['success_count'],
+                    'failure_count': record['failure_count']
+                })
             return records
             
         except Exception as e:
@@ -286,17 +342,12 @@ class CacheManager:
     def clear_url_cache(self, cache_file: Optional[str] = None) -> bool:
         """
         清空URL缓存
-        :param cache_file: 缓存文件路径，如果为None则使用配置中的默认路径
+        :param cache_file: 缓存数据库路径，如果为None则使用配置中的默认路径
         :return: 是否清空成功
         """
-        cache_file = cache_file or self.config.PATHS['url_cache']
-        
         try:
-            if os.path.exists(cache_file):
-                os.remove(cache_file)
-                print(f"已清空URL缓存文件: {cache_file}")
-            else:
-                print("URL缓存文件不存在")
+            count = self._get_url_store(cache_file).clear()
+            print(f"已清空URL缓存，共删除 {count} 条记录")
             return True
             
         except Exception as e:
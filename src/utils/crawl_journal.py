@@ -0,0 +1,358 @@
+"""
+抓取日志模块
+
+基于SQLite(WAL模式)持久化记录每个关键词、每一页的完成情况、商品数量和输出文件位置，
+以及流程控制模式的步骤状态（取代process.txt）。
+批量任务中断后重新运行时跳过已完成的关键词，未完成的关键词从下一页继续，并追加到原来的输出文件
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..core.config import CrawlerConfig
+
+
+@dataclass
+class KeywordProgress:
+    """关键词抓取进度"""
+
+    keyword: str
+    site: str
+    pages: int = 0                    # 目标页数
+    status: str = 'pending'           # pending/running/partial/done/failed
+    products: int = 0                 # 已写入的商品数量
+    completed_pages: List[int] = field(default_factory=list)
+    stream_paths: Dict[str, str] = field(default_factory=dict)
+    outputs: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return self.status == 'done'
+
+    @property
+    def next_page(self) -> int:
+        """第一个未完成的页码"""
+        completed = set(self.completed_pages)
+        page = 1
+        while page in completed:
+            page += 1
+        return page
+
+
+class CrawlJournal:
+    """持久化抓取日志"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS keyword_progress (
+            keyword       TEXT NOT NULL,
+            site          TEXT NOT NULL,
+            pages         INTEGER NOT NULL DEFAULT 0,
+            status        TEXT NOT NULL DEFAULT 'pending',
+            products      INTEGER NOT NULL DEFAULT 0,
+            stream_paths  TEXT NOT NULL DEFAULT '{}',
+            outputs       TEXT NOT NULL DEFAULT '{}',
+            started_at    REAL NOT NULL,
+            updated_at    REAL NOT NULL,
+            finished_at   REAL,
+            PRIMARY KEY (keyword, site)
+        );
+        CREATE TABLE IF NOT EXISTS page_progress (
+            keyword       TEXT NOT NULL,
+            site          TEXT NOT NULL,
+            page          INTEGER NOT NULL,
+            item_count    INTEGER NOT NULL DEFAULT 0,
+            url           TEXT,
+            completed_at  REAL NOT NULL,
+            PRIMARY KEY (keyword, site, page)
+        );
+        CREATE TABLE IF NOT EXISTS step_progress (
+            keyword       TEXT NOT NULL,
+            step          TEXT NOT NULL,
+            position      INTEGER NOT NULL,
+            status        INTEGER NOT NULL DEFAULT 0,
+            updated_at    REAL NOT NULL,
+            PRIMARY KEY (keyword, step)
+        );
+    """
+
+    _shared: Dict[str, 'CrawlJournal'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None, config: CrawlerConfig = None):
+        """
+        初始化抓取日志
+        :param db_path: 数据库文件路径，如果为None则使用配置中的默认路径
+        :param config: 爬虫配置对象
+        """
+        self.config = config or CrawlerConfig()
+        self.db_path = db_path or self.config.PATHS['journal_db']
+        self.settings = self.config.JOURNAL
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, timeout=self.settings['busy_timeout'],
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @classmethod
+    def shared(cls, db_path: Optional[str] = None, config: CrawlerConfig = None) -> 'CrawlJournal':
+        """
+        获取进程内共享的日志实例
+        :param db_path: 数据库文件路径
+        :param config: 爬虫配置对象
+        :return: 抓取日志
+        """
+        config = config or CrawlerConfig()
+        key = os.path.abspath(db_path or config.PATHS['journal_db'])
+        with cls._shared_lock:
+            journal = cls._shared.get(key)
+            if journal is None:
+                journal = cls(key, config)
+                cls._shared[key] = journal
+            return journal
+
+    # ---------- 关键词和页面进度 ----------
+
+    def get_keyword(self, keyword: str, site: str) -> Optional[KeywordProgress]:
+        """
+        读取关键词进度
+        :param keyword: 搜索关键词
+        :param site: 站点标识
+        :return: 关键词进度，没有记录时返回None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM keyword_progress WHERE keyword = ? AND site = ?",
+                                     (keyword, site)).fetchone()
+            if row is None:
+                return None
+            pages = [page_row['page'] for page_row in self._conn.execute(
+                "SELECT page FROM page_progress WHERE keyword = ? AND site = ? ORDER BY page", (keyword, site))]
+
+        return KeywordProgress(
+            keyword=keyword, site=site, pages=row['pages'], status=row['status'], products=row['products'],
+            completed_pages=pages, stream_paths=json.loads(row['stream_paths'] or '{}'),
+            outputs=json.loads(row['outputs'] or '{}')
+        )
+
+    def is_done(self, keyword: str, site: str, pages: int) -> bool:
+        """
+        检查关键词是否已按不少于pages页完成（未启用续抓时总是返回False）
+        :param keyword: 搜索关键词
+        :param site: 站点标识
+        :param pages: 目标页数
+        :return: 是否已完成
+        """
+        if not self.settings['resume']:
+            return False
+        progress = self.get_keyword(keyword, site)
+        return bool(progress and progress.done and progress.pages >= pages)
+
+    def begin_keyword(self, keyword: str, site: str, pages: int) -> KeywordProgress:
+        """
+        开始（或继续）处理关键词；未启用续抓时清除该关键词以前的进度
+        :param keyword: 搜索关键词
+        :param site: 站点标识
+        :param pages: 目标页数
+        :return: 关键词进度（done为True时调用方应跳过该关键词）
+        """
+        with self._lock:
+            if not self.settings['resume']:
+                self.reset(keyword, site)
+
+            progress = self.get_keyword(keyword, site)
+            if progress and progress.done and progress.pages >= pages:
+                return progress
+
+            now = time.time()
+            self._conn.execute("""
+                INSERT INTO keyword_progress (keyword, site, pages, status, started_at, updated_at)
+                VALUES (?, ?, ?, 'running', ?, ?)
+                ON CONFLICT(keyword, site) DO UPDATE SET
+                    pages = excluded.pages, status = 'running', updated_at = excluded.updated_at,
+                    finished_at = NULL
+            """, (keyword, site, pages, now, now))
+
+        progress = progress or KeywordProgress(keyword, site)
+        progress.pages = pages
+        progress.status = 'running'
+        if progress.completed_pages:
+            print(f"📒 关键词 '{keyword}' 已完成第 {progress.completed_pages} 页，从第 {progress.next_page} 页继续")
+        return progress
+
+    def set_stream_paths(self, keyword: str, site: str, paths: Dict[str, str]):
+        """
+        记录关键词的流式输出文件，续抓时追加到同一文件
+        :param keyword: 搜索关键词
+        :param site: 站点标识
+        :param paths: 格式到文件路径的映射
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE keyword_progress SET stream_paths = ?, updated_at = ? WHERE keyword = ? AND site = ?",
+                (json.dumps(paths, ensure_ascii=False), time.time(), keyword, site))
+
+    def complete_page(self, keyword: str, site: str, page: int, item_count: int, url: Optional[str] = None):
+        """
+        记录一页已完成（调用前应确保该页商品已写入磁盘）
+        :param keyword: 搜索关键词
+        :param site: 站点标识
+        :param page: 页码
+        :param item_count: 该页写入的商品数量
+        :param url: 该页URL
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute("""
+                    INSERT INTO page_progress (keyword, site, page, item_count, url, completed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(keyword, site, page) DO UPDATE SET
+                        item_count = excluded.item_count, url = COALESCE(excluded.url, url),
+                        completed_at = excluded.completed_at
+                """, (keyword, site, page, item_count, url, now))
+                self._conn.execute("""
+                    UPDATE keyword_progress SET
+                        products = (SELECT COALESCE(SUM(item_count), 0) FROM page_progress
+                                    WHERE keyword = ? AND site = ?),
+                        updated_at = ?
+                    WHERE keyword = ? AND site = ?
+                """, (keyword, site, now, keyword, site))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                # 日志写入失败不影响抓取，只是中断后无法从该页继续
+                logging.error(f"记录关键词 '{keyword}' 第 {page} 页进度失败: {e}")
+
+    def finish_keyword(self, keyword: str, site: str, outputs: Optional[Dict[str, str]] = None,
+                       products: Optional[int] = None, status: Optional[str] = None,
+                       last_page: Optional[int] = None) -> KeywordProgress:
+        """
+        结束关键词处理
+        :param keyword: 搜索关键词
+        :param site: 站点标识
+        :param outputs: 最终输出文件
+        :param products: 商品数量，如果为None则按各页记录汇总
+        :param status: 最终状态，如果为None则目标页（或结果的最后一页）全部完成时为done，
+                       否则为partial（下次从下一页继续）
+        :param last_page: 搜索结果的最后一页（结果不足目标页数时），为None时以目标页数为准
+        :return: 关键词进度
+        """
+        progress = self.get_keyword(keyword, site) or KeywordProgress(keyword, site)
+        if status is None:
+            final_page = min(progress.pages, last_page) if progress.pages and last_page else progress.pages
+            status = 'done' if final_page and progress.next_page > final_page else 'partial'
+        if products is None:
+            products = progress.products
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO keyword_progress (keyword, site, pages, status, products, outputs,
+                                              started_at, updated_at, finished_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(keyword, site) DO UPDATE SET
+                    status = excluded.status, products = excluded.products, outputs = excluded.outputs,
+                    updated_at = excluded.updated_at, finished_at = excluded.finished_at
+            """, (keyword, site, progress.pages, status, products,
+                  json.dumps(outputs or {}, ensure_ascii=False), now, now, now))
+
+        progress.status = status
+        progress.products = products
+        progress.outputs = outputs or {}
+        return progress
+
+    # ---------- 流程控制步骤 ----------
+
+    def reset_steps(self, keyword: str, steps: Sequence[str]):
+        """
+        初始化流程步骤，全部置为未完成
+        :param keyword: 搜索关键词
+        :param steps: 按顺序排列的步骤名称
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM step_progress WHERE keyword = ?", (keyword,))
+            self._conn.executemany(
+                "INSERT INTO step_progress (keyword, step, position, status, updated_at) VALUES (?, ?, ?, 0, ?)",
+                [(keyword, step, position, now) for position, step in enumerate(steps)])
+
+    def set_step(self, keyword: str, step: str, status: int):
+        """
+        更新步骤状态
+        :param keyword: 搜索关键词
+        :param step: 步骤名称
+        :param status: 0=未完成, 1=完成
+        """
+        with self._lock:
+            position = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM step_progress "
+                                          "WHERE keyword = ?", (keyword,)).fetchone()[0]
+            self._conn.execute("""
+                INSERT INTO step_progress (keyword, step, position, status, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(keyword, step) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at
+            """, (keyword, step, position, status, time.time()))
+
+    def step_status(self, keyword: str) -> Dict[str, int]:
+        """
+        读取步骤状态
+        :param keyword: 搜索关键词
+        :return: 按步骤顺序排列的 {步骤名称: 状态}
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT step, status FROM step_progress WHERE keyword = ? ORDER BY position",
+                                      (keyword,)).fetchall()
+        return {row['step']: row['status'] for row in rows}
+
+    # ---------- 查询和维护 ----------
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        获取所有关键词的进度汇总
+        :return: 记录列表
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT k.*, (SELECT COUNT(*) FROM page_progress p
+                             WHERE p.keyword = k.keyword AND p.site = k.site) AS completed_pages
+                FROM keyword_progress k ORDER BY k.updated_at
+            """).fetchall()
+        return [dict(row) for row in rows]
+
+    def reset(self, keyword: Optional[str] = None, site: Optional[str] = None) -> int:
+        """
+        清除进度（重新抓取）
+        :param keyword: 只清除该关键词，为None时全部清除
+        :param site: 只清除该站点
+        :return: 删除的关键词记录数
+        """
+        conditions = []
+        params = []
+        if keyword is not None:
+            conditions.append("keyword = ?")
+            params.append(keyword)
+        if site is not None:
+            conditions.append("site = ?")
+            params.append(site)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            count = self._conn.execute(f"DELETE FROM keyword_progress{where}", params).rowcount
+            self._conn.execute(f"DELETE FROM page_progress{where}", params)
+        return count
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
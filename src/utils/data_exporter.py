@@ -1,17 +1,24 @@
 """
 数据导出模块
 
-负责将爬取的数据导出为各种格式（Excel、CSV等）
+负责将爬取的数据导出为各种格式（Excel、CSV、Parquet等），以及按页流式导出
 """
 
 import os
+import uuid
 import logging
-import pandas as pd
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, date
+from typing import List, Dict, Optional, Iterable, Tuple, Union
 
 from ..core.config import CrawlerConfig
-from .helpers import safe_filename, ensure_directory_exists
+from .helpers import safe_filename, ensure_directory_exists, parse_price, parse_sales
+from .dedup_index import extract_offer_id
+from .profiler import profiled
+
+from .stream_sink import ProductStreamSink
+
+# pandas和pyarrow导入耗时较长，在实际导出时才加载（见_require_pyarrow和各导出方法）
+pa = pq = ds = None
 
 
 class DataExporter:
@@ -28,6 +35,7 @@ class DataExporter:
         ensure_directory_exists(self.config.PATHS['excel'])
         ensure_directory_exists(self.config.PATHS['json'])
 
+    @profiled('export')
     def save_to_excel(self, products: List[Dict], keyword: str = 'products',
                      output_dir: Optional[str] = None) -> str:
         """
@@ -52,6 +60,7 @@ class DataExporter:
             print(f"\n准备保存 {len(valid_products)} 条商品数据...")
 
             # 创建DataFrame并清理数据
+            import pandas as pd
             df = pd.DataFrame(valid_products)
 
             # 重命名列名为中文
@@ -76,6 +85,7 @@ class DataExporter:
             print(error_msg)
             return ""
 
+    @profiled('export')
     def save_to_csv(self, products: List[Dict], keyword: str = 'products',
                    output_dir: Optional[str] = None) -> str:
         """
@@ -100,6 +110,7 @@ class DataExporter:
             print(f"\n准备保存 {len(valid_products)} 条商品数据到CSV...")
 
             # 创建DataFrame并清理数据
+            import pandas as pd
             df = pd.DataFrame(valid_products)
 
             # 重命名列名为中文
@@ -121,6 +132,7 @@ class DataExporter:
             print(error_msg)
             return ""
 
+    @profiled('export')
     def save_to_json(self, products: List[Dict], keyword: str = 'products',
                     output_dir: Optional[str] = None) -> str:
         """
@@ -163,6 +175,216 @@ class DataExporter:
             print(error_msg)
             return ""
 
+    @profiled('export')
+    def save_to_parquet(self, products: List[Dict], keyword: str = 'products',
+                        output_dir: Optional[str] = None, partitioned: bool = True) -> str:
+        """
+        保存商品信息到Parquet文件（价格/销量解析为数值，店铺等列使用字典编码）
+        :param products: 商品列表
+        :param keyword: 搜索关键词
+        :param output_dir: 输出目录，分区模式下为数据集根目录，如果为None则使用配置中的默认目录
+        :param partitioned: 是否按 keyword=/date= 分区写入数据集
+        :return: 保存的文件路径，如果保存失败则返回空字符串
+        """
+        try:
+            if not products or not isinstance(products, list):
+                print("没有有效的商品数据可保存")
+                return ""
+
+            # 验证和清理商品数据
+            valid_products = self._validate_products(products)
+
+            if not valid_products:
+                print("没有有效的商品数据可保存")
+                return ""
+
+            print(f"\n准备保存 {len(valid_products)} 条商品数据到Parquet...")
+            filepath = self.write_parquet_chunks([valid_products], keyword, output_dir, partitioned)
+
+            print(f"\n商品信息已保存到: {filepath}")
+            return filepath
+
+        except Exception as e:
+            error_msg = f"保存Parquet文件时出错: {str(e)}"
+            logging.error(error_msg, exc_info=True)
+            print(error_msg)
+            return ""
+
+    @profiled('export')
+    def write_parquet_chunks(self, chunks: Iterable[List[Dict]], keyword: str = 'products',
+                             output_dir: Optional[str] = None, partitioned: bool = True,
+                             crawl_time: Optional[datetime] = None) -> str:
+        """
+        分块写入同一个Parquet文件，内存占用只与单块大小有关
+        :param chunks: 商品列表的迭代器（每块需已通过校验）
+        :param keyword: 搜索关键词
+        :param output_dir: 输出目录
+        :param partitioned: 是否按 keyword=/date= 分区写入数据集
+        :param crawl_time: 抓取时间，决定date分区，如果为None则使用当前时间
+        :return: 保存的文件路径
+        """
+        self._require_pyarrow()
+
+        crawl_time = (crawl_time or datetime.now()).replace(microsecond=0)
+        filepath = self._generate_parquet_filepath(keyword, crawl_time, output_dir, partitioned)
+        schema = self._parquet_schema(partitioned)
+
+        with pq.ParquetWriter(filepath, schema, compression=self.config.EXPORT_CONFIG['parquet_compression']) as writer:
+            for chunk in chunks:
+                if chunk:
+                    writer.write_table(self._products_to_arrow(chunk, keyword, crawl_time, partitioned))
+
+        return filepath
+
+    def load_parquet_dataset(self, root: Optional[str] = None, keywords: Optional[List[str]] = None,
+                             start_date: Union[str, date, None] = None, end_date: Union[str, date, None] = None,
+                             columns: Optional[List[str]] = None, as_pandas: bool = False):
+        """
+        读取分区Parquet数据集，分区过滤只扫描匹配的目录
+        :param root: 数据集根目录，如果为None则使用配置中的默认目录
+        :param keywords: 只读取这些关键词
+        :param start_date: 起始日期（含），如 '2025-05-01'
+        :param end_date: 结束日期（含）
+        :param columns: 只读取这些列
+        :param as_pandas: 是否返回pandas DataFrame，默认返回pyarrow Table
+        :return: pyarrow Table 或 pandas DataFrame
+        """
+        self._require_pyarrow()
+
+        root = root or self.config.PATHS['parquet']
+        partition_schema = pa.schema([('keyword', pa.string()), ('date', pa.string())])
+        partitioning = ds.partitioning(partition_schema, flavor='hive')
+        # 显式指定列定义，较早写入、缺少新增列（如offer_id）的文件读取为空值
+        schema = pa.schema(list(self._parquet_schema(True)) + list(partition_schema))
+        dataset = ds.dataset(root, schema=schema, format='parquet', partitioning=partitioning)
+
+        conditions = []
+        if keywords:
+            conditions.append(ds.field('keyword').isin([safe_filename(keyword) for keyword in keywords]))
+        if start_date:
+            conditions.append(ds.field('date') >= str(start_date))
+        if end_date:
+            conditions.append(ds.field('date') <= str(end_date))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = dataset.to_table(columns=columns, filter=expression)
+        return table.to_pandas() if as_pandas else table
+
+    @staticmethod
+    def _require_pyarrow():
+        """按需导入pyarrow"""
+        global pa, pq, ds
+        if pa is not None:
+            return
+        try:
+            import pyarrow
+            import pyarrow.parquet
+            import pyarrow.dataset
+        except ImportError:
+            raise ImportError("Parquet导出需要安装pyarrow: pip install pyarrow") from None
+        pa, pq, ds = pyarrow, pyarrow.parquet, pyarrow.dataset
+
+    @staticmethod
+    def _parquet_schema(partitioned: bool = True):
+        """Parquet列定义，分区模式下keyword/date由目录提供"""
+        dictionary = pa.dictionary(pa.int32(), pa.string())
+        fields = [
+            ('offer_id', pa.string()),
+            ('title', pa.string()),
+            ('price', pa.string()),
+            ('price_min', pa.float64()),
+            ('price_max', pa.float64()),
+            ('shop', dictionary),
+            ('location', dictionary),
+            ('sales', pa.string()),
+            ('sales_count', pa.int64()),
+            ('link', pa.string()),
+            ('image', pa.string()),
+            ('source', dictionary),
+            ('crawled_at', pa.timestamp('s'))
+        ]
+        if not partitioned:
+            fields += [('keyword', dictionary), ('date', pa.string())]
+        return pa.schema(fields)
+
+    def _products_to_arrow(self, products: List[Dict], keyword: str, crawl_time: datetime, partitioned: bool = True):
+        """将商品列表转换为带类型的Arrow表"""
+        prices = [self._price_range(product) for product in products]
+
+        def strings(field):
+            return pa.array([product.get(field) or None for product in products], pa.string())
+
+        def dictionary(values):
+            return pa.array(values, pa.string()).dictionary_encode()
+
+        columns = {
+            'offer_id': pa.array([str(product.get('offer_id') or '') or extract_offer_id(product.get('link', ''))
+                                  for product in products], pa.string()),
+            'title': strings('title'),
+            'price': strings('price'),
+            'price_min': pa.array([price[0] for price in prices], pa.float64()),
+            'price_max': pa.array([price[1] for price in prices], pa.float64()),
+            'shop': dictionary([product.get('shop') or None for product in products]),
+            'location': dictionary([product.get('location') or None for product in products]),
+            'sales': strings('sales'),
+            'sales_count': pa.array([self._sales_count(product) for product in products], pa.int64()),
+            'link': strings('link'),
+            'image': strings('image'),
+            'source': dictionary([product.get('source') or None for product in products]),
+            'crawled_at': pa.array([crawl_time] * len(products), pa.timestamp('s'))
+        }
+        if not partitioned:
+            columns['keyword'] = dictionary([keyword] * len(products))
+            columns['date'] = pa.array([crawl_time.strftime('%Y-%m-%d')] * len(products), pa.string())
+
+        return pa.Table.from_pydict(columns, schema=self._parquet_schema(partitioned))
+
+    @staticmethod
+    def _price_range(product: Dict) -> Tuple[Optional[float], Optional[float]]:
+        """价格区间：接口数据中有数值价格时以其为最低价，否则解析价格文本"""
+        price_min, price_max = parse_price(product.get('price', ''))
+        price_value = product.get('price_value')
+        if price_value is None:
+            return price_min, price_max
+        return float(price_value), max(float(price_value), price_max or 0.0)
+
+    @staticmethod
+    def _sales_count(product: Dict) -> Optional[int]:
+        """销量：优先使用接口数据中的数值销量，否则解析销量文本"""
+        sales_count = product.get('sales_count')
+        if sales_count is not None:
+            return int(sales_count)
+        return parse_sales(product.get('sales', ''))
+
+    def _generate_parquet_filepath(self, keyword: str, crawl_time: datetime,
+                                   output_dir: Optional[str] = None, partitioned: bool = True) -> str:
+        """生成Parquet文件路径，分区模式为 根目录/keyword=关键词/date=日期/part-时间-随机.parquet"""
+        safe_keyword = safe_filename(keyword) or 'products'
+        if not partitioned:
+            return self._generate_filepath(keyword, 'parquet', output_dir or self.config.PATHS['excel'])
+
+        partition_dir = os.path.join(output_dir or self.config.PATHS['parquet'],
+                                     f"keyword={safe_keyword}", f"date={crawl_time.strftime('%Y-%m-%d')}")
+        ensure_directory_exists(partition_dir)
+
+        filename = f"part-{crawl_time.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        return os.path.join(partition_dir, filename)
+
+    def open_stream(self, keyword: str = 'products', output_dir: Optional[str] = None,
+                    formats: Optional[List[str]] = None, paths: Optional[Dict[str, str]] = None) -> ProductStreamSink:
+        """
+        打开流式导出器，每页提取后追加写入，结束时调用finalize转换为Excel等格式
+        :param keyword: 搜索关键词，用于生成文件名
+        :param output_dir: 输出目录
+        :param formats: 追加写入的格式（jsonl/csv），默认使用配置
+        :param paths: 续抓时沿用的文件路径
+        :return: 流式导出器，可直接作为搜索的on_page回调
+        """
+        return ProductStreamSink(self, keyword, output_dir, formats, paths=paths)
+
     def _validate_products(self, products: List[Dict]) -> List[Dict]:
         """
         验证和清理商品数据
@@ -183,6 +405,16 @@ class DataExporter:
 
         return valid_products
 
+    def _generate_filepath(self, keyword: str, extension: str, output_dir: str) -> str:
+        """生成指定扩展名的文件路径"""
+        ensure_directory_exists(output_dir)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_keyword = safe_filename(keyword) or 'products'
+        filename = f"1688_{safe_keyword}_{timestamp}.{extension}"
+
+        return os.path.join(output_dir, filename)
+
     def _generate_excel_filepath(self, keyword: str, output_dir: Optional[str] = None) -> str:
         """生成Excel文件路径"""
         output_dir = output_dir or self.config.PATHS['excel']
@@ -276,5 +508,9 @@ class DataExporter:
                 filepath = self.save_to_json(products, keyword, output_dir)
                 if filepath:
                     results['json'] = filepath
+            elif format_type.lower() == 'parquet':
+                filepath = self.save_to_parquet(products, keyword, output_dir)
+                if filepath:
+                    results['parquet'] = filepath
 
         return results
@@ -0,0 +1,289 @@
+"""
+商品去重索引模块
+
+以1688商品ID（offer ID）为键，无法解析时退回到规范化的标题+店铺哈希，
+基于SQLite(WAL模式)持久化已导出的商品，跨页面、跨关键词、跨运行去重。
+查询(filter_new)和记录(mark_exported)分开进行，商品只在写入磁盘后才记为已导出。
+待导出的商品只在本进程内登记：同一进程中的并发页面/关键词不会重复导出同一商品，
+但同时运行的多个进程可能在任一方写入之前各自导出同一商品（之后的运行仍会跳过它）
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from ..core.config import CrawlerConfig
+
+
+# detail.1688.com/offer/123456.html、?offerId=123456、offer_id=123456 等形式
+_OFFER_ID_PATTERNS = [
+    re.compile(r'/offer/(\d{6,})\.html'),
+    re.compile(r'[?&#](?:offerId|offer_id|offerid)=(\d{6,})', re.IGNORECASE),
+]
+
+_NORMALIZE_PATTERN = re.compile(r'[\W_]+', re.UNICODE)
+
+# SQLite单条语句的参数数量上限较低，分批查询
+_QUERY_BATCH_SIZE = 500
+
+
+def extract_offer_id(link: str) -> Optional[str]:
+    """
+    从商品链接中解析1688商品ID
+    :param link: 商品链接
+    :return: 商品ID，无法解析时返回None
+    """
+    if not link:
+        return None
+    for pattern in _OFFER_ID_PATTERNS:
+        match = pattern.search(link)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _normalize(text: str) -> str:
+    """全角转半角、小写并去除空白和标点"""
+    return _NORMALIZE_PATTERN.sub('', unicodedata.normalize('NFKC', text or '').lower())
+
+
+def product_key(product: Dict[str, Any]) -> Optional[str]:
+    """
+    计算商品的去重键
+    :param product: 商品信息字典
+    :return: 'offer:<商品ID>' 或 'hash:<标题+店铺的sha1>'，标题为空时返回None
+    """
+    offer_id = extract_offer_id(product.get('link', ''))
+    if offer_id:
+        return f"offer:{offer_id}"
+
+    title = _normalize(product.get('title', ''))
+    if not title:
+        return None
+    digest = hashlib.sha1(f"{title}|{_normalize(product.get('shop', ''))}".encode('utf-8')).hexdigest()
+    return f"hash:{digest}"
+
+
+def product_keys(products: Iterable[Dict[str, Any]]) -> List[str]:
+    """
+    计算一批商品的去重键（跳过无法计算键的商品）
+    :param products: 商品列表
+    :return: 去重键列表
+    """
+    return [key for key, _ in _unique_with_keys(products)]
+
+
+def dedup_batch(products: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    在一批商品内部去重（不访问持久化索引），保留首次出现的商品
+    :param products: 商品列表
+    :return: 去重后的商品列表
+    """
+    return [product for _, product in _unique_with_keys(products)]
+
+
+def _unique_with_keys(products: Iterable[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    seen = set()
+    result = []
+    for product in products:
+        key = product_key(product)
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+        result.append((key, product))
+    return result
+
+
+class DedupIndex:
+    """持久化商品去重索引"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS seen_products (
+            key          TEXT PRIMARY KEY,
+            keyword      TEXT NOT NULL DEFAULT '',
+            first_seen   REAL NOT NULL,
+            last_seen    REAL NOT NULL,
+            exported_at  REAL NOT NULL,
+            seen_count   INTEGER NOT NULL DEFAULT 1
+        );
+    """
+
+    _shared: Dict[str, 'DedupIndex'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None, config: CrawlerConfig = None):
+        """
+        初始化商品去重索引
+        :param db_path: 数据库文件路径，如果为None则使用配置中的默认路径
+        :param config: 爬虫配置对象
+        """
+        self.config = config or CrawlerConfig()
+        self.db_path = db_path or self.config.PATHS['dedup_db']
+        self.settings = self.config.DEDUP
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, timeout=self.settings['busy_timeout'],
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+        # 本实例累计跳过的重复商品数
+        self.skipped = 0
+        # 已由filter_new返回、尚未写入磁盘的商品键
+        self._pending = set()
+
+    @classmethod
+    def shared(cls, db_path: Optional[str] = None, config: CrawlerConfig = None) -> 'DedupIndex':
+        """
+        获取进程内共享的索引实例（同一数据库文件只打开一个连接）
+        :param db_path: 数据库文件路径
+        :param config: 爬虫配置对象
+        :return: 商品去重索引
+        """
+        config = config or CrawlerConfig()
+        key = os.path.abspath(db_path or config.PATHS['dedup_db'])
+        with cls._shared_lock:
+            index = cls._shared.get(key)
+            if index is None:
+                index = cls(key, config)
+                cls._shared[key] = index
+            return index
+
+    def filter_new(self, products: Iterable[Dict[str, Any]], keyword: str = '') -> List[Dict[str, Any]]:
+        """
+        过滤掉以前已导出过的商品（只查询，不写入索引）。
+        返回的商品在本进程内记为待导出，调用mark_exported或release之前不会被再次返回，
+        避免并发解析的页面在写入磁盘前重复导出同一商品；其他进程看不到待导出的商品
+        :param products: 商品列表
+        :param keyword: 搜索关键词
+        :return: 新商品列表
+        """
+        candidates = _unique_with_keys(products)
+        if not candidates:
+            return []
+
+        ttl_days = self.settings['ttl_days']
+        expire_before = time.time() - ttl_days * 86400 if ttl_days else None
+
+        with self._lock:
+            exported = self._lookup([key for key, _ in candidates])
+
+            new_items = []
+            repeated = 0
+            for key, product in candidates:
+                exported_at = exported.get(key)
+                expired = exported_at is None or (expire_before is not None and exported_at < expire_before)
+                if expired and key not in self._pending:
+                    new_items.append((key, product))
+                else:
+                    repeated += 1
+
+            self._pending.update(key for key, _ in new_items)
+            self.skipped += repeated
+
+        if repeated:
+            logging.info(f"关键词 '{keyword}' 跳过 {repeated} 个已导出的商品")
+        return [product for _, product in new_items]
+
+    def mark_exported(self, keys: Iterable[str], keyword: str = ''):
+        """
+        将商品记录为已导出，应在商品写入磁盘之后调用；写入前中断的商品不会被记录，下次运行仍会抓取
+        :param keys: 商品去重键（product_key）
+        :param keyword: 搜索关键词（记录首次发现商品的关键词）
+        """
+        keys = [key for key in dict.fromkeys(keys) if key]
+        if not keys:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("""
+                    INSERT INTO seen_products (key, keyword, first_seen, last_seen, exported_at, seen_count)
+                    VALUES (?, ?, ?, ?, ?, 1)
+                    ON CONFLICT(key) DO UPDATE SET
+                        last_seen = excluded.last_seen,
+                        exported_at = excluded.exported_at,
+                        seen_count = seen_count + 1
+                """, [(key, keyword, now, now, now) for key in keys])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pending.difference_update(keys)
+
+    def release(self, keys: Iterable[str]):
+        """
+        放弃待导出的商品（写入失败时调用），之后filter_new会再次返回它们
+        :param keys: 商品去重键
+        """
+        with self._lock:
+            self._pending.difference_update(keys)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, float]:
+        """查询键对应的导出时间"""
+        exported = {}
+        for start in range(0, len(keys), _QUERY_BATCH_SIZE):
+            batch = keys[start:start + _QUERY_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, exported_at FROM seen_products WHERE key IN ({placeholders})", batch)
+            exported.update(rows.fetchall())
+        return exported
+
+    def contains(self, product: Dict[str, Any]) -> bool:
+        """
+        检查商品是否已导出过（不修改索引）
+        :param product: 商品信息字典
+        :return: 是否已导出
+        """
+        key = product_key(product)
+        if key is None:
+            return False
+        with self._lock:
+            return bool(self._lookup([key]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_products").fetchone()[0]
+
+    def prune_expired(self) -> int:
+        """
+        删除超过TTL未再出现的记录
+        :return: 删除的记录数
+        """
+        ttl_days = self.settings['ttl_days']
+        if not ttl_days:
+            return 0
+
+        with self._lock:
+            return self._conn.execute("DELETE FROM seen_products WHERE last_seen < ?",
+                                      (time.time() - ttl_days * 86400,)).rowcount
+
+    def clear(self, keyword: Optional[str] = None) -> int:
+        """
+        清空索引
+        :param keyword: 只删除由该关键词首次发现的商品，为None时全部删除
+        :return: 删除的记录数
+        """
+        with self._lock:
+            if keyword is None:
+                return self._conn.execute("DELETE FROM seen_products").rowcount
+            return self._conn.execute("DELETE FROM seen_products WHERE keyword = ?", (keyword,)).rowcount
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
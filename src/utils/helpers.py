@@ -5,28 +5,36 @@
 """
 
 import os
+import re
 import time
+import functools
 import random
 import logging
 from datetime import datetime
-from selenium import webdriver
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional, Tuple
 
+from .profiler import get_profiler
 
-def get_random_delay(min_seconds: float = 2, max_seconds: float = 5) -> float:
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+def get_random_delay(min_seconds: float = 2, max_seconds: float = 5, sleep: bool = True) -> float:
     """
     获取随机延迟时间并执行等待
     :param min_seconds: 最小等待秒数
     :param max_seconds: 最大等待秒数
+    :param sleep: 是否执行等待，为False时只返回延迟时间（由调用方自行等待，如asyncio.sleep）
     :return: 实际等待的秒数
     """
     delay = random.uniform(min_seconds, max_seconds)
-    print(f"等待 {delay:.2f} 秒...")
-    time.sleep(delay)
+    if sleep:
+        print(f"等待 {delay:.2f} 秒...")
+        time.sleep(delay)
     return delay
 
 
-def save_page_source(driver: webdriver.Chrome, filename: str, directory: str = "html") -> bool:
+def save_page_source(driver: 'webdriver.Chrome', filename: str, directory: str = "html") -> bool:
     """
     保存页面源代码用于调试
     :param driver: WebDriver实例
@@ -126,6 +134,69 @@ def format_price(price_text: str) -> str:
     return price
 
 
+_NUMBER = r'\d+(?:\.\d+)?'
+_RANGE_SEPARATOR = r'\s*[-~～至]\s*[¥￥]?\s*'
+# 价格只取货币符号后的数字或区间（如 "¥4\n售1.1万+\n件" 中的4），或以数字/区间开头的纯价格文本
+_CURRENCY_PRICE_PATTERN = re.compile(rf'[¥￥]\s*({_NUMBER})(?:{_RANGE_SEPARATOR}({_NUMBER}))?')
+_BARE_PRICE_PATTERN = re.compile(rf'^\s*({_NUMBER})(?:{_RANGE_SEPARATOR}({_NUMBER}))?\s*元?(?=\s|$)')
+_UNIT = r'\s*(万|w|W|千|k|K)?'
+# 销量必须紧跟"售/已售/成交/月销"之后，或位于"人付款/笔成交"等之前，避免把"3天内发货"当作销量
+_SALES_PATTERNS = [
+    re.compile(rf'(?:已售|售出|售|成交|月销|销量)\s*[:：]?\s*({_NUMBER}){_UNIT}'),
+    re.compile(rf'({_NUMBER}){_UNIT}\s*\+?\s*(?:人付款|人已付款|人成交|笔成交|件已售)'),
+    re.compile(rf'^\s*({_NUMBER}){_UNIT}\s*\+?\s*$'),
+]
+_SALES_UNITS = {'万': 10000, 'w': 10000, 'W': 10000, '千': 1000, 'k': 1000, 'K': 1000}
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """
+    解析接口返回的价格或销量值（支持数值和 "1.2万+" 这样的文本）
+    :param value: 原始值
+    :return: 数值，无法解析时返回None
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = re.search(rf'({_NUMBER}){_UNIT}', str(value or '').replace(',', ''))
+    if not match:
+        return None
+    return float(match.group(1)) * _SALES_UNITS.get(match.group(2), 1)
+
+
+def parse_price(price_text: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    解析价格文本为数值区间，如 "￥1,299.00"、"¥10.5-20" 或 "¥4\n售1.1万+\n件"（只取货币符号后的价格）
+    :param price_text: 价格文本
+    :return: (最低价, 最高价)，无法解析时为 (None, None)
+    """
+    if not price_text:
+        return None, None
+
+    text = str(price_text).replace(',', '')
+    match = _CURRENCY_PRICE_PATTERN.search(text) or _BARE_PRICE_PATTERN.match(text)
+    if not match:
+        return None, None
+    numbers = [float(value) for value in match.groups() if value is not None]
+    return min(numbers), max(numbers)
+
+
+def parse_sales(sales_text: str) -> Optional[int]:
+    """
+    解析销量文本为整数，如 "100+人付款"、"成交1.2万件"、"¥4\n售1.1万+\n件"
+    :param sales_text: 销量文本
+    :return: 销量，无法解析时返回None
+    """
+    if not sales_text:
+        return None
+
+    text = str(sales_text).replace(',', '')
+    for pattern in _SALES_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return int(round(float(match.group(1)) * _SALES_UNITS.get(match.group(2), 1)))
+    return None
+
+
 def clean_text(text: str) -> str:
     """
     清理文本，移除多余的空白字符和特殊字符
@@ -242,17 +313,22 @@ def log_function_call(func_name: str, *args, **kwargs):
 
 def measure_execution_time(func):
     """
-    装饰器：测量函数执行时间
+    装饰器：测量函数执行时间，启用性能分析时同时记录为以函数名命名的阶段
     :param func: 要测量的函数
     :return: 装饰后的函数
     """
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"函数 {func.__name__} 执行时间: {execution_time:.2f} 秒")
-        return result
+        start_time = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = func(*args, **kwargs)
+            outcome = 'ok'
+            return result
+        finally:
+            execution_time = time.perf_counter() - start_time
+            print(f"函数 {func.__name__} 执行时间: {execution_time:.2f} 秒")
+            get_profiler().record(func.__qualname__, execution_time, outcome)
     return wrapper
 
 
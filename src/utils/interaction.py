@@ -0,0 +1,82 @@
+"""
+用户交互策略模块
+
+统一处理流程中的人工确认：交互模式下读取用户输入，
+无人值守模式下按策略自动决策并记录日志，从不读取stdin
+"""
+
+import sys
+import logging
+
+from ..core.config import CrawlerConfig
+
+
+def stdin_is_interactive() -> bool:
+    """检查标准输入是否连接到终端"""
+    try:
+        return sys.stdin is not None and sys.stdin.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+class InteractionPolicy:
+    """人工确认策略"""
+
+    def __init__(self, config: CrawlerConfig = None):
+        """
+        初始化人工确认策略
+        :param config: 爬虫配置对象
+        """
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.UNATTENDED
+
+    @property
+    def unattended(self) -> bool:
+        """是否处于无人值守模式（配置开启，或配置允许时标准输入不是终端）"""
+        if self.settings['enabled']:
+            return True
+        return self.settings['auto_detect'] and not stdin_is_interactive()
+
+    def ask(self, prompt: str, auto_answer: str, reason: str = '') -> str:
+        """
+        询问用户；无人值守时直接返回自动决策
+        :param prompt: 提示文本
+        :param auto_answer: 无人值守模式下的回答
+        :param reason: 自动决策的依据（写入日志）
+        :return: 用户输入或自动决策（已去除首尾空白）
+        """
+        if not self.unattended:
+            try:
+                return input(prompt).strip()
+            except EOFError:
+                # 标准输入被关闭，按无人值守处理
+                pass
+
+        self.log_decision(prompt, auto_answer, reason)
+        return auto_answer
+
+    def pause(self, prompt: str, reason: str = '') -> bool:
+        """
+        等待用户按Enter继续；无人值守时不等待
+        :param prompt: 提示文本
+        :param reason: 跳过等待的依据（写入日志）
+        :return: 是否实际等待了用户
+        """
+        if not self.unattended:
+            try:
+                input(prompt)
+                return True
+            except EOFError:
+                pass
+
+        self.log_decision(prompt, '继续', reason)
+        return False
+
+    @staticmethod
+    def log_decision(prompt: str, decision: str, reason: str = ''):
+        """记录自动决策"""
+        message = f"[无人值守] {prompt.strip()} -> {decision}"
+        if reason:
+            message += f" ({reason})"
+        print(message)
+        logging.info(message)
@@ -0,0 +1,32 @@
+"""
+延迟导入工具
+
+各包的__init__通过模块级__getattr__（PEP 562）按需导入子模块，
+导入包或其中的轻量模块（如配置、抓取日志）时不会连带加载selenium、pandas等耗时依赖
+"""
+
+import sys
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    生成包的__getattr__和__dir__：首次访问导出名称时才导入对应子模块
+    :param package: 包名（传入__name__）
+    :param exports: 导出名称 -> 子模块相对名称（如 '.crawler'）
+    :return: (__getattr__, __dir__)
+    """
+    def __getattr__(name: str):
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # 缓存到包的命名空间，之后的访问不再经过__getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
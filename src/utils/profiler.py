@@ -0,0 +1,372 @@
+"""
+抓取流程性能分析模块
+
+按阶段（导航、清理弹窗、滚动、提取、导出等）记录耗时、WebDriver命令数和结果，
+按关键词汇总，并可导出为JSON或Prometheus文本格式
+"""
+
+import os
+import json
+import time
+import logging
+import functools
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from ..core.config import CrawlerConfig
+
+
+_profiler: Optional['CrawlProfiler'] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> 'CrawlProfiler':
+    """
+    获取进程内共享的性能分析器
+    :return: 性能分析器
+    """
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = CrawlProfiler()
+        return _profiler
+
+
+def profiled(stage: str) -> Callable:
+    """
+    装饰器：将函数调用记录为指定阶段的span
+    返回False视为失败；同一线程内嵌套调用同一阶段时只记录最外层
+    :param stage: 阶段名
+    :return: 装饰器
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+
+            with profiler.span(stage) as span:
+                result = func(*args, **kwargs)
+                if span is not None and result is False:
+                    span['outcome'] = 'failed'
+                return result
+        return wrapper
+    return decorator
+
+
+def keyword_profiled(func: Callable) -> Callable:
+    """
+    装饰器：用于第一个参数为keyword的搜索方法，整个调用记录为该关键词的 'keyword' 阶段，
+    期间的所有span都归属于该关键词
+    :param func: 要测量的方法
+    :return: 装饰后的方法
+    """
+    @functools.wraps(func)
+    def wrapper(self, keyword, *args, **kwargs):
+        profiler = get_profiler()
+        if not profiler.enabled:
+            return func(self, keyword, *args, **kwargs)
+
+        with profiler.keyword_scope(keyword), profiler.span('keyword') as span:
+            result = func(self, keyword, *args, **kwargs)
+            if span is not None and not result:
+                span['outcome'] = 'empty'
+            return result
+    return wrapper
+
+
+def _escape_label(value: Any) -> str:
+    """转义Prometheus标签值"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class CrawlProfiler:
+    """抓取流程性能分析器"""
+
+    def __init__(self, config: CrawlerConfig = None):
+        """
+        初始化性能分析器
+        :param config: 爬虫配置对象
+        """
+        self.config = config or CrawlerConfig()
+        self.settings = self.config.PROFILING
+
+        self.spans: Deque[Dict[str, Any]] = deque(maxlen=self.settings['max_spans'])
+        self.command_counts: Counter = Counter()
+        self._stats: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started_at = time.time()
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用（读取配置，运行时修改配置立即生效）"""
+        return bool(self.settings['enabled'])
+
+    # ---------- 线程上下文 ----------
+
+    def _state(self) -> threading.local:
+        state = self._local
+        if not hasattr(state, 'stack'):
+            state.stack = []
+            state.keyword = ''
+            state.commands = 0
+        return state
+
+    @contextmanager
+    def keyword_scope(self, keyword: str) -> Iterator[None]:
+        """
+        设置当前线程的关键词，之后的span都归属于该关键词
+        :param keyword: 搜索关键词
+        """
+        state = self._state()
+        previous = state.keyword
+        state.keyword = keyword
+        try:
+            yield
+        finally:
+            state.keyword = previous
+
+    @contextmanager
+    def span(self, stage: str, keyword: Optional[str] = None) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        记录一个阶段的耗时、WebDriver命令数和结果
+        可以在with块中设置 span['outcome'] 标记结果，抛出异常时记为 'error'
+        :param stage: 阶段名
+        :param keyword: 关键词，如果为None则使用当前线程的关键词
+        :return: span字典；未启用或同阶段嵌套时为None
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        state = self._state()
+        if stage in state.stack:
+            yield None
+            return
+
+        span = {
+            'stage': stage,
+            'keyword': keyword if keyword is not None else state.keyword,
+            'parent': state.stack[-1] if state.stack else None,
+            'thread': threading.current_thread().name,
+            'started_at': time.time(),
+            'outcome': 'ok'
+        }
+        start = time.perf_counter()
+        commands_before = state.commands
+        state.stack.append(stage)
+        try:
+            yield span
+        except BaseException:
+            span['outcome'] = 'error'
+            raise
+        finally:
+            state.stack.pop()
+            span['duration'] = time.perf_counter() - start
+            span['webdriver_commands'] = state.commands - commands_before
+            self._record(span)
+
+    def record(self, stage: str, duration: float, outcome: str = 'ok', keyword: Optional[str] = None):
+        """
+        直接记录一个已测量的阶段（用于无法使用with的场景）
+        :param stage: 阶段名
+        :param duration: 耗时（秒）
+        :param outcome: 结果
+        :param keyword: 关键词，如果为None则使用当前线程的关键词
+        """
+        if not self.enabled:
+            return
+        state = self._state()
+        self._record({
+            'stage': stage,
+            'keyword': keyword if keyword is not None else state.keyword,
+            'parent': state.stack[-1] if state.stack else None,
+            'thread': threading.current_thread().name,
+            'started_at': time.time() - duration,
+            'outcome': outcome,
+            'duration': duration,
+            'webdriver_commands': 0
+        })
+
+    def _record(self, span: Dict[str, Any]):
+        key = (span['keyword'], span['stage'])
+        with self._lock:
+            self.spans.append(span)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = {'count': 0, 'total': 0.0, 'max': 0.0, 'webdriver_commands': 0, 'outcomes': Counter()}
+                self._stats[key] = stats
+            stats['count'] += 1
+            stats['total'] += span['duration']
+            stats['max'] = max(stats['max'], span['duration'])
+            stats['webdriver_commands'] += span['webdriver_commands']
+            stats['outcomes'][span['outcome']] += 1
+
+        logging.debug(f"[profile] {span['keyword'] or '-'} {span['stage']} "
+                      f"{span['duration']:.3f}s cmds={span['webdriver_commands']} {span['outcome']}")
+
+    # ---------- WebDriver命令统计 ----------
+
+    def instrument_driver(self, driver):
+        """
+        包装driver.execute，统计每个线程发出的WebDriver命令数
+        :param driver: WebDriver实例
+        :return: 同一个WebDriver实例
+        """
+        if getattr(driver, '_profiler_instrumented', False):
+            return driver
+
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            if self.enabled:
+                self._state().commands += 1
+                with self._lock:
+                    self.command_counts[driver_command] += 1
+            return original_execute(driver_command, params)
+
+        driver.execute = execute
+        driver._profiler_instrumented = True
+        return driver
+
+    # ---------- 汇总和导出 ----------
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        按关键词和阶段汇总
+        :return: {关键词: {阶段: {'count', 'total', 'mean', 'max', 'webdriver_commands', 'outcomes'}}}
+        """
+        with self._lock:
+            items = [(key, dict(stats, outcomes=dict(stats['outcomes']))) for key, stats in self._stats.items()]
+
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (keyword, stage), stats in sorted(items, key=lambda item: (item[0][0], -item[1]['total'])):
+            stats['mean'] = stats['total'] / stats['count'] if stats['count'] else 0.0
+            result.setdefault(keyword or '-', {})[stage] = stats
+        return result
+
+    def print_summary(self):
+        """打印各关键词的阶段耗时汇总"""
+        summary = self.summary()
+        if not summary:
+            print("没有性能分析数据")
+            return
+
+        print("\n⏱️ 阶段耗时汇总:")
+        for keyword, stages in summary.items():
+            print(f"\n  关键词: {keyword}")
+            print(f"    {'阶段':<14}{'次数':>6}{'总耗时(s)':>12}{'平均(s)':>10}{'最大(s)':>10}{'命令数':>8}  结果")
+            for stage, stats in stages.items():
+                outcomes = ', '.join(f"{name}={count}" for name, count in stats['outcomes'].items())
+                print(f"    {stage:<14}{stats['count']:>6}{stats['total']:>12.2f}{stats['mean']:>10.2f}"
+                      f"{stats['max']:>10.2f}{stats['webdriver_commands']:>8}  {outcomes}")
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        导出为JSON可序列化的字典
+        :return: 包含汇总、span明细和WebDriver命令统计的字典
+        """
+        with self._lock:
+            spans = list(self.spans)
+            commands = dict(self.command_counts)
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(),
+            'exported_at': datetime.now().isoformat(),
+            'summary': self.summary(),
+            'webdriver_commands': commands,
+            'spans': spans
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        导出为Prometheus文本格式
+        :return: 指标文本
+        """
+        summary = self.summary()
+        with self._lock:
+            commands = dict(self.command_counts)
+
+        lines = [
+            '# HELP crawler_stage_duration_seconds Time spent in each crawl stage.',
+            '# TYPE crawler_stage_duration_seconds summary'
+        ]
+        for keyword, stages in summary.items():
+            for stage, stats in stages.items():
+                labels = f'keyword="{_escape_label(keyword)}",stage="{_escape_label(stage)}"'
+                lines.append(f'crawler_stage_duration_seconds_sum{{{labels}}} {stats["total"]:.6f}')
+                lines.append(f'crawler_stage_duration_seconds_count{{{labels}}} {stats["count"]}')
+
+        lines += [
+            '# HELP crawler_stage_webdriver_commands_total WebDriver commands issued within each crawl stage.',
+            '# TYPE crawler_stage_webdriver_commands_total counter'
+        ]
+        for keyword, stages in summary.items():
+            for stage, stats in stages.items():
+                labels = f'keyword="{_escape_label(keyword)}",stage="{_escape_label(stage)}"'
+                lines.append(f'crawler_stage_webdriver_commands_total{{{labels}}} {stats["webdriver_commands"]}')
+
+        lines += [
+            '# HELP crawler_stage_outcomes_total Crawl stage results by outcome.',
+            '# TYPE crawler_stage_outcomes_total counter'
+        ]
+        for keyword, stages in summary.items():
+            for stage, stats in stages.items():
+                for outcome, count in stats['outcomes'].items():
+                    labels = (f'keyword="{_escape_label(keyword)}",stage="{_escape_label(stage)}",'
+                              f'outcome="{_escape_label(outcome)}"')
+                    lines.append(f'crawler_stage_outcomes_total{{{labels}}} {count}')
+
+        lines += [
+            '# HELP crawler_webdriver_commands_total WebDriver commands by command name.',
+            '# TYPE crawler_webdriver_commands_total counter'
+        ]
+        for command, count in sorted(commands.items()):
+            lines.append(f'crawler_webdriver_commands_total{{command="{_escape_label(command)}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, output_dir: Optional[str] = None, formats: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        将分析结果写入文件
+        :param output_dir: 输出目录，如果为None则使用配置中的默认目录
+        :param formats: 导出格式列表，支持 'json' 和 'prometheus'
+        :return: 格式到文件路径的映射字典
+        """
+        output_dir = output_dir or self.config.PATHS['profiles']
+        formats = formats or self.settings['export_formats']
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        results = {}
+        for format_type in formats:
+            try:
+                if format_type == 'json':
+                    filepath = os.path.join(output_dir, f"profile_{timestamp}.json")
+                    with open(filepath, 'w', encoding='utf-8') as f:
+                        json.dump(self.to_json(), f, ensure_ascii=False, indent=2)
+                elif format_type == 'prometheus':
+                    filepath = os.path.join(output_dir, f"profile_{timestamp}.prom")
+                    with open(filepath, 'w', encoding='utf-8') as f:
+                        f.write(self.to_prometheus())
+                else:
+                    print(f"不支持的性能分析导出格式: {format_type}")
+                    continue
+                results[format_type] = filepath
+            except Exception as e:
+                print(f"导出性能分析结果时出错: {e}")
+                logging.error(f"导出性能分析结果({format_type})时出错: {e}")
+
+        return results
+
+    def reset(self):
+        """清空已记录的数据"""
+        with self._lock:
+            self.spans.clear()
+            self.command_counts.clear()
+            self._stats.clear()
+            self.started_at = time.time()
@@ -0,0 +1,156 @@
+"""
+访问频率控制模块
+
+将礼貌性访问间隔与页面就绪等待分离：只在两次导航间隔不足时补足剩余时间；
+并发抓取时按主机使用令牌桶，在全局范围内控制访问频率
+"""
+
+import time
+import random
+import asyncio
+import threading
+from urllib.parse import urlparse
+from typing import Dict, Optional, Tuple
+
+from ..core.config import CrawlerConfig
+from .helpers import get_random_delay
+
+
+class RateLimiter:
+    """导航间隔控制器"""
+
+    def __init__(self, min_interval: float, max_interval: Optional[float] = None):
+        """
+        初始化导航间隔控制器
+        :param min_interval: 两次导航之间的最小间隔（秒）
+        :param max_interval: 最大间隔（秒），每次在[min, max]之间随机取值
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval or min_interval, min_interval)
+        self._last_time = 0.0
+        self._next_interval = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: CrawlerConfig = None) -> 'RateLimiter':
+        """
+        根据配置创建
+        :param config: 爬虫配置对象
+        :return: 导航间隔控制器
+        """
+        config = config or CrawlerConfig()
+        return cls(config.RATE_LIMIT['min_interval'], config.RATE_LIMIT['max_interval'])
+
+    def wait(self) -> float:
+        """
+        等待到允许下一次导航，页面加载和解析所用时间计入间隔
+        :return: 实际等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = self._last_time + self._next_interval - now
+            if delay > 0:
+                print(f"访问间隔控制，等待 {delay:.2f} 秒...")
+                time.sleep(delay)
+            else:
+                delay = 0.0
+
+            self._last_time = time.monotonic()
+            self._next_interval = random.uniform(self.min_interval, self.max_interval)
+            return delay
+
+    def reset(self):
+        """清除上次导航记录，下一次导航不等待"""
+        with self._lock:
+            self._last_time = 0.0
+            self._next_interval = 0.0
+
+
+class AsyncTokenBucket:
+    """asyncio令牌桶：平均每秒rate个请求，允许capacity个突发"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        初始化令牌桶
+        :param rate: 每秒补充的令牌数
+        :param capacity: 桶容量（允许的突发请求数）
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        取得一个令牌，不足时按先来先得等待
+        :return: 等待的秒数
+        """
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= 1
+        return waited
+
+
+class HostRateLimiter:
+    """按主机分别限速的异步访问频率控制器（www.1688.com 与 global.1688.com 各自独立计算）"""
+
+    def __init__(self, rate: float, burst: float = 1, jitter: Tuple[float, float] = (0.0, 0.0),
+                 per_host: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        初始化按主机限速的控制器
+        :param rate: 每个主机默认每秒允许的请求数
+        :param burst: 每个主机默认允许的突发请求数
+        :param jitter: 取得令牌后额外随机等待的范围（秒）
+        :param per_host: 按主机覆盖的 {'rate', 'burst'}
+        """
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.per_host = per_host or {}
+        self._buckets: Dict[str, AsyncTokenBucket] = {}
+
+    @classmethod
+    def from_config(cls, config: CrawlerConfig = None) -> 'HostRateLimiter':
+        """
+        根据配置创建，默认速率取RATE_LIMIT的平均导航间隔，与串行抓取的礼貌程度一致
+        :param config: 爬虫配置对象
+        :return: 按主机限速的控制器
+        """
+        config = config or CrawlerConfig()
+        settings = config.RATE_LIMIT
+        mean_interval = (settings['min_interval'] + settings['max_interval']) / 2.0
+        return cls(1.0 / max(mean_interval, 0.01), settings['burst'], tuple(settings['jitter']),
+                   settings['per_host'])
+
+    def bucket(self, host: str) -> AsyncTokenBucket:
+        """获取主机对应的令牌桶"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            settings = self.per_host.get(host, {})
+            bucket = AsyncTokenBucket(settings.get('rate', self.rate), settings.get('burst', self.burst))
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str) -> float:
+        """
+        等待到允许访问该URL所在主机
+        :param url: 目标URL
+        :return: 等待的总秒数（含随机抖动）
+        """
+        waited = await self.bucket(urlparse(url).netloc.lower()).acquire()
+        jitter = get_random_delay(self.jitter[0], self.jitter[1], sleep=False)
+        if jitter > 0:
+            await asyncio.sleep(jitter)
+        return waited + jitter
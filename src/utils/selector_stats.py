@@ -0,0 +1,325 @@
+"""
+选择器命中统计模块
+
+按站点（www/global）记录每个商品卡片选择器的尝试次数、命中次数和命中数量，
+据此调整探测顺序：近期命中率高的选择器优先，长期未命中的选择器排到最后并只定期重新探测。
+统计保存在SQLite中，跨运行保留
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from urllib.parse import urlparse
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..core.config import CrawlerConfig
+
+
+# 站点标识
+SITES = ('www', 'global')
+
+
+def site_key(url: str) -> str:
+    """
+    根据URL确定站点标识
+    :param url: 页面URL或站点基础URL
+    :return: 'global' 或 'www'
+    """
+    host = urlparse(url or '').netloc.lower()
+    return 'global' if host.startswith('global.') else 'www'
+
+
+def current_site(driver: Any, default_url: str = '') -> str:
+    """
+    浏览器当前页面所在的站点（统计按实际加载的页面记录，如global模板命中时记到global）
+    :param driver: WebDriver实例
+    :param default_url: 无法读取当前URL时使用的URL（通常为配置的站点基础URL）
+    :return: 'global' 或 'www'
+    """
+    try:
+        url = driver.current_url
+    except Exception as e:
+        logging.debug(f"读取当前URL失败: {e}")
+        url = ''
+    return site_key(url if url.startswith('http') else default_url)
+
+
+def get_selector_stats(config: CrawlerConfig = None) -> Optional['SelectorStats']:
+    """
+    获取共享的选择器统计；未启用选择器排序时返回None
+    :param config: 爬虫配置对象
+    :return: 选择器统计或None
+    """
+    config = config or CrawlerConfig()
+    if not config.SELECTOR_RANKING['enabled']:
+        return None
+    try:
+        return SelectorStats.shared(config=config)
+    except Exception as e:
+        logging.error(f"打开选择器统计失败，按配置顺序探测: {e}")
+        return None
+
+
+def probe_selectors(selectors: Sequence[str], find: Callable[[str], list], site: str = 'www',
+                    kind: str = 'standard', stats: Optional['SelectorStats'] = None) -> Tuple[Optional[str], list]:
+    """
+    按排序依次探测选择器，第一个有结果的选择器命中后停止；
+    全部未命中时不记录（多半是页面本身没有商品，如登录页）
+    :param selectors: 配置中的选择器列表
+    :param find: 查找函数，参数为选择器，返回元素列表；抛出异常视为未命中
+    :param site: 站点标识
+    :param kind: 选择器类别（standard/xpath/broad，分别统计）
+    :param stats: 选择器统计，为None时按配置顺序探测且不记录
+    :return: (命中的选择器, 元素列表)，都未命中时返回 (None, [])
+    """
+    ordered = stats.rank(site, selectors, kind) if stats else list(selectors)
+
+    tried = []
+    for selector in ordered:
+        tried.append(selector)
+        try:
+            elements = find(selector)
+        except Exception as e:
+            logging.debug(f"选择器 '{selector}' 查找出错: {e}")
+            continue
+        if elements:
+            if stats:
+                stats.record_probe(site, tried, selector, len(elements), kind)
+            return selector, elements
+
+    return None, []
+
+
+class SelectorStats:
+    """选择器命中统计存储"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS selector_stats (
+            site         TEXT NOT NULL,
+            kind         TEXT NOT NULL,
+            selector     TEXT NOT NULL,
+            attempts     INTEGER NOT NULL DEFAULT 0,
+            hits         INTEGER NOT NULL DEFAULT 0,
+            total_yield  INTEGER NOT NULL DEFAULT 0,
+            recent_rate  REAL NOT NULL DEFAULT 0.5,
+            last_hit     REAL,
+            updated_at   REAL NOT NULL,
+            PRIMARY KEY (site, kind, selector)
+        );
+    """
+
+    _shared: Dict[str, 'SelectorStats'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None, config: CrawlerConfig = None):
+        """
+        初始化选择器统计存储
+        :param db_path: 数据库文件路径，如果为None则使用配置中的默认路径
+        :param config: 爬虫配置对象
+        """
+        self.config = config or CrawlerConfig()
+        self.db_path = db_path or self.config.PATHS['selector_stats_db']
+        self.settings = self.config.SELECTOR_RANKING
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, timeout=self.settings['busy_timeout'],
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+        # 启动时载入内存，排序只读内存；写入以增量方式落库，多进程同时更新时计数不丢失
+        self._stats: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._probe_counts: Dict[Tuple[str, str], int] = {}
+        for row in self._conn.execute("SELECT * FROM selector_stats"):
+            self._stats[(row['site'], row['kind'], row['selector'])] = {
+                'attempts': row['attempts'], 'hits': row['hits'],
+                'total_yield': row['total_yield'], 'recent_rate': row['recent_rate'],
+                'last_hit': row['last_hit']
+            }
+
+    @classmethod
+    def shared(cls, db_path: Optional[str] = None, config: CrawlerConfig = None) -> 'SelectorStats':
+        """
+        获取进程内共享的统计实例
+        :param db_path: 数据库文件路径
+        :param config: 爬虫配置对象
+        :return: 选择器统计存储
+        """
+        config = config or CrawlerConfig()
+        key = os.path.abspath(db_path or config.PATHS['selector_stats_db'])
+        with cls._shared_lock:
+            stats = cls._shared.get(key)
+            if stats is None:
+                stats = cls(key, config)
+                cls._shared[key] = stats
+            return stats
+
+    # ---------- 排序 ----------
+
+    @staticmethod
+    def _score(record: Optional[Dict[str, Any]]) -> float:
+        """近期命中率（指数滑动平均），未探测过的选择器为0.5"""
+        return record['recent_rate'] if record else 0.5
+
+    def _is_stale(self, record: Optional[Dict[str, Any]]) -> bool:
+        """探测次数足够多且近期几乎不命中（从未命中，或页面改版后失效）"""
+        return (bool(record) and record['attempts'] >= self.settings['stale_after']
+                and record['recent_rate'] < self.settings['stale_rate'])
+
+    def rank(self, site: str, selectors: Sequence[str], kind: str = 'standard', advance: bool = True) -> List[str]:
+        """
+        按命中率排序选择器，命中率相同时保持配置顺序；
+        失效的选择器默认不参与探测，每隔explore_interval次探测才放回队尾重新验证
+        :param site: 站点标识
+        :param selectors: 配置中的选择器列表
+        :param kind: 选择器类别
+        :param advance: 是否计为一次探测；只借用排序、不记录结果的调用（页面状态快照、就绪等待）传False，
+                        此时不推进重新验证计数，失效的选择器始终排在队尾
+        :return: 排序后的选择器列表
+        """
+        with self._lock:
+            records = [self._stats.get((site, kind, selector)) for selector in selectors]
+            count = self._probe_counts.get((site, kind), 0)
+            if advance:
+                count += 1
+                self._probe_counts[(site, kind)] = count
+
+        explore = not advance or count % self.settings['explore_interval'] == 0
+        active = []
+        stale = []
+        for position, (selector, record) in enumerate(zip(selectors, records)):
+            if self._is_stale(record):
+                stale.append(selector)
+            else:
+                active.append((-self._score(record), position, selector))
+
+        ordered = [selector for _, _, selector in sorted(active)]
+        if explore or not ordered:
+            ordered.extend(stale)
+        return ordered
+
+    # ---------- 记录 ----------
+
+    def record_probe(self, site: str, tried: Sequence[str], hit: Optional[str], yield_count: int = 0,
+                     kind: str = 'standard'):
+        """
+        记录一次探测：tried中命中选择器之前的都记为未命中
+        :param site: 站点标识
+        :param tried: 按探测顺序实际尝试过的选择器
+        :param hit: 命中的选择器，全部未命中时为None
+        :param yield_count: 命中选择器找到的元素数量
+        :param kind: 选择器类别
+        """
+        now = time.time()
+        alpha = self.settings['decay']
+        rows = []
+        with self._lock:
+            for selector in tried:
+                is_hit = selector == hit
+                record = self._stats.setdefault((site, kind, selector), {
+                    'attempts': 0, 'hits': 0, 'total_yield': 0, 'recent_rate': 0.5, 'last_hit': None
+                })
+                record['attempts'] += 1
+                record['recent_rate'] = record['recent_rate'] * (1 - alpha) + alpha * int(is_hit)
+                if is_hit:
+                    record['hits'] += 1
+                    record['total_yield'] += yield_count
+                    record['last_hit'] = now
+                rows.append((site, kind, selector, int(is_hit), yield_count if is_hit else 0,
+                             0.5 * (1 - alpha) + alpha * int(is_hit), now if is_hit else None, now,
+                             1 - alpha, alpha))
+
+            if not rows:
+                return
+            try:
+                self._conn.executemany("""
+                    INSERT INTO selector_stats
+                        (site, kind, selector, attempts, hits, total_yield, recent_rate, last_hit, updated_at)
+                    VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)
+                    ON CONFLICT(site, kind, selector) DO UPDATE SET
+                        attempts = attempts + 1,
+                        hits = hits + excluded.hits,
+                        total_yield = total_yield + excluded.total_yield,
+                        recent_rate = recent_rate * ? + ? * excluded.hits,
+                        last_hit = COALESCE(excluded.last_hit, last_hit),
+                        updated_at = excluded.updated_at
+                """, rows)
+            except sqlite3.Error as e:
+                # 统计写入失败不影响抓取
+                logging.error(f"保存选择器统计失败: {e}")
+
+    def record_ordered_hit(self, site: str, ordered: Sequence[str], hit: str, yield_count: int = 0,
+                           kind: str = 'standard'):
+        """
+        记录一次在浏览器端按顺序完成的探测（如单次脚本或单次遍历），
+        命中选择器之前的选择器记为未命中，之后的不记录
+        :param site: 站点标识
+        :param ordered: 探测时使用的选择器顺序
+        :param hit: 命中的选择器
+        :param yield_count: 命中选择器找到的元素数量
+        :param kind: 选择器类别
+        """
+        ordered = list(ordered)
+        if hit not in ordered:
+            return
+        self.record_probe(site, ordered[:ordered.index(hit) + 1], hit, yield_count, kind)
+
+    # ---------- 查询和维护 ----------
+
+    def summary(self, site: Optional[str] = None, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        获取统计汇总（按站点、类别、命中率排序）
+        :param site: 只返回该站点，为None时返回全部
+        :param kind: 只返回该类别，为None时返回全部
+        :return: 统计记录列表
+        """
+        with self._lock:
+            items = list(self._stats.items())
+
+        result = []
+        for (record_site, record_kind, selector), record in items:
+            if (site and record_site != site) or (kind and record_kind != kind):
+                continue
+            attempts = record['attempts']
+            result.append({
+                'site': record_site,
+                'kind': record_kind,
+                'selector': selector,
+                'attempts': attempts,
+                'hits': record['hits'],
+                'hit_rate': record['hits'] / attempts if attempts else 0.0,
+                'recent_rate': record['recent_rate'],
+                'avg_yield': record['total_yield'] / record['hits'] if record['hits'] else 0.0,
+                'last_hit': record['last_hit'],
+                'stale': self._is_stale(record)
+            })
+        return sorted(result, key=lambda item: (item['site'], item['kind'], -item['recent_rate']))
+
+    def reset(self, site: Optional[str] = None) -> int:
+        """
+        清除统计（页面改版后重新学习）
+        :param site: 只清除该站点，为None时全部清除
+        :return: 删除的记录数
+        """
+        with self._lock:
+            if site is None:
+                count = self._conn.execute("DELETE FROM selector_stats").rowcount
+                self._stats.clear()
+            else:
+                count = self._conn.execute("DELETE FROM selector_stats WHERE site = ?", (site,)).rowcount
+                self._stats = {key: value for key, value in self._stats.items() if key[0] != site}
+            self._probe_counts.clear()
+        return count
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,256 @@
+"""
+流式导出模块
+
+按页追加写入商品数据（JSONL/CSV），分批刷新到磁盘，
+运行中断时已写入的数据仍然可用；结束时再从JSONL流式转换为Excel/JSON/Parquet
+"""
+
+import os
+import csv
+import json
+import logging
+import textwrap
+import threading
+from typing import List, Dict, Any, Iterator, Optional, Iterable
+
+from ..core.config import CrawlerConfig
+from .profiler import get_profiler
+
+
+class ProductStreamSink:
+    """商品流式导出器"""
+
+    # 结束时从JSONL转换时每批读取的记录数
+    CHUNK_SIZE = 1000
+
+    def __init__(self, exporter, keyword: str = 'products', output_dir: Optional[str] = None,
+                 formats: Optional[List[str]] = None, batch_size: Optional[int] = None,
+                 paths: Optional[Dict[str, str]] = None):
+        """
+        初始化流式导出器
+        :param exporter: DataExporter实例（用于数据校验和生成文件路径）
+        :param keyword: 搜索关键词，用于生成文件名
+        :param output_dir: 输出目录，如果为None则JSONL放在json目录、CSV放在excel目录
+        :param formats: 追加写入的格式，支持 'jsonl' 和 'csv'，JSONL始终写入（用于结束时转换）
+        :param batch_size: 缓冲多少条记录后刷新到磁盘
+        :param paths: 续抓时沿用的文件路径（格式到路径的映射），已有的记录保留并继续追加
+        """
+        self.exporter = exporter
+        self.config: CrawlerConfig = exporter.config
+        self.keyword = keyword
+        self.output_dir = output_dir
+        self.batch_size = batch_size or self.config.EXPORT_CONFIG['stream_batch_size']
+
+        formats = [f.lower() for f in (formats or self.config.EXPORT_CONFIG['stream_formats'])]
+        self.fieldnames = list(self.config.EXPORT_CONFIG['column_mapping'].keys()) + ['source']
+
+        self.paths: Dict[str, str] = {
+            'jsonl': exporter._generate_filepath(keyword, 'jsonl', output_dir or self.config.PATHS['json'])
+        }
+        if 'csv' in formats:
+            self.paths['csv'] = exporter._generate_filepath(keyword, 'csv', output_dir or self.config.PATHS['excel'])
+        if paths:
+            self.paths.update({format_type: path for format_type, path in paths.items() if format_type in self.paths})
+
+        # 续抓时计入文件中已有的记录，并补上中断时可能缺失的换行
+        self.count = self._prepare_existing(self.paths['jsonl'])
+        self.closed = False
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._jsonl_file = open(self.paths['jsonl'], 'a', encoding='utf-8')
+        self._csv_file = None
+        self._csv_writer = None
+        if 'csv' in self.paths:
+            # 续抓时沿用已有文件的表头，列数与之前写入的行保持一致
+            csv_fields = self._existing_csv_fields(self.paths['csv']) or self.fieldnames
+            self._csv_file = open(self.paths['csv'], 'a', encoding='utf-8-sig', newline='')
+            self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=csv_fields, extrasaction='ignore')
+            if self._csv_file.tell() == 0:
+                mapping = self.config.EXPORT_CONFIG['column_mapping']
+                self._csv_writer.writerow({field: mapping.get(field, field) for field in csv_fields})
+
+    def _existing_csv_fields(self, path: str) -> Optional[List[str]]:
+        """读取已有CSV文件的表头并映射回字段名，文件不存在或为空时返回None"""
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        reverse_mapping = {label: field for field, label in self.config.EXPORT_CONFIG['column_mapping'].items()}
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            header = next(csv.reader(f), None)
+        return [reverse_mapping.get(label, label) for label in header] if header else None
+
+    @staticmethod
+    def _prepare_existing(path: str) -> int:
+        """统计已有JSONL文件的记录数，最后一行不完整时补换行（记录与换行一起写入，缺少换行说明该行被截断，不计数）"""
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0
+
+        count = 0
+        last = b''
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    count += 1
+                last = line
+        if not last.endswith(b'\n'):
+            with open(path, 'ab') as f:
+                f.write(b'\n')
+            if last.strip():
+                count -= 1
+        return count
+
+    def __call__(self, page_number: int, products: List[Dict[str, Any]]):
+        """作为搜索的 on_page 回调使用"""
+        self.write(products)
+
+    def write(self, products: Iterable[Dict[str, Any]]):
+        """
+        追加商品，缓冲达到批量大小时刷新到磁盘
+        :param products: 商品列表
+        """
+        valid_products = self.exporter._validate_products(list(products))
+        with self._lock:
+            if self.closed:
+                raise ValueError("流式导出器已关闭")
+            self._buffer.extend(valid_products)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        """将缓冲中的记录写入磁盘"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+
+        for product in self._buffer:
+            self._jsonl_file.write(json.dumps(product, ensure_ascii=False) + '\n')
+        self._jsonl_file.flush()
+
+        if self._csv_writer:
+            self._csv_writer.writerows(self._buffer)
+            self._csv_file.flush()
+
+        if self.config.EXPORT_CONFIG['stream_fsync']:
+            os.fsync(self._jsonl_file.fileno())
+            if self._csv_file:
+                os.fsync(self._csv_file.fileno())
+
+        self.count += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """刷新剩余记录并关闭文件"""
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self._flush_locked()
+            finally:
+                self._jsonl_file.close()
+                if self._csv_file:
+                    self._csv_file.close()
+                self.closed = True
+
+    def iter_products(self) -> Iterator[Dict[str, Any]]:
+        """逐条读取已写入的商品（不一次性加载到内存）"""
+        if not self.closed:
+            self.flush()
+        with open(self.paths['jsonl'], 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # 中断时可能留下不完整的最后一行
+                    logging.warning(f"跳过无法解析的JSONL行: {line[:80]}")
+
+    def _iter_chunks(self) -> Iterator[List[Dict[str, Any]]]:
+        chunk = []
+        for product in self.iter_products():
+            chunk.append(product)
+            if len(chunk) >= self.CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def finalize(self, formats: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        关闭流并转换为最终格式
+        :param formats: 最终格式列表，支持 'excel'、'json'、'parquet'，默认使用配置
+        :return: 格式到文件路径的映射字典（包含流式写入的jsonl/csv）
+        """
+        self.close()
+        results = dict(self.paths)
+
+        if not self.count:
+            print("没有有效的商品数据可保存")
+            return results
+
+        formats = formats if formats is not None else self.config.EXPORT_CONFIG['finalize_formats']
+        with get_profiler().span('export', keyword=self.keyword):
+            for format_type in formats:
+                format_type = format_type.lower()
+                try:
+                    if format_type == 'excel':
+                        results['excel'] = self._finalize_excel()
+                    elif format_type == 'json':
+                        results['json'] = self._finalize_json()
+                    elif format_type == 'parquet':
+                        results['parquet'] = self._finalize_parquet()
+                    else:
+                        print(f"不支持的导出格式: {format_type}")
+                except Exception as e:
+                    error_msg = f"转换为{format_type}时出错: {e}"
+                    logging.error(error_msg, exc_info=True)
+                    print(error_msg)
+
+        return results
+
+    def _finalize_excel(self) -> str:
+        """使用openpyxl只写模式逐行写入Excel"""
+        from openpyxl import Workbook
+
+        filepath = self.exporter._generate_excel_filepath(self.keyword, self.output_dir)
+        mapping = self.config.EXPORT_CONFIG['column_mapping']
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append([mapping.get(field, field) for field in self.fieldnames])
+        for product in self.iter_products():
+            sheet.append([product.get(field, '') for field in self.fieldnames])
+        workbook.save(filepath)
+
+        print(f"商品信息已保存到: {filepath}")
+        return filepath
+
+    def _finalize_json(self) -> str:
+        """逐条写出JSON数组，格式与save_to_json一致"""
+        filepath = self.exporter._generate_json_filepath(self.keyword, self.output_dir)
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for i, product in enumerate(self.iter_products()):
+                f.write(',\n' if i else '\n')
+                f.write(textwrap.indent(json.dumps(product, ensure_ascii=False, indent=2), '  '))
+            f.write('\n]')
+
+        print(f"商品信息已保存到: {filepath}")
+        return filepath
+
+    def _finalize_parquet(self) -> str:
+        """分块写入分区Parquet数据集（需要安装pyarrow）"""
+        filepath = self.exporter.write_parquet_chunks(self._iter_chunks(), self.keyword)
+
+        print(f"商品信息已保存到: {filepath}")
+        return filepath
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
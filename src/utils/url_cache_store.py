@@ -0,0 +1,325 @@
+"""
+URL缓存存储模块
+
+基于SQLite(WAL模式)保存关键词到成功搜索URL的映射，
+提供O(1)的内存索引查询、TTL/成功率元数据以及多进程安全写入
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+from ..core.config import CrawlerConfig
+
+
+class URLCacheStore:
+    """SQLite URL缓存存储"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS url_cache (
+            keyword        TEXT PRIMARY KEY,
+            url            TEXT NOT NULL,
+            note           TEXT NOT NULL DEFAULT '',
+            created_at     REAL NOT NULL,
+            updated_at     REAL NOT NULL,
+            last_success   REAL,
+            success_count  INTEGER NOT NULL DEFAULT 0,
+            failure_count  INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key    TEXT PRIMARY KEY,
+            value  TEXT
+        );
+    """
+
+    _shared: Dict[str, 'URLCacheStore'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None, config: CrawlerConfig = None,
+                 legacy_file: Optional[str] = None):
+        """
+        初始化URL缓存存储
+        :param db_path: 数据库文件路径，如果为None则使用配置中的默认路径
+        :param config: 爬虫配置对象
+        :param legacy_file: 旧版文本缓存文件（关键词|URL|时间戳|备注），首次创建时自动导入
+        """
+        self.config = config or CrawlerConfig()
+        self.db_path = db_path or self.config.PATHS['url_cache_db']
+        self.settings = self.config.URL_CACHE
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, timeout=self.settings['busy_timeout'],
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._data_version = None
+        self._reload_index()
+
+        legacy_file = legacy_file if legacy_file is not None else self.config.PATHS.get('url_cache')
+        if legacy_file:
+            self._import_legacy_once(legacy_file)
+
+    @classmethod
+    def shared(cls, db_path: Optional[str] = None, config: CrawlerConfig = None) -> 'URLCacheStore':
+        """
+        获取进程内共享的存储实例（同一数据库文件只打开一个连接）
+        :param db_path: 数据库文件路径
+        :param config: 爬虫配置对象
+        :return: URL缓存存储
+        """
+        config = config or CrawlerConfig()
+        key = os.path.abspath(db_path or config.PATHS['url_cache_db'])
+        with cls._shared_lock:
+            store = cls._shared.get(key)
+            if store is None:
+                store = cls(key, config)
+                cls._shared[key] = store
+            return store
+
+    # ---------- 内存索引 ----------
+
+    def _reload_index(self):
+        """从数据库重建内存索引"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM url_cache").fetchall()
+            self._index = {row['keyword']: dict(row) for row in rows}
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync_index(self):
+        """其他进程写入后（data_version变化）刷新内存索引"""
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._reload_index()
+
+    def _is_usable(self, record: Dict[str, Any]) -> bool:
+        """检查记录是否在有效期内且成功率达标"""
+        ttl_days = self.settings['ttl_days']
+        last_used = record['last_success'] or record['updated_at']
+        if ttl_days and time.time() - last_used > ttl_days * 86400:
+            return False
+
+        attempts = record['success_count'] + record['failure_count']
+        if attempts >= self.settings['min_attempts']:
+            return record['success_count'] / attempts >= self.settings['min_success_rate']
+        return True
+
+    # ---------- 查询 ----------
+
+    def get(self, keyword: str, include_stale: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        获取关键词的缓存记录
+        :param keyword: 搜索关键词
+        :param include_stale: 是否返回过期或成功率过低的记录
+        :return: 缓存记录，不存在或不可用时返回None
+        """
+        with self._lock:
+            self._sync_index()
+            record = self._index.get(keyword)
+            if record and (include_stale or self._is_usable(record)):
+                return dict(record)
+            return None
+
+    def get_url(self, keyword: str) -> Optional[str]:
+        """
+        获取关键词对应的可用URL
+        :param keyword: 搜索关键词
+        :return: URL，不存在或不可用时返回None
+        """
+        record = self.get(keyword)
+        return record['url'] if record else None
+
+    def all_records(self) -> List[Dict[str, Any]]:
+        """
+        获取所有缓存记录（按更新时间倒序）
+        :return: 记录列表
+        """
+        with self._lock:
+            self._sync_index()
+            records = [dict(record) for record in self._index.values()]
+        return sorted(records, key=lambda record: record['updated_at'], reverse=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync_index()
+            return len(self._index)
+
+    # ---------- 写入 ----------
+
+    def record_success(self, keyword: str, url: str, note: str = "直接访问成功"):
+        """
+        记录一次URL访问成功，URL变化时重置成功/失败计数
+        :param keyword: 搜索关键词
+        :param url: 成功的URL
+        :param note: 备注
+        """
+        now = time.time()
+        self._write("""
+            INSERT INTO url_cache (keyword, url, note, created_at, updated_at, last_success, success_count, failure_count)
+            VALUES (?, ?, ?, ?, ?, ?, 1, 0)
+            ON CONFLICT(keyword) DO UPDATE SET
+                success_count = CASE WHEN url = excluded.url THEN success_count + 1 ELSE 1 END,
+                failure_count = CASE WHEN url = excluded.url THEN failure_count ELSE 0 END,
+                url = excluded.url,
+                note = excluded.note,
+                updated_at = excluded.updated_at,
+                last_success = excluded.last_success
+        """, (keyword, url, note, now, now, now), keyword)
+
+    def record_failure(self, keyword: str, url: Optional[str] = None):
+        """
+        记录一次URL访问失败
+        :param keyword: 搜索关键词
+        :param url: 失败的URL，如果与缓存中的URL不同则忽略
+        """
+        if url:
+            self._write("UPDATE url_cache SET failure_count = failure_count + 1 WHERE keyword = ? AND url = ?",
+                        (keyword, url), keyword)
+        else:
+            self._write("UPDATE url_cache SET failure_count = failure_count + 1 WHERE keyword = ?",
+                        (keyword,), keyword)
+
+    def put(self, keyword: str, url: str, note: str = "手动添加"):
+        """
+        直接写入（覆盖）一条缓存记录
+        :param keyword: 搜索关键词
+        :param url: URL
+        :param note: 备注
+        """
+        now = time.time()
+        self._write("""
+            INSERT OR REPLACE INTO url_cache (keyword, url, note, created_at, updated_at, last_success, success_count, failure_count)
+            VALUES (?, ?, ?, ?, ?, NULL, 0, 0)
+        """, (keyword, url, note, now, now), keyword)
+
+    def remove(self, keyword: str) -> bool:
+        """
+        删除关键词的缓存记录
+        :param keyword: 搜索关键词
+        :return: 是否删除了记录
+        """
+        return self._write("DELETE FROM url_cache WHERE keyword = ?", (keyword,), keyword) > 0
+
+    def clear(self) -> int:
+        """
+        清空所有缓存记录
+        :return: 删除的记录数
+        """
+        with self._lock:
+            count = self._conn.execute("DELETE FROM url_cache").rowcount
+            self._index.clear()
+        return count
+
+    def prune_expired(self) -> int:
+        """
+        删除超过TTL未成功访问的记录
+        :return: 删除的记录数
+        """
+        ttl_days = self.settings['ttl_days']
+        if not ttl_days:
+            return 0
+
+        with self._lock:
+            count = self._conn.execute("DELETE FROM url_cache WHERE COALESCE(last_success, updated_at) < ?",
+                                       (time.time() - ttl_days * 86400,)).rowcount
+            self._reload_index()
+        return count
+
+    def _write(self, sql: str, params: tuple, keyword: str) -> int:
+        """执行单条写入语句并更新该关键词的内存索引"""
+        with self._lock:
+            # 先同步其他进程的写入，避免本次写入后的版本号掩盖它们
+            self._sync_index()
+            rowcount = self._conn.execute(sql, params).rowcount
+
+            row = self._conn.execute("SELECT * FROM url_cache WHERE keyword = ?", (keyword,)).fetchone()
+            if row:
+                self._index[keyword] = dict(row)
+            else:
+                self._index.pop(keyword, None)
+            return rowcount
+
+    # ---------- 旧版文本缓存导入 ----------
+
+    def _import_legacy_once(self, legacy_file: str):
+        """首次使用时导入旧版文本缓存文件"""
+        with self._lock:
+            imported = self._conn.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone()
+            if imported or not os.path.exists(legacy_file):
+                return
+
+            count = self.import_legacy_file(legacy_file)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                               (os.path.abspath(legacy_file),))
+            if count:
+                print(f"已从 {legacy_file} 导入 {count} 条URL缓存")
+
+    def import_legacy_file(self, legacy_file: str) -> int:
+        """
+        导入旧版文本缓存文件（关键词|URL|时间戳|备注），已存在的关键词不覆盖
+        :param legacy_file: 文本缓存文件路径
+        :return: 导入的记录数
+        """
+        rows = []
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    parts = [part.strip() for part in line.split('|')]
+                    if len(parts) < 2:
+                        continue
+
+                    timestamp = self._parse_timestamp(parts[2]) if len(parts) > 2 else time.time()
+                    note = parts[3] if len(parts) > 3 else ''
+                    rows.append((parts[0], parts[1], note, timestamp, timestamp, timestamp))
+        except Exception as e:
+            print(f"读取旧版URL缓存失败: {e}")
+            logging.error(f"读取旧版URL缓存失败 {legacy_file}: {e}")
+            return 0
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                count = 0
+                for row in rows:
+                    count += self._conn.execute("""
+                        INSERT OR IGNORE INTO url_cache
+                            (keyword, url, note, created_at, updated_at, last_success, success_count, failure_count)
+                        VALUES (?, ?, ?, ?, ?, ?, 1, 0)
+                    """, row).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._reload_index()
+        return count
+
+    @staticmethod
+    def _parse_timestamp(value: str) -> float:
+        try:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").timestamp()
+        except ValueError:
+            return time.time()
+
+    @staticmethod
+    def format_timestamp(value: Optional[float]) -> str:
+        """将记录中的时间戳格式化为字符串"""
+        return datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M:%S") if value else ''
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
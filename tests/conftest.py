@@ -0,0 +1,23 @@
+"""
+测试公共配置：把项目根目录加入模块搜索路径，并提供输出文件和数据库都放在临时目录中的配置
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CrawlerConfig
+
+
+@pytest.fixture
+def config(tmp_path):
+    """各输出目录、缓存文件和数据库都指向临时目录的配置（配置项是类属性，复制后再修改，不影响其他测试）"""
+    config = CrawlerConfig()
+    for name, value in vars(CrawlerConfig).items():
+        if name.isupper() and isinstance(value, dict):
+            setattr(config, name, dict(value))
+    config.PATHS = {name: str(tmp_path / path) for name, path in CrawlerConfig.PATHS.items()}
+    return config
@@ -0,0 +1,36 @@
+"""
+异步关键词调度测试
+"""
+
+from src.core.async_scheduler import KeywordJob
+from src.utils.crawl_journal import CrawlJournal
+
+
+def test_last_result_page_from_trailing_empty_pages():
+    assert KeywordJob('k').last_result_page is None
+    assert KeywordJob('k', pages_done=[1, 2], empty_pages=[3, 4]).last_result_page == 2
+    # 中间的空页之后还有成功的页，不是结果末尾
+    assert KeywordJob('k', pages_done=[1, 2, 4], empty_pages=[3]).last_result_page is None
+    # 第1页没有商品需要浏览器确认，不视为结果末尾
+    assert KeywordJob('k', empty_pages=[1]).last_result_page is None
+
+
+def test_short_keyword_finishes_done(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('k', 'www', 5)
+    for page in (1, 2):
+        journal.complete_page('k', 'www', page, 10)
+    job = KeywordJob('k', pages_done=[1, 2], empty_pages=[3, 4, 5])
+
+    progress = journal.finish_keyword('k', 'www', products=20, last_page=job.last_result_page)
+    assert progress.done and not job.needs_browser
+
+
+def test_blocked_page_before_end_stays_partial(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('k', 'www', 4)
+    journal.complete_page('k', 'www', 1, 10)
+    job = KeywordJob('k', pages_done=[1], blocked_pages=[2], empty_pages=[3, 4])
+
+    assert journal.finish_keyword('k', 'www', last_page=job.last_result_page).status == 'partial'
+    assert job.needs_browser
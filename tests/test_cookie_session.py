@@ -0,0 +1,78 @@
+"""
+浏览器Cookie状态测试（假驱动记录CDP写入Cookie的次数）
+"""
+
+import os
+import json
+import time
+
+from src.utils.cache_manager import CacheManager, CookieSessionState
+
+
+class CookieDriver:
+    current_url = 'https://www.1688.com/'
+
+    def __init__(self):
+        self.loads = 0
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == 'Network.setCookies'
+        self.loads += 1
+
+
+def _write_cookies(path, expiry=None, mtime=None):
+    cookie = {'name': 'cna', 'value': 'abc', 'domain': '.1688.com'}
+    if expiry:
+        cookie['expiry'] = expiry
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([cookie], f)
+    if mtime:
+        os.utime(path, (mtime, mtime))
+
+
+def test_is_valid():
+    state = CookieSessionState()
+    assert not state.is_valid('c.json', 1.0)
+
+    state.cookie_file, state.file_mtime, state.primed = 'c.json', 1.0, True
+    assert state.is_valid('c.json', 1.0)
+    assert not state.is_valid('c.json', 2.0)
+    assert not state.is_valid('other.json', 1.0)
+
+    state.expires_at = time.time() - 1
+    assert not state.is_valid('c.json', 1.0)
+    state.expires_at = time.time() + 3600
+    assert state.is_valid('c.json', 1.0)
+
+
+def test_ensure_cookies_loads_once_per_file_version(config):
+    driver = CookieDriver()
+    manager = CacheManager(driver, config)
+    path = config.PATHS['cookies']
+    assert not manager.ensure_cookies()
+
+    _write_cookies(path, mtime=time.time() - 60)
+    assert manager.ensure_cookies() and manager.ensure_cookies()
+    # 同一浏览器上的其他CacheManager共用状态
+    assert CacheManager(driver, config).ensure_cookies()
+    assert driver.loads == 1
+
+    # 文件更新或被标记失效后重新加载
+    _write_cookies(path)
+    manager.ensure_cookies()
+    assert driver.loads == 2
+    manager.invalidate_cookies()
+    manager.ensure_cookies()
+    assert driver.loads == 3
+
+
+def test_expired_cookie_triggers_reload(config):
+    driver = CookieDriver()
+    manager = CacheManager(driver, config)
+    _write_cookies(config.PATHS['cookies'], expiry=time.time() + 3600)
+    manager.ensure_cookies()
+    assert manager.cookie_state.expires_at is not None
+
+    manager.cookie_state.expires_at = time.time() - 1
+    manager.ensure_cookies()
+    assert driver.loads == 2
@@ -0,0 +1,105 @@
+"""
+抓取日志测试
+"""
+
+from src.utils.crawl_journal import CrawlJournal, KeywordProgress
+
+
+def test_next_page_is_first_gap():
+    assert KeywordProgress('k', 'www').next_page == 1
+    assert KeywordProgress('k', 'www', completed_pages=[1, 2, 4]).next_page == 3
+
+
+def test_resume_continues_from_next_page(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('k', 'www', 3)
+    journal.set_stream_paths('k', 'www', {'jsonl': 'outputs/k.jsonl'})
+    journal.complete_page('k', 'www', 1, 40, 'https://s.1688.com/?beginPage=1')
+    journal.complete_page('k', 'www', 2, 35)
+    journal.close()
+
+    # 中断后重新运行
+    progress = CrawlJournal(config=config).begin_keyword('k', 'www', 3)
+    assert progress.status == 'running'
+    assert progress.completed_pages == [1, 2]
+    assert progress.next_page == 3
+    assert progress.products == 75
+    assert progress.stream_paths == {'jsonl': 'outputs/k.jsonl'}
+
+
+def test_finish_keyword_done_when_all_pages_completed(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('k', 'www', 2)
+    journal.complete_page('k', 'www', 1, 10)
+    journal.complete_page('k', 'www', 2, 5)
+
+    progress = journal.finish_keyword('k', 'www', outputs={'excel': 'k.xlsx'})
+    assert progress.status == 'done' and progress.products == 15
+    assert journal.is_done('k', 'www', 2)
+    assert not journal.is_done('k', 'www', 3)
+    # 已完成的关键词再次开始时原样返回，调用方据此跳过
+    assert journal.begin_keyword('k', 'www', 2).done
+
+
+def test_finish_keyword_partial_when_pages_missing(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('k', 'www', 3)
+    journal.complete_page('k', 'www', 1, 10)
+
+    assert journal.finish_keyword('k', 'www').status == 'partial'
+    assert journal.begin_keyword('k', 'www', 3).next_page == 2
+
+
+def test_finish_keyword_done_at_last_result_page(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('k', 'www', 5)
+    journal.complete_page('k', 'www', 1, 10)
+    journal.complete_page('k', 'www', 2, 3)
+
+    # 搜索结果只有2页，少于目标页数
+    assert journal.finish_keyword('k', 'www', last_page=2).status == 'done'
+    assert journal.is_done('k', 'www', 5)
+
+
+def test_finish_keyword_explicit_status(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('empty', 'www', 2)
+    journal.begin_keyword('broken', 'www', 2)
+
+    # 提取到商品但全部是重复商品：没有新商品也应结束
+    done = journal.finish_keyword('empty', 'www', products=0, status='done')
+    assert done.done and done.products == 0
+    assert journal.finish_keyword('broken', 'www', status='failed').status == 'failed'
+    assert not journal.begin_keyword('broken', 'www', 2).done
+
+
+def test_no_resume_starts_over(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('k', 'www', 1)
+    journal.complete_page('k', 'www', 1, 10)
+    journal.finish_keyword('k', 'www')
+
+    config.JOURNAL['resume'] = False
+    assert not journal.is_done('k', 'www', 1)
+    progress = journal.begin_keyword('k', 'www', 1)
+    assert progress.completed_pages == [] and progress.next_page == 1
+
+
+def test_sites_are_tracked_separately(config):
+    journal = CrawlJournal(config=config)
+    journal.begin_keyword('k', 'www', 1)
+    journal.complete_page('k', 'www', 1, 10)
+    journal.finish_keyword('k', 'www')
+
+    assert journal.begin_keyword('k', 'global', 1).next_page == 1
+    assert journal.reset('k', 'www') == 1
+    assert journal.get_keyword('k', 'www') is None
+
+
+def test_steps_keep_order(config):
+    journal = CrawlJournal(config=config)
+    journal.reset_steps('k', ['visit', 'search', 'extract'])
+    journal.set_step('k', 'search', 1)
+    journal.set_step('k', 'save', 1)
+
+    assert journal.step_status('k') == {'visit': 0, 'search': 1, 'extract': 0, 'save': 1}
@@ -0,0 +1,122 @@
+"""
+数据导出测试
+"""
+
+import os
+import csv
+import json
+from datetime import datetime
+
+import pytest
+
+from src.utils.data_exporter import DataExporter
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def _network_product():
+    """OfferPayloadParser.to_product 产生的商品记录"""
+    return {'title': '手机壳硅胶', 'price': '¥3.50-5.00', 'shop': '义乌某某贸易', 'sales': '1.2万+',
+            'link': 'https://detail.1688.com/offer/610000001.html', 'image': '', 'source': 'network',
+            'offer_id': '610000001', 'price_value': 3.5, 'sales_count': 12000}
+
+
+def _dom_product():
+    return {'title': '数据线', 'price': '¥8.9\n售900+\n件', 'shop': '深圳某某电子', 'sales': '900+人付款',
+            'link': 'https://detail.1688.com/offer/620000002.html', 'image': '', 'source': 'dom'}
+
+
+@pytest.fixture
+def exporter(config, monkeypatch):
+    monkeypatch.setattr(DataExporter, '_open_file_directory', lambda self, filepath: None)
+    return DataExporter(config)
+
+
+def test_parquet_keeps_offer_id_and_api_numbers(exporter):
+    path = exporter.save_to_parquet([_network_product(), _dom_product()], '手机壳', partitioned=False)
+    rows = pq.read_table(path).to_pylist()
+
+    assert [row['offer_id'] for row in rows] == ['610000001', '620000002']
+    assert (rows[0]['price_min'], rows[0]['price_max'], rows[0]['sales_count']) == (3.5, 5.0, 12000)
+    # DOM提取的商品没有接口数值，解析文本
+    assert (rows[1]['price_min'], rows[1]['price_max'], rows[1]['sales_count']) == (8.9, 8.9, 900)
+
+
+def test_stream_outputs_include_offer_id(exporter):
+    with exporter.open_stream('手机壳', formats=['jsonl', 'csv']) as sink:
+        sink.write([_network_product()])
+    results = sink.finalize(['excel'])
+
+    with open(results['jsonl'], encoding='utf-8') as f:
+        assert json.loads(f.readline())['offer_id'] == '610000001'
+
+    with open(results['csv'], encoding='utf-8-sig', newline='') as f:
+        row = next(csv.DictReader(f))
+    assert (row['商品ID'], row['价格数值'], row['销量数值']) == ('610000001', '3.5', '12000')
+
+    from openpyxl import load_workbook
+    sheet = load_workbook(results['excel']).active
+    header, values = [list(row) for row in sheet.iter_rows(values_only=True)][:2]
+    assert dict(zip(header, values))['商品ID'] == '610000001'
+
+
+def test_resumed_csv_keeps_existing_header(exporter, config):
+    path = exporter._generate_filepath('旧文件', 'csv', config.PATHS['excel'])
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        f.write('商品标题,价格,店铺名称,销量,商品链接,图片链接,source\n')
+
+    sink = exporter.open_stream('旧文件', formats=['jsonl', 'csv'], paths={'csv': path})
+    sink.write([_network_product()])
+    sink.close()
+
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.reader(f))
+    assert len(rows[1]) == len(rows[0]) == 7
+
+
+def test_dataset_reads_files_written_before_offer_id(exporter, config):
+    old_schema = pa.schema([field for field in exporter._parquet_schema(True) if field.name != 'offer_id'])
+    # 新增offer_id列之前写入的分区文件
+    table = exporter._products_to_arrow([_dom_product()], 'k', datetime(2025, 1, 1, 12), True)
+    directory = os.path.join(config.PATHS['parquet'], 'keyword=k', 'date=2025-01-01')
+    os.makedirs(directory)
+    pq.write_table(table.select(old_schema.names).cast(old_schema), os.path.join(directory, 'part-old.parquet'))
+    exporter.save_to_parquet([_network_product()], 'k')
+
+    rows = exporter.load_parquet_dataset(keywords=['k']).to_pylist()
+    assert sorted(row['offer_id'] or '' for row in rows) == ['', '610000001']
+
+
+def test_parquet_columns_are_typed_and_partitioned(exporter, config):
+    path = exporter.save_to_parquet([_dom_product(), dict(_dom_product(), shop='深圳某某电子', price='价格面议')], '数据线')
+    assert os.sep.join(['keyword=数据线', 'date=']) in path
+
+    table = pq.read_table(path)
+    assert table.schema.field('price_min').type == pa.float64()
+    assert table.schema.field('sales_count').type == pa.int64()
+    assert pa.types.is_dictionary(table.schema.field('shop').type)
+    assert table.column('price_min').to_pylist() == [8.9, None]
+
+    loaded = exporter.load_parquet_dataset(keywords=['数据线'])
+    assert loaded.num_rows == 2 and set(loaded.column('keyword').to_pylist()) == {'数据线'}
+
+
+def test_export_multiple_formats_honours_output_dir(exporter, tmp_path):
+    output_dir = str(tmp_path / 'custom')
+    results = exporter.export_multiple_formats([_network_product()], 'k', ['json', 'parquet'], output_dir)
+
+    assert results['json'].startswith(output_dir)
+    assert results['parquet'].startswith(output_dir)
+
+
+def test_chunked_parquet_and_date_filter(exporter):
+    chunks = [[_dom_product()], [], [_network_product()]]
+    exporter.write_parquet_chunks(iter(chunks), 'k', crawl_time=datetime(2025, 1, 1, 12))
+    exporter.write_parquet_chunks(iter([[_dom_product()]]), 'k', crawl_time=datetime(2025, 2, 1, 12))
+
+    assert exporter.load_parquet_dataset(keywords=['k']).num_rows == 3
+    # 分区过滤只读取匹配日期的目录
+    january = exporter.load_parquet_dataset(keywords=['k'], end_date='2025-01-31', columns=['offer_id', 'crawled_at'])
+    assert january.column_names == ['offer_id', 'crawled_at']
+    assert sorted(january.column('offer_id').to_pylist()) == ['610000001', '620000002']
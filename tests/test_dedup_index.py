@@ -0,0 +1,97 @@
+"""
+商品去重索引测试
+"""
+
+import time
+
+from src.utils.dedup_index import DedupIndex, dedup_batch, extract_offer_id, product_key, product_keys
+
+
+def _offer(offer_id, title='商品'):
+    return {'title': f"{title}{offer_id}", 'shop': '店铺', 'link': f"https://detail.1688.com/offer/{offer_id}.html"}
+
+
+def test_product_key_prefers_offer_id():
+    assert extract_offer_id('https://detail.1688.com/offer/1234567.html?spm=a') == '1234567'
+    assert extract_offer_id('https://m.1688.com/x?offerId=7654321') == '7654321'
+    assert product_key(_offer('1234567')) == 'offer:1234567'
+
+
+def test_product_key_falls_back_to_normalized_title_and_shop():
+    first = product_key({'title': 'ＡＢＣ 手机壳！', 'shop': '店铺'})
+    second = product_key({'title': 'abc手机壳', 'shop': '店铺'})
+    assert first == second and first.startswith('hash:')
+    assert product_key({'title': '', 'shop': '店铺'}) is None
+
+
+def test_dedup_batch_keeps_first_occurrence():
+    products = [_offer('1000001', 'a'), _offer('1000001', 'b'), _offer('1000002')]
+    assert [product['title'] for product in dedup_batch(products)] == ['a1000001', '商品1000002']
+
+
+def test_filter_new_does_not_persist(config):
+    index = DedupIndex(config=config)
+    products = [_offer('1000001'), _offer('1000002')]
+
+    assert index.filter_new(products, 'k') == products
+    assert len(index) == 0
+
+    # 中断后（未调用mark_exported）重新运行，商品仍然是新的
+    index.close()
+    reopened = DedupIndex(config=config)
+    assert reopened.filter_new(products, 'k') == products
+
+
+def test_pending_products_are_not_returned_twice(config):
+    index = DedupIndex(config=config)
+    products = [_offer('1000001'), _offer('1000002')]
+
+    index.filter_new(products)
+    assert index.filter_new(products + [_offer('1000003')]) == [_offer('1000003')]
+    assert index.skipped == 2
+
+
+def test_mark_after_flush_records_exported_products(config):
+    index = DedupIndex(config=config)
+    products = [_offer('1000001'), _offer('1000002')]
+
+    new_products = index.filter_new(products, 'k')
+    # 写入磁盘之后才记为已导出
+    index.mark_exported(product_keys(new_products), 'k')
+
+    assert len(index) == 2
+    assert index.contains(products[0])
+    assert index.filter_new(products) == []
+
+    index.close()
+    assert DedupIndex(config=config).filter_new(products) == []
+
+
+def test_release_makes_products_new_again(config):
+    index = DedupIndex(config=config)
+    products = [_offer('1000001')]
+
+    index.filter_new(products)
+    index.release(product_keys(products))
+
+    assert index.filter_new(products) == products
+    assert len(index) == 0
+
+
+def test_ttl_re_exports_old_products(config):
+    config.DEDUP['ttl_days'] = 1
+    index = DedupIndex(config=config)
+    product = _offer('1000001')
+    index.mark_exported(product_keys([product]))
+
+    index._conn.execute("UPDATE seen_products SET exported_at = ?", (time.time() - 2 * 86400,))
+    assert index.filter_new([product]) == [product]
+
+
+def test_clear_by_keyword(config):
+    index = DedupIndex(config=config)
+    index.mark_exported(['offer:1000001'], 'a')
+    index.mark_exported(['offer:1000002'], 'b')
+
+    assert index.clear('a') == 1
+    assert len(index) == 1
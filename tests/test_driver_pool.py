@@ -0,0 +1,75 @@
+"""
+WebDriver池测试（使用不启动浏览器的假驱动）
+"""
+
+import pytest
+
+from src.drivers.driver_pool import DriverPool, PooledDriver
+
+
+class FakeDriver:
+    window_handles = ['main']
+
+
+class FakePool(DriverPool):
+    """创建假驱动的池，可指定创建失败的次数"""
+
+    def __init__(self, *args, failures=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures = failures
+        self.created = 0
+
+    def _create_pooled_driver(self, index):
+        if self.failures:
+            self.failures -= 1
+            return None
+        self.created += 1
+        return PooledDriver(index, FakeDriver(), manager=None)
+
+    @staticmethod
+    def _quit(pooled):
+        pass
+
+
+def test_release_counts_pages_actually_processed(config):
+    with FakePool(size=1, config=config, max_pages_per_driver=3) as pool:
+        for pages in (0, 1, 1):
+            with pool.driver() as pooled:
+                pooled.pages_in_use = pages
+        assert pool.created == 1
+        assert (pooled.pages_served, pooled.keywords_served) == (2, 3)
+
+        # 达到页数上限后回收重建
+        with pool.driver() as pooled:
+            pooled.pages_in_use = 1
+        assert pool.created == 2
+
+
+def test_acquire_times_out(config):
+    with FakePool(size=1, config=config) as pool:
+        pool.acquire()
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+
+
+def test_lost_slot_fails_fast_when_no_driver_left(config):
+    with FakePool(size=1, config=config, max_pages_per_driver=1) as pool:
+        pooled = pool.acquire()
+        pool.failures = 2
+        pool.release(pooled, 1)
+        with pytest.raises(RuntimeError):
+            pool.acquire(timeout=1)
+
+        # 之后创建恢复正常时重新补上该位置
+        assert pool.acquire(timeout=1).index == 0
+
+
+def test_pool_navigation_interval_spans_keywords_and_drivers(config):
+    config.RATE_LIMIT.update(min_interval=0.1, max_interval=0.1)
+    with FakePool(size=2, config=config) as pool:
+        first, second = pool.acquire(), pool.acquire()
+        assert first is not second
+
+        # 两个实例上的关键词共用同一个间隔：第一个实例刚导航过，第二个实例的首次导航也要等待
+        pool.rate_limiter.wait()
+        assert pool.rate_limiter.wait() > 0.05
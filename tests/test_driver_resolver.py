@@ -0,0 +1,88 @@
+"""
+chromedriver路径解析测试（用输出版本号的脚本代替Chrome和chromedriver，离线模式，不联网）
+"""
+
+import os
+import sys
+import json
+
+import pytest
+
+from src.drivers import driver_resolver
+from src.drivers.driver_resolver import ChromeDriverResolver
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith('win'), reason='假的可执行文件是shell脚本')
+
+
+def _fake_binary(path, version):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(f'#!/bin/sh\necho "Fake {version}"\n')
+    os.chmod(path, 0o755)
+    return str(path)
+
+
+@pytest.fixture
+def resolver_config(config, tmp_path, monkeypatch):
+    """离线模式：只在临时目录中查找，不受本机PATH和~/.wdm中的chromedriver影响"""
+    monkeypatch.setattr(ChromeDriverResolver, '_memo', {})
+    monkeypatch.setenv('PATH', str(tmp_path / 'empty'))
+    monkeypatch.setenv('WDM_ROOT', str(tmp_path / 'wdm'))
+    config.CHROMEDRIVER.update(
+        offline=True,
+        chrome_binary=_fake_binary(tmp_path / 'chrome' / 'chrome', '120.0.6099.109'),
+        search_dirs=[str(tmp_path / 'drivers-119'), str(tmp_path / 'drivers-120')]
+    )
+    _fake_binary(tmp_path / 'drivers-119' / 'chromedriver', '119.0.6045.105')
+    _fake_binary(tmp_path / 'drivers-120' / 'chromedriver', '120.0.6099.71')
+    return config
+
+
+def test_offline_resolves_matching_major_version_and_caches(resolver_config, tmp_path, monkeypatch):
+    expected = str(tmp_path / 'drivers-120' / 'chromedriver')
+    assert ChromeDriverResolver(resolver_config).resolve() == expected
+
+    with open(resolver_config.PATHS['chromedriver_cache'], encoding='utf-8') as f:
+        entry = json.load(f)[resolver_config.CHROMEDRIVER['chrome_binary']]
+    assert (entry['chrome_version'], entry['driver_path']) == ('120.0.6099.109', expected)
+
+    # 新进程（进程内缓存为空）直接使用缓存文件，不再读取版本号
+    monkeypatch.setattr(ChromeDriverResolver, '_memo', {})
+    monkeypatch.setattr(driver_resolver, 'read_binary_version', lambda binary: pytest.fail('不应读取版本号'))
+    assert ChromeDriverResolver(resolver_config).resolve() == expected
+
+
+def test_chrome_upgrade_invalidates_cache(resolver_config, tmp_path, monkeypatch):
+    resolver = ChromeDriverResolver(resolver_config)
+    resolver.resolve()
+
+    chrome = resolver_config.CHROMEDRIVER['chrome_binary']
+    _fake_binary(chrome, '119.0.6045.200')
+    os.utime(chrome, (1, 1))
+    monkeypatch.setattr(ChromeDriverResolver, '_memo', {})
+    assert resolver.resolve() == str(tmp_path / 'drivers-119' / 'chromedriver')
+
+
+def test_invalidate_forces_new_lookup(resolver_config, tmp_path):
+    resolver = ChromeDriverResolver(resolver_config)
+    resolver.resolve()
+    resolver.invalidate()
+
+    with open(resolver_config.PATHS['chromedriver_cache'], encoding='utf-8') as f:
+        assert json.load(f) == {}
+    assert ChromeDriverResolver._memo == {}
+
+
+def test_offline_without_matching_driver_raises(resolver_config):
+    resolver_config.CHROMEDRIVER['search_dirs'] = []
+    with pytest.raises(RuntimeError):
+        ChromeDriverResolver(resolver_config).resolve()
+
+
+def test_configured_driver_path(resolver_config, tmp_path):
+    resolver_config.CHROMEDRIVER['driver_path'] = str(tmp_path / 'missing')
+    with pytest.raises(FileNotFoundError):
+        ChromeDriverResolver(resolver_config).resolve()
+
+    resolver_config.CHROMEDRIVER['driver_path'] = str(tmp_path / 'drivers-119' / 'chromedriver')
+    assert ChromeDriverResolver(resolver_config).resolve() == resolver_config.CHROMEDRIVER['driver_path']
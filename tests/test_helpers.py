@@ -0,0 +1,52 @@
+"""
+价格和销量文本解析测试（样例取自data/目录下导出文件中的真实单元格）
+"""
+
+import pytest
+
+from src.utils.helpers import parse_number, parse_price, parse_sales
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('¥4\n售1.1万+\n件', (4.0, 4.0)),
+    ('¥8.9\n售900+\n件', (8.9, 8.9)),
+    ('¥11.62\n限时价\n售9300+\n件', (11.62, 11.62)),
+    ('¥69.3\n1件起\n批', (69.3, 69.3)),
+    ('起批2件 ￥3.50', (3.5, 3.5)),
+    ('￥1,299.00', (1299.0, 1299.0)),
+    ('¥10.5-20', (10.5, 20.0)),
+    ('¥10.5 - ¥20', (10.5, 20.0)),
+    ('3.50', (3.5, 3.5)),
+    ('10-20元', (10.0, 20.0)),
+    ('2件起批', (None, None)),
+    ('价格面议', (None, None)),
+    ('', (None, None)),
+])
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('¥4\n售1.1万+\n件', 11000),
+    ('¥8.9\n售900+\n件', 900),
+    ('¥0.85\n售10万+\n件', 100000),
+    ('3天内发货 已售50件', 50),
+    ('100+人付款', 100),
+    ('0人付款', 0),
+    ('成交1.2万件', 12000),
+    ('月销 3k', 3000),
+    ('1200', 1200),
+    ('3天内发货', None),
+    ('¥69.3\n1件起\n批', None),
+    ('', None),
+])
+def test_parse_sales(text, expected):
+    assert parse_sales(text) == expected
+
+
+def test_parse_number():
+    assert parse_number('1.2万+') == 12000
+    assert parse_number('¥1,299.00') == 1299.0
+    assert parse_number(15) == 15.0
+    assert parse_number('暂无') is None
+    assert parse_number(True) is None
@@ -0,0 +1,59 @@
+"""
+HTML离线解析测试（使用内置的搜索结果页片段，不需要浏览器）
+"""
+
+from src.extractors.html_extractor import HTMLProductExtractor
+
+BASE_URL = 'https://s.1688.com/selloffer/offer_search.htm?keywords=abc'
+
+SEARCH_PAGE = """
+<html><body>
+<div class="offer-list">
+  <div class="offer-card">
+    <a href="//detail.1688.com/offer/610000001.html" title="手机壳硅胶防摔">
+      <img src="//cbu01.alicdn.com/img/a.jpg">
+    </a>
+    <div class="offer-price">¥3.50</div>
+    <div class="company-name">义乌某某贸易</div>
+    <div class="sale-amount">900+人付款</div>
+  </div>
+  <div class="offer-card">
+    <a href="/offer/620000002.html" title="数据线快充">数据线快充</a>
+    <span>￥8.90</span>
+  </div>
+  <div class="offer-card"><span class="ad">广告</span></div>
+</div>
+</body></html>
+"""
+
+
+def test_extracts_cards_with_fields_and_absolute_links(config):
+    products = HTMLProductExtractor(config).extract_from_html(SEARCH_PAGE, BASE_URL)
+
+    assert [product['title'] for product in products] == ['手机壳硅胶防摔', '数据线快充']
+    first, second = products
+    assert first['link'] == 'https://detail.1688.com/offer/610000001.html'
+    assert first['image'] == 'https://cbu01.alicdn.com/img/a.jpg'
+    assert (first['price'], first['shop'], first['sales']) == ('¥3.50', '义乌某某贸易', '900+人付款')
+    assert first['source'] == 'HTML解析'
+    # 价格没有专用class时按货币符号文本定位，相对链接按页面URL补全
+    assert second['price'] == '￥8.90'
+    assert second['link'] == 'https://s.1688.com/offer/620000002.html'
+
+
+def test_falls_back_to_offer_links_without_known_cards(config):
+    html = '<ul><li><a href="https://detail.1688.com/offer/630000003.html" title="蓝牙耳机无线">耳机</a></li></ul>'
+    products = HTMLProductExtractor(config).extract_from_html(html, BASE_URL)
+
+    assert [(product['title'], product['link']) for product in products] == [
+        ('蓝牙耳机无线', 'https://detail.1688.com/offer/630000003.html')]
+
+
+def test_extract_from_file_and_broken_input(config, tmp_path):
+    path = tmp_path / 'page.html'
+    path.write_text(SEARCH_PAGE, encoding='utf-8')
+    extractor = HTMLProductExtractor(config)
+
+    assert len(extractor.extract_from_file(str(path), BASE_URL)) == 2
+    assert extractor.extract_from_file(str(tmp_path / 'missing.html')) == []
+    assert extractor.extract_from_html('', BASE_URL) == []
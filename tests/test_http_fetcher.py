@@ -0,0 +1,72 @@
+"""
+HTTP页面获取测试（替换会话的get方法，不发出网络请求）
+"""
+
+import os
+import json
+
+import pytest
+import requests
+
+from src.drivers.http_fetcher import HttpFetcher
+
+SEARCH_URL = 'https://s.1688.com/selloffer/offer_search.htm?keywords=abc'
+
+
+class FakeResponse:
+    def __init__(self, url, status_code=200, text='<html>商品</html>'):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.encoding = 'utf-8'
+
+
+@pytest.fixture
+def fetcher(config):
+    fetcher = HttpFetcher(config)
+    yield fetcher
+    fetcher.close()
+
+
+@pytest.mark.parametrize('final_url, html, expected', [
+    (SEARCH_URL, '<div class="offer-card">商品</div>', None),
+    ('https://login.1688.com/member/signin.htm?redirect=x', '', 'login'),
+    ('https://s.1688.com/selloffer/_____tmd_____/punish?x5secdata=abc', '', 'captcha'),
+    (SEARCH_URL, '<div id="nc_1_wrapper"></div>', 'captcha'),
+    (SEARCH_URL, '<div class="baxia-dialog"></div>', 'captcha'),
+])
+def test_blocked_reason(fetcher, final_url, html, expected):
+    assert fetcher._blocked_reason(final_url, html) == expected
+
+
+def test_fetch_reports_block_reason_and_stats(fetcher, monkeypatch):
+    responses = iter([
+        FakeResponse(SEARCH_URL),
+        FakeResponse('https://login.1688.com/member/signin.htm'),
+        FakeResponse(SEARCH_URL, status_code=404, text='not found'),
+    ])
+    monkeypatch.setattr(fetcher.session, 'get', lambda url, headers=None, timeout=None: next(responses))
+
+    results = [fetcher.fetch(SEARCH_URL) for _ in range(3)]
+    assert [result.blocked for result in results] == [None, 'login', 'http_404']
+    assert results[0].ok and results[0].html == '<html>商品</html>'
+    assert (fetcher.stats['requests'], fetcher.stats['blocked']) == (3, 2)
+
+
+def test_fetch_request_error(fetcher, monkeypatch):
+    def fail(url, headers=None, timeout=None):
+        raise requests.ConnectionError('connection refused')
+
+    monkeypatch.setattr(fetcher.session, 'get', fail)
+    assert fetcher.fetch(SEARCH_URL).blocked == 'error'
+
+
+def test_load_cookie_file(fetcher, config):
+    assert fetcher.load_cookie_file() == 0 and not fetcher.has_cookies
+
+    os.makedirs(os.path.dirname(config.PATHS['cookies']))
+    with open(config.PATHS['cookies'], 'w', encoding='utf-8') as f:
+        json.dump([{'name': 'cna', 'value': 'abc', 'domain': '.1688.com'}, {'value': 'no-name'}], f)
+    assert fetcher.load_cookie_file() == 1
+    assert fetcher.session.cookies.get('cna', domain='.1688.com') == 'abc'
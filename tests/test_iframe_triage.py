@@ -0,0 +1,77 @@
+"""
+iframe分诊测试（假驱动直接返回分诊脚本的结果）
+"""
+
+import pytest
+
+from src.handlers.iframe_triage import FrameInfo, IframeTriage
+
+
+class ScriptDriver:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def execute_script(self, script):
+        return self.frames
+
+
+@pytest.fixture(autouse=True)
+def empty_history(monkeypatch):
+    """进入结果按类共享，每个测试使用独立的记录"""
+    monkeypatch.setattr(IframeTriage, '_history', {})
+
+
+def _frame(src='https://example.com/frame.html', **kwargs):
+    values = dict(index=0, src=src, visible=True, width=400, height=300)
+    values.update(kwargs)
+    return FrameInfo(**values)
+
+
+@pytest.mark.parametrize('frame, verdict', [
+    (_frame('https://g.mmstat.com/pixel.html'), 'skip'),
+    (_frame(visible=False), 'skip'),
+    (_frame(width=1, height=1), 'skip'),
+    (_frame('https://air.1688.com/app/popup/aibuy.html'), 'candidate'),
+    (_frame(overlay=True, z_index=999), 'candidate'),
+    (_frame(overlay=True, z_index=1), 'skip'),
+    (_frame(coverage=0.6), 'candidate'),
+    (_frame(), 'skip'),
+])
+def test_classify(config, frame, verdict):
+    assert IframeTriage(None, config)._classify(frame)[0] == verdict
+
+
+def test_src_without_popups_is_given_up_and_rechecked(config):
+    config.IFRAME_TRIAGE.update(give_up_after=2, recheck_interval=3)
+    triage = IframeTriage(None, config)
+    frame = _frame('https://example.com/float.html?t=1', overlay=True, z_index=999)
+
+    for _ in range(2):
+        triage.record_result(frame, found=False)
+    # 查询参数不同的同一src共享记录
+    same_src = _frame('https://example.com/float.html?t=2', overlay=True, z_index=999)
+    verdicts = [triage._classify(same_src)[0] for _ in range(3)]
+    assert verdicts == ['skip', 'skip', 'candidate']
+
+
+def test_src_that_had_popup_stays_candidate(config):
+    triage = IframeTriage(None, config)
+    frame = _frame(overlay=True, z_index=999)
+    triage.record_result(frame, found=True)
+    for _ in range(config.IFRAME_TRIAGE['give_up_after']):
+        triage.record_result(frame, found=False)
+
+    assert triage._classify(frame)[0] == 'candidate'
+
+
+def test_candidates_from_script_result(config):
+    driver = ScriptDriver([
+        {'index': 0, 'src': 'https://g.mmstat.com/a.html', 'visible': True, 'width': 1, 'height': 1},
+        {'index': 1, 'src': 'https://example.com/float.html', 'visible': True, 'width': 400, 'height': 300,
+         'overlay': True, 'zIndex': 1000},
+        {'index': 2, 'src': '', 'visible': True, 'width': 800, 'height': 600, 'coverage': 0.9},
+    ])
+    triage = IframeTriage(driver, config)
+
+    assert [frame.index for frame in triage.candidates()] == [1, 2]
+    assert [frame.index for frame in triage.candidates(frame_indices=[0, 2])] == [2]
@@ -0,0 +1,59 @@
+"""
+人工确认策略测试（monkeypatch替换终端检测和input，不读取真实标准输入）
+"""
+
+import pytest
+
+from src.utils import interaction
+from src.utils.interaction import InteractionPolicy
+
+
+def _fail_input(prompt=''):
+    raise AssertionError('无人值守模式不应读取标准输入')
+
+
+@pytest.fixture
+def interactive(monkeypatch):
+    monkeypatch.setattr(interaction, 'stdin_is_interactive', lambda: True)
+
+
+def test_unattended_detection(config, monkeypatch):
+    policy = InteractionPolicy(config)
+    monkeypatch.setattr(interaction, 'stdin_is_interactive', lambda: False)
+    assert policy.unattended
+
+    config.UNATTENDED['auto_detect'] = False
+    assert not policy.unattended
+
+    config.UNATTENDED['enabled'] = True
+    monkeypatch.setattr(interaction, 'stdin_is_interactive', lambda: True)
+    assert policy.unattended
+
+
+def test_unattended_answers_without_reading_stdin(config, monkeypatch):
+    config.UNATTENDED['enabled'] = True
+    monkeypatch.setattr('builtins.input', _fail_input)
+    policy = InteractionPolicy(config)
+
+    assert policy.ask('是否继续? (y/n): ', 'y', '无人值守默认继续') == 'y'
+    assert policy.pause('按Enter继续...') is False
+
+
+def test_interactive_reads_input(config, monkeypatch, interactive):
+    answers = iter(['  n  ', ''])
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers))
+    policy = InteractionPolicy(config)
+
+    assert policy.ask('是否继续? (y/n): ', 'y') == 'n'
+    assert policy.pause('按Enter继续...') is True
+
+
+def test_closed_stdin_falls_back_to_auto_answer(config, monkeypatch, interactive):
+    def closed(prompt=''):
+        raise EOFError
+
+    monkeypatch.setattr('builtins.input', closed)
+    policy = InteractionPolicy(config)
+
+    assert policy.ask('选择: ', '1') == '1'
+    assert policy.pause('按Enter继续...') is False
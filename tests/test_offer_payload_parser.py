@@ -0,0 +1,58 @@
+"""
+商品列表接口数据解析测试
+"""
+
+import json
+
+from src.extractors.network_capture import OfferPayloadParser, parse_payload
+
+
+def _payload():
+    return {'data': {'content': {'offerList': [
+        {
+            'id': 610000001,
+            'information': {'subject': '<em>手机壳</em>硅胶', 'detailUrl': '//detail.1688.com/offer/610000001.html'},
+            'tradePrice': {'offerPrice': {'valueString': '3.50'}},
+            'company': {'name': '义乌某某贸易'},
+            'tradeQuantity': {'number': '1.2万+'},
+            'image': {'imgUrl': '//cbu01.alicdn.com/img/a.jpg'}
+        },
+        {'offerId': '610000002', 'subject': '数据线', 'price': 8, 'companyName': '深圳某某电子', 'saleQuantity': 120},
+        {'offerId': '610000003', 'subject': ''}
+    ]}}}
+
+
+def test_parse_payload_accepts_json_and_jsonp():
+    assert parse_payload('{"a": 1}') == {'a': 1}
+    assert parse_payload('mtopjsonp3({"a": [1]});') == {'a': [1]}
+    assert parse_payload('<html></html>') is None
+    assert parse_payload('') is None
+
+
+def test_parse_text_finds_nested_offer_list(config):
+    products = OfferPayloadParser(config).parse_text(json.dumps(_payload(), ensure_ascii=False))
+
+    # 标题为空的商品被丢弃
+    assert [product['offer_id'] for product in products] == ['610000001', '610000002']
+
+    first = products[0]
+    assert first['title'] == '手机壳硅胶'
+    assert first['link'] == 'https://detail.1688.com/offer/610000001.html'
+    assert first['image'] == 'https://cbu01.alicdn.com/img/a.jpg'
+    assert first['shop'] == '义乌某某贸易'
+    assert first['price_value'] == 3.5
+    assert first['sales_count'] == 12000
+    assert first['source'] == 'network'
+
+
+def test_link_built_from_offer_id(config):
+    product = OfferPayloadParser(config).to_product({'offerId': '610000002', 'subject': '数据线', 'price': 8})
+    assert product['link'] == 'https://detail.1688.com/offer/610000002.html'
+    assert product['price_value'] == 8.0
+    assert product['sales_count'] is None
+
+
+def test_unrelated_payload_yields_nothing(config):
+    parser = OfferPayloadParser(config)
+    assert parser.parse_text('{"data": {"list": [{"name": "广告位"}], "total": 3}}') == []
+    assert parser.parse_text('not json') == []
@@ -0,0 +1,61 @@
+"""
+单次批量提取与商品字段规范化测试（假驱动直接返回提取脚本的结果）
+"""
+
+from src.extractors.product_extractor import SINGLE_PASS_EXTRACTION_SCRIPT, ProductExtractor
+from src.extractors.product_fields import build_product_record
+
+
+class ScriptDriver:
+    """execute_script返回预设结果的假驱动，记录传入的参数"""
+
+    current_url = 'https://s.1688.com/selloffer/offer_search.htm?keywords=abc'
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.result
+
+
+def test_build_product_record_normalizes_fields():
+    product = build_product_record({'title': '  手机壳\n硅胶 ', 'price': '¥3.50\n售900+\n件', 'shop': '义乌某某贸易',
+                                    'link': ' https://detail.1688.com/offer/610000001.html '}, '批量提取')
+
+    assert product == {'title': '手机壳 硅胶', 'price': '¥3.50', 'shop': '义乌某某贸易', 'sales': '0人付款',
+                       'link': 'https://detail.1688.com/offer/610000001.html', 'image': '', 'source': '批量提取'}
+
+
+def test_build_product_record_rejects_incomplete_cards():
+    assert build_product_record({'title': '手机壳'}, '批量提取') is None
+    assert build_product_record({'price': '¥3.50', 'shop': '义乌某某贸易'}, '批量提取') is None
+
+
+def test_single_pass_makes_one_script_call_and_records_hit(config):
+    driver = ScriptDriver({'selector': '.offer-card', 'total': 2, 'cards': [
+        {'title': '手机壳', 'price': '¥3.50', 'shop': '义乌某某贸易', 'sales': '售900+'},
+        {'title': '', 'price': '¥8.00'},
+    ]})
+    extractor = ProductExtractor(driver, config)
+    config.PRODUCT_SELECTORS['standard'] = ['.card', '.offer-card']
+
+    products = extractor.extract_products_single_pass()
+
+    assert [product['title'] for product in products] == ['手机壳']
+    assert len(driver.calls) == 1
+    script, args = driver.calls[0]
+    assert script == SINGLE_PASS_EXTRACTION_SCRIPT
+    assert args[0] == ['.card', '.offer-card'] and args[2] == config.PRODUCT_FIELD_SELECTORS
+
+    # 命中的选择器排到前面
+    assert extractor._ranked_selectors('standard', 'www')[0] == '.offer-card'
+
+
+def test_single_pass_script_error_returns_no_products(config):
+    class FailingDriver(ScriptDriver):
+        def execute_script(self, script, *args):
+            raise RuntimeError('javascript error')
+
+    assert ProductExtractor(FailingDriver(None), config).extract_products_single_pass() == []
@@ -0,0 +1,89 @@
+"""
+Chrome配置目录锁测试
+"""
+
+import os
+import json
+import time
+import socket
+import subprocess
+import sys
+
+from src.drivers.profile_store import LOCK_FILE, ProfileStore
+
+
+def _write_lock(store, name, pid, host=None, age_hours=0.0):
+    path = store.profile_path(name)
+    os.makedirs(path, exist_ok=True)
+    lock_path = os.path.join(path, LOCK_FILE)
+    with open(lock_path, 'w', encoding='utf-8') as f:
+        json.dump({'pid': pid, 'host': host or socket.gethostname(), 'locked_at': time.time()}, f)
+    mtime = time.time() - age_hours * 3600
+    os.utime(lock_path, (mtime, mtime))
+    return lock_path
+
+
+def _exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_acquire_and_release(config):
+    store = ProfileStore(config=config)
+    lease = store.acquire('p')
+
+    assert lease.created and os.path.isdir(lease.path)
+    assert store.acquire('p') is None
+    store.release(lease)
+
+    again = store.acquire('p')
+    assert again is not None and not again.created
+
+
+def test_acquire_without_name_reuses_idle_profile_and_respects_limit(config):
+    config.PROFILE_STORE['max_profiles'] = 2
+    store = ProfileStore(config=config)
+    first = store.acquire()
+    second = store.acquire()
+
+    assert {first.name, second.name} == {'profile-1', 'profile-2'}
+    assert store.acquire() is None
+
+    store.release(first)
+    assert store.acquire().name == first.name
+
+
+def test_old_lock_of_live_local_process_is_kept(config):
+    store = ProfileStore(config=config)
+    lock_path = _write_lock(store, 'p', os.getpid(), age_hours=config.PROFILE_STORE['stale_lock_hours'] + 1)
+
+    assert not store._lock_is_stale(lock_path)
+    assert store.acquire('p') is None
+
+
+def test_lock_of_exited_local_process_is_cleared(config):
+    store = ProfileStore(config=config)
+    _write_lock(store, 'p', _exited_pid())
+
+    assert store.acquire('p') is not None
+
+
+def test_other_host_lock_expires_by_age(config):
+    store = ProfileStore(config=config)
+    hours = config.PROFILE_STORE['stale_lock_hours']
+    fresh = _write_lock(store, 'fresh', 1, host='other-host', age_hours=hours - 1)
+    old = _write_lock(store, 'old', 1, host='other-host', age_hours=hours + 1)
+
+    assert not store._lock_is_stale(fresh)
+    assert store._lock_is_stale(old)
+
+
+def test_remove_skips_locked_profile(config):
+    store = ProfileStore(config=config)
+    lease = store.acquire('p')
+
+    assert not store.remove('p')
+    store.release(lease)
+    assert store.remove('p')
+    assert not os.path.exists(lease.path)
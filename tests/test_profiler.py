@@ -0,0 +1,78 @@
+"""
+抓取流程性能分析测试
+"""
+
+import json
+
+import pytest
+
+from src.utils.profiler import CrawlProfiler
+
+
+class FakeDriver:
+    def execute(self, driver_command, params=None):
+        return {'value': None}
+
+
+@pytest.fixture
+def profiler(config):
+    config.PROFILING['enabled'] = True
+    return CrawlProfiler(config)
+
+
+def test_spans_are_grouped_by_keyword_and_stage(profiler):
+    driver = profiler.instrument_driver(FakeDriver())
+    with profiler.keyword_scope('手机壳'):
+        with profiler.span('navigate'):
+            driver.execute('get')
+            # 同一阶段嵌套时只记录最外层
+            with profiler.span('navigate') as nested:
+                assert nested is None
+                driver.execute('findElements')
+        with profiler.span('extract') as span:
+            span['outcome'] = 'empty'
+    profiler.record('export', 0.5, keyword='数据线')
+
+    summary = profiler.summary()
+    navigate = summary['手机壳']['navigate']
+    assert (navigate['count'], navigate['webdriver_commands'], navigate['outcomes']) == (1, 2, {'ok': 1})
+    assert summary['手机壳']['extract']['outcomes'] == {'empty': 1}
+    assert summary['数据线']['export']['mean'] == 0.5
+    assert profiler.command_counts == {'get': 1, 'findElements': 1}
+
+
+def test_span_error_is_recorded(profiler):
+    with pytest.raises(RuntimeError):
+        with profiler.span('scroll'):
+            raise RuntimeError('boom')
+    assert profiler.summary()['-']['scroll']['outcomes'] == {'error': 1}
+
+
+def test_disabled_profiler_records_nothing(config):
+    profiler = CrawlProfiler(config)
+    with profiler.span('navigate') as span:
+        assert span is None
+    profiler.record('export', 1.0)
+    assert profiler.summary() == {}
+
+
+def test_prometheus_output_escapes_labels(profiler):
+    profiler.record('navigate', 1.25, keyword='手机"壳')
+    profiler.record('navigate', 0.75, outcome='failed', keyword='手机"壳')
+    text = profiler.to_prometheus()
+
+    labels = 'keyword="手机\\"壳",stage="navigate"'
+    assert f'crawler_stage_duration_seconds_sum{{{labels}}} 2.000000' in text
+    assert f'crawler_stage_duration_seconds_count{{{labels}}} 2' in text
+    assert f'crawler_stage_outcomes_total{{{labels},outcome="failed"}} 1' in text
+    assert text.count('# TYPE ') == 4 and text.endswith('\n')
+
+
+def test_export_writes_json_and_prometheus(profiler, tmp_path):
+    profiler.record('navigate', 0.1, keyword='k')
+    results = profiler.export(str(tmp_path), ['json', 'prometheus', 'csv'])
+
+    assert set(results) == {'json', 'prometheus'}
+    with open(results['json'], encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['summary']['k']['navigate']['count'] == 1 and len(data['spans']) == 1
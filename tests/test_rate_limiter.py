@@ -0,0 +1,81 @@
+"""
+访问频率控制和关键词文件读取测试
+"""
+
+import asyncio
+import time
+
+from src.core.async_scheduler import load_keywords
+from src.utils.rate_limiter import AsyncTokenBucket, HostRateLimiter, RateLimiter
+
+
+def test_rate_limiter_waits_only_for_remaining_interval():
+    limiter = RateLimiter(0.2)
+    assert limiter.wait() == 0.0
+
+    time.sleep(0.05)
+    waited = limiter.wait()
+    assert 0 < waited <= 0.15
+
+    limiter.reset()
+    assert limiter.wait() == 0.0
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    async def run():
+        bucket = AsyncTokenBucket(rate=20, capacity=2)
+        started = time.monotonic()
+        waits, times = [], []
+        for _ in range(5):
+            waits.append(await bucket.acquire())
+            times.append(time.monotonic() - started)
+        return waits, times
+
+    waits, times = asyncio.run(run())
+    # 前两个请求使用突发容量，不等待；之后第k个请求不早于(k-容量+1)/rate秒
+    assert waits[:2] == [0.0, 0.0]
+    for k in range(2, 5):
+        assert times[k] >= (k - 1) / 20 - 0.005
+
+
+def test_token_bucket_serves_concurrent_waiters_at_rate():
+    async def run():
+        bucket = AsyncTokenBucket(rate=20, capacity=1)
+        started = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 3 / 20 - 0.005
+
+
+def test_host_rate_limiter_keeps_hosts_independent():
+    async def run():
+        limiter = HostRateLimiter(rate=5, burst=1, per_host={'global.1688.com': {'rate': 50, 'burst': 1}})
+        await limiter.acquire('https://s.1688.com/a')
+        await limiter.acquire('https://global.1688.com/a')
+        # 另一个主机只按自己的速率等待，不受www的限速影响
+        other_host = await limiter.acquire('https://global.1688.com/b')
+        same_host = await limiter.acquire('https://s.1688.com/b')
+        return limiter, other_host, same_host
+
+    limiter, other_host, same_host = asyncio.run(run())
+    assert other_host <= 1 / 50 + 1e-6
+    assert same_host > 1 / 50
+    assert limiter.bucket('global.1688.com').rate == 50
+
+
+def test_host_rate_limiter_from_config(config):
+    config.RATE_LIMIT.update(min_interval=2, max_interval=4, burst=3, jitter=(0.0, 0.0), per_host={})
+    limiter = HostRateLimiter.from_config(config)
+    assert limiter.rate == 1 / 3
+    assert limiter.bucket('s.1688.com').capacity == 3
+
+
+def test_load_keywords_sorts_by_priority(tmp_path):
+    keywords_file = tmp_path / 'keywords.txt'
+    keywords_file.write_text("# 注释\n\n手机壳\n数据线|5\n充电器 | 2\nA|B|1\n不是优先级|x\n", encoding='utf-8')
+
+    assert load_keywords(str(keywords_file)) == [
+        ('数据线', 5), ('充电器', 2), ('A|B', 1), ('手机壳', 0), ('不是优先级|x', 0)
+    ]
+    assert load_keywords(str(keywords_file), default_priority=3)[1] == ('手机壳', 3)
@@ -0,0 +1,87 @@
+"""
+选择器命中统计测试
+"""
+
+from src.utils.selector_stats import SelectorStats, probe_selectors, site_key
+
+SELECTORS = ['.a', '.b', '.c']
+
+
+def _make_stale(stats, site, selector, hit):
+    """连续探测未命中，直到滑动平均命中率低于失效阈值"""
+    for _ in range(stats.settings['stale_after'] * 2):
+        stats.record_probe(site, [selector, hit], hit, 10)
+
+
+def test_site_key():
+    assert site_key('https://global.1688.com/s/offer_search.htm') == 'global'
+    assert site_key('https://s.1688.com/selloffer/offer_search.htm') == 'www'
+    assert site_key('') == 'www'
+
+
+def test_unknown_selectors_keep_config_order(config):
+    assert SelectorStats(config=config).rank('www', SELECTORS) == SELECTORS
+
+
+def test_hits_move_selector_forward(config):
+    stats = SelectorStats(config=config)
+    stats.record_ordered_hit('www', SELECTORS, '.c', 20)
+
+    assert stats.rank('www', SELECTORS) == ['.c', '.a', '.b']
+    # 另一个站点的统计互不影响
+    assert stats.rank('global', SELECTORS) == SELECTORS
+
+
+def test_record_ordered_hit_ignores_selectors_after_hit(config):
+    stats = SelectorStats(config=config)
+    stats.record_ordered_hit('www', SELECTORS, '.b', 5)
+
+    records = {item['selector']: item for item in stats.summary('www')}
+    assert set(records) == {'.a', '.b'}
+    assert records['.b']['hits'] == 1 and records['.a']['hits'] == 0
+
+
+def test_stale_selector_only_explored_periodically(config):
+    config.SELECTOR_RANKING['explore_interval'] = 3
+    stats = SelectorStats(config=config)
+    _make_stale(stats, 'www', '.a', '.b')
+
+    orders = [stats.rank('www', SELECTORS) for _ in range(3)]
+    assert orders[0] == ['.b', '.c']
+    assert orders[1] == ['.b', '.c']
+    assert orders[2] == ['.b', '.c', '.a']
+
+
+def test_rank_without_advance_does_not_consume_exploration(config):
+    config.SELECTOR_RANKING['explore_interval'] = 2
+    stats = SelectorStats(config=config)
+    _make_stale(stats, 'www', '.a', '.b')
+
+    # 页面状态快照等只借用排序的调用：失效选择器排在队尾，但不推进探测计数
+    for _ in range(5):
+        assert stats.rank('www', SELECTORS, advance=False) == ['.b', '.c', '.a']
+    assert stats.rank('www', SELECTORS) == ['.b', '.c']
+    assert stats.rank('www', SELECTORS) == ['.b', '.c', '.a']
+
+
+def test_stats_persist_across_instances(config):
+    stats = SelectorStats(config=config)
+    stats.record_ordered_hit('global', SELECTORS, '.b', 8)
+    stats.close()
+
+    reopened = SelectorStats(config=config)
+    assert reopened.rank('global', SELECTORS)[0] == '.b'
+    assert reopened.summary('global', 'standard')[0]['avg_yield'] == 8
+
+
+def test_probe_selectors_records_misses_before_hit(config):
+    stats = SelectorStats(config=config)
+    found = {'.b': ['x', 'y']}
+
+    selector, elements = probe_selectors(SELECTORS, lambda css: found.get(css, []), 'www', stats=stats)
+    assert (selector, elements) == ('.b', ['x', 'y'])
+    assert {item['selector'] for item in stats.summary('www')} == {'.a', '.b'}
+
+    # 全部未命中时不记录
+    assert probe_selectors(['.z'], lambda css: [], 'www', stats=stats) == (None, [])
+    assert len(stats.summary('www')) == 2
@@ -0,0 +1,74 @@
+"""
+商品流式导出测试
+"""
+
+import json
+
+import pytest
+
+from src.utils.data_exporter import DataExporter
+from src.utils.stream_sink import ProductStreamSink
+
+
+def _product(i):
+    return {'title': f'商品{i}', 'price': '¥1.00', 'shop': '某某贸易', 'sales': '10人付款',
+            'link': f'https://detail.1688.com/offer/61000000{i}.html', 'image': '', 'source': 'dom'}
+
+
+def _lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture
+def exporter(config, monkeypatch):
+    monkeypatch.setattr(DataExporter, '_open_file_directory', lambda self, filepath: None)
+    return DataExporter(config)
+
+
+def test_records_reach_disk_per_batch(exporter):
+    sink = ProductStreamSink(exporter, 'k', formats=['jsonl'], batch_size=2)
+    sink(1, [_product(1)])
+    assert _lines(sink.paths['jsonl']) == []
+
+    # 作为on_page回调，缓冲达到批量大小时写入磁盘
+    sink(2, [_product(2)])
+    assert [item['title'] for item in _lines(sink.paths['jsonl'])] == ['商品1', '商品2']
+    sink.close()
+
+    with pytest.raises(ValueError):
+        sink.write([_product(3)])
+
+
+def test_finalize_converts_all_records(exporter):
+    with exporter.open_stream('k', formats=['jsonl']) as sink:
+        sink.write([_product(1), _product(2)])
+    results = sink.finalize(['json'])
+
+    with open(results['json'], encoding='utf-8') as f:
+        assert [item['title'] for item in json.load(f)] == ['商品1', '商品2']
+    assert sink.count == 2
+
+
+def test_finalize_without_records_writes_no_final_files(exporter):
+    sink = exporter.open_stream('k', formats=['jsonl'])
+    assert set(sink.finalize(['json', 'excel'])) == {'jsonl'}
+
+
+def test_resume_appends_after_truncated_line(exporter):
+    first = exporter.open_stream('k', formats=['jsonl'])
+    first.write([_product(1)])
+    first.close()
+    path = first.paths['jsonl']
+    # 模拟中断时写了一半的最后一行
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"title": "商品')
+
+    resumed = exporter.open_stream('k', formats=['jsonl'], paths={'jsonl': path})
+    # 被截断的行不计入记录数
+    assert resumed.count == 1
+    resumed.write([_product(2)])
+
+    assert [item['title'] for item in resumed.iter_products()] == ['商品1', '商品2']
+    resumed.close()
+    assert resumed.count == 2
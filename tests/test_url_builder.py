@@ -0,0 +1,30 @@
+"""
+搜索URL构造与模板排序测试
+"""
+
+from src.strategies.url_builder import URL_TEMPLATE_KIND, URLBuilder
+
+
+def _probe_count(builder):
+    return builder.stats._probe_counts.get(('www', URL_TEMPLATE_KIND), 0)
+
+
+def test_build_search_urls_does_not_advance_exploration(config):
+    builder = URLBuilder(config)
+    urls = builder.build_search_urls('手机壳')
+
+    assert urls and all(builder.validate_search_url(url) for url in urls)
+    assert _probe_count(builder) == 0
+
+    # 真正逐个尝试并记录结果的排序才计为一次尝试
+    builder.rank_search_candidates('手机壳')
+    assert _probe_count(builder) == 1
+
+
+def test_build_search_urls_follows_template_ranking(config):
+    builder = URLBuilder(config)
+    candidates = builder.rank_search_candidates('手机壳', advance=False)
+    best_id, best_url = candidates[-1]
+    builder.record_search_result([template_id for template_id, _ in candidates], best_id)
+
+    assert builder.build_search_urls('手机壳')[0] == best_url
@@ -0,0 +1,80 @@
+"""
+URL缓存存储测试
+"""
+
+import time
+from pathlib import Path
+
+from src.utils.url_cache_store import URLCacheStore
+
+
+def test_record_success_and_lookup(config):
+    store = URLCacheStore(config=config)
+    store.record_success('手机壳', 'https://s.1688.com/a')
+    store.record_success('手机壳', 'https://s.1688.com/a')
+
+    record = store.get('手机壳')
+    assert record['url'] == 'https://s.1688.com/a'
+    assert record['success_count'] == 2
+    assert store.get_url('不存在') is None
+
+
+def test_changed_url_resets_counts(config):
+    store = URLCacheStore(config=config)
+    store.record_success('k', 'https://s.1688.com/a')
+    store.record_failure('k')
+    store.record_success('k', 'https://s.1688.com/b')
+
+    record = store.get('k')
+    assert record['url'] == 'https://s.1688.com/b'
+    assert (record['success_count'], record['failure_count']) == (1, 0)
+
+
+def test_failure_for_other_url_is_ignored(config):
+    store = URLCacheStore(config=config)
+    store.record_success('k', 'https://s.1688.com/a')
+    store.record_failure('k', 'https://s.1688.com/other')
+    assert store.get('k')['failure_count'] == 0
+
+
+def test_low_success_rate_is_unusable(config):
+    store = URLCacheStore(config=config)
+    store.record_success('k', 'https://s.1688.com/a')
+    for _ in range(config.URL_CACHE['min_attempts']):
+        store.record_failure('k')
+
+    assert store.get_url('k') is None
+    assert store.get('k', include_stale=True)['url'] == 'https://s.1688.com/a'
+
+
+def test_expired_record_is_unusable_and_pruned(config):
+    store = URLCacheStore(config=config)
+    store.record_success('k', 'https://s.1688.com/a')
+    old = time.time() - (config.URL_CACHE['ttl_days'] + 1) * 86400
+    store._write("UPDATE url_cache SET last_success = ?, updated_at = ? WHERE keyword = ?", (old, old, 'k'), 'k')
+
+    assert store.get_url('k') is None
+    assert store.prune_expired() == 1
+    assert len(store) == 0
+
+
+def test_writes_from_another_connection_are_visible(config):
+    first = URLCacheStore(config=config)
+    second = URLCacheStore(config=config)
+    second.put('k', 'https://s.1688.com/a')
+    assert first.get_url('k') == 'https://s.1688.com/a'
+
+
+def test_legacy_file_is_imported_once(config):
+    legacy = Path(config.PATHS['url_cache'])
+    legacy.parent.mkdir(parents=True, exist_ok=True)
+    legacy.write_text("# 注释\n手机壳|https://s.1688.com/a|2024-01-01 10:00:00|直接访问成功\n"
+                      "数据线|https://s.1688.com/b\n", encoding='utf-8')
+
+    store = URLCacheStore(config=config)
+    assert len(store) == 2
+    assert store.get('手机壳', include_stale=True)['note'] == '直接访问成功'
+
+    store.remove('数据线')
+    store.close()
+    assert len(URLCacheStore(config=config)) == 1